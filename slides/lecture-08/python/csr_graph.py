@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+csr_graph.py
+Compressed sparse row (CSR) adjacency helpers shared by the graph engines.
+
+The gen_* scripts build small networkx graphs for drawing; the engines
+behind them (hop distances, PageRank, ...) work on a CSR adjacency matrix
+instead so the same code runs on graphs with millions of edges. Nodes are
+always the integers 0..n-1; `from_networkx` returns the node order used.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def from_edges(src, dst, n=None, symmetric=False, dtype=np.float64):
+    """Build an n x n CSR adjacency matrix from parallel edge arrays.
+
+    Duplicate edges are collapsed to a single entry of weight 1. With
+    `symmetric=True` every edge is also added in the reverse direction,
+    which is what the undirected social-network slides want.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    if n is None:
+        n = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+    if symmetric:
+        src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+    data = np.ones(len(src), dtype=dtype)
+    A = sp.csr_matrix((data, (src, dst)), shape=(n, n))
+    A.sum_duplicates()
+    A.data[:] = 1
+    A.sort_indices()
+    return A
+
+
+def from_networkx(G, nodelist=None):
+    """Return (A, nodelist) for a networkx graph.
+
+    Undirected graphs give a symmetric matrix; directed graphs keep
+    A[u, v] = 1 for every edge u -> v.
+    """
+    if nodelist is None:
+        nodelist = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodelist)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()],
+                     dtype=np.int64).reshape(-1, 2)
+    A = from_edges(edges[:, 0], edges[:, 1], n=len(nodelist),
+                   symmetric=not G.is_directed())
+    return A, nodelist
+
+
+def save_edge_list(path, src, dst):
+    """Write edges as an (m, 2) int32 .npy file for memory-mapped loading."""
+    edges = np.empty((len(src), 2), dtype=np.int32)
+    edges[:, 0] = src
+    edges[:, 1] = dst
+    np.save(path, edges)
+
+
+def _open_edge_list(path):
+    """Memory-map an edge list: (m, 2) .npy, or raw int32 (src, dst) pairs."""
+    if str(path).endswith('.npy'):
+        edges = np.load(path, mmap_mode='r')
+    else:
+        edges = np.memmap(path, dtype=np.int32, mode='r').reshape(-1, 2)
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError(f'{path}: expected (m, 2) edge array, '
+                         f'got shape {edges.shape}')
+    return edges
+
+
+def load_edge_list(path, n=None, chunk_size=1 << 22):
+    """Build a CSR adjacency from a memory-mapped binary edge list.
+
+    The file is streamed twice in chunks of `chunk_size` edges: once to
+    count out-degrees (giving indptr) and once to scatter targets into
+    place, so peak memory is the CSR arrays plus one chunk. Parallel edges
+    are kept and act as extra weight.
+    """
+    edges = _open_edge_list(path)
+    m = edges.shape[0]
+
+    if n is None:
+        n = 0
+        for lo in range(0, m, chunk_size):
+            block = edges[lo:lo + chunk_size]
+            if len(block):
+                n = max(n, int(block.max()) + 1)
+
+    degree = np.zeros(n, dtype=np.int64)
+    for lo in range(0, m, chunk_size):
+        degree += np.bincount(edges[lo:lo + chunk_size, 0], minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+
+    indices = np.empty(m, dtype=np.int32)
+    fill = indptr[:-1].copy()
+    for lo in range(0, m, chunk_size):
+        block = np.asarray(edges[lo:lo + chunk_size])
+        order = np.argsort(block[:, 0], kind='stable')
+        src = block[order, 0]
+        # Rank of each edge within its run of equal sources in this chunk
+        run_start = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+        run_len = np.diff(np.r_[run_start, len(src)])
+        rank = np.arange(len(src)) - np.repeat(run_start, run_len)
+        indices[fill[src] + rank] = block[order, 1]
+        fill[src[run_start]] += run_len
+
+    data = np.ones(m, dtype=np.float64)
+    A = sp.csr_matrix((data, indices, indptr), shape=(n, n))
+    return A
@@ -15,27 +15,13 @@ import matplotlib.patches as mpatches
 import networkx as nx
 import numpy as np
 
+from theme import CARD_BG, YELLOW, TEAL, TEXT, MUTED, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '04-cayley-trees.png')
-os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-BLUE      = '#3498db'
-YELLOW    = '#f1c40f'
-GREEN     = '#2ecc71'
-TEAL      = '#1abc9c'
-ORANGE    = '#e67e22'
-RED       = '#e74c3c'
-PURPLE    = '#9b59b6'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
 
 # ---------------------------------------------------------------------------
 # Generate all labeled trees on n nodes using Prufer sequences
@@ -151,109 +137,103 @@ def draw_tree_cell(ax, G, n, cx, cy, cell_w, cell_h):
 # ---------------------------------------------------------------------------
 # Figure
 # ---------------------------------------------------------------------------
-plt.style.use('dark_background')
-fig, ax = plt.subplots(figsize=(3840/200, 2160/200), dpi=200)
-fig.patch.set_facecolor(BG)
-ax.set_facecolor(BG)
-ax.axis('off')
-
-# Total layout area
-total_w = 16.0
-total_h = 9.0
-ax.set_xlim(0, total_w)
-ax.set_ylim(0, total_h)
-
-# ---------------------------------------------------------------------------
-# Row 1: n=2, T_2 = 1 tree
-# ---------------------------------------------------------------------------
-trees_2 = all_labeled_trees(2)
-row_y = 7.8
-cell_w = 2.0
-cell_h = 1.2
-x_start = total_w / 2 - (len(trees_2) * cell_w) / 2
-
-ax.text(0.5, row_y, r'$n = 2$', fontsize=18, color=YELLOW, fontweight='bold',
-        va='center')
-ax.text(0.5, row_y - 0.5, r'$T_2 = 1$', fontsize=14, color=MUTED, va='center')
-
-for i, tree in enumerate(trees_2):
-    cx = x_start + i * cell_w + cell_w / 2
-    cy = row_y - 0.15
-    # Cell background
-    rect = mpatches.FancyBboxPatch(
-        (cx - cell_w*0.45, cy - cell_h*0.45), cell_w*0.9, cell_h*0.9,
-        boxstyle=mpatches.BoxStyle.Round(pad=0.05),
-        facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.8, alpha=0.5, zorder=1)
-    ax.add_patch(rect)
-    draw_tree_cell(ax, tree, 2, cx, cy, cell_w, cell_h)
-
-# ---------------------------------------------------------------------------
-# Row 2: n=3, T_3 = 3 trees
-# ---------------------------------------------------------------------------
-trees_3 = all_labeled_trees(3)
-row_y = 6.0
-x_start = total_w / 2 - (len(trees_3) * cell_w) / 2
-
-ax.text(0.5, row_y, r'$n = 3$', fontsize=18, color=YELLOW, fontweight='bold',
-        va='center')
-ax.text(0.5, row_y - 0.5, r'$T_3 = 3$', fontsize=14, color=MUTED, va='center')
-
-for i, tree in enumerate(trees_3):
-    cx = x_start + i * cell_w + cell_w / 2
-    cy = row_y - 0.15
-    rect = mpatches.FancyBboxPatch(
-        (cx - cell_w*0.45, cy - cell_h*0.45), cell_w*0.9, cell_h*0.9,
-        boxstyle=mpatches.BoxStyle.Round(pad=0.05),
-        facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.8, alpha=0.5, zorder=1)
-    ax.add_patch(rect)
-    draw_tree_cell(ax, tree, 3, cx, cy, cell_w, cell_h)
-
-# ---------------------------------------------------------------------------
-# Row 3: n=4, T_4 = 16 trees in 4x4 grid
-# ---------------------------------------------------------------------------
-trees_4 = all_labeled_trees(4)
-row_y_top = 4.2
-cell_w4 = 2.0
-cell_h4 = 1.1
-cols = 8
-rows_needed = 2  # 16 trees in 8x2
-
-ax.text(total_w / 2, row_y_top + 0.8, r'$n = 4$,  $T_4 = 16$', fontsize=18,
-        color=YELLOW, fontweight='bold', va='center', ha='center')
-
-grid_w = cols * cell_w4
-x_start4 = (total_w - grid_w) / 2
-
-for idx, tree in enumerate(trees_4):
-    col = idx % cols
-    row = idx // cols
-    cx = x_start4 + col * cell_w4 + cell_w4 / 2
-    cy = row_y_top - row * cell_h4 - 0.3
-
-    rect = mpatches.FancyBboxPatch(
-        (cx - cell_w4*0.45, cy - cell_h4*0.42), cell_w4*0.9, cell_h4*0.84,
-        boxstyle=mpatches.BoxStyle.Round(pad=0.05),
-        facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.6, alpha=0.4, zorder=1)
-    ax.add_patch(rect)
-    draw_tree_cell(ax, tree, 4, cx, cy, cell_w4, cell_h4)
-
-# ---------------------------------------------------------------------------
-# Title
-# ---------------------------------------------------------------------------
-ax.text(total_w / 2, total_h - 0.25,
-        "Cayley's Formula:  The number of labeled trees on n nodes is  $T_n = n^{n-2}$",
-        fontsize=26, fontweight='bold', color=TEXT, ha='center', va='top')
-
-# Bottom annotation
-ax.text(total_w / 2, 0.4,
-        '$T_2 = 2^0 = 1$          $T_3 = 3^1 = 3$          $T_4 = 4^2 = 16$'
-        '          $T_5 = 5^3 = 125$          $T_{10} = 10^8 = 100{,}000{,}000$',
-        fontsize=15, color=MUTED, ha='center', va='center', style='italic')
-
-# ---------------------------------------------------------------------------
-# Save
-# ---------------------------------------------------------------------------
-plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-            facecolor=BG, edgecolor='none')
-plt.close()
-print(f'Saved: {OUTPUT_PATH}')
+with slide_figure(OUTPUT_PATH) as (fig, ax):
+    ax.axis('off')
+
+    # Total layout area
+    total_w = 16.0
+    total_h = 9.0
+    ax.set_xlim(0, total_w)
+    ax.set_ylim(0, total_h)
+
+    # -----------------------------------------------------------------------
+    # Row 1: n=2, T_2 = 1 tree
+    # -----------------------------------------------------------------------
+    trees_2 = all_labeled_trees(2)
+    row_y = 7.8
+    cell_w = 2.0
+    cell_h = 1.2
+    x_start = total_w / 2 - (len(trees_2) * cell_w) / 2
+
+    ax.text(0.5, row_y, r'$n = 2$', fontsize=18, color=YELLOW,
+            fontweight='bold', va='center')
+    ax.text(0.5, row_y - 0.5, r'$T_2 = 1$', fontsize=14, color=MUTED,
+            va='center')
+
+    for i, tree in enumerate(trees_2):
+        cx = x_start + i * cell_w + cell_w / 2
+        cy = row_y - 0.15
+        # Cell background
+        rect = mpatches.FancyBboxPatch(
+            (cx - cell_w*0.45, cy - cell_h*0.45), cell_w*0.9, cell_h*0.9,
+            boxstyle=mpatches.BoxStyle.Round(pad=0.05),
+            facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.8, alpha=0.5,
+            zorder=1)
+        ax.add_patch(rect)
+        draw_tree_cell(ax, tree, 2, cx, cy, cell_w, cell_h)
+
+    # -----------------------------------------------------------------------
+    # Row 2: n=3, T_3 = 3 trees
+    # -----------------------------------------------------------------------
+    trees_3 = all_labeled_trees(3)
+    row_y = 6.0
+    x_start = total_w / 2 - (len(trees_3) * cell_w) / 2
+
+    ax.text(0.5, row_y, r'$n = 3$', fontsize=18, color=YELLOW,
+            fontweight='bold', va='center')
+    ax.text(0.5, row_y - 0.5, r'$T_3 = 3$', fontsize=14, color=MUTED,
+            va='center')
+
+    for i, tree in enumerate(trees_3):
+        cx = x_start + i * cell_w + cell_w / 2
+        cy = row_y - 0.15
+        rect = mpatches.FancyBboxPatch(
+            (cx - cell_w*0.45, cy - cell_h*0.45), cell_w*0.9, cell_h*0.9,
+            boxstyle=mpatches.BoxStyle.Round(pad=0.05),
+            facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.8, alpha=0.5,
+            zorder=1)
+        ax.add_patch(rect)
+        draw_tree_cell(ax, tree, 3, cx, cy, cell_w, cell_h)
+
+    # -----------------------------------------------------------------------
+    # Row 3: n=4, T_4 = 16 trees in 4x4 grid
+    # -----------------------------------------------------------------------
+    trees_4 = all_labeled_trees(4)
+    row_y_top = 4.2
+    cell_w4 = 2.0
+    cell_h4 = 1.1
+    cols = 8
+    rows_needed = 2  # 16 trees in 8x2
+
+    ax.text(total_w / 2, row_y_top + 0.8, r'$n = 4$,  $T_4 = 16$', fontsize=18,
+            color=YELLOW, fontweight='bold', va='center', ha='center')
+
+    grid_w = cols * cell_w4
+    x_start4 = (total_w - grid_w) / 2
+
+    for idx, tree in enumerate(trees_4):
+        col = idx % cols
+        row = idx // cols
+        cx = x_start4 + col * cell_w4 + cell_w4 / 2
+        cy = row_y_top - row * cell_h4 - 0.3
+
+        rect = mpatches.FancyBboxPatch(
+            (cx - cell_w4*0.45, cy - cell_h4*0.42), cell_w4*0.9, cell_h4*0.84,
+            boxstyle=mpatches.BoxStyle.Round(pad=0.05),
+            facecolor=CARD_BG, edgecolor=MUTED, linewidth=0.6, alpha=0.4,
+            zorder=1)
+        ax.add_patch(rect)
+        draw_tree_cell(ax, tree, 4, cx, cy, cell_w4, cell_h4)
+
+    # -----------------------------------------------------------------------
+    # Title
+    # -----------------------------------------------------------------------
+    ax.text(total_w / 2, total_h - 0.25,
+            "Cayley's Formula:  The number of labeled trees on n nodes is  $T_n = n^{n-2}$",
+            fontsize=26, fontweight='bold', color=TEXT, ha='center', va='top')
+
+    # Bottom annotation
+    ax.text(total_w / 2, 0.4,
+            '$T_2 = 2^0 = 1$          $T_3 = 3^1 = 3$          $T_4 = 4^2 = 16$'
+            '          $T_5 = 5^3 = 125$          $T_{10} = 10^8 = 100{,}000{,}000$',
+            fontsize=15, color=MUTED, ha='center', va='center', style='italic')
@@ -4,37 +4,39 @@ Two subplots showing tree structures in CS/AI:
 LEFT:  NLP parse tree for "The cat sat on the mat"
 RIGHT: Simple decision tree for a weather scenario
 
+The parse tree is not hand-placed: SENTENCE is parsed by the PCFG in
+cky_parser.py and laid out with its tidy-tree layout, so any sentence
+the toy grammar covers (40+ words included) can be shown, and K_BEST > 1
+draws the most probable parses side by side.
+
 Output: ../images/05-parse-tree.png (3840x2160, 4K)
 """
 
+import math
 import os
+import textwrap
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as pe
 import networkx as nx
 import numpy as np
 
+from cky_parser import CKYParser, tidy_layout
+from theme import (BG, CARD_BG, BLUE, YELLOW, GREEN, ORANGE, TEXT, MUTED,
+                   slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '05-parse-tree.png')
-os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 
 # ---------------------------------------------------------------------------
-# Palette
+# Sentence to parse
 # ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-BLUE      = '#3498db'
-YELLOW    = '#f1c40f'
-GREEN     = '#2ecc71'
-TEAL      = '#1abc9c'
-ORANGE    = '#e67e22'
-RED       = '#e74c3c'
-PURPLE    = '#9b59b6'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
+SENTENCE = 'The cat sat on the mat'
+K_BEST = 1        # > 1 draws the K most probable parses side by side
+                  # (e.g. 'The man saw the dog with the telescope', K_BEST=2)
 
 # ---------------------------------------------------------------------------
 # Helper: draw a tree given nodes, edges, positions, and styling info
@@ -94,161 +96,151 @@ def draw_labeled_tree(ax, nodes, edges, pos, node_styles, edge_labels=None):
                 color=text_color, ha='center', va='center', zorder=4)
 
 
-# ---------------------------------------------------------------------------
-# Figure
-# ---------------------------------------------------------------------------
-plt.style.use('dark_background')
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(3840/200, 2160/200), dpi=200)
-fig.patch.set_facecolor(BG)
-for ax in (ax1, ax2):
-    ax.set_facecolor(BG)
-    ax.set_aspect('equal')
-    ax.axis('off')
-
-fig.suptitle('Trees in Computer Science and AI',
-             fontsize=30, fontweight='bold', color=TEXT, y=0.96)
-
-# ===================================================================
-# LEFT: NLP Parse Tree for "The cat sat on the mat"
-# ===================================================================
-# S -> NP VP
-# NP -> DET N
-# VP -> V PP
-# PP -> P NP2
-# NP2 -> DET2 N2
-
-# Node IDs and labels
-parse_nodes = [
-    ('S', 'S'),
-    ('NP1', 'NP'), ('VP', 'VP'),
-    ('DET1', 'Det'), ('N1', 'N'),
-    ('V', 'V'), ('PP', 'PP'),
-    ('P', 'P'), ('NP2', 'NP'),
-    ('DET2', 'Det'), ('N2', 'N'),
-    # Leaf words
-    ('w_the1', '"The"'), ('w_cat', '"cat"'),
-    ('w_sat', '"sat"'),
-    ('w_on', '"on"'),
-    ('w_the2', '"the"'), ('w_mat', '"mat"'),
-]
-
-parse_edges = [
-    ('S', 'NP1'), ('S', 'VP'),
-    ('NP1', 'DET1'), ('NP1', 'N1'),
-    ('VP', 'V'), ('VP', 'PP'),
-    ('PP', 'P'), ('PP', 'NP2'),
-    ('NP2', 'DET2'), ('NP2', 'N2'),
-    ('DET1', 'w_the1'), ('N1', 'w_cat'),
-    ('V', 'w_sat'),
-    ('P', 'w_on'),
-    ('DET2', 'w_the2'), ('N2', 'w_mat'),
-]
-
-# Manual top-down layout
-parse_pos = {
-    'S':     (0.0,  3.0),
-    'NP1':   (-1.2, 2.2),
-    'VP':    (1.2,  2.2),
-    'DET1':  (-1.7, 1.4),
-    'N1':    (-0.7, 1.4),
-    'V':     (0.4,  1.4),
-    'PP':    (2.0,  1.4),
-    'P':     (1.3,  0.6),
-    'NP2':   (2.7,  0.6),
-    'DET2':  (2.2, -0.2),
-    'N2':    (3.2, -0.2),
-    'w_the1': (-1.7, 0.5),
-    'w_cat':  (-0.7, 0.5),
-    'w_sat':  (0.4,  0.5),
-    'w_on':   (1.3, -0.3),
-    'w_the2': (2.2, -1.0),
-    'w_mat':  (3.2, -1.0),
-}
-
-parse_styles = {}
-internal_nodes = ['S', 'NP1', 'VP', 'DET1', 'N1', 'V', 'PP', 'P', 'NP2', 'DET2', 'N2']
-leaf_nodes = ['w_the1', 'w_cat', 'w_sat', 'w_on', 'w_the2', 'w_mat']
-for nid in internal_nodes:
-    parse_styles[nid] = {'color': BLUE, 'fontsize': 14}
-for nid in leaf_nodes:
-    parse_styles[nid] = {'color': YELLOW, 'fontsize': 12, 'leaf': True}
-
-draw_labeled_tree(ax1, parse_nodes, parse_edges, parse_pos, parse_styles)
-ax1.set_title('Parse Tree (NLP)', fontsize=22, color=TEXT, pad=15)
-ax1.set_xlim(-2.8, 4.3)
-ax1.set_ylim(-1.8, 3.8)
-
-# Sentence below
-ax1.text(0.75, -1.5, '"The cat sat on the mat"',
-         fontsize=15, color=YELLOW, ha='center', va='center',
-         style='italic',
-         bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
-                   edgecolor=YELLOW, linewidth=1, alpha=0.7))
-
-# ===================================================================
-# RIGHT: Decision Tree
-# ===================================================================
-# Root: "Temperature > 30C?"
-#   Yes -> "Humidity > 70%?"
-#     Yes -> "Stay Inside"
-#     No  -> "Use Sunscreen"
-#   No  -> "Go Outside"
-
-dt_nodes = [
-    ('root',  'Temp > 30\u00b0C?'),
-    ('humid', 'Humidity > 70%?'),
-    ('no_hot', 'Go Outside'),
-    ('stay',  'Stay Inside'),
-    ('sun',   'Use Sunscreen'),
-]
-
-dt_edges = [
-    ('root', 'humid'),
-    ('root', 'no_hot'),
-    ('humid', 'stay'),
-    ('humid', 'sun'),
-]
-
-dt_pos = {
-    'root':   (0.0,  2.5),
-    'humid':  (-1.2, 1.3),
-    'no_hot': (1.2,  1.3),
-    'stay':   (-2.0, 0.1),
-    'sun':    (-0.4, 0.1),
-}
-
-dt_edge_labels = {
-    ('root', 'humid'):  'Yes',
-    ('root', 'no_hot'): 'No',
-    ('humid', 'stay'):  'Yes',
-    ('humid', 'sun'):   'No',
-}
-
-dt_styles = {
-    'root':   {'color': GREEN, 'fontsize': 12},
-    'humid':  {'color': GREEN, 'fontsize': 12},
-    'no_hot': {'color': YELLOW, 'fontsize': 12, 'leaf': True},
-    'stay':   {'color': YELLOW, 'fontsize': 12, 'leaf': True},
-    'sun':    {'color': YELLOW, 'fontsize': 12, 'leaf': True},
-}
-
-draw_labeled_tree(ax2, dt_nodes, dt_edges, dt_pos, dt_styles, dt_edge_labels)
-ax2.set_title('Decision Tree (ML)', fontsize=22, color=TEXT, pad=15)
-ax2.set_xlim(-3.0, 2.5)
-ax2.set_ylim(-0.8, 3.5)
-
-# Annotation
-ax2.text(-0.4, -0.6,
-         'Decision trees partition data recursively\nusing feature thresholds.',
-         fontsize=12, color=MUTED, ha='center', va='center',
-         style='italic', linespacing=1.5)
-
-plt.subplots_adjust(wspace=0.2, top=0.88, bottom=0.06)
+def node_width(label, leaf):
+    """Horizontal extent of a node as draw_labeled_tree draws it."""
+    if leaf:
+        return len(label) * 0.09 + 0.25
+    return 2 * max(len(label) * 0.065 + 0.1, 0.18)
+
+
+def quote_words(tree):
+    """Copy of a parse tree with its words shown in quotes."""
+    if isinstance(tree, str):
+        return f'"{tree}"'
+    return (tree[0],) + tuple(quote_words(c) for c in tree[1:])
+
 
 # ---------------------------------------------------------------------------
-# Save
+# Figure
 # ---------------------------------------------------------------------------
-plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-            facecolor=BG, edgecolor='none')
-plt.close()
-print(f'Saved: {OUTPUT_PATH}')
+with slide_figure(OUTPUT_PATH, 1, 2) as (fig, (ax1, ax2)):
+    for ax in (ax1, ax2):
+        ax.set_facecolor(BG)
+        ax.set_aspect('equal')
+        ax.axis('off')
+
+    fig.suptitle('Trees in Computer Science and AI',
+                 fontsize=30, fontweight='bold', color=TEXT, y=0.96)
+
+    # ===================================================================
+    # LEFT: NLP Parse Tree(s) for SENTENCE, from the CKY parser
+    # ===================================================================
+    parses = CKYParser().parse(SENTENCE, k=K_BEST)
+    if not parses:
+        raise ValueError(f'the toy grammar has no parse for {SENTENCE!r}')
+
+    # Lay out each parse, then place them left to right with a gap
+    parse_nodes, parse_edges, parse_pos, parse_styles = [], [], {}, {}
+    rank_labels = []
+    x_at = 0.0
+    for rank, (logp, tree) in enumerate(parses):
+        nodes, edges, pos, leaf_ids = tidy_layout(quote_words(tree),
+                                                  width=node_width, level=0.8)
+        labels = dict(nodes)
+        lo = min(pos[n][0] - node_width(labels[n], n in leaf_ids) / 2
+                 for n in pos)
+        hi = max(pos[n][0] + node_width(labels[n], n in leaf_ids) / 2
+                 for n in pos)
+        dx = x_at - lo
+        tag = f't{rank}_'
+        parse_nodes += [(tag + n, label) for n, label in nodes]
+        parse_edges += [(tag + a, tag + b) for a, b in edges]
+        for n, (x, y) in pos.items():
+            parse_pos[tag + n] = (x + dx, y + 3.0)
+            parse_styles[tag + n] = ({'color': YELLOW, 'fontsize': 12,
+                                      'leaf': True} if n in leaf_ids else
+                                     {'color': BLUE, 'fontsize': 14})
+        rank_labels.append((pos['n0'][0] + dx, logp))
+        x_at = hi + dx + 0.8
+
+    # Fit the axes around the trees; beyond the slide's original extent
+    # (7.1 x 5.6) everything, fonts included, is scaled down together
+    x_lo, x_hi = 0.0, x_at - 0.8
+    y_lo = min(y for _, y in parse_pos.values())
+    scale = max(1.0, (x_hi - x_lo + 0.9) / 7.1, (3.0 - y_lo + 1.6) / 5.6)
+    for style in parse_styles.values():
+        style['fontsize'] /= scale
+    x_mid = (x_lo + x_hi) / 2
+
+    draw_labeled_tree(ax1, parse_nodes, parse_edges, parse_pos, parse_styles)
+    title = 'Parse Tree (NLP)' if len(parses) == 1 else \
+        f'{len(parses)} Most Probable Parses (NLP)'
+    ax1.set_title(title, fontsize=22, color=TEXT, pad=15)
+    ax1.set_xlim(x_mid - 3.55 * scale, x_mid + 3.55 * scale)
+    ax1.set_ylim(3.0 + 0.8 * scale - 5.6 * scale, 3.0 + 0.8 * scale)
+
+    if len(parses) > 1:
+        for rank, (x, logp) in enumerate(rank_labels, 1):
+            ax1.text(x, 3.0 + 0.4 * scale,
+                     f'#{rank}  p = {math.exp(logp):.2g}',
+                     fontsize=12 / scale ** 0.5, color=MUTED, ha='center',
+                     va='center', fontweight='bold')
+
+    # Sentence below
+    ax1.text(x_mid, 3.0 + 0.8 * scale - 5.3 * scale,
+             '\n'.join(textwrap.wrap(f'"{SENTENCE}"', 60)),
+             fontsize=15 / scale ** 0.5, color=YELLOW, ha='center',
+             va='center', style='italic',
+             bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
+                       edgecolor=YELLOW, linewidth=1, alpha=0.7))
+
+    # ===================================================================
+    # RIGHT: Decision Tree
+    # ===================================================================
+    # Root: "Temperature > 30C?"
+    #   Yes -> "Humidity > 70%?"
+    #     Yes -> "Stay Inside"
+    #     No  -> "Use Sunscreen"
+    #   No  -> "Go Outside"
+
+    dt_nodes = [
+        ('root',  'Temp > 30\u00b0C?'),
+        ('humid', 'Humidity > 70%?'),
+        ('no_hot', 'Go Outside'),
+        ('stay',  'Stay Inside'),
+        ('sun',   'Use Sunscreen'),
+    ]
+
+    dt_edges = [
+        ('root', 'humid'),
+        ('root', 'no_hot'),
+        ('humid', 'stay'),
+        ('humid', 'sun'),
+    ]
+
+    dt_pos = {
+        'root':   (0.0,  2.5),
+        'humid':  (-1.2, 1.3),
+        'no_hot': (1.2,  1.3),
+        'stay':   (-2.0, 0.1),
+        'sun':    (-0.4, 0.1),
+    }
+
+    dt_edge_labels = {
+        ('root', 'humid'):  'Yes',
+        ('root', 'no_hot'): 'No',
+        ('humid', 'stay'):  'Yes',
+        ('humid', 'sun'):   'No',
+    }
+
+    dt_styles = {
+        'root':   {'color': GREEN, 'fontsize': 12},
+        'humid':  {'color': GREEN, 'fontsize': 12},
+        'no_hot': {'color': YELLOW, 'fontsize': 12, 'leaf': True},
+        'stay':   {'color': YELLOW, 'fontsize': 12, 'leaf': True},
+        'sun':    {'color': YELLOW, 'fontsize': 12, 'leaf': True},
+    }
+
+    draw_labeled_tree(ax2, dt_nodes, dt_edges, dt_pos, dt_styles,
+                      dt_edge_labels)
+    ax2.set_title('Decision Tree (ML)', fontsize=22, color=TEXT, pad=15)
+    ax2.set_xlim(-3.0, 2.5)
+    ax2.set_ylim(-0.8, 3.5)
+
+    # Annotation
+    ax2.text(-0.4, -0.6,
+             'Decision trees partition data recursively\nusing feature thresholds.',
+             fontsize=12, color=MUTED, ha='center', va='center',
+             style='italic', linespacing=1.5)
+
+    plt.subplots_adjust(wspace=0.2, top=0.88, bottom=0.06)
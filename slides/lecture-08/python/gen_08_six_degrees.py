@@ -5,37 +5,29 @@ Generate slide 08: Six Degrees of Separation.
 Social network with 4 colour-coded communities built via a stochastic
 block model. Bridge nodes (connecting communities) are highlighted in
 yellow. One shortest path between distant communities is drawn in bold
-yellow with its length annotated.
+yellow with its length annotated. An inset histogram shows the full
+hop-distance distribution over all node pairs (from hop_distances.py)
+with the effective diameter marked.
 
 Output: ../images/08-six-degrees.png (3840x2160, 4K)
 """
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import networkx as nx
 
+import csr_graph
+from hop_distances import hop_distance_distribution
+from theme import (CARD_BG, BLUE, GREEN, ORANGE, PURPLE, YELLOW, TEXT, MUTED,
+                   EDGE_CLR, slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '08-six-degrees.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-BLUE      = '#3498db'
-GREEN     = '#2ecc71'
-ORANGE    = '#e67e22'
-PURPLE    = '#9b59b6'
-YELLOW    = '#f1c40f'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
-EDGE_CLR  = '#4a5568'
-
 COMMUNITY_COLORS = [BLUE, GREEN, ORANGE, PURPLE]
 
 # ---------------------------------------------------------------------------
@@ -81,8 +73,6 @@ def find_bridge_nodes(G, community_map):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
     G, community_map = build_social_network()
     bridge_nodes = find_bridge_nodes(G, community_map)
 
@@ -109,76 +99,95 @@ def main():
     path_edges = list(zip(shortest_path[:-1], shortest_path[1:]))
     path_length = len(path_edges)
 
+    # Distribution of hop distances over all pairs
+    A, nodelist = csr_graph.from_networkx(G)
+    labels = np.array([community_map[n] for n in nodelist])
+    dist = hop_distance_distribution(A, labels=labels, workers=1)
+
     # Layout
     pos = nx.kamada_kawai_layout(G)
 
     # -----------------------------------------------------------------------
     # Plot
     # -----------------------------------------------------------------------
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-    ax.axis('off')
-
-    fig.suptitle('Social Network: Six Degrees of Separation',
-                 fontsize=36, fontweight='bold', color=TEXT, y=0.95)
-
-    # Node colours and sizes
-    node_colors = []
-    node_sizes = []
-    for node in G.nodes():
-        if node in bridge_nodes:
-            node_colors.append(YELLOW)
-            node_sizes.append(500)
-        else:
-            node_colors.append(COMMUNITY_COLORS[community_map[node]])
-            node_sizes.append(300)
-
-    # Draw all edges (background)
-    non_path_edges = [e for e in G.edges() if e not in path_edges
-                      and (e[1], e[0]) not in path_edges]
-    nx.draw_networkx_edges(G, pos, edgelist=non_path_edges, ax=ax,
-                           edge_color=EDGE_CLR, width=1.0, alpha=0.4)
-
-    # Draw shortest-path edges (foreground)
-    nx.draw_networkx_edges(G, pos, edgelist=path_edges, ax=ax,
-                           edge_color=YELLOW, width=4.0, alpha=0.95,
-                           style='solid')
-
-    # Draw nodes
-    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=node_sizes,
-                           node_color=node_colors, edgecolors='white',
-                           linewidths=1.2)
-
-    # Labels on path nodes
-    path_labels = {n: str(i) for i, n in enumerate(shortest_path)}
-    nx.draw_networkx_labels(G, pos, labels=path_labels, ax=ax,
-                            font_size=11, font_color='#1b2631',
-                            font_weight='bold')
-
-    # Path length annotation
-    mid_idx = len(shortest_path) // 2
-    mid_node = shortest_path[mid_idx]
-    mx, my = pos[mid_node]
-    ax.annotate(f'Shortest path length = {path_length}',
-                xy=(mx, my), xytext=(mx + 0.15, my + 0.20),
-                fontsize=20, fontweight='bold', color=YELLOW,
-                arrowprops=dict(arrowstyle='->', color=YELLOW, lw=2),
-                bbox=dict(boxstyle='round,pad=0.4', facecolor=CARD_BG,
-                          edgecolor=YELLOW, alpha=0.9))
-
-    # Legend
-    handles = [mpatches.Patch(color=c, label=f'Community {i+1}')
-               for i, c in enumerate(COMMUNITY_COLORS)]
-    handles.append(mpatches.Patch(color=YELLOW, label='Bridge nodes'))
-    fig.legend(handles=handles, loc='lower center', ncol=5,
-               fontsize=16, frameon=False, labelcolor=TEXT,
-               handlelength=2.0, bbox_to_anchor=(0.5, 0.02))
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.axis('off')
+        # Keep the right quarter free for the hop-distance inset
+        fig.subplots_adjust(left=0.02, right=0.75)
+
+        fig.suptitle('Social Network: Six Degrees of Separation',
+                     fontsize=36, fontweight='bold', color=TEXT, y=0.95)
+
+        # Node colours and sizes
+        node_colors = []
+        node_sizes = []
+        for node in G.nodes():
+            if node in bridge_nodes:
+                node_colors.append(YELLOW)
+                node_sizes.append(500)
+            else:
+                node_colors.append(COMMUNITY_COLORS[community_map[node]])
+                node_sizes.append(300)
+
+        # Draw all edges (background)
+        non_path_edges = [e for e in G.edges() if e not in path_edges
+                          and (e[1], e[0]) not in path_edges]
+        nx.draw_networkx_edges(G, pos, edgelist=non_path_edges, ax=ax,
+                               edge_color=EDGE_CLR, width=1.0, alpha=0.4)
+
+        # Draw shortest-path edges (foreground)
+        nx.draw_networkx_edges(G, pos, edgelist=path_edges, ax=ax,
+                               edge_color=YELLOW, width=4.0, alpha=0.95,
+                               style='solid')
+
+        # Draw nodes
+        nx.draw_networkx_nodes(G, pos, ax=ax, node_size=node_sizes,
+                               node_color=node_colors, edgecolors='white',
+                               linewidths=1.2)
+
+        # Labels on path nodes
+        path_labels = {n: str(i) for i, n in enumerate(shortest_path)}
+        nx.draw_networkx_labels(G, pos, labels=path_labels, ax=ax,
+                                font_size=11, font_color='#1b2631',
+                                font_weight='bold')
+
+        # Path length annotation
+        mid_idx = len(shortest_path) // 2
+        mid_node = shortest_path[mid_idx]
+        mx, my = pos[mid_node]
+        ax.annotate(f'Shortest path length = {path_length}',
+                    xy=(mx, my), xytext=(mx + 0.15, my + 0.20),
+                    fontsize=20, fontweight='bold', color=YELLOW,
+                    arrowprops=dict(arrowstyle='->', color=YELLOW, lw=2),
+                    bbox=dict(boxstyle='round,pad=0.4', facecolor=CARD_BG,
+                              edgecolor=YELLOW, alpha=0.9))
+
+        # Inset: hop-distance histogram over all ordered pairs
+        hist = dist['histogram']
+        hops = np.arange(1, len(hist))
+        share = hist[1:] / hist.sum()
+        inset = fig.add_axes([0.79, 0.36, 0.19, 0.26], facecolor=CARD_BG)
+        inset.bar(hops, share, color=BLUE, edgecolor=TEXT, linewidth=0.8)
+        inset.axvline(dist['effective_diameter'], color=YELLOW, lw=2.5,
+                      ls='--')
+        inset.set_title(f'All pairs: mean {dist["mean_distance"]:.2f} hops',
+                        fontsize=14, color=TEXT, pad=8)
+        inset.text(dist['effective_diameter'], share.max() * 0.95,
+                   f'  90% within {dist["effective_diameter"]:.1f}',
+                   fontsize=12, color=YELLOW, ha='left', va='top')
+        inset.set_xticks(hops)
+        inset.tick_params(colors=MUTED, labelsize=11)
+        inset.set_yticks([])
+        for spine in inset.spines.values():
+            spine.set_color(EDGE_CLR)
+
+        # Legend
+        handles = [mpatches.Patch(color=c, label=f'Community {i+1}')
+                   for i, c in enumerate(COMMUNITY_COLORS)]
+        handles.append(mpatches.Patch(color=YELLOW, label='Bridge nodes'))
+        fig.legend(handles=handles, loc='lower center', ncol=5,
+                   fontsize=16, frameon=False, labelcolor=TEXT,
+                   handlelength=2.0, bbox_to_anchor=(0.5, 0.02))
 
 
 if __name__ == '__main__':
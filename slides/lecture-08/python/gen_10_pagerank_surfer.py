@@ -3,8 +3,10 @@
 Generate slide 10: The Random Surfer Model.
 
 Same web graph as gen_09, but now a "surfer" is shown on one node with a
-glowing halo. A dotted trail of recently visited pages fades in green,
-and one teleportation jump is drawn as a dashed orange arc.
+glowing halo. The trail is a real walk sampled by random_surfer.py: link
+follows fade in green and the one teleportation jump in the window is
+drawn as a dashed orange arc. An inset shows the L1 distance between the
+visit frequencies of 100k simulated surfers and the PageRank vector.
 
 Output: ../images/10-pagerank-surfer.png (3840x2160, 4K)
 """
@@ -15,25 +17,18 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as FancyArrowPatch
 import networkx as nx
 
+import csr_graph
+from pagerank import pagerank
+from random_surfer import simulate
+from theme import (CARD_BG, BLUE, YELLOW, GREEN, ORANGE, TEXT, MUTED,
+                   EDGE_CLR, slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '10-pagerank-surfer.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-BLUE      = '#3498db'
-YELLOW    = '#f1c40f'
-GREEN     = '#2ecc71'
-ORANGE    = '#e67e22'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
-EDGE_CLR  = '#4a5568'
-
 # ---------------------------------------------------------------------------
 # Web-graph (same as gen_09)
 # ---------------------------------------------------------------------------
@@ -53,21 +48,34 @@ EDGES = [
 ]
 
 SEED = 42
+ALPHA = 0.85
 
-# Surfer trail: sequence of pages the surfer recently visited
-# The last entry is the surfer's *current* position.
-TRAIL = ['Blog', 'News', 'Wiki', 'Home', 'Shop', 'FAQ']
-SURFER_NODE = TRAIL[-1]           # current position
+# Simulation: walkers for the convergence inset, and one recorded walker
+# whose history supplies the trail
+N_WALKERS = 100_000
+N_STEPS = 200
+TRAIL_LEN = 6                     # pages shown, last = current position
 
-# Teleportation: surfer jumps from FAQ to Forum (no direct link FAQ->Forum
-# exists, but FAQ->Forum IS in edges -- so let's use a pair with no edge)
-TELEPORT_FROM = 'FAQ'
-TELEPORT_TO   = 'News'           # distant jump
 
+def sample_trail(G, history, teleported):
+    """Pick a window of TRAIL_LEN distinct pages from a real walk.
 
-def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    The window must contain exactly one teleport, between two pages with
+    no direct link, so the slide shows both kinds of move. Returns
+    (trail, teleport_step) where trail[teleport_step] -> trail[+1] jumped.
+    """
+    for start in range(len(history) - TRAIL_LEN + 1):
+        trail = history[start:start + TRAIL_LEN]
+        jumps = np.flatnonzero(teleported[start:start + TRAIL_LEN - 1])
+        if len(set(trail)) < TRAIL_LEN or len(jumps) != 1:
+            continue
+        u, v = trail[jumps[0]], trail[jumps[0] + 1]
+        if not G.has_edge(u, v):
+            return trail, int(jumps[0])
+    raise RuntimeError('no suitable trail window; increase N_STEPS')
 
+
+def main():
     G = nx.DiGraph()
     G.add_nodes_from(PAGES)
     G.add_edges_from(EDGES)
@@ -75,112 +83,131 @@ def main():
     # Use SAME layout seed as gen_09 for visual consistency
     pos = nx.spring_layout(G, seed=SEED, k=1.8)
 
+    # Simulate surfers and compare with power-iteration PageRank
+    A, nodelist = csr_graph.from_networkx(G, nodelist=PAGES)
+    rank = pagerank(A, alpha=ALPHA)['rank']
+    sim = simulate(A, n_walkers=N_WALKERS, n_steps=N_STEPS, alpha=ALPHA,
+                   reference=rank, record=1, seed=SEED)
+    history = [nodelist[i] for i in sim['trails'][:, 0]]
+    trail, tp_step = sample_trail(G, history, sim['teleported'][:, 0])
+    surfer_node = trail[-1]
+    teleport_from, teleport_to = trail[tp_step], trail[tp_step + 1]
+
     # -----------------------------------------------------------------------
     # Plot
     # -----------------------------------------------------------------------
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-    ax.axis('off')
-
-    fig.suptitle('The Random Surfer Model',
-                 fontsize=36, fontweight='bold', color=TEXT, y=0.95)
-
-    # --- background edges ---------------------------------------------------
-    nx.draw_networkx_edges(
-        G, pos, ax=ax, edge_color=EDGE_CLR, width=1.2, alpha=0.35,
-        arrows=True, arrowstyle='-|>', arrowsize=16,
-        connectionstyle='arc3,rad=0.12',
-        min_source_margin=20, min_target_margin=20)
-
-    # --- trail edges (dotted green, decreasing alpha) -----------------------
-    trail_edges = list(zip(TRAIL[:-1], TRAIL[1:]))
-    n_trail = len(trail_edges)
-    for i, (u, v) in enumerate(trail_edges):
-        alpha = 0.25 + 0.65 * (i / max(n_trail - 1, 1))
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.axis('off')
+
+        fig.suptitle('The Random Surfer Model',
+                     fontsize=36, fontweight='bold', color=TEXT, y=0.95)
+
+        # --- background edges ------------------------------------------------
         nx.draw_networkx_edges(
-            G, pos, edgelist=[(u, v)], ax=ax,
-            edge_color=GREEN, width=3.5, alpha=alpha,
-            arrows=True, arrowstyle='-|>', arrowsize=20,
-            connectionstyle='arc3,rad=0.10',
-            style='dotted',
+            G, pos, ax=ax, edge_color=EDGE_CLR, width=1.2, alpha=0.35,
+            arrows=True, arrowstyle='-|>', arrowsize=16,
+            connectionstyle='arc3,rad=0.12',
             min_source_margin=20, min_target_margin=20)
 
-    # --- teleportation arc (dashed orange) ----------------------------------
-    tp_from_pos = np.array(pos[TELEPORT_FROM])
-    tp_to_pos   = np.array(pos[TELEPORT_TO])
-    ax.annotate(
-        '', xy=tp_to_pos, xytext=tp_from_pos,
-        arrowprops=dict(
-            arrowstyle='-|>', color=ORANGE, lw=3,
-            linestyle='dashed',
-            connectionstyle='arc3,rad=-0.4'))
-
-    # --- draw all nodes (base layer) ----------------------------------------
-    regular_nodes = [n for n in PAGES if n != SURFER_NODE]
-    nx.draw_networkx_nodes(
-        G, pos, nodelist=regular_nodes, ax=ax,
-        node_size=1400, node_color=BLUE,
-        edgecolors='white', linewidths=1.2)
-
-    # --- surfer node with glow halo -----------------------------------------
-    sx, sy = pos[SURFER_NODE]
-    # Outer glow rings
-    for radius, alpha in [(0.095, 0.08), (0.070, 0.14), (0.050, 0.22)]:
-        glow = plt.Circle((sx, sy), radius, color=YELLOW,
-                           alpha=alpha, transform=ax.transData)
-        ax.add_patch(glow)
-
-    # Surfer node itself
-    nx.draw_networkx_nodes(
-        G, pos, nodelist=[SURFER_NODE], ax=ax,
-        node_size=2200, node_color=YELLOW,
-        edgecolors='white', linewidths=2.5)
-
-    # --- node labels --------------------------------------------------------
-    nx.draw_networkx_labels(
-        G, pos, ax=ax, font_size=12, font_weight='bold',
-        font_color='#1b2631')
-
-    # --- trail node markers (small green ring on visited nodes) -------------
-    visited = TRAIL[:-1]  # exclude current
-    nx.draw_networkx_nodes(
-        G, pos, nodelist=visited, ax=ax,
-        node_size=1400, node_color='none',
-        edgecolors=GREEN, linewidths=2.5)
-
-    # --- annotations --------------------------------------------------------
-    # "85% follow links" near a regular trail edge
-    mid_edge_u, mid_edge_v = TRAIL[2], TRAIL[3]  # Wiki -> Home
-    mx = (pos[mid_edge_u][0] + pos[mid_edge_v][0]) / 2
-    my = (pos[mid_edge_u][1] + pos[mid_edge_v][1]) / 2
-    ax.text(mx + 0.06, my + 0.08, '85% follow links',
-            fontsize=18, fontweight='bold', color=GREEN,
-            ha='left', va='bottom',
-            bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
-                      edgecolor=GREEN, alpha=0.85))
-
-    # "15% teleport" near the dashed arc
-    tmx = (tp_from_pos[0] + tp_to_pos[0]) / 2
-    tmy = (tp_from_pos[1] + tp_to_pos[1]) / 2
-    ax.text(tmx - 0.04, tmy - 0.12, '15% teleport',
-            fontsize=18, fontweight='bold', color=ORANGE,
-            ha='center', va='top',
-            bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
-                      edgecolor=ORANGE, alpha=0.85))
-
-    # Subtitle
-    ax.text(0.5, -0.04,
-            'Green trail = recent browsing history   |   '
-            'Orange arc = random teleportation   |   '
-            'Yellow glow = current position',
-            transform=ax.transAxes, fontsize=16, color=MUTED,
-            ha='center', va='top')
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+        # --- trail edges (dotted green, decreasing alpha) --------------------
+        trail_edges = list(zip(trail[:-1], trail[1:]))
+        n_trail = len(trail_edges)
+        for i, (u, v) in enumerate(trail_edges):
+            if i == tp_step:
+                continue
+            alpha = 0.25 + 0.65 * (i / max(n_trail - 1, 1))
+            nx.draw_networkx_edges(
+                G, pos, edgelist=[(u, v)], ax=ax,
+                edge_color=GREEN, width=3.5, alpha=alpha,
+                arrows=True, arrowstyle='-|>', arrowsize=20,
+                connectionstyle='arc3,rad=0.10',
+                style='dotted',
+                min_source_margin=20, min_target_margin=20)
+
+        # --- teleportation arc (dashed orange) -------------------------------
+        tp_from_pos = np.array(pos[teleport_from])
+        tp_to_pos   = np.array(pos[teleport_to])
+        ax.annotate(
+            '', xy=tp_to_pos, xytext=tp_from_pos,
+            arrowprops=dict(
+                arrowstyle='-|>', color=ORANGE, lw=3,
+                linestyle='dashed',
+                connectionstyle='arc3,rad=-0.4'))
+
+        # --- draw all nodes (base layer) -------------------------------------
+        regular_nodes = [n for n in PAGES if n != surfer_node]
+        nx.draw_networkx_nodes(
+            G, pos, nodelist=regular_nodes, ax=ax,
+            node_size=1400, node_color=BLUE,
+            edgecolors='white', linewidths=1.2)
+
+        # --- surfer node with glow halo --------------------------------------
+        sx, sy = pos[surfer_node]
+        # Outer glow rings
+        for radius, alpha in [(0.095, 0.08), (0.070, 0.14), (0.050, 0.22)]:
+            glow = plt.Circle((sx, sy), radius, color=YELLOW,
+                               alpha=alpha, transform=ax.transData)
+            ax.add_patch(glow)
+
+        # Surfer node itself
+        nx.draw_networkx_nodes(
+            G, pos, nodelist=[surfer_node], ax=ax,
+            node_size=2200, node_color=YELLOW,
+            edgecolors='white', linewidths=2.5)
+
+        # --- node labels -----------------------------------------------------
+        nx.draw_networkx_labels(
+            G, pos, ax=ax, font_size=12, font_weight='bold',
+            font_color='#1b2631')
+
+        # --- trail node markers (small green ring on visited nodes) ----------
+        visited = trail[:-1]  # exclude current
+        nx.draw_networkx_nodes(
+            G, pos, nodelist=visited, ax=ax,
+            node_size=1400, node_color='none',
+            edgecolors=GREEN, linewidths=2.5)
+
+        # --- annotations -----------------------------------------------------
+        # "85% follow links" near a link-follow trail edge
+        follow_steps = [i for i in range(n_trail) if i != tp_step]
+        mid_step = follow_steps[len(follow_steps) // 2]
+        mid_edge_u, mid_edge_v = trail_edges[mid_step]
+        mx = (pos[mid_edge_u][0] + pos[mid_edge_v][0]) / 2
+        my = (pos[mid_edge_u][1] + pos[mid_edge_v][1]) / 2
+        ax.text(mx + 0.06, my + 0.08, '85% follow links',
+                fontsize=18, fontweight='bold', color=GREEN,
+                ha='left', va='bottom',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
+                          edgecolor=GREEN, alpha=0.85))
+
+        # "15% teleport" near the dashed arc
+        tmx = (tp_from_pos[0] + tp_to_pos[0]) / 2
+        tmy = (tp_from_pos[1] + tp_to_pos[1]) / 2
+        ax.text(tmx - 0.04, tmy - 0.12, '15% teleport',
+                fontsize=18, fontweight='bold', color=ORANGE,
+                ha='center', va='top',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor=CARD_BG,
+                          edgecolor=ORANGE, alpha=0.85))
+
+        # Inset: visit frequency -> PageRank
+        inset = fig.add_axes([0.07, 0.64, 0.17, 0.20], facecolor=CARD_BG)
+        inset.loglog(sim['steps'], sim['l1'], color=GREEN, lw=2.5,
+                     marker='o', markersize=4)
+        inset.set_title(f'{N_WALKERS:,} surfers vs PageRank',
+                        fontsize=14, color=TEXT, pad=8)
+        inset.set_xlabel('steps', fontsize=12, color=MUTED)
+        inset.set_ylabel('L1 distance', fontsize=12, color=MUTED)
+        inset.tick_params(colors=MUTED, labelsize=10, which='both')
+        for spine in inset.spines.values():
+            spine.set_color(EDGE_CLR)
+
+        # Subtitle
+        ax.text(0.5, -0.04,
+                'Green trail = recent browsing history   |   '
+                'Orange arc = random teleportation   |   '
+                'Yellow glow = current position',
+                transform=ax.transAxes, fontsize=16, color=MUTED,
+                ha='center', va='top')
 
 
 if __name__ == '__main__':
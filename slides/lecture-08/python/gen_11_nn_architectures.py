@@ -16,31 +16,18 @@ Output: ../images/11-nn-architectures.png (3840x2160, 4K)
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyArrowPatch
 import networkx as nx
 
+from theme import BG, BLUE, TEAL, GREEN, YELLOW, TEXT, MUTED, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '11-nn-architectures.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-BLUE      = '#3498db'
-TEAL      = '#1abc9c'
-GREEN     = '#2ecc71'
-YELLOW    = '#f1c40f'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
-EDGE_CLR  = '#4a5568'
-
-
 def layer_positions(layers, x_spacing=1.6, y_spacing=0.9):
     """
     Assign (x, y) positions for nodes arranged in vertical layer columns.
@@ -239,42 +226,34 @@ def draw_inception(ax):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, axes = plt.subplots(2, 2, figsize=(19.2, 10.8), facecolor=BG)
-    fig.subplots_adjust(hspace=0.32, wspace=0.22, top=0.88, bottom=0.06)
-
-    fig.suptitle('Neural Network Architectures as Graphs',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.96)
-
-    # 1. Feedforward
-    draw_nn(axes[0, 0], layers=[3, 4, 2], color=BLUE,
-            title='Feedforward')
-
-    # 2. Deep (VGG)
-    draw_nn(axes[0, 1], layers=[3, 4, 4, 4, 4, 2], color=TEAL,
-            title='Deep (VGG)')
-
-    # 3. Branching (Inception) -- custom function
-    draw_inception(axes[1, 0])
-
-    # 4. Skip (ResNet) -- 5 layers with skip connections
-    draw_nn(axes[1, 1], layers=[3, 4, 4, 4, 2], color=BLUE,
-            title='Skip (ResNet)',
-            skip_layers=[(0, 2), (1, 3), (2, 4)])
-
-    # Legend for skip connections
-    blue_patch = mpatches.Patch(color=BLUE, label='Regular connections')
-    yellow_patch = mpatches.Patch(color=YELLOW, label='Skip connections')
-    fig.legend(handles=[blue_patch, yellow_patch], loc='lower right',
-               fontsize=14, frameon=False, labelcolor=TEXT,
-               bbox_to_anchor=(0.98, 0.01))
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH, 2, 2) as (fig, axes):
+        fig.subplots_adjust(hspace=0.32, wspace=0.22, top=0.88, bottom=0.06)
+
+        fig.suptitle('Neural Network Architectures as Graphs',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.96)
+
+        # 1. Feedforward
+        draw_nn(axes[0, 0], layers=[3, 4, 2], color=BLUE,
+                title='Feedforward')
+
+        # 2. Deep (VGG)
+        draw_nn(axes[0, 1], layers=[3, 4, 4, 4, 4, 2], color=TEAL,
+                title='Deep (VGG)')
+
+        # 3. Branching (Inception) -- custom function
+        draw_inception(axes[1, 0])
+
+        # 4. Skip (ResNet) -- 5 layers with skip connections
+        draw_nn(axes[1, 1], layers=[3, 4, 4, 4, 2], color=BLUE,
+                title='Skip (ResNet)',
+                skip_layers=[(0, 2), (1, 3), (2, 4)])
+
+        # Legend for skip connections
+        blue_patch = mpatches.Patch(color=BLUE, label='Regular connections')
+        yellow_patch = mpatches.Patch(color=YELLOW, label='Skip connections')
+        fig.legend(handles=[blue_patch, yellow_patch], loc='lower right',
+                   fontsize=14, frameon=False, labelcolor=TEXT,
+                   bbox_to_anchor=(0.98, 0.01))
 
 
 if __name__ == '__main__':
@@ -7,15 +7,21 @@ pair (15 arcs total for a complete graph). Arc thickness and opacity
 encode pre-set attention weights -- strong relationships are bright
 yellow, moderate ones blue, and weak ones muted grey.
 
+With ATTENTION_FILE set, the tokens and (heads x n x n) weights of a real
+sentence are drawn instead: arcs below THRESHOLD or outside each token's
+TOP_K are pruned and every head gets its own colour. All arcs are one
+PathCollection (attention_arcs.py), so 100+ tokens x 12 heads still
+render in about a second.
+
 Output: ../images/12-attention-complete.png (3840x2160, 4K)
 """
 
 import os
-import itertools
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyArrowPatch
+
+from attention_arcs import attention_arcs, prune_attention
+from theme import CARD_BG, YELLOW, BLUE, TEXT, MUTED, slide_figure
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -26,13 +32,10 @@ OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '12-attention-complete.pn
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
-BG        = '#1b2631'
-CARD_BG   = '#1e3044'
-YELLOW    = '#f1c40f'
-BLUE      = '#3498db'
 WEAK_CLR  = '#4a5568'
-TEXT      = '#ecf0f1'
-MUTED     = '#95a5a6'
+HEAD_COLORS = [YELLOW, BLUE, '#2ecc71', '#e67e22', '#e74c3c', '#9b59b6',
+               '#1abc9c', '#f39c12', '#ecf0f1', '#16a085', '#d35400',
+               '#8e44ad']
 
 # ---------------------------------------------------------------------------
 # Words and attention weights
@@ -60,6 +63,38 @@ ATTENTION = {
     frozenset({2, 4}): 0.10,  # sat-the
 }
 
+ATTENTION_FILE = None  # e.g. 'attention.npz' holding 'tokens' (n,) and
+                       # 'weights' (n, n) or (heads, n, n), rows = queries
+THRESHOLD = 0.02       # pruning for ATTENTION_FILE: weight floor and
+TOP_K = 3              # keys kept per token and head
+
+
+def load_attention():
+    """(words, weights, pruned): the toy sentence or ATTENTION_FILE.
+
+    weights is (heads, n, n); pruned says whether THRESHOLD/TOP_K apply.
+    """
+    if not ATTENTION_FILE:
+        W = np.zeros((1, N, N))
+        for pair, weight in ATTENTION.items():
+            i, j = sorted(pair)
+            W[0, i, j] = W[0, j, i] = weight
+        return WORDS, W, False
+    data = np.load(ATTENTION_FILE)
+    W = np.asarray(data['weights'], dtype=np.float64)
+    return [str(t) for t in data['tokens']], W.reshape((-1,) + W.shape[-2:]), \
+        True
+
+
+def arc_height(span, weight):
+    """Control-point height of an arc: grows with its span and weight."""
+    return 1.2 + span * 1.0 + weight * 2.5
+
+
+def long_arc_height(span, weight):
+    """Arc height for long sentences: sub-linear, so short arcs stay open."""
+    return 0.3 + 2.0 * np.sqrt(span)
+
 
 def arc_color(weight):
     """Return colour string based on attention weight."""
@@ -71,68 +106,8 @@ def arc_color(weight):
         return WEAK_CLR
 
 
-def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-    ax.axis('off')
-
-    fig.suptitle('Self-Attention: Every Word Attends to Every Other',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.93)
-
-    # Word positions along a horizontal line
-    x_margin = 1.5
-    x_positions = np.linspace(x_margin, 10 - x_margin, N)
-    word_y = 1.5  # baseline for words
-
-    # Draw arcs ABOVE the word line
-    # Sort pairs by weight so strong arcs are drawn on top
-    from matplotlib.path import Path
-
-    pairs = sorted(ATTENTION.items(), key=lambda kv: kv[1])
-
-    for pair_set, weight in pairs:
-        i, j = sorted(pair_set)
-        x1, x2 = x_positions[i], x_positions[j]
-
-        # Arc height proportional to distance + weight
-        # Quadratic Bezier control-point is ~2x the visual apex,
-        # so use aggressive scaling to fill vertical space.
-        span = abs(x2 - x1)
-        height = 1.2 + span * 1.0 + weight * 2.5
-
-        color = arc_color(weight)
-        lw = 1.0 + weight * 7.0       # linewidth 1..8
-        alpha = 0.15 + weight * 0.75   # alpha 0.15..0.90
-
-        # Draw a quadratic Bezier arc
-        mid_x = (x1 + x2) / 2
-        arc_top = word_y + height
-
-        verts = [
-            (x1, word_y + 0.3),      # start (just above word)
-            (mid_x, arc_top),         # control point (peak)
-            (x2, word_y + 0.3),       # end
-        ]
-        codes = [Path.MOVETO, Path.CURVE3, Path.CURVE3]
-        path = Path(verts, codes)
-
-        patch = mpatches.PathPatch(
-            path, facecolor='none', edgecolor=color,
-            lw=lw, alpha=alpha, capstyle='round')
-        ax.add_patch(patch)
-
-    # Draw word nodes as scatter points (always circular in display space)
-    ax.scatter(x_positions, [word_y] * N, s=900, c=BLUE,
-               edgecolors='white', linewidths=2.5, zorder=5)
-
-    # Word labels below
-    for x, word in zip(x_positions, WORDS):
-        ax.text(x, word_y - 0.8, word, fontsize=28, fontweight='bold',
-                color=TEXT, ha='center', va='top', zorder=6)
-
+def draw_toy_annotations(fig, ax, x_positions, word_y):
+    """Weight legend, the two highlighted pairs and limits of the toy."""
     # Weight legend
     legend_items = [
         mpatches.Patch(color=YELLOW, label='Strong ($w \\geq 0.5$)'),
@@ -143,10 +118,9 @@ def main():
                fontsize=17, frameon=False, labelcolor=TEXT,
                handlelength=2.5, bbox_to_anchor=(0.5, 0.04))
 
-    # Compute arc-height function (same formula as drawing code) for annotations
+    # Arc height (same formula as drawing code) for annotations
     def _arc_h(i, j, w):
-        span = abs(x_positions[j] - x_positions[i])
-        return 1.2 + span * 1.0 + w * 2.5
+        return arc_height(abs(x_positions[j] - x_positions[i]), w)
 
     # Highlighted pair annotations
     # "cat" - "sat" strongest
@@ -177,10 +151,76 @@ def main():
     ax.set_xlim(-0.3, 10.3)
     ax.set_ylim(-0.2, word_y + max_arc_h + 2.5)
 
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+
+def main():
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.axis('off')
+
+        fig.suptitle('Self-Attention: Every Word Attends to Every Other',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.93)
+
+        words, W, pruned = load_attention()
+        n = len(words)
+
+        # Word positions along a horizontal line
+        x_margin = 1.5 if n <= 12 else 0.3
+        x_positions = np.linspace(x_margin, 10 - x_margin, n)
+        word_y = 1.5  # baseline for words
+
+        # Draw arcs ABOVE the word line, all in one collection; arcs are
+        # sorted by weight so strong arcs are drawn on top. The quadratic
+        # Bezier control point is ~2x the visual apex, so the height formula
+        # scales aggressively to fill vertical space.
+        if not pruned:
+            attention_arcs(ax, x_positions, W, y=word_y, symmetric=True,
+                           color=arc_color, width=(1.0, 8.0),
+                           alpha=(0.15, 0.90), w_max=1.0, lift=0.3,
+                           height=arc_height, zorder=1)
+        else:
+            attention_arcs(ax, x_positions, W, y=word_y, threshold=THRESHOLD,
+                           top_k=TOP_K, symmetric=True,
+                           color=HEAD_COLORS if len(W) > 1 else YELLOW,
+                           width=(0.4, 5.0), alpha=(0.08, 0.9), lift=0.15,
+                           height=long_arc_height, zorder=1)
+
+        # Draw word nodes as scatter points (always circular in display space)
+        ax.scatter(x_positions, [word_y] * n, s=min(900, 6 * 900 / n), c=BLUE,
+                   edgecolors='white', linewidths=min(2.5, 15 / n), zorder=5)
+
+        # Word labels below (vertical once the sentence gets long)
+        size = float(np.clip(150 / n, 5, 28))
+        for x, word in zip(x_positions, words):
+            ax.text(x, word_y - (0.8 if n <= 12 else 0.25), word,
+                    fontsize=size, fontweight='bold' if n <= 12 else 'normal',
+                    color=TEXT, ha='center', va='top',
+                    rotation=0 if n <= 12 else 90, zorder=6)
+
+        if pruned:
+            # Head legend and a note on what survived the pruning
+            head, q, k, w = prune_attention(W, THRESHOLD, TOP_K,
+                                            symmetric=True)
+            spans = np.abs(x_positions[k] - x_positions[q])
+            top_span = spans.max(initial=0)
+            arc_top = word_y + 0.15 + long_arc_height(top_span, 0) / 2
+            if len(W) > 1:
+                legend_items = [
+                    mpatches.Patch(color=HEAD_COLORS[h % len(HEAD_COLORS)],
+                                   label=f'Head {h + 1}')
+                    for h in range(len(W))]
+                fig.legend(handles=legend_items, loc='lower center',
+                           ncol=min(len(W), 6), fontsize=13, frameon=False,
+                           labelcolor=TEXT, bbox_to_anchor=(0.5, 0.0))
+            if len(w):
+                note = (f'{len(w):,} of {len(W) * n * (n - 1) // 2:,} pairs '
+                        f'shown (top-{TOP_K} per token, $w \\geq {THRESHOLD}$)'
+                        f' -- strongest: "{words[q[-1]]}"-"{words[k[-1]]}" '
+                        f'$w={w[-1]:.2f}$')
+                ax.text(5.0, arc_top + 0.4, note, fontsize=15,
+                        color=MUTED, ha='center', va='bottom', zorder=7)
+            ax.set_xlim(-0.3, 10.3)
+            ax.set_ylim(word_y - 1.2, arc_top + 1.0)
+        else:
+            draw_toy_annotations(fig, ax, x_positions, word_y)
 
 
 if __name__ == '__main__':
@@ -8,36 +8,34 @@ Left-to-right: User Question -> Query Engine -> Knowledge Graph ->
 Each stage is a rounded box; thick arrows connect them.
 The Knowledge Graph box contains a small embedded node cluster.
 
+The "Retrieved Facts" card above the flow is a real retrieval: PASSAGES
+are embedded with retrieval.hash_embed and searched with exact top-k for
+QUESTION. The footer quotes the recall of the IVF index against exact
+search on a BENCH_N x BENCH_D synthetic corpus (or on EMBEDDINGS_FILE, a
+memory-mapped .npy written by write_embeddings). Latencies go to the
+console, and onto the slide only when pinned in RESULTS_FILE, so the PNG
+does not change between renders.
+
 Output: ../images/14-rag-pipeline.png (3840x2160, 4K)
 """
 
+import json
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as pe
 
+from retrieval import (IVFIndex, benchmark, clustered_corpus, exact_search,
+                       hash_embed, normalize, open_embeddings)
+from theme import (BG, CARD_BG, BLUE, YELLOW, GREEN, TEAL, ORANGE, PURPLE,
+                   TEXT, MUTED, slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '14-rag-pipeline.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG      = '#1b2631'
-CARD_BG = '#1e3044'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-TEAL    = '#1abc9c'
-ORANGE  = '#e67e22'
-RED     = '#e74c3c'
-PURPLE  = '#9b59b6'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
-
 # Stage definitions: (label, color, x_center)
 STAGES = [
     ('User\nQuestion',    PURPLE, 1.2),
@@ -48,6 +46,35 @@ STAGES = [
     ('Answer',           YELLOW, 15.2),
 ]
 
+# ---------------------------------------------------------------------------
+# Retrieval demo
+# ---------------------------------------------------------------------------
+QUESTION = 'Where was Einstein born?'
+
+PASSAGES = [
+    'Albert Einstein was born in Ulm, in the Kingdom of Wurttemberg.',
+    'Ulm is a city located in Germany on the river Danube.',
+    'Berlin is the capital of Germany.',
+    'Einstein developed the theory of relativity.',
+    'Einstein was awarded the Nobel Prize in Physics in 1921.',
+    'The Nobel Prize is awarded annually in Stockholm.',
+    'Einstein emigrated to the United States in 1933.',
+    'Physics is the natural science of matter and energy.',
+    'The Einstein family moved to Munich in 1880.',
+    'Relativity changed our understanding of space and time.',
+]
+TOP_K = 3
+
+EMBEDDINGS_FILE = None     # optional .npy corpus; None = synthetic below
+BENCH_N = 200_000
+BENCH_D = 128
+BENCH_QUERIES = 100
+BENCH_NLIST = 512
+BENCH_NPROBE = 16
+# Saved measure_search results (JSON): written by the first render, then
+# reused so the footer can quote fixed ms/query. None = measure, console only.
+RESULTS_FILE = None        # e.g. 'search-bench.json'
+
 BOX_W = 2.2
 BOX_H = 2.0
 BOX_Y = 4.0  # vertical center of boxes
@@ -112,66 +139,141 @@ def draw_mini_graph(ax, cx, cy, color):
                 alpha=0.7, zorder=7)
 
 
-def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(3840 / 200, 2160 / 200), dpi=200)
-    fig.patch.set_facecolor(BG)
-    ax.set_facecolor(BG)
-    ax.set_xlim(-0.5, 17.0)
-    ax.set_ylim(0.0, 8.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-
-    # Draw boxes
-    for label, color, xc in STAGES:
-        draw_rounded_box(ax, xc, BOX_Y, BOX_W, BOX_H, color, label)
-
-    # Mini graph inside Knowledge Graph box
-    kg_x = STAGES[2][2]
-    draw_mini_graph(ax, kg_x, BOX_Y, TEAL)
-
-    # Draw arrows between consecutive boxes
-    for i in range(len(STAGES) - 1):
-        x1 = STAGES[i][2] + BOX_W / 2 + 0.1
-        x2 = STAGES[i + 1][2] - BOX_W / 2 - 0.1
-        draw_arrow(ax, x1, BOX_Y, x2)
-
-    # Annotation: "Less hallucination!" pointing to KG->Facts connection
-    mid_x = (STAGES[2][2] + STAGES[3][2]) / 2
-    ann_y = BOX_Y - BOX_H / 2 - 1.2
+def retrieve(question, passages, k=TOP_K):
+    """Top-k (score, passage) pairs for the question."""
+    scores, ids = exact_search(hash_embed(passages), hash_embed([question]), k)
+    return [(float(s), passages[i]) for s, i in zip(scores[0], ids[0])]
+
+
+def measure_search():
+    """Exact and IVF rows from retrieval.benchmark, plus the corpus shape."""
+    if EMBEDDINGS_FILE:
+        X = open_embeddings(EMBEDDINGS_FILE)
+    else:
+        X = normalize(clustered_corpus(BENCH_N, BENCH_D))
+    rng = np.random.default_rng(1)
+    Q = (np.asarray(X[np.sort(rng.choice(len(X), BENCH_QUERIES))],
+                    dtype=np.float32) +
+         0.05 * rng.normal(size=(BENCH_QUERIES, X.shape[1])))
+    index = IVFIndex.build(X, nlist=BENCH_NLIST)
+    exact, ivf = benchmark(X, Q, k=10, index=index, nprobes=(BENCH_NPROBE,))
+    return exact, ivf, X.shape
+
+
+def search_results():
+    """measure_search() output, pinned to RESULTS_FILE when one is set."""
+    path = RESULTS_FILE and os.path.join(SCRIPT_DIR, RESULTS_FILE)
+    if path and os.path.exists(path):
+        with open(path) as fh:
+            saved = json.load(fh)
+        return saved['exact'], saved['ivf'], tuple(saved['shape'])
+    exact, ivf, shape = measure_search()
+    if path:
+        with open(path, 'w') as fh:
+            json.dump({'exact': exact, 'ivf': ivf, 'shape': list(shape)},
+                      fh, indent=1)
+    return exact, ivf, shape
+
+
+def draw_hits(ax, question, hits, x0, x1, y_top, target_x, target_y):
+    """Card listing the retrieved passages, linked to the Facts stage."""
+    line_h = 0.48
+    h = 0.7 + line_h * len(hits)
+    card = mpatches.FancyBboxPatch(
+        (x0, y_top - h), x1 - x0, h,
+        boxstyle=mpatches.BoxStyle.Round(pad=0.1, rounding_size=0.2),
+        facecolor=CARD_BG, edgecolor=GREEN, linewidth=1.5, zorder=3,
+    )
+    ax.add_patch(card)
+    ax.text(x0 + 0.25, y_top - 0.35, f'Q: "{question}"  ->  top-{len(hits)}',
+            fontsize=13, fontweight='bold', color=TEXT, va='center',
+            zorder=5)
+    for row, (score, passage) in enumerate(hits):
+        y = y_top - 0.85 - row * line_h
+        ax.text(x0 + 0.25, y, f'{score:.2f}', fontsize=12, color=GREEN,
+                fontweight='bold', va='center', family='monospace', zorder=5)
+        ax.text(x0 + 1.1, y, passage, fontsize=12, color=TEXT,
+                va='center', zorder=5)
     ax.annotate(
-        'Less hallucination!',
-        xy=(mid_x, BOX_Y - BOX_H / 2 - 0.15),
-        xytext=(mid_x, ann_y),
-        fontsize=16, fontweight='bold', color=YELLOW, ha='center',
-        arrowprops=dict(
-            arrowstyle='->', color=YELLOW, lw=2.5,
-            connectionstyle='arc3,rad=0.0',
-        ),
-        zorder=8,
-        bbox=dict(boxstyle='round,pad=0.3', facecolor=BG,
-                  edgecolor=YELLOW, linewidth=1.5),
+        '', xy=(target_x, target_y), xytext=(target_x, y_top - h - 0.1),
+        arrowprops=dict(arrowstyle='-|>', color=GREEN, lw=2.0,
+                        linestyle='--', mutation_scale=16),
+        zorder=4,
     )
 
-    # Subtitle below the flow
-    ax.text(
-        8.25, 1.0,
-        'Ground the LLM in real facts retrieved from a structured knowledge graph',
-        fontsize=14, color=MUTED, ha='center', va='center', style='italic',
-    )
 
-    # Title
-    ax.set_title(
-        'Retrieval-Augmented Generation (RAG)',
-        fontsize=30, fontweight='bold', color=TEXT, pad=24,
-    )
+def main():
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.set_xlim(-0.5, 17.0)
+        ax.set_ylim(0.0, 8.5)
+        ax.set_aspect('equal')
+        ax.axis('off')
+
+        # Draw boxes
+        for label, color, xc in STAGES:
+            draw_rounded_box(ax, xc, BOX_Y, BOX_W, BOX_H, color, label)
+
+        # Mini graph inside Knowledge Graph box
+        kg_x = STAGES[2][2]
+        draw_mini_graph(ax, kg_x, BOX_Y, TEAL)
 
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+        # Draw arrows between consecutive boxes
+        for i in range(len(STAGES) - 1):
+            x1 = STAGES[i][2] + BOX_W / 2 + 0.1
+            x2 = STAGES[i + 1][2] - BOX_W / 2 - 0.1
+            draw_arrow(ax, x1, BOX_Y, x2)
+
+        # Annotation: "Less hallucination!" pointing to KG->Facts connection
+        mid_x = (STAGES[2][2] + STAGES[3][2]) / 2
+        ann_y = BOX_Y - BOX_H / 2 - 1.2
+        ax.annotate(
+            'Less hallucination!',
+            xy=(mid_x, BOX_Y - BOX_H / 2 - 0.15),
+            xytext=(mid_x, ann_y),
+            fontsize=16, fontweight='bold', color=YELLOW, ha='center',
+            arrowprops=dict(
+                arrowstyle='->', color=YELLOW, lw=2.5,
+                connectionstyle='arc3,rad=0.0',
+            ),
+            zorder=8,
+            bbox=dict(boxstyle='round,pad=0.3', facecolor=BG,
+                      edgecolor=YELLOW, linewidth=1.5),
+        )
+
+        # Real top-k retrieval feeding the "Retrieved Facts" stage
+        facts_x = STAGES[3][2]
+        draw_hits(ax, QUESTION, retrieve(QUESTION, PASSAGES),
+                  x0=4.2, x1=15.0, y_top=8.2,
+                  target_x=facts_x, target_y=BOX_Y + BOX_H / 2 + 0.3)
+
+        exact, ivf, (n, d) = search_results()
+        print(f'exact top-10 over {n:,} x {d}: {exact["ms_per_query"]:.1f} '
+              f'ms/query | IVF nprobe={ivf["nprobe"]}: '
+              f'{ivf["ms_per_query"]:.2f} ms/query, '
+              f'recall@10 {ivf["recall"]:.2f}')
+        footer = (f'exact top-10 over {n:,} x {d}  vs  IVF '
+                  f'nprobe={ivf["nprobe"]}: recall@10 {ivf["recall"]:.2f}')
+        if RESULTS_FILE:
+            footer += (f'  |  {exact["ms_per_query"]:.1f} vs '
+                       f'{ivf["ms_per_query"]:.2f} ms/query')
+        ax.text(
+            8.25, 0.35, footer,
+            fontsize=12, color=MUTED, ha='center', va='center',
+            family='monospace',
+        )
+
+        # Subtitle below the flow
+        ax.text(
+            8.25, 1.0,
+            'Ground the LLM in real facts retrieved from a structured knowledge graph',
+            fontsize=14, color=MUTED, ha='center', va='center', style='italic',
+        )
+
+        # Title
+        ax.set_title(
+            'Retrieval-Augmented Generation (RAG)',
+            fontsize=30, fontweight='bold', color=TEXT, pad=24,
+        )
 
 
 if __name__ == '__main__':
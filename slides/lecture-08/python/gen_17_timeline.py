@@ -5,37 +5,27 @@ gen_17_timeline.py
 
 Horizontal bezier curve with 8 milestone dots, colored by type.
 Names above the line, years below. Dots sized by recency/impact.
-Subtle gradient glow behind the curve.
+Subtle gradient glow behind the curve. Names and years are measured and
+placed in lanes by label_layout.py, so milestones that crowd together
+(or come from MILESTONES_FILE) never overprint each other.
 
 Output: ../images/17-timeline-chain.png (3840x2160, 4K)
 """
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patheffects as pe
 
+from label_layout import TextMeasure, layout_labels, load_milestones
+from theme import (BG, BLUE, YELLOW, GREEN, TEAL, ORANGE, RED, PURPLE, TEXT,
+                   MUTED, slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '17-timeline-chain.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG      = '#1b2631'
-CARD_BG = '#1e3044'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-TEAL    = '#1abc9c'
-ORANGE  = '#e67e22'
-RED     = '#e74c3c'
-PURPLE  = '#9b59b6'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
-
 # ---------------------------------------------------------------------------
 # Milestones
 # ---------------------------------------------------------------------------
@@ -52,6 +42,29 @@ MILESTONES = [
     (16.8, '2020\u20132024', 'Graph Neural\nNetworks',               BLUE,   1.8),
 ]
 
+MILESTONES_FILE = None  # e.g. 'milestones.csv': year,name,color,size[,x]
+                        # (names may contain \\n; rows without x are spaced
+                        # evenly; color a hex code or ORANGE, BLUE, ... )
+PALETTE = dict(BLUE=BLUE, YELLOW=YELLOW, GREEN=GREEN, TEAL=TEAL,
+               ORANGE=ORANGE, RED=RED, PURPLE=PURPLE)
+
+NAME_STYLE = dict(fontsize=11, fontweight='bold', linespacing=1.3)
+YEAR_STYLE = dict(fontsize=11, fontweight='bold')
+
+
+def milestones():
+    """MILESTONES, or the rows of MILESTONES_FILE in the same shape."""
+    if not MILESTONES_FILE:
+        return MILESTONES
+    rows = load_milestones(MILESTONES_FILE)
+    even = np.linspace(1.5, 16.8, len(rows))
+    return [(float(row['x']) if row.get('x') not in (None, '') else x,
+             str(row['year']), str(row['name']).replace('\\n', '\n'),
+             PALETTE.get(str(row.get('color', '')).upper(),
+                         row.get('color') or BLUE),
+             float(row.get('size') or 1.0))
+            for row, x in zip(rows, even)]
+
 
 def cubic_bezier(p0, p1, p2, p3, t):
     """Evaluate cubic bezier at parameter t (array)."""
@@ -63,123 +76,132 @@ def cubic_bezier(p0, p1, p2, p3, t):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(3840 / 200, 2160 / 200), dpi=200)
-    fig.patch.set_facecolor(BG)
-    ax.set_facecolor(BG)
-    ax.set_xlim(-0.5, 19.0)
-    ax.set_ylim(-2.5, 6.5)
-    ax.axis('off')
-
-    # x positions come directly from the milestone definitions
-    xs = [m[0] for m in MILESTONES]
-    y_line = 2.0  # vertical position of the timeline
-
-    # Draw the flowing bezier curve through the timeline
-    # Control points for a gentle S-curve
-    p0 = (xs[0] - 1.5, y_line)
-    p1 = (xs[2], y_line + 0.6)
-    p2 = (xs[5], y_line - 0.6)
-    p3 = (xs[-1] + 1.5, y_line)
-
-    t_vals = np.linspace(0, 1, 500)
-    curve = cubic_bezier(p0, p1, p2, p3, t_vals)
-
-    # Glow effect: multiple passes with decreasing alpha and increasing width
-    glow_widths = [28, 20, 14, 8, 4]
-    glow_alphas = [0.03, 0.06, 0.10, 0.18, 0.35]
-    glow_color = BLUE
-    for w, a in zip(glow_widths, glow_alphas):
-        ax.plot(curve[0], curve[1], color=glow_color, linewidth=w,
-                alpha=a, solid_capstyle='round', zorder=1)
-
-    # Main curve line
-    ax.plot(curve[0], curve[1], color=TEXT, linewidth=2.5,
-            alpha=0.5, solid_capstyle='round', zorder=2)
-
-    # Function to get y on bezier at a given x (approximate)
-    def bezier_y_at_x(target_x):
-        dists = np.abs(curve[0] - target_x)
-        idx = np.argmin(dists)
-        return curve[1][idx]
-
-    # Draw milestones
-    for i, (x_pos, year_label, name, color, size_fac) in enumerate(MILESTONES):
-        x = xs[i]
-        y_base = bezier_y_at_x(x)
-
-        dot_size = 140 * size_fac
-
-        # Glow behind dot
-        ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size) * 1.6,
-                alpha=0.15, zorder=3)
-        ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size) * 1.2,
-                alpha=0.25, zorder=3)
-
-        # Dot
-        ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size),
-                markeredgecolor='white', markeredgewidth=1.5, zorder=5)
-
-        # Vertical stem
-        stem_top = y_base + 0.3
-        stem_bot = y_base - 0.3
-        ax.plot([x, x], [stem_top, stem_top + 0.15], color=MUTED,
-                linewidth=1.0, alpha=0.5, zorder=4)
-        ax.plot([x, x], [stem_bot, stem_bot - 0.15], color=MUTED,
-                linewidth=1.0, alpha=0.5, zorder=4)
-
-        # Name ABOVE the line
-        ax.text(
-            x, y_base + 0.85, name,
-            fontsize=11, fontweight='bold', color=TEXT,
-            ha='center', va='bottom', zorder=6,
-            linespacing=1.3,
-            path_effects=[pe.withStroke(linewidth=3, foreground=BG)],
+    # Figure at the save resolution: the label layout measures text in pixels
+    with slide_figure(OUTPUT_PATH, dpi=200) as (fig, ax):
+        ax.set_xlim(-0.5, 19.0)
+        ax.set_ylim(-2.5, 6.5)
+        ax.axis('off')
+
+        # x positions come directly from the milestone definitions
+        events = milestones()
+        xs = [m[0] for m in events]
+        y_line = 2.0  # vertical position of the timeline
+
+        # Draw the flowing bezier curve through the timeline
+        # Control points for a gentle S-curve
+        p0 = (xs[0] - 1.5, y_line)
+        p1 = (xs[2], y_line + 0.6)
+        p2 = (xs[5], y_line - 0.6)
+        p3 = (xs[-1] + 1.5, y_line)
+
+        t_vals = np.linspace(0, 1, 500)
+        curve = cubic_bezier(p0, p1, p2, p3, t_vals)
+
+        # Glow effect: multiple passes, decreasing alpha and increasing width
+        glow_widths = [28, 20, 14, 8, 4]
+        glow_alphas = [0.03, 0.06, 0.10, 0.18, 0.35]
+        glow_color = BLUE
+        for w, a in zip(glow_widths, glow_alphas):
+            ax.plot(curve[0], curve[1], color=glow_color, linewidth=w,
+                    alpha=a, solid_capstyle='round', zorder=1)
+
+        # Main curve line
+        ax.plot(curve[0], curve[1], color=TEXT, linewidth=2.5,
+                alpha=0.5, solid_capstyle='round', zorder=2)
+
+        # Function to get y on bezier at a given x (approximate)
+        def bezier_y_at_x(target_x):
+            dists = np.abs(curve[0] - target_x)
+            idx = np.argmin(dists)
+            return curve[1][idx]
+
+        # Lay out names above the curve and years below it
+        measure = TextMeasure(ax)
+        name_size = np.array([measure.extent(m[2], **NAME_STYLE)
+                              for m in events])
+        year_size = np.array([measure.extent(m[1], **YEAR_STYLE)
+                              for m in events])
+        y_top = max(bezier_y_at_x(x) for x in xs)
+        y_bot = min(bezier_y_at_x(x) for x in xs)
+        names = layout_labels(xs, name_size[:, 0], name_size[:, 1], y0=y_top,
+                              offset=0.6, x_min=-0.4, x_max=18.9,
+                              sides=('above',), n_lanes=4, lane_gap=0.2,
+                              pad=0.2)
+        years = layout_labels(xs, year_size[:, 0], year_size[:, 1], y0=y_bot,
+                              offset=0.55, x_min=-0.4, x_max=18.9,
+                              sides=('below',), n_lanes=4, lane_gap=0.15,
+                              pad=0.2)
+        if names.overlaps.any() or years.overlaps.any():
+            n_over = names.overlaps.sum() + years.overlaps.sum()
+            print(f'  {n_over} labels did not fit without overlap')
+
+        # Draw milestones
+        for i, (x_pos, year_label, name, color, size_fac) in enumerate(events):
+            x = xs[i]
+            y_base = bezier_y_at_x(x)
+
+            dot_size = 140 * size_fac
+
+            # Glow behind dot
+            ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size) * 1.6,
+                    alpha=0.15, zorder=3)
+            ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size) * 1.2,
+                    alpha=0.25, zorder=3)
+
+            # Dot
+            ax.plot(x, y_base, 'o', color=color, markersize=np.sqrt(dot_size),
+                    markeredgecolor='white', markeredgewidth=1.5, zorder=5)
+
+            # Stems from the dot to its name and its year
+            for lay, start in ((names, y_base + 0.3), (years, y_base - 0.3)):
+                (_, _), (sx, sy) = lay.leaders(inset=0.1)[i]
+                ax.plot([x, sx], [start, sy - lay.side[i] * 0.1], color=MUTED,
+                        linewidth=1.0, alpha=0.5, zorder=4)
+
+            # Name ABOVE the line
+            ax.text(
+                names.center[i], names.bottom[i], name,
+                color=TEXT, ha='center', va='bottom', zorder=6,
+                path_effects=[pe.withStroke(linewidth=3, foreground=BG)],
+                **NAME_STYLE,
+            )
+
+            # Year BELOW the line
+            ax.text(
+                years.center[i], years.top[i], year_label,
+                color=color, ha='center', va='top', zorder=6,
+                path_effects=[pe.withStroke(linewidth=3, foreground=BG)],
+                **YEAR_STYLE,
+            )
+
+        # Color legend
+        legend_items = [
+            (ORANGE, 'Origin'),
+            (GREEN,  'Discovery'),
+            (YELLOW, 'Breakthrough'),
+            (BLUE,   'AI Connection'),
+        ]
+        lx_start = 2.0
+        ly = -1.5
+        for i, (col, label) in enumerate(legend_items):
+            lx = lx_start + i * 3.5
+            ax.plot(lx, ly, 'o', color=col, markersize=10, zorder=8)
+            ax.text(lx + 0.35, ly, label, fontsize=12, color=TEXT,
+                    va='center', zorder=8)
+
+        # Title
+        ax.set_title(
+            '300 Years of Connection Mathematics',
+            fontsize=32, fontweight='bold', color=TEXT, pad=28,
         )
 
-        # Year BELOW the line
+        # Subtitle
         ax.text(
-            x, y_base - 0.75, year_label,
-            fontsize=11, color=color, fontweight='bold',
-            ha='center', va='top', zorder=6,
-            path_effects=[pe.withStroke(linewidth=3, foreground=BG)],
+            9.25, -2.1,
+            'From Euler\'s bridges to modern Graph Neural Networks',
+            fontsize=15, color=MUTED, ha='center', va='center', style='italic',
         )
 
-    # Color legend
-    legend_items = [
-        (ORANGE, 'Origin'),
-        (GREEN,  'Discovery'),
-        (YELLOW, 'Breakthrough'),
-        (BLUE,   'AI Connection'),
-    ]
-    lx_start = 2.0
-    ly = -1.5
-    for i, (col, label) in enumerate(legend_items):
-        lx = lx_start + i * 3.5
-        ax.plot(lx, ly, 'o', color=col, markersize=10, zorder=8)
-        ax.text(lx + 0.35, ly, label, fontsize=12, color=TEXT,
-                va='center', zorder=8)
-
-    # Title
-    ax.set_title(
-        '300 Years of Connection Mathematics',
-        fontsize=32, fontweight='bold', color=TEXT, pad=28,
-    )
-
-    # Subtitle
-    ax.text(
-        9.25, -2.1,
-        'From Euler\'s bridges to modern Graph Neural Networks',
-        fontsize=15, color=MUTED, ha='center', va='center', style='italic',
-    )
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
-
 
 if __name__ == '__main__':
     main()
@@ -3,9 +3,12 @@
 gen_18_milgram_letters.py
 Milgram's 1967 "Six Degrees" letter experiment.
 
-A chain of 6 person-nodes from "You (Nebraska)" to "Target (Boston)",
-illustrating how a letter passes through ~6 intermediaries.
-Arrows show the letter's path through the chain.
+A chain of person-nodes from "You (Nebraska)" to "Target (Boston)",
+illustrating how a letter passes through ~6 intermediaries. The chain is
+a real greedy route sampled by kleinberg_routing.py on a small-world
+lattice, each friend labelled with their remaining distance to the
+target. An inset shows mean delivery length against the long-range
+exponent r.
 
 Output: ../images/18-milgram-letters.png (3840x2160, 4K)
 """
@@ -17,6 +20,9 @@ import matplotlib.patches as mpatches
 import matplotlib.patheffects as pe
 import networkx as nx
 
+from kleinberg_routing import build_lattice, route, sweep
+from theme import BG, CARD_BG, BLUE, YELLOW, GREEN, TEXT, MUTED, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -24,34 +30,67 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '18-milgram-letters.png')
 
 # ---------------------------------------------------------------------------
-# Palette
+# Small-world lattice (Kleinberg model)
 # ---------------------------------------------------------------------------
-BG      = '#1b2631'
-CARD_BG = '#1e3044'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+L = 100               # 100 x 100 grid of people
+Q = 16                # long-range acquaintances per person
+R = 2.0               # long-range links drawn with P ~ d^-R
+HOPS = 6              # chain length to show
+SEED = 42
 
-# ---------------------------------------------------------------------------
-# Chain definition
-# ---------------------------------------------------------------------------
-NODES = [
-    ('You\n(Nebraska)', BLUE),
-    ('Friend 1\nKansas',  GREEN),
-    ('Friend 2\nMissouri', GREEN),
-    ('Friend 3\nOhio',    GREEN),
-    ('Friend 4\nNew York', GREEN),
-    ('Friend 5\nConn.',   GREEN),
-    ('Target\n(Boston)',  YELLOW),
-]
+# Inset: mean delivery length vs exponent r
+SWEEP_R = [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
+SWEEP_PAIRS = 20_000
+
+
+def sample_chain():
+    """Return the node labels of a real HOPS-hop greedy delivery.
 
-N = len(NODES)   # 7 nodes  →  6 hops
+    When no sampled message takes exactly HOPS hops, the delivered length
+    nearest to it is shown instead (and reported); RuntimeError if no
+    message got through at all.
+    """
+    contacts = build_lattice(L, r=R, q=Q, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    sources = rng.integers(0, L * L, size=5000)
+    targets = rng.integers(0, L * L, size=5000)
+    lengths = route(contacts, L, sources, targets)['lengths']
+    delivered = np.flatnonzero(lengths > 0)
+    if delivered.size == 0:
+        raise RuntimeError(f'no greedy delivery succeeded on the {L} x {L} '
+                           f'lattice (r={R}, q={Q})')
+    # Of the deliveries nearest HOPS hops, show the one that started
+    # farthest away
+    gap = np.abs(lengths[delivered] - HOPS)
+    candidates = delivered[gap == gap.min()]
+    if gap.min():
+        print(f'  no {HOPS}-hop delivery sampled; showing a '
+              f'{lengths[candidates[0]]}-hop one')
+    sx, sy = np.divmod(sources, L)
+    tx, ty = np.divmod(targets, L)
+    start_dist = np.abs(sx - tx) + np.abs(sy - ty)
+    i = int(candidates[np.argmax(start_dist[candidates])])
+    path = route(contacts, L, sources[i:i + 1], targets[i:i + 1],
+                 record=1)['paths'][0]
+
+    nodes = []
+    for k, node in enumerate(path):
+        x, y = divmod(node, L)
+        away = abs(x - tx[i]) + abs(y - ty[i])
+        where = f'{away} block{"s" if away != 1 else ""} away'
+        if k == 0:
+            nodes.append((f'You\n{where}', BLUE))
+        elif k == len(path) - 1:
+            nodes.append(('Target\n(Boston)', YELLOW))
+        else:
+            nodes.append((f'Friend {k}\n{where}', GREEN))
+    return nodes
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    NODES = sample_chain()
+    N = len(NODES)   # HOPS + 1 nodes
+    delivery = sweep(L, SWEEP_R, SWEEP_PAIRS, q=Q, seed=SEED)
 
     # -----------------------------------------------------------------------
     # Build directed path graph
@@ -68,161 +107,168 @@ def main():
     # -----------------------------------------------------------------------
     # Figure
     # -----------------------------------------------------------------------
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(3840 / 200, 2160 / 200), dpi=200)
-    fig.patch.set_facecolor(BG)
-    ax.set_facecolor(BG)
-    ax.set_xlim(-0.5, 17.0)
-    ax.set_ylim(0.0, 8.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.set_xlim(-0.5, 17.0)
+        ax.set_ylim(0.0, 8.5)
+        ax.set_aspect('equal')
+        ax.axis('off')
 
-    # -----------------------------------------------------------------------
-    # Draw connecting edges (arrows)
-    # -----------------------------------------------------------------------
-    for i in range(N - 1):
-        x1, y1 = pos[i]
-        x2, y2 = pos[i + 1]
-        # nudge arrow endpoints away from node centres
-        dx = x2 - x1
+        # -------------------------------------------------------------------
+        # Draw connecting edges (arrows)
+        # -------------------------------------------------------------------
+        for i in range(N - 1):
+            x1, y1 = pos[i]
+            x2, y2 = pos[i + 1]
+            # nudge arrow endpoints away from node centres
+            dx = x2 - x1
+            ax.annotate(
+                '', xy=(x2 - 0.30, y2), xytext=(x1 + 0.30, y1),
+                arrowprops=dict(
+                    arrowstyle='-|>', color=MUTED, lw=2.5,
+                    mutation_scale=24, shrinkA=0, shrinkB=0,
+                ),
+                zorder=2,
+            )
+            # Draw a subtle dashed connecting line as well
+            ax.plot([x1 + 0.30, x2 - 0.30], [y1, y2],
+                    color=MUTED, linewidth=1.5, linestyle='--',
+                    alpha=0.35, zorder=1)
+
+        # -------------------------------------------------------------------
+        # Draw hop count labels above edges
+        # -------------------------------------------------------------------
+        hop_labels = [f'Hop {i + 1}' for i in range(N - 1)]
+        for i, label in enumerate(hop_labels):
+            mx = (pos[i][0] + pos[i + 1][0]) / 2
+            my = y_main + 0.72
+            ax.text(mx, my, label, fontsize=11, color=MUTED,
+                    ha='center', va='center', style='italic',
+                    path_effects=[pe.withStroke(linewidth=2, foreground=BG)])
+
+        # -------------------------------------------------------------------
+        # Draw nodes as circles with labels below
+        # -------------------------------------------------------------------
+        NODE_R = 0.45
+        for i, (label, color) in enumerate(NODES):
+            x, y = pos[i]
+
+            # Glow / halo
+            glow = plt.Circle((x, y), NODE_R + 0.12, color=color,
+                               alpha=0.18, zorder=3)
+            ax.add_patch(glow)
+
+            # Main circle
+            circle = plt.Circle((x, y), NODE_R, color=color,
+                                 ec='white', linewidth=2.5, zorder=4)
+            ax.add_patch(circle)
+
+            # Node index (1-based) inside circle
+            ax.text(x, y, str(i + 1) if 0 < i < N - 1 else ('S' if i == 0 else 'T'),
+                    fontsize=18, fontweight='bold',
+                    color=BG if color == YELLOW else 'white',
+                    ha='center', va='center', zorder=5,
+                    path_effects=[pe.withStroke(linewidth=2,
+                                                foreground=color)])
+
+            # Label below each node
+            ax.text(x, y - NODE_R - 0.50, label,
+                    fontsize=12, fontweight='bold', color=color,
+                    ha='center', va='top', zorder=5, linespacing=1.4,
+                    path_effects=[pe.withStroke(linewidth=3, foreground=BG)])
+
+        # -------------------------------------------------------------------
+        # "~6 steps" annotation arc above the chain
+        # -------------------------------------------------------------------
+        # A curved double-headed arrow spanning all nodes
         ax.annotate(
-            '', xy=(x2 - 0.30, y2), xytext=(x1 + 0.30, y1),
+            '', xy=(pos[N - 1][0], y_main + NODE_R + 0.18),
+            xytext=(pos[0][0], y_main + NODE_R + 0.18),
             arrowprops=dict(
-                arrowstyle='-|>', color=MUTED, lw=2.5,
-                mutation_scale=24, shrinkA=0, shrinkB=0,
+                arrowstyle='<->', color=YELLOW, lw=2.0,
+                connectionstyle='arc3,rad=-0.35',
+                mutation_scale=18,
             ),
-            zorder=2,
+            zorder=6,
+        )
+        ax.text(
+            (pos[0][0] + pos[N - 1][0]) / 2, y_main + NODE_R + 1.62,
+            '~6 steps to reach anyone',
+            fontsize=22, fontweight='bold', color=YELLOW,
+            ha='center', va='center', zorder=7,
+            path_effects=[pe.withStroke(linewidth=4, foreground=BG)],
         )
-        # Draw a subtle dashed connecting line as well
-        ax.plot([x1 + 0.30, x2 - 0.30], [y1, y2],
-                color=MUTED, linewidth=1.5, linestyle='--',
-                alpha=0.35, zorder=1)
-
-    # -----------------------------------------------------------------------
-    # Draw hop count labels above edges
-    # -----------------------------------------------------------------------
-    hop_labels = ['Hop 1', 'Hop 2', 'Hop 3', 'Hop 4', 'Hop 5', 'Hop 6']
-    for i, label in enumerate(hop_labels):
-        mx = (pos[i][0] + pos[i + 1][0]) / 2
-        my = y_main + 0.72
-        ax.text(mx, my, label, fontsize=11, color=MUTED,
-                ha='center', va='center', style='italic',
-                path_effects=[pe.withStroke(linewidth=2, foreground=BG)])
-
-    # -----------------------------------------------------------------------
-    # Draw nodes as circles with labels below
-    # -----------------------------------------------------------------------
-    NODE_R = 0.45
-    for i, (label, color) in enumerate(NODES):
-        x, y = pos[i]
-
-        # Glow / halo
-        glow = plt.Circle((x, y), NODE_R + 0.12, color=color,
-                           alpha=0.18, zorder=3)
-        ax.add_patch(glow)
-
-        # Main circle
-        circle = plt.Circle((x, y), NODE_R, color=color,
-                             ec='white', linewidth=2.5, zorder=4)
-        ax.add_patch(circle)
-
-        # Node index (1-based) inside circle
-        ax.text(x, y, str(i + 1) if 0 < i < N - 1 else ('S' if i == 0 else 'T'),
-                fontsize=18, fontweight='bold',
-                color=BG if color == YELLOW else 'white',
-                ha='center', va='center', zorder=5,
-                path_effects=[pe.withStroke(linewidth=2, foreground=color)])
-
-        # Label below each node
-        ax.text(x, y - NODE_R - 0.50, label,
-                fontsize=12, fontweight='bold', color=color,
-                ha='center', va='top', zorder=5, linespacing=1.4,
-                path_effects=[pe.withStroke(linewidth=3, foreground=BG)])
-
-    # -----------------------------------------------------------------------
-    # "~6 steps" annotation arc above the chain
-    # -----------------------------------------------------------------------
-    # A curved double-headed arrow spanning all nodes
-    ax.annotate(
-        '', xy=(pos[N - 1][0], y_main + NODE_R + 0.18),
-        xytext=(pos[0][0], y_main + NODE_R + 0.18),
-        arrowprops=dict(
-            arrowstyle='<->', color=YELLOW, lw=2.0,
-            connectionstyle='arc3,rad=-0.35',
-            mutation_scale=18,
-        ),
-        zorder=6,
-    )
-    ax.text(
-        (pos[0][0] + pos[N - 1][0]) / 2, y_main + NODE_R + 1.62,
-        '~6 steps to reach anyone',
-        fontsize=22, fontweight='bold', color=YELLOW,
-        ha='center', va='center', zorder=7,
-        path_effects=[pe.withStroke(linewidth=4, foreground=BG)],
-    )
 
-    # -----------------------------------------------------------------------
-    # Envelope icon (letter) moving along the path — placed midway
-    # -----------------------------------------------------------------------
-    # Draw a small stylised envelope at the midpoint of hop 3
-    ex = (pos[2][0] + pos[3][0]) / 2
-    ey = y_main + 1.25
-    env_w, env_h = 0.60, 0.38
-    envelope = mpatches.FancyBboxPatch(
-        (ex - env_w / 2, ey - env_h / 2), env_w, env_h,
-        boxstyle='square,pad=0.04',
-        facecolor=CARD_BG, edgecolor=MUTED, linewidth=1.5, zorder=6,
-        alpha=0.90,
-    )
-    ax.add_patch(envelope)
-    # Envelope flap (V lines)
-    ax.plot([ex - env_w / 2, ex, ex + env_w / 2],
-            [ey + env_h / 2, ey + 0.05, ey + env_h / 2],
-            color=MUTED, linewidth=1.2, zorder=7)
-    ax.text(ex, ey - 0.06, 'Letter', fontsize=9, color=MUTED,
-            ha='center', va='center', zorder=8)
+        # -------------------------------------------------------------------
+        # Envelope icon (letter) moving along the path — placed midway
+        # -------------------------------------------------------------------
+        # Draw a small stylised envelope at the midpoint of hop 3
+        ex = (pos[2][0] + pos[3][0]) / 2
+        ey = y_main + 1.25
+        env_w, env_h = 0.60, 0.38
+        envelope = mpatches.FancyBboxPatch(
+            (ex - env_w / 2, ey - env_h / 2), env_w, env_h,
+            boxstyle='square,pad=0.04',
+            facecolor=CARD_BG, edgecolor=MUTED, linewidth=1.5, zorder=6,
+            alpha=0.90,
+        )
+        ax.add_patch(envelope)
+        # Envelope flap (V lines)
+        ax.plot([ex - env_w / 2, ex, ex + env_w / 2],
+                [ey + env_h / 2, ey + 0.05, ey + env_h / 2],
+                color=MUTED, linewidth=1.2, zorder=7)
+        ax.text(ex, ey - 0.06, 'Letter', fontsize=9, color=MUTED,
+                ha='center', va='center', zorder=8)
 
-    # -----------------------------------------------------------------------
-    # Legend
-    # -----------------------------------------------------------------------
-    legend_handles = [
-        mpatches.Patch(color=BLUE,   label='Source (Nebraska)'),
-        mpatches.Patch(color=GREEN,  label='Intermediate contacts'),
-        mpatches.Patch(color=YELLOW, label='Target (Boston)'),
-    ]
-    fig.legend(
-        handles=legend_handles, loc='lower center', ncol=3,
-        fontsize=15, frameon=False, labelcolor=TEXT,
-        handlelength=2.0, bbox_to_anchor=(0.5, 0.03),
-    )
+        # -------------------------------------------------------------------
+        # Legend
+        # -------------------------------------------------------------------
+        legend_handles = [
+            mpatches.Patch(color=BLUE,   label='Source (Nebraska)'),
+            mpatches.Patch(color=GREEN,  label='Intermediate contacts'),
+            mpatches.Patch(color=YELLOW, label='Target (Boston)'),
+        ]
+        fig.legend(
+            handles=legend_handles, loc='lower center', ncol=3,
+            fontsize=15, frameon=False, labelcolor=TEXT,
+            handlelength=2.0, bbox_to_anchor=(0.5, 0.03),
+        )
 
-    # -----------------------------------------------------------------------
-    # Subtitle bar at bottom
-    # -----------------------------------------------------------------------
-    ax.text(
-        8.25, 1.35,
-        'Milgram (1967): Letters mailed to strangers in Nebraska reached a Boston '
-        'stockbroker in ~6 hops on average.',
-        fontsize=13, color=MUTED, ha='center', va='center',
-        style='italic', wrap=True,
-        path_effects=[pe.withStroke(linewidth=2, foreground=BG)],
-    )
+        # -------------------------------------------------------------------
+        # Inset: greedy delivery length vs long-range exponent r
+        # -------------------------------------------------------------------
+        inset = fig.add_axes([0.43, 0.30, 0.16, 0.10], facecolor=CARD_BG)
+        means = [delivery[r].mean() for r in SWEEP_R]
+        inset.plot(SWEEP_R, means, color=GREEN, lw=2.5, marker='o',
+                   markersize=5)
+        inset.axvline(R, color=YELLOW, lw=1.5, ls='--')
+        inset.set_title(f'{SWEEP_PAIRS:,} letters per r', fontsize=12,
+                        color=TEXT, pad=6)
+        inset.set_xlabel('long-range exponent $r$', fontsize=11, color=MUTED)
+        inset.set_ylabel('mean hops', fontsize=11, color=MUTED)
+        inset.tick_params(colors=MUTED, labelsize=9)
+        for spine in inset.spines.values():
+            spine.set_color(MUTED)
 
-    # -----------------------------------------------------------------------
-    # Title
-    # -----------------------------------------------------------------------
-    ax.set_title(
-        "Milgram's Small-World Experiment — Six Degrees of Separation (1967)",
-        fontsize=30, fontweight='bold', color=TEXT, pad=22,
-    )
+        # -------------------------------------------------------------------
+        # Subtitle bar at bottom
+        # -------------------------------------------------------------------
+        ax.text(
+            8.25, 0.55,
+            'Milgram (1967): Letters mailed to strangers in Nebraska reached a Boston '
+            'stockbroker in ~6 hops on average.',
+            fontsize=13, color=MUTED, ha='center', va='center',
+            style='italic', wrap=True,
+            path_effects=[pe.withStroke(linewidth=2, foreground=BG)],
+        )
 
-    # -----------------------------------------------------------------------
-    # Save
-    # -----------------------------------------------------------------------
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+        # -------------------------------------------------------------------
+        # Title
+        # -------------------------------------------------------------------
+        ax.set_title(
+            "Milgram's Small-World Experiment — "
+            'Six Degrees of Separation (1967)',
+            fontsize=30, fontweight='bold', color=TEXT, pad=22,
+        )
 
 
 if __name__ == '__main__':
@@ -9,8 +9,14 @@ Left-to-right flow of four stages:
   3. Communities        — yellow (clustered subgraph with boundary)
   4. LLM Synthesis      — red (single output node with glow)
 
-Thick arrows connect stages; each stage has an icon drawn with
-matplotlib patches so no external images are required.
+Thick arrows connect stages. The Knowledge Graph and Communities panels
+are drawn from a real graphrag_index.CommunityIndex: the entity
+co-occurrence graph of N_DOCS synthetic documents (or CORPUS_PATH) and
+its Louvain community hierarchy -- top-level communities as halos, their
+level-0 sub-communities as dots inside. The index is cached in
+INDEX_FILE: a CORPUS_PATH re-render only indexes documents that are new,
+and the synthetic corpus (fixed by N_DOCS) is loaded without being
+regenerated.
 
 Output: ../images/19-graphrag-concept.png (3840x2160, 4K)
 """
@@ -20,6 +26,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as pe
+import scipy.sparse as sp
+
+from graphrag_index import CommunityIndex, read_corpus, synthetic_corpus
+from theme import (BG, CARD_BG, BLUE, YELLOW, GREEN, RED, TEXT, MUTED,
+                   slide_figure)
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -27,17 +38,18 @@ import matplotlib.patheffects as pe
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '19-graphrag-concept.png')
 
+# Top-level community colours, cycled
+COMMUNITY_COLORS = [BLUE, GREEN, YELLOW, RED, '#9b59b6', '#1abc9c',
+                    '#e67e22', '#ecf0f1']
+
 # ---------------------------------------------------------------------------
-# Palette
+# Corpus / index
 # ---------------------------------------------------------------------------
-BG      = '#1b2631'
-CARD_BG = '#1e3044'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-RED     = '#e74c3c'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+CORPUS_PATH = None     # directory of .txt files or one doc per line
+N_DOCS = 100_000       # synthetic documents when CORPUS_PATH is None
+INDEX_FILE = '.graphrag-index.npz'  # None rebuilds the index every render
+MAX_HALOS = 12         # top-level communities drawn
+GRAPH_NODES = 4        # highest-degree entities per community in the KG panel
 
 # ---------------------------------------------------------------------------
 # Stage definitions  (label, color, x_center, sublabel)
@@ -130,72 +142,112 @@ def draw_documents_icon(ax, xc, yc, color):
                 color=color, linewidth=1.3, alpha=0.55, zorder=6)
 
 
-def draw_knowledge_graph_icon(ax, xc, yc, color):
-    """Small 6-node connected graph."""
-    r = 0.62
-    angles = np.linspace(0, 2 * np.pi, 6, endpoint=False)
-    node_pos = [(xc + r * np.cos(a), yc + r * np.sin(a)) for a in angles]
-    # Edges
-    edges = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 0),
-             (0, 3), (1, 4), (2, 5)]
-    for i, j in edges:
-        ax.plot(
-            [node_pos[i][0], node_pos[j][0]],
-            [node_pos[i][1], node_pos[j][1]],
-            color=color, linewidth=1.8, alpha=0.50, zorder=5,
-        )
-    # Nodes
-    for (nx_, ny_) in node_pos:
-        ax.plot(nx_, ny_, 'o', color=color,
-                markersize=9, alpha=0.90, zorder=6,
-                markeredgecolor='white', markeredgewidth=1.2)
-
-
-def draw_communities_icon(ax, xc, yc, color):
-    """Two clusters with elliptical halos."""
-    clusters = [
-        {'centre': (xc - 0.42, yc + 0.28), 'nodes': [(-0.22, 0.20), (0.22, 0.25),
-                                                       (-0.10, -0.18), (0.15, -0.12)],
-         'color': BLUE},
-        {'centre': (xc + 0.42, yc - 0.28), 'nodes': [(-0.20, 0.18), (0.20, 0.12),
-                                                       (-0.05, -0.22), (0.18, -0.18)],
-         'color': GREEN},
-    ]
-    for cl in clusters:
-        cx_, cy_ = cl['centre']
-        # Halo ellipse
-        halo = mpatches.Ellipse(
-            (cx_, cy_), 0.78, 0.68,
-            facecolor=cl['color'], edgecolor=cl['color'],
-            linewidth=2.0, alpha=0.20, zorder=5,
-        )
-        ax.add_patch(halo)
-        halo_edge = mpatches.Ellipse(
-            (cx_, cy_), 0.78, 0.68,
-            facecolor='none', edgecolor=cl['color'],
-            linewidth=2.0, linestyle='--', alpha=0.70, zorder=5,
-        )
-        ax.add_patch(halo_edge)
-        # Inner nodes
-        npos = [(cx_ + dx, cy_ + dy) for dx, dy in cl['nodes']]
-        for (nx_, ny_) in npos:
-            ax.plot(nx_, ny_, 'o', color=cl['color'],
-                    markersize=7, alpha=0.95, zorder=6,
-                    markeredgecolor='white', markeredgewidth=1.0)
-        for k in range(len(npos)):
-            for l in range(k + 1, len(npos)):
-                ax.plot([npos[k][0], npos[l][0]],
-                        [npos[k][1], npos[l][1]],
-                        color=cl['color'], linewidth=1.2,
-                        alpha=0.40, zorder=5)
-    # Inter-cluster bridge
-    ax.plot(
-        [clusters[0]['centre'][0] + 0.32,
-         clusters[1]['centre'][0] - 0.32],
-        [clusters[0]['centre'][1] - 0.05,
-         clusters[1]['centre'][1] + 0.05],
-        color=color, linewidth=2.0, linestyle=':', alpha=0.60, zorder=5,
-    )
+def load_index():
+    """Build (or load and update) the community index for the slide."""
+    if not INDEX_FILE:
+        return CommunityIndex.build(read_corpus(CORPUS_PATH) if CORPUS_PATH
+                                    else synthetic_corpus(N_DOCS))
+    path = os.path.join(SCRIPT_DIR, INDEX_FILE)
+    if CORPUS_PATH:
+        return CommunityIndex.update(path, read_corpus(CORPUS_PATH))
+    # The synthetic corpus is deterministic: one index file per size
+    path = f'{os.path.splitext(path)[0]}-synthetic-{N_DOCS}.npz'
+    if os.path.exists(path):
+        return CommunityIndex.load(path)
+    index = CommunityIndex.build(synthetic_corpus(N_DOCS))
+    index.save(path)
+    return index
+
+
+def community_grid(n, xc, yc, w, h):
+    """Centres of n equal cells filling a w x h area, and the cell size."""
+    # Largest cell that fits; fewest empty slots on ties
+    cols = max(range(1, n + 1),
+               key=lambda c: (min(w / c, h / -(-n // c)), -c))
+    rows = -(-n // cols)
+    cell = min(w / cols, h / rows)
+    i = np.arange(n)
+    centres = np.column_stack([
+        xc + (i % cols - (cols - 1) / 2) * cell,
+        yc + ((rows - 1) / 2 - i // cols) * cell,
+    ])
+    return centres, cell
+
+
+def draw_knowledge_graph_panel(ax, xc, yc, index, w=2.4, h=1.5):
+    """Top entities of each community and the links among them.
+
+    Entities sit around their top-level community's slot in the same grid
+    the Communities panel uses, so the two panels line up visually.
+    """
+    top = index.levels[-1]
+    degree = index.degree
+    groups = index.communities(-1)[:MAX_HALOS]
+    centres, cell = community_grid(len(groups), xc, yc, w, h)
+    picked, xy = [], []
+    for c, members in enumerate(groups):
+        best = members[np.argsort(-degree[members])[:GRAPH_NODES]]
+        ang = np.linspace(0, 2 * np.pi, len(best), endpoint=False) + c
+        r = 0.3 * cell if len(best) > 1 else 0.0
+        picked.extend(best)
+        xy.extend(centres[c] + r * np.column_stack([np.cos(ang),
+                                                     np.sin(ang)]))
+    picked, xy = np.array(picked), np.array(xy)
+
+    sub = sp.triu(index.A[picked][:, picked], k=1).tocoo()
+    w_max = sub.data.max() if sub.nnz else 1.0
+    for i, j, wt in zip(sub.row, sub.col, sub.data):
+        ax.plot(xy[[i, j], 0], xy[[i, j], 1], color=TEXT,
+                linewidth=0.3 + 1.5 * wt / w_max,
+                alpha=0.12 + 0.4 * wt / w_max, zorder=5)
+    colors = [COMMUNITY_COLORS[top[e] % len(COMMUNITY_COLORS)]
+              for e in picked]
+    ax.scatter(xy[:, 0], xy[:, 1], s=28, c=colors, edgecolors='white',
+               linewidths=0.7, zorder=6)
+
+
+def draw_community_panel(ax, xc, yc, index, w=2.4, h=1.5):
+    """Top-level communities as halos holding their level-0 children."""
+    top_level = index.levels.shape[0] - 1
+    sizes = np.bincount(index.levels[-1])[:MAX_HALOS]
+    fine_sizes = np.bincount(index.levels[0])
+    n_halo = len(sizes)
+    centres, cell = community_grid(n_halo, xc, yc, w, h)
+    r_max = 0.42 * cell
+    radii = r_max * np.sqrt(sizes / sizes.max())
+
+    # Bridges: inter-community link weight between the drawn halos
+    P = np.zeros((len(index.entities), n_halo))
+    drawn = index.levels[-1] < n_halo
+    P[np.flatnonzero(drawn), index.levels[-1][drawn]] = 1.0
+    between = P.T @ (index.A @ P)
+    np.fill_diagonal(between, 0)
+    if between.max() > 0:
+        for a, b in zip(*np.nonzero(np.triu(between))):
+            wt = between[a, b] / between.max()
+            ax.plot(centres[[a, b], 0], centres[[a, b], 1], color=MUTED,
+                    linewidth=0.3 + 1.5 * wt, alpha=0.1 + 0.4 * wt, zorder=4)
+
+    for c in range(n_halo):
+        color = COMMUNITY_COLORS[c % len(COMMUNITY_COLORS)]
+        (cx_, cy_), r = centres[c], radii[c]
+        ax.add_patch(plt.Circle((cx_, cy_), r, facecolor=BG,
+                                edgecolor='none', zorder=5))
+        ax.add_patch(plt.Circle((cx_, cy_), r, facecolor=color,
+                                edgecolor=color, alpha=0.22, zorder=5))
+        ax.add_patch(plt.Circle((cx_, cy_), r, facecolor='none',
+                                edgecolor=color, linewidth=1.2,
+                                linestyle='--', alpha=0.8, zorder=5))
+        kids = (index.children(top_level, c) if top_level > 0
+                else np.array([c]))
+        k_sizes = fine_sizes[kids]
+        k_ang = np.linspace(np.pi / 4, np.pi / 4 + 2 * np.pi, len(kids),
+                            endpoint=False)
+        k_r = 0.5 * r if len(kids) > 1 else 0.0
+        ax.scatter(cx_ + k_r * np.cos(k_ang), cy_ + k_r * np.sin(k_ang),
+                   s=8 + 30 * k_sizes / fine_sizes.max(),
+                   color=color, edgecolors='white', linewidths=0.5,
+                   zorder=6)
 
 
 def draw_llm_icon(ax, xc, yc, color):
@@ -231,98 +283,96 @@ def draw_llm_icon(ax, xc, yc, color):
 # ---------------------------------------------------------------------------
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(3840 / 200, 2160 / 200), dpi=200)
-    fig.patch.set_facecolor(BG)
-    ax.set_facecolor(BG)
-    ax.set_xlim(-0.5, 17.5)
-    ax.set_ylim(0.0, 8.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
-
-    # -----------------------------------------------------------------------
-    # Stage boxes
-    # -----------------------------------------------------------------------
-    for label, color, xc, sublabel in STAGES:
-        draw_stage_box(ax, xc, STAGE_Y, BOX_W, BOX_H, color, label, sublabel)
-
-    # -----------------------------------------------------------------------
-    # Icons inside each stage box (centred, slightly above mid)
-    # -----------------------------------------------------------------------
-    icon_y = STAGE_Y + 0.30
-    draw_documents_icon(ax,       STAGES[0][2], icon_y, STAGES[0][1])
-    draw_knowledge_graph_icon(ax, STAGES[1][2], icon_y, STAGES[1][1])
-    draw_communities_icon(ax,     STAGES[2][2], icon_y, STAGES[2][1])
-    draw_llm_icon(ax,             STAGES[3][2], icon_y, STAGES[3][1])
-
-    # -----------------------------------------------------------------------
-    # Arrows between stages
-    # -----------------------------------------------------------------------
-    for i in range(len(STAGES) - 1):
-        x1 = STAGES[i][2]  + BOX_W / 2 + 0.10
-        x2 = STAGES[i + 1][2] - BOX_W / 2 - 0.10
-        clr = STAGES[i][1]
-        draw_arrow(ax, x1, x2, STAGE_Y, color=clr)
-
-    # -----------------------------------------------------------------------
-    # Step labels above arrows
-    # -----------------------------------------------------------------------
-    step_labels = ['1. Extract', '2. Cluster', '3. Query']
-    for i, slabel in enumerate(step_labels):
-        mx = (STAGES[i][2] + STAGES[i + 1][2]) / 2
-        ax.text(mx, STAGE_Y + BOX_H / 2 + 0.45, slabel,
-                fontsize=13, color=MUTED, ha='center', va='center',
-                style='italic',
-                path_effects=[pe.withStroke(linewidth=2, foreground=BG)])
-
-    # -----------------------------------------------------------------------
-    # Annotation: "Global context" at Community→LLM edge
-    # -----------------------------------------------------------------------
-    ann_x = (STAGES[2][2] + STAGES[3][2]) / 2
-    ann_y_box = STAGE_Y - BOX_H / 2 - 1.0
-    ax.annotate(
-        'Global context\n(not just chunks)',
-        xy=(ann_x, STAGE_Y - BOX_H / 2 - 0.12),
-        xytext=(ann_x, ann_y_box),
-        fontsize=14, fontweight='bold', color=YELLOW, ha='center',
-        arrowprops=dict(
-            arrowstyle='->', color=YELLOW, lw=2.2,
-            connectionstyle='arc3,rad=0.0',
-        ),
-        zorder=8,
-        bbox=dict(boxstyle='round,pad=0.35', facecolor=BG,
-                  edgecolor=YELLOW, linewidth=1.5),
-    )
-
-    # -----------------------------------------------------------------------
-    # Bottom subtitle
-    # -----------------------------------------------------------------------
-    ax.text(
-        8.50, 1.05,
-        'GraphRAG (Microsoft, 2024): builds a knowledge graph + community summaries '
-        'to enable global reasoning over large corpora.',
-        fontsize=13, color=MUTED, ha='center', va='center',
-        style='italic',
-        path_effects=[pe.withStroke(linewidth=2, foreground=BG)],
-    )
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.set_xlim(-0.5, 17.5)
+        ax.set_ylim(0.0, 8.5)
+        ax.set_aspect('equal')
+        ax.axis('off')
+
+        index = load_index()
+        levels = [int(l.max()) + 1 for l in index.levels]
+        sublabels = [
+            f'{index.n_documents:,} documents',
+            f'{len(index.entities):,} entities, {index.A.nnz // 2:,} links',
+            f'{len(levels)} levels: ' + ' > '.join(map(str, levels[::-1])),
+            STAGES[3][3],
+        ]
+
+        # -------------------------------------------------------------------
+        # Stage boxes
+        # -------------------------------------------------------------------
+        for (label, color, xc, _), sublabel in zip(STAGES, sublabels):
+            draw_stage_box(ax, xc, STAGE_Y, BOX_W, BOX_H, color, label,
+                           sublabel)
+
+        # -------------------------------------------------------------------
+        # Icons inside each stage box (centred, slightly above mid)
+        # -------------------------------------------------------------------
+        icon_y = STAGE_Y + 0.30
+        draw_documents_icon(ax,       STAGES[0][2], icon_y, STAGES[0][1])
+        panel_y = STAGE_Y - 0.05
+        draw_knowledge_graph_panel(ax, STAGES[1][2], panel_y, index)
+        draw_community_panel(ax,      STAGES[2][2], panel_y, index)
+        draw_llm_icon(ax,             STAGES[3][2], icon_y, STAGES[3][1])
+
+        # -------------------------------------------------------------------
+        # Arrows between stages
+        # -------------------------------------------------------------------
+        for i in range(len(STAGES) - 1):
+            x1 = STAGES[i][2]  + BOX_W / 2 + 0.10
+            x2 = STAGES[i + 1][2] - BOX_W / 2 - 0.10
+            clr = STAGES[i][1]
+            draw_arrow(ax, x1, x2, STAGE_Y, color=clr)
+
+        # -------------------------------------------------------------------
+        # Step labels above arrows
+        # -------------------------------------------------------------------
+        step_labels = ['1. Extract', '2. Cluster', '3. Query']
+        for i, slabel in enumerate(step_labels):
+            mx = (STAGES[i][2] + STAGES[i + 1][2]) / 2
+            ax.text(mx, STAGE_Y + BOX_H / 2 + 0.45, slabel,
+                    fontsize=13, color=MUTED, ha='center', va='center',
+                    style='italic',
+                    path_effects=[pe.withStroke(linewidth=2, foreground=BG)])
+
+        # -------------------------------------------------------------------
+        # Annotation: "Global context" at Community→LLM edge
+        # -------------------------------------------------------------------
+        ann_x = (STAGES[2][2] + STAGES[3][2]) / 2
+        ann_y_box = STAGE_Y - BOX_H / 2 - 1.0
+        ax.annotate(
+            'Global context\n(not just chunks)',
+            xy=(ann_x, STAGE_Y - BOX_H / 2 - 0.12),
+            xytext=(ann_x, ann_y_box),
+            fontsize=14, fontweight='bold', color=YELLOW, ha='center',
+            arrowprops=dict(
+                arrowstyle='->', color=YELLOW, lw=2.2,
+                connectionstyle='arc3,rad=0.0',
+            ),
+            zorder=8,
+            bbox=dict(boxstyle='round,pad=0.35', facecolor=BG,
+                      edgecolor=YELLOW, linewidth=1.5),
+        )
 
-    # -----------------------------------------------------------------------
-    # Title
-    # -----------------------------------------------------------------------
-    ax.set_title(
-        'GraphRAG — Graph-Enhanced Retrieval-Augmented Generation (Microsoft 2024)',
-        fontsize=28, fontweight='bold', color=TEXT, pad=22,
-    )
+        # -------------------------------------------------------------------
+        # Bottom subtitle
+        # -------------------------------------------------------------------
+        ax.text(
+            8.50, 1.05,
+            'GraphRAG (Microsoft, 2024): builds a knowledge graph + community summaries '
+            'to enable global reasoning over large corpora.',
+            fontsize=13, color=MUTED, ha='center', va='center',
+            style='italic',
+            path_effects=[pe.withStroke(linewidth=2, foreground=BG)],
+        )
 
-    # -----------------------------------------------------------------------
-    # Save
-    # -----------------------------------------------------------------------
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+        # -------------------------------------------------------------------
+        # Title
+        # -------------------------------------------------------------------
+        ax.set_title(
+            'GraphRAG — Graph-Enhanced Retrieval-Augmented Generation (Microsoft 2024)',
+            fontsize=28, fontweight='bold', color=TEXT, pad=22,
+        )
 
 
 if __name__ == '__main__':
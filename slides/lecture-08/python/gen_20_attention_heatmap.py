@@ -10,27 +10,16 @@ Output: ../images/20-attention-heatmap.png (3840x2160, 4K)
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 
+from theme import BG, YELLOW, BLUE, ORANGE, TEXT, MUTED, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '20-attention-heatmap.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG      = '#1b2631'
-YELLOW  = '#f1c40f'
-BLUE    = '#3498db'
-TEAL    = '#2ecc71'
-RED     = '#e74c3c'
-ORANGE  = '#e67e22'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
-
 # ---------------------------------------------------------------------------
 # Words and attention weights (reused from gen_12_attention.py)
 # ---------------------------------------------------------------------------
@@ -68,58 +57,49 @@ def build_matrix():
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-
-    mat = build_matrix()
-
-    # Custom colormap: dark bg -> blue -> yellow
-    cmap = LinearSegmentedColormap.from_list(
-        'attention', [BG, '#1a3a5c', BLUE, ORANGE, YELLOW], N=256
-    )
-
-    im = ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal')
-
-    # Axis labels
-    ax.set_xticks(range(N))
-    ax.set_xticklabels(WORDS, fontsize=24, fontweight='bold', color=TEXT)
-    ax.set_yticks(range(N))
-    ax.set_yticklabels(WORDS, fontsize=24, fontweight='bold', color=TEXT)
-    ax.tick_params(axis='both', length=0, pad=10)
-
-    # Move x-axis labels to top as well
-    ax.xaxis.set_ticks_position('both')
-    ax.xaxis.set_label_position('top')
-    ax.tick_params(axis='x', top=True, bottom=True, labeltop=True, labelbottom=True)
-
-    # Annotate cell values
-    for i in range(N):
-        for j in range(N):
-            val = mat[i, j]
-            txt_color = BG if val > 0.6 else TEXT
-            ax.text(j, i, f'{val:.2f}', ha='center', va='center',
-                    fontsize=23, fontweight='bold', color=txt_color)
-
-    # Colorbar
-    cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
-    cbar.set_label('Attention Weight', fontsize=23, color=TEXT, labelpad=12)
-    cbar.ax.tick_params(labelsize=23, colors=TEXT)
-
-    # Title
-    fig.suptitle('Attention Weights = Adjacency Matrix',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.95)
-
-    # Subtitle
-    ax.set_xlabel('"The cat sat on the mat" \u2014 each cell is an edge weight',
-                  fontsize=23, color=MUTED, labelpad=15)
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        mat = build_matrix()
+
+        # Custom colormap: dark bg -> blue -> yellow
+        cmap = LinearSegmentedColormap.from_list(
+            'attention', [BG, '#1a3a5c', BLUE, ORANGE, YELLOW], N=256
+        )
+
+        im = ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal')
+
+        # Axis labels
+        ax.set_xticks(range(N))
+        ax.set_xticklabels(WORDS, fontsize=24, fontweight='bold', color=TEXT)
+        ax.set_yticks(range(N))
+        ax.set_yticklabels(WORDS, fontsize=24, fontweight='bold', color=TEXT)
+        ax.tick_params(axis='both', length=0, pad=10)
+
+        # Move x-axis labels to top as well
+        ax.xaxis.set_ticks_position('both')
+        ax.xaxis.set_label_position('top')
+        ax.tick_params(axis='x', top=True, bottom=True, labeltop=True, labelbottom=True)
+
+        # Annotate cell values
+        for i in range(N):
+            for j in range(N):
+                val = mat[i, j]
+                txt_color = BG if val > 0.6 else TEXT
+                ax.text(j, i, f'{val:.2f}', ha='center', va='center',
+                        fontsize=23, fontweight='bold', color=txt_color)
+
+        # Colorbar
+        cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+        cbar.set_label('Attention Weight', fontsize=23, color=TEXT,
+                       labelpad=12)
+        cbar.ax.tick_params(labelsize=23, colors=TEXT)
+
+        # Title
+        fig.suptitle('Attention Weights = Adjacency Matrix',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.95)
+
+        # Subtitle
+        ax.set_xlabel('"The cat sat on the mat" \u2014 each cell is an edge weight',
+                      fontsize=23, color=MUTED, labelpad=15)
 
 
 if __name__ == '__main__':
@@ -16,6 +16,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 
+from theme import (BG, YELLOW, BLUE, RED, ORANGE, TEXT, MUTED, GREEN,
+                   slide_figure)
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -25,14 +28,7 @@ OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '21-multihead-attention.p
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
-BG      = '#1b2631'
-YELLOW  = '#f1c40f'
-BLUE    = '#3498db'
-TEAL    = '#2ecc71'
-RED     = '#e74c3c'
-ORANGE  = '#e67e22'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+TEAL    = GREEN       # this slide's accent is the theme green
 
 # ---------------------------------------------------------------------------
 # Data
@@ -96,54 +92,47 @@ def head_semantics():
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, axes = plt.subplots(1, 3, figsize=(19.2, 10.8), facecolor=BG)
-
-    cmap = LinearSegmentedColormap.from_list(
-        'attention', [BG, '#1a3a5c', BLUE, ORANGE, YELLOW], N=256
-    )
-
-    heads = [
-        ('Head 1: Position', head_position(), YELLOW),
-        ('Head 2: Syntax', head_syntax(), TEAL),
-        ('Head 3: Semantics', head_semantics(), RED),
-    ]
-
-    for ax, (title, mat, accent) in zip(axes, heads):
-        ax.set_facecolor(BG)
-        im = ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal')
-
-        ax.set_xticks(range(N))
-        ax.set_xticklabels(WORDS, fontsize=23, fontweight='bold', color=TEXT)
-        ax.set_yticks(range(N))
-        ax.set_yticklabels(WORDS, fontsize=23, fontweight='bold', color=TEXT)
-        ax.tick_params(axis='both', length=0, pad=6)
-
-        ax.set_title(title, fontsize=24, fontweight='bold', color=accent, pad=14)
-
-        # Annotate cells
-        for i in range(N):
-            for j in range(N):
-                val = mat[i, j]
-                txt_color = BG if val > 0.6 else TEXT
-                ax.text(j, i, f'{val:.1f}', ha='center', va='center',
-                        fontsize=23, fontweight='bold', color=txt_color)
-
-    fig.suptitle('Multi-Head Attention: H Heads = H Parallel Graphs',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.97)
-
-    fig.text(0.5, 0.02,
-             'Each head learns a different relationship pattern over the same tokens',
-             ha='center', fontsize=23, color=MUTED)
-
-    plt.tight_layout(rect=[0, 0.05, 1, 0.92])
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH, 1, 3) as (fig, axes):
+        cmap = LinearSegmentedColormap.from_list(
+            'attention', [BG, '#1a3a5c', BLUE, ORANGE, YELLOW], N=256
+        )
+
+        heads = [
+            ('Head 1: Position', head_position(), YELLOW),
+            ('Head 2: Syntax', head_syntax(), TEAL),
+            ('Head 3: Semantics', head_semantics(), RED),
+        ]
+
+        for ax, (title, mat, accent) in zip(axes, heads):
+            ax.set_facecolor(BG)
+            im = ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal')
+
+            ax.set_xticks(range(N))
+            ax.set_xticklabels(WORDS, fontsize=23, fontweight='bold',
+                               color=TEXT)
+            ax.set_yticks(range(N))
+            ax.set_yticklabels(WORDS, fontsize=23, fontweight='bold',
+                               color=TEXT)
+            ax.tick_params(axis='both', length=0, pad=6)
+
+            ax.set_title(title, fontsize=24, fontweight='bold', color=accent, pad=14)
+
+            # Annotate cells
+            for i in range(N):
+                for j in range(N):
+                    val = mat[i, j]
+                    txt_color = BG if val > 0.6 else TEXT
+                    ax.text(j, i, f'{val:.1f}', ha='center', va='center',
+                            fontsize=23, fontweight='bold', color=txt_color)
+
+        fig.suptitle('Multi-Head Attention: H Heads = H Parallel Graphs',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.97)
+
+        fig.text(0.5, 0.02,
+                 'Each head learns a different relationship pattern over the same tokens',
+                 ha='center', fontsize=23, color=MUTED)
+
+        plt.tight_layout(rect=[0, 0.05, 1, 0.92])
 
 
 if __name__ == '__main__':
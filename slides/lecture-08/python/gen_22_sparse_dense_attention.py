@@ -15,6 +15,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 
+from theme import BG, YELLOW, BLUE, ORANGE, TEXT, MUTED, GREEN, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -24,14 +26,7 @@ OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '22-sparse-dense-attentio
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
-BG      = '#1b2631'
-YELLOW  = '#f1c40f'
-BLUE    = '#3498db'
-TEAL    = '#2ecc71'
-RED     = '#e74c3c'
-ORANGE  = '#e67e22'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+TEAL    = GREEN       # this slide's accent is the theme green
 
 N = 16  # matrix dimension
 
@@ -64,56 +59,48 @@ def longformer(w=3):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, axes = plt.subplots(1, 3, figsize=(19.2, 10.8), facecolor=BG)
-
-    # Binary colormap: dark bg for 0, blue for 1
-    cmap = LinearSegmentedColormap.from_list('binary_blue', [BG, BLUE], N=2)
-
-    panels = [
-        ('Full Attention', full_attention(), YELLOW),
-        ('Sliding Window (w=3)', sliding_window(3), TEAL),
-        ('Longformer', longformer(3), ORANGE),
-    ]
-
-    for ax, (title, mat, accent) in zip(axes, panels):
-        ax.set_facecolor(BG)
-        ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal',
-                  interpolation='nearest')
-
-        edges = int(mat.sum())
-        total = N * N
-        pct = edges / total * 100
-
-        ax.set_title(title, fontsize=24, fontweight='bold', color=accent, pad=14)
-        ax.set_xlabel(f'{edges} edges ({pct:.0f}%)', fontsize=23,
-                      color=TEXT, labelpad=10)
-
-        # Tick styling
-        ax.set_xticks(range(0, N, 4))
-        ax.set_yticks(range(0, N, 4))
-        ax.tick_params(axis='both', colors=MUTED, labelsize=23, length=0)
-
-        # Subtle grid
-        for k in range(N + 1):
-            ax.axhline(k - 0.5, color=MUTED, lw=0.3, alpha=0.3)
-            ax.axvline(k - 0.5, color=MUTED, lw=0.3, alpha=0.3)
-
-    fig.suptitle('Sparse Attention = Sparse Graph',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.97)
-
-    fig.text(0.5, 0.02,
-             'Reducing edges from O(n\u00b2) to O(n) cuts compute while preserving key connections',
-             ha='center', fontsize=23, color=MUTED)
-
-    plt.tight_layout(rect=[0, 0.05, 1, 0.92])
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH, 1, 3) as (fig, axes):
+        # Binary colormap: dark bg for 0, blue for 1
+        cmap = LinearSegmentedColormap.from_list('binary_blue', [BG, BLUE],
+                                                 N=2)
+
+        panels = [
+            ('Full Attention', full_attention(), YELLOW),
+            ('Sliding Window (w=3)', sliding_window(3), TEAL),
+            ('Longformer', longformer(3), ORANGE),
+        ]
+
+        for ax, (title, mat, accent) in zip(axes, panels):
+            ax.set_facecolor(BG)
+            ax.imshow(mat, cmap=cmap, vmin=0, vmax=1, aspect='equal',
+                      interpolation='nearest')
+
+            edges = int(mat.sum())
+            total = N * N
+            pct = edges / total * 100
+
+            ax.set_title(title, fontsize=24, fontweight='bold', color=accent, pad=14)
+            ax.set_xlabel(f'{edges} edges ({pct:.0f}%)', fontsize=23,
+                          color=TEXT, labelpad=10)
+
+            # Tick styling
+            ax.set_xticks(range(0, N, 4))
+            ax.set_yticks(range(0, N, 4))
+            ax.tick_params(axis='both', colors=MUTED, labelsize=23, length=0)
+
+            # Subtle grid
+            for k in range(N + 1):
+                ax.axhline(k - 0.5, color=MUTED, lw=0.3, alpha=0.3)
+                ax.axvline(k - 0.5, color=MUTED, lw=0.3, alpha=0.3)
+
+        fig.suptitle('Sparse Attention = Sparse Graph',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.97)
+
+        fig.text(0.5, 0.02,
+                 'Reducing edges from O(n\u00b2) to O(n) cuts compute while preserving key connections',
+                 ha='center', fontsize=23, color=MUTED)
+
+        plt.tight_layout(rect=[0, 0.05, 1, 0.92])
 
 
 if __name__ == '__main__':
@@ -14,6 +14,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.special import expit
 
+from theme import YELLOW, BLUE, RED, TEXT, MUTED, GREEN, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -23,14 +25,7 @@ OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '24-emergence-phase-trans
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
-BG      = '#1b2631'
-YELLOW  = '#f1c40f'
-BLUE    = '#3498db'
-TEAL    = '#2ecc71'
-RED     = '#e74c3c'
-ORANGE  = '#e67e22'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+TEAL    = GREEN       # this slide's accent is the theme green
 
 
 def draw_llm_panel(ax):
@@ -108,29 +103,18 @@ def draw_er_panel(ax):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-    plt.style.use('dark_background')
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(19.2, 10.8), facecolor=BG)
-    ax1.set_facecolor(BG)
-    ax2.set_facecolor(BG)
-
-    draw_llm_panel(ax1)
-    draw_er_panel(ax2)
-
-    fig.suptitle('Same Math, Different Systems',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.97)
+    with slide_figure(OUTPUT_PATH, 1, 2) as (fig, (ax1, ax2)):
+        draw_llm_panel(ax1)
+        draw_er_panel(ax2)
 
-    fig.text(0.5, 0.02,
-             'Phase transitions explain why abilities "suddenly" appear at scale',
-             ha='center', fontsize=23, color=MUTED)
+        fig.suptitle('Same Math, Different Systems',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.97)
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.92])
+        fig.text(0.5, 0.02,
+                 'Phase transitions explain why abilities "suddenly" appear at scale',
+                 ha='center', fontsize=23, color=MUTED)
 
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+        plt.tight_layout(rect=[0, 0.05, 1, 0.92])
 
 
 if __name__ == '__main__':
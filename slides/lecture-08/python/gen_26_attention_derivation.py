@@ -12,27 +12,16 @@ Output: ../images/26-attention-derivation.png (3840x2160, 4K)
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 
+from theme import BG, YELLOW, BLUE, ORANGE, TEXT, MUTED, slide_figure
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '26-attention-derivation.png')
 
-# ---------------------------------------------------------------------------
-# Palette
-# ---------------------------------------------------------------------------
-BG      = '#1b2631'
-YELLOW  = '#f1c40f'
-BLUE    = '#3498db'
-TEAL    = '#2ecc71'
-RED     = '#e74c3c'
-ORANGE  = '#e67e22'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
-
 # Custom colourmap: dark bg -> blue -> yellow
 CMAP = LinearSegmentedColormap.from_list(
     'attn', [BG, '#1a3a5c', BLUE, ORANGE, YELLOW], N=256)
@@ -114,8 +103,6 @@ def draw_matrix(ax, mat, title, formula, row_labels=None, col_labels=None,
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
     # Compute all intermediate matrices
     Q = X @ W_Q
     K = X @ W_K
@@ -127,75 +114,69 @@ def main():
     A = softmax_rows(S_scaled)          # attention weights
     Out = A @ V                         # final output
 
-    plt.style.use('dark_background')
-    fig, axes = plt.subplots(2, 3, figsize=(19.2, 10.8), facecolor=BG)
-    fig.subplots_adjust(hspace=0.55, wspace=0.35, top=0.86, bottom=0.06,
-                        left=0.06, right=0.96)
-
-    dim_labels = ['d1', 'd2', 'd3']
-
-    # Panel 1: Input X (4x3)
-    draw_matrix(axes[0, 0], X,
-                title='1. Input X',
-                formula='$X \\in \\mathbb{R}^{4 \\times 3}$',
-                row_labels=TOKENS, col_labels=dim_labels,
-                fmt='.0f')
-
-    # Panel 2: Q projection (show Q; mention K, V)
-    draw_matrix(axes[0, 1], Q,
-                title='2. Q = X W_Q',
-                formula='$Q, K, V = X W_Q,\\; X W_K,\\; X W_V$',
-                row_labels=TOKENS, col_labels=dim_labels,
-                fmt='.0f')
-
-    # Panel 3: Score matrix S = QK^T (4x4)
-    draw_matrix(axes[0, 2], S,
-                title='3. Scores  S = QK$^T$',
-                formula='$S_{ij} = q_i \\cdot k_j$',
-                row_labels=TOKENS, col_labels=TOKENS,
-                fmt='.0f')
-
-    # Panel 4: After scaling
-    draw_matrix(axes[1, 0], S_scaled,
-                title=f'4. Scale by $\\sqrt{{d_k}}={np.sqrt(d_k):.2f}$',
-                formula='$S / \\sqrt{d_k}$',
-                row_labels=TOKENS, col_labels=TOKENS,
-                fmt='.1f')
-
-    # Panel 5: After softmax (probabilities)
-    draw_matrix(axes[1, 1], A,
-                title='5. Softmax (row-wise)',
-                formula='$A = \\mathrm{softmax}(S / \\sqrt{d_k})$',
-                row_labels=TOKENS, col_labels=TOKENS,
-                fmt='.2f', vmin=0, vmax=1)
-
-    # Panel 6: Output
-    draw_matrix(axes[1, 2], Out,
-                title='6. Output = A V',
-                formula='$\\mathrm{Attention}(Q,K,V) = A \\, V$',
-                row_labels=TOKENS, col_labels=dim_labels,
-                fmt='.1f')
-
-    # Suptitle
-    fig.suptitle('Attention: Step by Step',
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.97)
-
-    # Flow arrows between panels (figure-level text)
-    for col in range(2):
-        x = 0.06 + (col + 1) * (0.90 / 3) + 0.01
-        for row in range(2):
-            y = 0.86 - row * 0.44 - 0.04
-            fig.text(x, y, '\u2192', fontsize=28, color=YELLOW,
-                     ha='center', va='center', fontweight='bold')
-
-    # Arrow from row 0 col 2 down to row 1 col 0
-    fig.text(0.50, 0.46, '\u2193', fontsize=28, color=YELLOW,
-             ha='center', va='center', fontweight='bold')
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH, 2, 3) as (fig, axes):
+        fig.subplots_adjust(hspace=0.55, wspace=0.35, top=0.86, bottom=0.06,
+                            left=0.06, right=0.96)
+
+        dim_labels = ['d1', 'd2', 'd3']
+
+        # Panel 1: Input X (4x3)
+        draw_matrix(axes[0, 0], X,
+                    title='1. Input X',
+                    formula='$X \\in \\mathbb{R}^{4 \\times 3}$',
+                    row_labels=TOKENS, col_labels=dim_labels,
+                    fmt='.0f')
+
+        # Panel 2: Q projection (show Q; mention K, V)
+        draw_matrix(axes[0, 1], Q,
+                    title='2. Q = X W_Q',
+                    formula='$Q, K, V = X W_Q,\\; X W_K,\\; X W_V$',
+                    row_labels=TOKENS, col_labels=dim_labels,
+                    fmt='.0f')
+
+        # Panel 3: Score matrix S = QK^T (4x4)
+        draw_matrix(axes[0, 2], S,
+                    title='3. Scores  S = QK$^T$',
+                    formula='$S_{ij} = q_i \\cdot k_j$',
+                    row_labels=TOKENS, col_labels=TOKENS,
+                    fmt='.0f')
+
+        # Panel 4: After scaling
+        draw_matrix(axes[1, 0], S_scaled,
+                    title=f'4. Scale by $\\sqrt{{d_k}}={np.sqrt(d_k):.2f}$',
+                    formula='$S / \\sqrt{d_k}$',
+                    row_labels=TOKENS, col_labels=TOKENS,
+                    fmt='.1f')
+
+        # Panel 5: After softmax (probabilities)
+        draw_matrix(axes[1, 1], A,
+                    title='5. Softmax (row-wise)',
+                    formula='$A = \\mathrm{softmax}(S / \\sqrt{d_k})$',
+                    row_labels=TOKENS, col_labels=TOKENS,
+                    fmt='.2f', vmin=0, vmax=1)
+
+        # Panel 6: Output
+        draw_matrix(axes[1, 2], Out,
+                    title='6. Output = A V',
+                    formula='$\\mathrm{Attention}(Q,K,V) = A \\, V$',
+                    row_labels=TOKENS, col_labels=dim_labels,
+                    fmt='.1f')
+
+        # Suptitle
+        fig.suptitle('Attention: Step by Step',
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.97)
+
+        # Flow arrows between panels (figure-level text)
+        for col in range(2):
+            x = 0.06 + (col + 1) * (0.90 / 3) + 0.01
+            for row in range(2):
+                y = 0.86 - row * 0.44 - 0.04
+                fig.text(x, y, '\u2192', fontsize=28, color=YELLOW,
+                         ha='center', va='center', fontweight='bold')
+
+        # Arrow from row 0 col 2 down to row 1 col 0
+        fig.text(0.50, 0.46, '\u2193', fontsize=28, color=YELLOW,
+                 ha='center', va='center', fontweight='bold')
 
 
 if __name__ == '__main__':
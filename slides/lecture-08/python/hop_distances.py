@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+hop_distances.py
+All-pairs hop-distance distribution via bit-parallel multi-source BFS.
+
+Each node carries one uint64 word per batch of up to 64 BFS sources; bit j
+is set once source j has reached the node. One BFS level for all 64
+sources is then a single gather + bitwise-OR reduction over the CSR
+adjacency, so the full distribution of shortest-path lengths on a 10^5
+node graph needs n/64 sweeps rather than n separate searches.
+
+Memory per batch is O(n + nnz) words regardless of how many sources are
+processed, and batches are independent so they are spread over a process
+pool. Passing `n_sources` samples that many sources instead of all n,
+which gives an unbiased estimate of the distribution for very large
+graphs.
+
+Usage:
+    from hop_distances import hop_distance_distribution
+    result = hop_distance_distribution(A, labels=community_of_node)
+    result['histogram'], result['effective_diameter'], result['mean_distance']
+
+    python hop_distances.py   # timing demo on a 100k-node block model
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+WORD_BITS = 64
+
+# Per-process graph, set once by _init_worker so batches do not re-pickle it
+_GRAPH = {}
+
+
+def _popcount(words):
+    """Number of set bits in each uint64 word."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.int64)
+    as_bytes = words.view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def _init_worker(indptr, indices, labels, n_labels):
+    _GRAPH['indptr'] = indptr
+    _GRAPH['indices'] = indices
+    _GRAPH['labels'] = labels
+    _GRAPH['n_labels'] = n_labels
+    # Rows with no in-neighbours must be skipped by reduceat
+    has_nbrs = np.diff(indptr) > 0
+    _GRAPH['has_nbrs'] = has_nbrs
+    _GRAPH['starts'] = indptr[:-1][has_nbrs]
+
+
+def _bfs_batch(sources):
+    """Run up to 64 simultaneous BFS searches from `sources`.
+
+    Returns (hist, dist_sum, pair_count) where hist[d] counts (source,
+    target) pairs at distance d >= 1, and the two n_labels x n_labels
+    matrices accumulate distances between reachable community pairs.
+    """
+    indices = _GRAPH['indices']
+    labels = _GRAPH['labels']
+    n_labels = _GRAPH['n_labels']
+    has_nbrs = _GRAPH['has_nbrs']
+    starts = _GRAPH['starts']
+    n = len(_GRAPH['indptr']) - 1
+    k = len(sources)
+
+    bits = np.left_shift(np.uint64(1), np.arange(k, dtype=np.uint64))
+    visited = np.zeros(n, dtype=np.uint64)
+    np.bitwise_or.at(visited, sources, bits)
+    frontier = visited.copy()
+
+    hist = [0]
+    dist_sum = pair_count = None
+    if labels is not None:
+        dist_sum = np.zeros((n_labels, n_labels))
+        pair_count = np.zeros((n_labels, n_labels), dtype=np.int64)
+        src_onehot = np.zeros((n_labels, k))
+        src_onehot[labels[sources], np.arange(k)] = 1.0
+
+    reached = np.zeros(n, dtype=np.uint64)
+    depth = 0
+    while True:
+        depth += 1
+        reached[:] = 0
+        if starts.size:
+            reached[has_nbrs] = np.bitwise_or.reduceat(frontier[indices],
+                                                       starts)
+        new = reached & ~visited
+        active = np.flatnonzero(new)
+        if active.size == 0:
+            break
+        visited |= new
+        frontier = new
+        hist.append(int(_popcount(new[active]).sum()))
+
+        if labels is not None:
+            # counts[c, j] = nodes of community c first reached by source j
+            unpacked = np.unpackbits(new[active].view(np.uint8).reshape(-1, 8),
+                                     axis=1, bitorder='little')[:, :k]
+            m = active.size
+            onehot = sp.csr_matrix(
+                (np.ones(m), (labels[active], np.arange(m))),
+                shape=(n_labels, m))
+            counts = onehot @ unpacked.astype(np.float64)
+            pairs = src_onehot @ counts.T
+            dist_sum += depth * pairs
+            pair_count += pairs.astype(np.int64)
+
+    return np.array(hist, dtype=np.int64), dist_sum, pair_count
+
+
+def effective_diameter(histogram, q=0.9):
+    """Interpolated q-quantile of the hop-distance distribution.
+
+    Following Leskovec et al., the effective diameter is the smallest d
+    (linearly interpolated between integers) such that a fraction q of all
+    connected pairs lie within d hops.
+    """
+    histogram = np.asarray(histogram, dtype=np.float64)
+    total = histogram.sum()
+    if total == 0:
+        return 0.0
+    cdf = np.cumsum(histogram) / total
+    d = int(np.searchsorted(cdf, q))
+    prev = cdf[d - 1] if d > 0 else 0.0
+    if cdf[d] == prev:
+        return float(d)
+    return (d - 1) + (q - prev) / (cdf[d] - prev)
+
+
+def hop_distance_distribution(A, labels=None, n_sources=None, workers=None,
+                              seed=0):
+    """Distribution of shortest-path hop counts over all connected pairs.
+
+    A          : (n x n) scipy sparse adjacency; A[u, v] != 0 for u -> v.
+                 Undirected graphs should be passed symmetric.
+    labels     : optional int array of community ids per node; enables the
+                 per-community mean-distance matrix.
+    n_sources  : sample this many BFS sources instead of all n.
+    workers    : process count (default: os.cpu_count(); 1 runs inline).
+
+    Returns a dict with
+        histogram           hist[d] = #ordered (s, t) pairs at distance d
+        effective_diameter  interpolated 90th percentile of the distances
+        mean_distance       average over connected pairs
+        n_sources           number of BFS sources actually used
+        community_distance  mean distance between communities (or None)
+        community_pairs     connected pair counts per community pair
+    """
+    # Pull-style BFS needs each node's in-neighbours: rows of A^T
+    AT = sp.csr_matrix(A, copy=False).T.tocsr()
+    AT.sort_indices()
+    n = AT.shape[0]
+    indptr = AT.indptr.astype(np.int64)
+    indices = AT.indices.astype(np.int64)
+
+    n_labels = 0
+    if labels is not None:
+        labels = np.asarray(labels, dtype=np.int64)
+        n_labels = int(labels.max()) + 1
+
+    if n_sources is None or n_sources >= n:
+        sources = np.arange(n, dtype=np.int64)
+    else:
+        rng = np.random.default_rng(seed)
+        sources = np.sort(rng.choice(n, size=n_sources, replace=False))
+    batches = [sources[i:i + WORD_BITS]
+               for i in range(0, len(sources), WORD_BITS)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(batches)))
+
+    init_args = (indptr, indices, labels, n_labels)
+    if workers == 1:
+        _init_worker(*init_args)
+        results = [_bfs_batch(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            results = list(pool.map(_bfs_batch, batches,
+                                    chunksize=max(1, len(batches) //
+                                                  (4 * workers))))
+
+    max_len = max(len(h) for h, _, _ in results)
+    histogram = np.zeros(max_len, dtype=np.int64)
+    dist_sum = pair_count = None
+    if labels is not None:
+        dist_sum = np.zeros((n_labels, n_labels))
+        pair_count = np.zeros((n_labels, n_labels), dtype=np.int64)
+    for hist, ds, pc in results:
+        histogram[:len(hist)] += hist
+        if labels is not None:
+            dist_sum += ds
+            pair_count += pc
+
+    connected = histogram.sum()
+    mean_distance = (float(np.arange(max_len) @ histogram) / connected
+                     if connected else 0.0)
+    community_distance = None
+    if labels is not None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            community_distance = np.where(pair_count > 0,
+                                          dist_sum / pair_count, np.nan)
+
+    return {
+        'histogram': histogram,
+        'effective_diameter': effective_diameter(histogram),
+        'mean_distance': mean_distance,
+        'n_sources': len(sources),
+        'community_distance': community_distance,
+        'community_pairs': pair_count,
+    }
+
+
+def _demo():
+    """Time the engine on a 100k-node, 4-community block model."""
+    import csr_graph
+
+    rng = np.random.default_rng(42)
+    n, n_comm, avg_deg, p_out = 100_000, 4, 10, 0.05
+    labels = rng.integers(0, n_comm, size=n)
+    m = n * avg_deg // 2
+    src = rng.integers(0, n, size=m)
+    # Most edges stay inside the source's community
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(n_comm + 1))
+    same = rng.random(m) > p_out
+    c = labels[src]
+    pick = bounds[c] + (rng.random(m) * (bounds[c + 1] - bounds[c])).astype(
+        np.int64)
+    dst = np.where(same, order[pick], rng.integers(0, n, size=m))
+    A = csr_graph.from_edges(src, dst, n=n, symmetric=True)
+
+    t0 = time.perf_counter()
+    res = hop_distance_distribution(A, labels=labels, n_sources=4096)
+    dt = time.perf_counter() - t0
+    print(f'{n:,} nodes, {A.nnz // 2:,} edges, '
+          f'{res["n_sources"]:,} sources in {dt:.2f} s')
+    print(f'histogram: {res["histogram"].tolist()}')
+    print(f'mean distance {res["mean_distance"]:.3f}, '
+          f'effective diameter {res["effective_diameter"]:.3f}')
+    print('community distance matrix:')
+    print(np.round(res['community_distance'], 3))
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+kleinberg_routing.py
+Greedy decentralized routing on Kleinberg's small-world lattice.
+
+Nodes sit on an L x L grid (no wrap-around) with lattice distance
+d(u, v) = |dx| + |dy|. Each node links to its four grid neighbours plus
+`q` long-range contacts v chosen with probability proportional to
+d(u, v)^-r. A message only knows the target's coordinates and at every
+step moves to whichever contact of its current holder is closest to the
+target -- the strategy Milgram's letter senders used.
+
+Kleinberg (2000) showed that only r = 2 lets this local rule find paths
+of length O(log^2 n); for other exponents the expected delivery time
+grows polynomially. `delivery_lengths` reproduces that by routing a batch
+of messages in lockstep: each step is one (B, 4 + q) candidate array and
+an argmin, so hundreds of thousands of source-target pairs take seconds.
+
+Usage:
+    from kleinberg_routing import build_lattice, route
+    contacts = build_lattice(L=200, r=2.0)
+    result = route(contacts, L=200, sources, targets, record=1)
+    result['lengths'], result['paths'][0]
+
+    python kleinberg_routing.py   # delivery length vs r on a 300 x 300 grid
+"""
+
+import time
+
+import numpy as np
+
+# Grid steps to the four lattice neighbours
+_LATTICE_STEPS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)])
+
+
+def _sample_offsets(k, r, max_d, rng):
+    """Draw k offsets (dx, dy) with P(offset) proportional to d^-r.
+
+    On the infinite lattice there are 4d points at distance d, so d is
+    drawn with weight d^(1 - r) and the point is uniform on that ring.
+    """
+    d = np.arange(1, max_d + 1)
+    weights = d ** (1.0 - r)
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    dist = np.searchsorted(cdf, rng.random(k), side='right') + 1
+    # Position along the ring of 4d points: walk the diamond's four sides
+    t = (rng.random(k) * 4 * dist).astype(np.int64)
+    side, step = np.divmod(t, dist)
+    dx = np.select([side == 0, side == 1, side == 2],
+                   [dist - step, -step, -dist + step], default=step)
+    dy = np.select([side == 0, side == 1, side == 2],
+                   [step, dist - step, -step], default=-dist + step)
+    return dx, dy
+
+
+def build_lattice(L, r=2.0, q=1, seed=0):
+    """Long-range contacts for every node of an L x L grid.
+
+    Returns an (L*L, q) int array; node id = x * L + y. Offsets that land
+    off the grid are redrawn, which restricts the d^-r law to the grid.
+    """
+    rng = np.random.default_rng(seed)
+    n = L * L
+    x, y = np.divmod(np.repeat(np.arange(n), q), L)
+    cx = np.empty_like(x)
+    cy = np.empty_like(y)
+    todo = np.arange(n * q)
+    while todo.size:
+        dx, dy = _sample_offsets(todo.size, r, 2 * (L - 1), rng)
+        nx_, ny_ = x[todo] + dx, y[todo] + dy
+        ok = (nx_ >= 0) & (nx_ < L) & (ny_ >= 0) & (ny_ < L)
+        cx[todo[ok]] = nx_[ok]
+        cy[todo[ok]] = ny_[ok]
+        todo = todo[~ok]
+    return (cx * L + cy).reshape(n, q)
+
+
+def route(contacts, L, sources, targets, max_steps=None, record=0):
+    """Greedily route messages from `sources` to `targets` in lockstep.
+
+    Returns a dict with 'lengths' (hops per message, -1 if not delivered
+    within max_steps) and 'paths', a list of node-id lists for the first
+    `record` messages.
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if max_steps is None:
+        max_steps = 2 * L
+    tx, ty = np.divmod(targets, L)
+    current = sources.copy()
+    lengths = np.full(len(sources), -1, dtype=np.int64)
+    lengths[current == targets] = 0
+    active = np.flatnonzero(current != targets)
+    paths = [[int(s)] for s in sources[:record]]
+
+    for step in range(1, max_steps + 1):
+        if active.size == 0:
+            break
+        cur = current[active]
+        x, y = np.divmod(cur, L)
+        # Candidates: 4 grid neighbours (clipped to the grid) + long links
+        gx = np.clip(x[:, None] + _LATTICE_STEPS[:, 0], 0, L - 1)
+        gy = np.clip(y[:, None] + _LATTICE_STEPS[:, 1], 0, L - 1)
+        cand = np.hstack([gx * L + gy, contacts[cur]])
+        cx, cy = np.divmod(cand, L)
+        dist = (np.abs(cx - tx[active, None]) +
+                np.abs(cy - ty[active, None]))
+        best = cand[np.arange(len(cand)), np.argmin(dist, axis=1)]
+        current[active] = best
+
+        for i in active[active < record]:
+            paths[i].append(int(current[i]))
+        arrived = best == targets[active]
+        lengths[active[arrived]] = step
+        active = active[~arrived]
+
+    return {'lengths': lengths, 'paths': paths}
+
+
+def delivery_lengths(L, r, n_pairs, q=1, seed=0):
+    """Hop counts for n_pairs random source-target pairs at exponent r."""
+    contacts = build_lattice(L, r=r, q=q, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    n = L * L
+    sources = rng.integers(0, n, size=n_pairs)
+    targets = rng.integers(0, n, size=n_pairs)
+    return route(contacts, L, sources, targets)['lengths']
+
+
+def sweep(L, exponents, n_pairs, q=1, seed=0):
+    """Delivery-length distribution for each exponent r.
+
+    Returns {r: lengths array}; undelivered messages (-1) are dropped.
+    """
+    out = {}
+    for r in exponents:
+        lengths = delivery_lengths(L, r, n_pairs, q=q, seed=seed)
+        out[r] = lengths[lengths >= 0]
+    return out
+
+
+def _demo(L=300, n_pairs=200_000):
+    exponents = [0.0, 1.0, 1.5, 2.0, 2.5, 3.0]
+    t0 = time.perf_counter()
+    results = sweep(L, exponents, n_pairs)
+    dt = time.perf_counter() - t0
+    print(f'{L} x {L} grid, {n_pairs:,} pairs per exponent, '
+          f'{len(exponents)} exponents in {dt:.1f} s')
+    for r, lengths in results.items():
+        print(f'  r = {r:.1f}: mean {lengths.mean():6.2f} hops, '
+              f'median {np.median(lengths):5.1f}, '
+              f'95th pct {np.percentile(lengths, 95):5.1f}')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+label_layout.py
+Overlap-free label lanes for timelines: measure once, sweep, place.
+
+Every milestone has an anchor x on the timeline and a label block of
+measured width and height. Labels go into horizontal lanes above and
+below the line (lane 0 nearest the line) and are joined to their anchor
+by a leader. A placement is legal when
+
+    - the label does not overlap a label already in its lane,
+    - no leader of a label further out passes through it, and
+    - its own leader does not pass through a label in a nearer lane.
+
+Labels are swept left to right by anchor. Each lane keeps its label
+boxes and the leader crossings through it as sorted interval lists, so
+a legality check is a bisection per lane: about O(n L^2 log n) for n
+labels over L lanes. A label is tried centred on its anchor, beside
+the anchor, and flush against each neighbour in the lane. A label
+beside its anchor gets a slanted leader to its nearest corner, and that
+leader is checked against every nearer lane it passes through. The
+cheapest legal candidate wins:
+
+    - sideways shifts and leader slant cost their length,
+    - lanes cost their distance from a target lane, which is 0 for an
+      isolated label and further out when the next anchors fall under
+      the label (their leaders need nearer lanes), so a dense cluster
+      steps down towards the line instead of piling up behind its
+      first label.
+
+The sweep also runs mirrored, right to left, and the pass with fewer
+unplaceable labels (then the lower total cost) is kept: a crowded right
+edge is resolved as well as a crowded left one.
+
+Text is measured through the figure's renderer once per distinct
+(string, style), from font metrics for plain single lines, and converted
+to data units. For 300 milestones, measuring takes about 0.2 s and the
+layout (both passes) about 0.1 s.
+
+Usage:
+    from label_layout import TextMeasure, layout_labels
+    measure = TextMeasure(ax)
+    w, h = measure.block([('1948', year_style), ('Shannon', name_style)])
+    lay = layout_labels(xs, widths, heights, y0=48, offset=5,
+                        x_min=1, x_max=99)
+    lay.left, lay.bottom, lay.side, lay.leaders()
+
+    python label_layout.py   # lay out 300 random milestones, check overlaps
+"""
+
+import bisect
+import csv
+import json
+import time
+
+import numpy as np
+from matplotlib.font_manager import FontProperties
+from matplotlib.text import Text
+
+SIDES = {'above': 1, 'below': -1}
+
+
+# ---------------------------------------------------------------------------
+# Measuring text
+# ---------------------------------------------------------------------------
+class TextMeasure:
+    """Text extents in data units of ax, cached per (text, style).
+
+    Assumes linear axis scales; call after the axes limits are final.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.fig = ax.figure
+        self.renderer = self.fig.canvas.get_renderer()
+        (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+        bbox = ax.get_window_extent(self.renderer)
+        self.sx = (x1 - x0) / bbox.width
+        self.sy = (y1 - y0) / bbox.height
+        self._cache = {}
+        self._fonts = {}
+
+    def extent(self, text, **style):
+        """(width, height) of one text artist with the given style."""
+        style_key = tuple(sorted(style.items()))
+        hit = self._cache.get((text, style_key))
+        if hit is None:
+            if '\n' in text or '$' in text:
+                t = Text(0, 0, text, **style)
+                t.set_figure(self.fig)
+                bb = t.get_window_extent(self.renderer)
+                w, h = bb.width, bb.height
+            else:                   # one plain line: straight font metrics
+                prop, h = self._font(style_key)
+                w, _, _ = self.renderer.get_text_width_height_descent(
+                    text, prop, ismath=False)
+            hit = self._cache[(text, style_key)] = (w * self.sx, h * self.sy)
+        return hit
+
+    def _font(self, style_key):
+        """FontProperties and line height for a style, built once."""
+        hit = self._fonts.get(style_key)
+        if hit is None:
+            style = dict(style_key)
+            prop = FontProperties(
+                family=style.get('family', style.get('fontfamily')),
+                style=style.get('fontstyle', style.get('style')),
+                weight=style.get('fontweight', style.get('weight')),
+                size=style.get('fontsize', style.get('size')))
+            _, h, _ = self.renderer.get_text_width_height_descent(
+                'lp', prop, ismath=False)
+            hit = self._fonts[style_key] = (prop, h)
+        return hit
+
+    def block(self, lines, gap=0.0):
+        """(width, height) of lines of (text, style) stacked with gap."""
+        sizes = [self.extent(text, **style) for text, style in lines]
+        return (max(w for w, _ in sizes),
+                sum(h for _, h in sizes) + gap * (len(sizes) - 1))
+
+    def stack(self, lines, gap=0.0):
+        """Bottom offsets of each line within its block, first line on
+        top: draw line k with va='bottom' at block_bottom + offsets[k]."""
+        heights = [self.extent(text, **style)[1] for text, style in lines]
+        offsets, y = [], 0.0
+        for h in reversed(heights):
+            offsets.append(y)
+            y += h + gap
+        return offsets[::-1]
+
+
+# ---------------------------------------------------------------------------
+# Lane assignment
+# ---------------------------------------------------------------------------
+class _Lane:
+    """Label boxes and leader crossings in one lane, as sorted intervals.
+
+    Boxes in a lane never overlap, so sorted by left they are sorted by
+    right too and an overlap query is one bisection. Leader crossings
+    may overlap each other; they are short, so a query bisects to the
+    first crossing that could reach the range and scans forward.
+    """
+
+    def __init__(self):
+        self.lefts, self.rights = [], []
+        self.cross_lo, self.cross_hi = [], []
+        self.cross_len = 0.0
+
+    def boxes_free(self, lo, hi):
+        """No box overlaps (lo, hi); touching is allowed."""
+        j = bisect.bisect_right(self.rights, lo)
+        return j == len(self.lefts) or self.lefts[j] >= hi
+
+    def leaders_free(self, lo, hi):
+        """No leader crosses (lo, hi); touching is allowed."""
+        j = bisect.bisect_left(self.cross_lo, lo - self.cross_len)
+        while j < len(self.cross_lo) and self.cross_lo[j] < hi:
+            if self.cross_hi[j] > lo:
+                return False
+            j += 1
+        return True
+
+    def near(self, lo, hi):
+        """Edges of boxes and crossings intersecting [lo, hi]."""
+        j = bisect.bisect_left(self.rights, lo)
+        while j < len(self.lefts) and self.lefts[j] <= hi:
+            yield self.lefts[j], self.rights[j]
+            j += 1
+        j = bisect.bisect_left(self.cross_lo, lo - self.cross_len)
+        while j < len(self.cross_lo) and self.cross_lo[j] <= hi:
+            yield self.cross_lo[j], self.cross_hi[j]
+            j += 1
+
+    def add_box(self, lo, hi):
+        j = bisect.bisect_left(self.lefts, lo)
+        self.lefts.insert(j, lo)
+        self.rights.insert(j, hi)
+
+    def add_crossing(self, lo, hi):
+        j = bisect.bisect_left(self.cross_lo, lo)
+        self.cross_lo.insert(j, lo)
+        self.cross_hi.insert(j, hi)
+        self.cross_len = max(self.cross_len, hi - lo)
+
+
+class LabelLayout:
+    """Placed labels: lane, side, box and leader geometry per label."""
+
+    def __init__(self, anchor, left, width, height, side, lane, bottom,
+                 y0, overlaps):
+        self.anchor = anchor          # (n,) anchor x on the timeline
+        self.left = left              # (n,) label box left edge
+        self.right = left + width
+        self.center = left + width / 2
+        self.width = width
+        self.height = height
+        self.side = side              # (n,) +1 above the line, -1 below
+        self.lane = lane              # (n,) 0 = nearest the line
+        self.bottom = bottom          # (n,) label box bottom edge
+        self.top = bottom + height
+        self.y0 = y0
+        self.overlaps = overlaps      # (n,) True where no legal lane fitted
+
+    def near_edge(self):
+        """y of each label's edge facing the timeline."""
+        return np.where(self.side > 0, self.bottom, self.top)
+
+    def leaders(self, clearance=0.0, inset=0.0):
+        """(n, 2, 2) leader segments from the line to each label.
+
+        A leader starts clearance away from the line at the anchor and
+        ends on the label's near edge: straight above or below the
+        anchor when the label covers it, else at the nearest corner
+        (moved inset towards the middle).
+        """
+        y_start = self.y0 + self.side * clearance
+        x_end = np.clip(self.anchor, self.left + inset, self.right - inset)
+        return np.stack([np.stack([self.anchor, y_start], -1),
+                         np.stack([x_end, self.near_edge()], -1)], 1)
+
+
+def _sweep(x, widths, x_min, x_max, signs, n_lanes, pitch, offset, pad,
+           shift_cap, alternate):
+    """One left-to-right pass; returns left, side, lane, overlaps, cost."""
+    n = len(x)
+    lanes = {s: [_Lane() for _ in range(n_lanes)] for s in signs}
+
+    # Anchors that will fall under each label's right half need nearer
+    # lanes for their leaders, so a label with q of them aims q / sides
+    # lanes out and a dense cluster steps down towards the line.
+    order = np.argsort(x, kind='stable')
+    xs = x[order]
+    ahead = (np.searchsorted(xs, xs + widths[order] / 2 + pad, 'right') -
+             np.arange(n) - 1)
+    target = np.minimum(np.ceil(ahead / len(signs)), n_lanes - 1)
+
+    def crossings(a, x_end, k):
+        """x-extent of the leader a -> x_end inside each lane j < k."""
+        depth = offset + k * pitch
+        for j in range(k):
+            d0, d1 = offset + j * pitch, offset + (j + 1) * pitch
+            xa = a + (x_end - a) * d0 / depth
+            xb = a + (x_end - a) * d1 / depth
+            yield j, min(xa, xb), max(xa, xb)
+
+    left = np.zeros(n)
+    side = np.zeros(n, dtype=np.int64)
+    lane = np.zeros(n, dtype=np.int64)
+    overlaps = np.zeros(n, dtype=bool)
+    total = 0.0
+
+    for rank, i in enumerate(order):
+        a, w, cap = x[i], widths[i], shift_cap[i]
+        s0 = min(max(a - w / 2, x_min), x_max - w)
+        prefer = signs[rank % len(signs)] if alternate else signs[0]
+        best = None
+        for s in signs:
+            for k in range(n_lanes):
+                floor = (k - target[rank]) * pitch
+                if best is not None and floor >= best[0]:
+                    break                # farther lanes cannot do better
+                here = lanes[s][k]
+                starts = {s0, a - w - pad, a + pad}
+                for lo, hi in here.near(s0 - cap - w - pad, s0 + cap + w +
+                                        pad):
+                    starts.update((hi + pad, lo - pad - w))
+                for start in starts:
+                    if (abs(start - s0) > cap or start < x_min or
+                            start + w > x_max):
+                        continue
+                    if not (here.boxes_free(start - pad, start + w + pad) and
+                            here.leaders_free(start - pad, start + w + pad)):
+                        continue
+                    x_end = min(max(a, start), start + w)
+                    if not all(lanes[s][j].boxes_free(lo - pad, hi + pad)
+                               for j, lo, hi in crossings(a, x_end, k)):
+                        continue
+                    cost = (abs(k - target[rank]) * pitch +
+                            abs(start - s0) + 2 * abs(x_end - a) +
+                            (x_end != a) * 1.5 * pitch +
+                            (s != prefer) * 0.5 * pitch)
+                    if best is None or cost < best[0]:
+                        best = (cost, s, k, start)
+        if best is None:                 # crowded: outermost lane, centred
+            overlaps[i] = True
+            best = (0.0, prefer, n_lanes - 1, s0)
+        cost, s, k, start = best
+        total += cost
+        left[i], side[i], lane[i] = start, s, k
+        lanes[s][k].add_box(start, start + w)
+        x_end = min(max(a, start), start + w)
+        for j, lo, hi in crossings(a, x_end, k):
+            lanes[s][j].add_crossing(lo, hi)
+    return left, side, lane, overlaps, total
+
+
+def layout_labels(x, widths, heights, y0=0.0, offset=1.0, x_min=-np.inf,
+                  x_max=np.inf, sides=('above', 'below'), n_lanes=6,
+                  pitch=None, lane_gap=0.0, pad=0.0, max_shift=None,
+                  alternate=True):
+    """Assign every label a lane and a left edge without overlaps.
+
+    x, widths, heights: anchors and label sizes in data units.
+    y0, offset: the timeline's y and the gap to lane 0 on each side.
+    pitch: lane spacing per side; default tallest label + lane_gap.
+    pad: minimum horizontal clearance between labels and leaders.
+    max_shift: how far a label may slide from centred on its anchor;
+        default its width, which lets it sit beside the anchor with a
+        slanted leader when the space above the anchor is taken.
+    alternate: prefer above and below in turn, as hand-made timelines
+        do, when both sides offer equally good lanes.
+
+    The sweep runs left to right and, mirrored, right to left (which
+    suits clusters pressed against the right edge); the pass with fewer
+    unplaced labels, then lower total cost, is kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    widths = np.asarray(widths, dtype=np.float64)
+    heights = np.asarray(heights, dtype=np.float64)
+    n = len(x)
+    if pitch is None:
+        pitch = heights.max() + lane_gap if n else 1.0
+    signs = [SIDES[s] for s in sides]
+    shift_cap = widths if max_shift is None else np.broadcast_to(
+        np.asarray(max_shift, dtype=np.float64), (n,))
+    args = (signs, n_lanes, pitch, offset, pad, shift_cap, alternate)
+
+    fwd = _sweep(x, widths, x_min, x_max, *args)
+    rev = list(_sweep(-x, widths, -x_max, -x_min, *args))
+    rev[0] = -(rev[0] + widths)
+    left, side, lane, overlaps, _ = min(
+        (fwd, rev), key=lambda r: (r[3].sum(), r[4]))
+
+    near = y0 + side * (offset + lane * pitch)
+    bottom = np.where(side > 0, near, near - heights)
+    return LabelLayout(x, left, widths, heights, side, lane, bottom, y0,
+                       overlaps)
+
+
+def box_overlaps(lay, pad=0.0):
+    """Pairs of label boxes that intersect (for checking a layout)."""
+    lo = np.stack([lay.left, lay.bottom], 1)
+    hi = np.stack([lay.right, lay.top], 1)
+    hit = ((lo[:, None] < hi[None] - pad) &
+           (lo[None] < hi[:, None] - pad)).all(-1)
+    np.fill_diagonal(hit, False)
+    return np.argwhere(np.triu(hit))
+
+
+def leader_crossings(lay, eps=1e-9):
+    """(leader, label) pairs where a leader passes through another
+    label's box (for checking a layout)."""
+    (x0, y0), (x1, y1) = np.moveaxis(lay.leaders(), 1, 0).transpose(0, 2, 1)
+    # clip each leader to each box's y-range, compare the x-extent
+    dy = np.where(y1 == y0, eps, y1 - y0)[:, None]
+    ta = np.clip((lay.bottom[None] - y0[:, None]) / dy, 0, 1)
+    tb = np.clip((lay.top[None] - y0[:, None]) / dy, 0, 1)
+    xa = x0[:, None] + (x1 - x0)[:, None] * ta
+    xb = x0[:, None] + (x1 - x0)[:, None] * tb
+    spans_y = ((np.minimum(y0, y1)[:, None] < lay.top[None] - eps) &
+               (np.maximum(y0, y1)[:, None] > lay.bottom[None] + eps))
+    hit = (spans_y & (np.minimum(xa, xb) < lay.right[None] - eps) &
+           (np.maximum(xa, xb) > lay.left[None] + eps))
+    np.fill_diagonal(hit, False)
+    return np.argwhere(hit)
+
+
+# ---------------------------------------------------------------------------
+# Milestone files
+# ---------------------------------------------------------------------------
+def load_milestones(path):
+    """List of dicts from a CSV (header row) or JSON list of objects.
+
+    Values that parse as numbers (years) are returned as int or float.
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as fh:
+            rows = json.load(fh)
+    else:
+        with open(path, newline='', encoding='utf-8') as fh:
+            rows = list(csv.DictReader(fh))
+    out = []
+    for row in rows:
+        parsed = {}
+        for key, value in row.items():
+            if isinstance(value, str):
+                try:
+                    value = int(value)
+                except ValueError:
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        pass
+            parsed[key] = value
+        out.append(parsed)
+    return out
+
+
+def _demo(n=300, seed=0):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    rng = np.random.default_rng(seed)
+    fig, ax = plt.subplots(figsize=(76.8, 10.8))   # four slides wide
+    ax.set_xlim(0, 1000)
+    ax.set_ylim(0, 100)
+    years = np.sort(rng.choice(np.arange(1600, 2025), n, replace=False))
+    names = [f'M{k}' + 'x' * int(rng.integers(0, 6)) for k in range(n)]
+    style = dict(fontsize=6, fontweight='bold')
+    t0 = time.perf_counter()
+    measure = TextMeasure(ax)
+    sizes = np.array([measure.block([(str(y), style), (name, style)])
+                      for y, name in zip(years, names)])
+    t1 = time.perf_counter()
+    xs = (years - 1600) / 425 * 980 + 10
+    lay = layout_labels(xs, sizes[:, 0], sizes[:, 1], y0=50, offset=2,
+                        x_min=0, x_max=1000, n_lanes=20, pad=1, lane_gap=0.5)
+    t2 = time.perf_counter()
+    ok = ~lay.overlaps
+    print(f'{n} labels: measured in {(t1 - t0) * 1e3:.0f} ms, laid out in '
+          f'{(t2 - t1) * 1e3:.0f} ms; lanes used {lay.lane[ok].max() + 1}, '
+          f'unplaceable {lay.overlaps.sum()}')
+    print(f'box overlaps among placed labels: '
+          f'{sum(ok[i] and ok[j] for i, j in box_overlaps(lay))}, '
+          f'leaders through labels: '
+          f'{sum(ok[i] and ok[j] for i, j in leader_crossings(lay))}')
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+message_passing.py
+GNN-style feature propagation as sparse matrix x feature-matrix products.
+
+One round of message passing is H <- M H, where M is the (row-normalised)
+adjacency operator for the chosen aggregation:
+
+    'sum'        M = A (+ I)                 neighbours added up
+    'mean'       M = D^-1 (A + I)            average of self + neighbours
+    'attention'  M_ij = softmax_j(<h_i, h_j> / sqrt(d)) over the
+                 neighbourhood, recomputed from the current features
+
+so k rounds over n nodes cost O(k * nnz * d) in compiled code instead of
+O(k * n^2) Python-level loops. Several graphs are batched by stacking
+them block-diagonally; they stay disjoint and are propagated in one
+product. Every round's embedding is kept, which is what the over-
+smoothing animation needs.
+
+Usage:
+    from message_passing import propagate
+    history = propagate(A, H0, rounds=10, aggregation='mean')
+    history[k]   # (n, d) embedding after k rounds; history[0] is H0
+
+    python message_passing.py   # over-smoothing on 64 x 1000-node graphs
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+AGGREGATIONS = ('sum', 'mean', 'attention')
+
+
+def batch_graphs(adjacencies, features):
+    """Stack disjoint graphs into one block-diagonal problem.
+
+    Returns (A, H, graph_ptr) where graph i owns rows
+    graph_ptr[i]:graph_ptr[i + 1] of A and H.
+    """
+    if len(adjacencies) != len(features):
+        raise ValueError('need one feature matrix per graph')
+    sizes = [a.shape[0] for a in adjacencies]
+    graph_ptr = np.concatenate([[0], np.cumsum(sizes)])
+    A = sp.block_diag(adjacencies, format='csr')
+    H = np.vstack([np.asarray(f, dtype=np.float64) for f in features])
+    return A, H, graph_ptr
+
+
+def aggregation_matrix(A, aggregation='mean', self_loops=True):
+    """Fixed propagation operator for 'sum' or 'mean' aggregation."""
+    A = sp.csr_matrix(A, dtype=np.float64)
+    A.data[:] = 1.0
+    if self_loops:
+        A = (A + sp.identity(A.shape[0], format='csr')).tocsr()
+        A.data[:] = 1.0
+    if aggregation == 'sum':
+        return A
+    if aggregation == 'mean':
+        degree = np.asarray(A.sum(axis=1)).ravel()
+        inv = np.divide(1.0, degree, out=np.zeros_like(degree),
+                        where=degree > 0)
+        return (sp.diags(inv) @ A).tocsr()
+    raise ValueError(f'aggregation must be one of {AGGREGATIONS}, '
+                     f'got {aggregation!r}')
+
+
+def _attention_matrix(pattern, rows, H, temperature):
+    """Row-softmax of scaled dot-product scores on the sparsity pattern."""
+    cols = pattern.indices
+    scores = np.einsum('ij,ij->i', H[rows], H[cols]) / temperature
+    starts = pattern.indptr[:-1]
+    nonempty = np.diff(pattern.indptr) > 0
+    row_max = np.zeros(pattern.shape[0])
+    row_max[nonempty] = np.maximum.reduceat(scores, starts[nonempty])
+    weights = np.exp(scores - row_max[rows])
+    row_sum = np.zeros(pattern.shape[0])
+    row_sum[nonempty] = np.add.reduceat(weights, starts[nonempty])
+    weights /= row_sum[rows]
+    return sp.csr_matrix((weights, cols, pattern.indptr),
+                         shape=pattern.shape)
+
+
+def propagate(A, H0, rounds=3, aggregation='mean', self_loops=True,
+              temperature=None):
+    """Run `rounds` rounds of message passing and return every embedding.
+
+    A            : (n x n) sparse adjacency (e.g. from batch_graphs)
+    H0           : (n, d) initial node features
+    aggregation  : 'sum', 'mean' or 'attention'
+    temperature  : attention score scale, default sqrt(d)
+
+    Returns an array of shape (rounds + 1, n, d).
+    """
+    H = np.asarray(H0, dtype=np.float64)
+    if H.ndim == 1:
+        H = H[:, None]
+    history = np.empty((rounds + 1,) + H.shape)
+    history[0] = H
+
+    if aggregation == 'attention':
+        pattern = aggregation_matrix(A, 'sum', self_loops)
+        rows = np.repeat(np.arange(pattern.shape[0]), np.diff(pattern.indptr))
+        if temperature is None:
+            temperature = np.sqrt(H.shape[1])
+        for k in range(1, rounds + 1):
+            M = _attention_matrix(pattern, rows, history[k - 1], temperature)
+            history[k] = M @ history[k - 1]
+    else:
+        M = aggregation_matrix(A, aggregation, self_loops)
+        for k in range(1, rounds + 1):
+            history[k] = M @ history[k - 1]
+    return history
+
+
+def oversmoothing(history, graph_ptr=None):
+    """Mean distance of node embeddings from their graph's mean, per round.
+
+    Falls towards zero as repeated averaging makes every node in a
+    connected graph look the same.
+    """
+    history = np.asarray(history)
+    n = history.shape[1]
+    if graph_ptr is None:
+        graph_ptr = np.array([0, n])
+    graph_of = np.repeat(np.arange(len(graph_ptr) - 1), np.diff(graph_ptr))
+    sizes = np.diff(graph_ptr)[:, None]
+    spread = np.empty(len(history))
+    for k, H in enumerate(history):
+        means = np.add.reduceat(H, graph_ptr[:-1], axis=0) / sizes
+        spread[k] = np.linalg.norm(H - means[graph_of], axis=1).mean()
+    return spread
+
+
+def _demo(n_graphs=64, n=1000, d=16, rounds=20):
+    """Propagate a batch of random geometric-ish graphs and time it."""
+    import csr_graph
+
+    rng = np.random.default_rng(0)
+    adjs, feats = [], []
+    for _ in range(n_graphs):
+        src = rng.integers(0, n, size=4 * n)
+        dst = np.clip(src + rng.integers(-20, 21, size=4 * n), 0, n - 1)
+        adjs.append(csr_graph.from_edges(src, dst, n=n, symmetric=True))
+        feats.append(rng.normal(size=(n, d)))
+    A, H0, graph_ptr = batch_graphs(adjs, feats)
+
+    for aggregation in AGGREGATIONS:
+        t0 = time.perf_counter()
+        history = propagate(A, H0, rounds=rounds, aggregation=aggregation)
+        dt = time.perf_counter() - t0
+        spread = oversmoothing(history, graph_ptr)
+        print(f'{aggregation:9s}: {n_graphs} x {n} nodes, {rounds} rounds '
+              f'in {dt:.2f} s; spread {spread[0]:.2f} -> {spread[-1]:.3g}')
+
+
+if __name__ == '__main__':
+    _demo()
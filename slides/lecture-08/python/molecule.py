@@ -0,0 +1,865 @@
+#!/usr/bin/env python3
+"""
+molecule.py
+SMILES -> atom/bond graph -> 2-D depiction -> batched matplotlib drawing.
+
+    parse_smiles      organic-subset and bracket atoms, branches, ring
+                      closures (incl. %nn), bond symbols, '.' fragments;
+                      stereo marks are accepted and ignored
+    canonical_smiles  Morgan-style rank refinement + rank-ordered DFS, so
+                      the same molecule written in a different atom order
+                      gets the same string (no aromaticity perception:
+                      Kekule and aromatic inputs stay distinct)
+    depict            ring-aware layout with unit bond length: fused ring
+                      systems become regular polygons sharing edges,
+                      chains zig-zag at 120 degrees, substituents fan out
+                      into the largest free angle
+    CoordinateCache   depictions keyed by canonical SMILES, optionally
+                      persisted as JSON, so a molecule is laid out once
+    draw_molecules    every bond of every molecule in one LineCollection
+                      and every atom in one EllipseCollection
+
+Usage:
+    from molecule import parse_smiles, CoordinateCache, draw_grid
+    mol = parse_smiles('CN1C=NC2=C1C(=O)N(C(=O)N2C)C')   # caffeine
+    xy = CoordinateCache().coordinates(mol)
+    draw_grid(ax, [parse_smiles(s) for s in smiles], cols=20)
+
+    python molecule.py   # parse, depict and draw 500 molecules
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+
+import numpy as np
+import networkx as nx
+from matplotlib.collections import EllipseCollection, LineCollection
+
+# ---------------------------------------------------------------------------
+# Palette (matches the slide scripts)
+# ---------------------------------------------------------------------------
+ELEMENT_COLORS = {
+    'C': '#3498db', 'N': '#2ecc71', 'O': '#e74c3c', 'S': '#f1c40f',
+    'P': '#e67e22', 'F': '#1abc9c', 'Cl': '#1abc9c', 'Br': '#1abc9c',
+    'I': '#1abc9c',
+}
+OTHER_COLOR = '#9b59b6'
+SINGLE_COLOR = '#95a5a6'
+MULTIPLE_COLOR = '#ecf0f1'
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+_TOKEN = re.compile(
+    r'(\[[^\]]+\])|(Br|Cl|B|C|N|O|P|S|F|I|b|c|n|o|p|s|\*)'
+    r'|(\()|(\))|([-=#$:/\\])|(%\d\d|\d)|(\.)')
+_BRACKET = re.compile(
+    r'\[(\d+)?([A-Z][a-z]?|[a-z][a-z]?|\*)(@*)(H\d*)?([+-]+\d*)?(:\d+)?\]$')
+_BOND_ORDER = {'-': 1.0, '=': 2.0, '#': 3.0, '$': 4.0, ':': 1.5,
+               '/': 1.0, '\\': 1.0}
+_VALENCE = {'B': (3,), 'C': (4,), 'N': (3, 5), 'O': (2,), 'P': (3, 5),
+            'S': (2, 4, 6), 'F': (1,), 'Cl': (1,), 'Br': (1,), 'I': (1,)}
+
+
+class Molecule:
+    """Heavy-atom graph: per-atom arrays plus (m, 2) bonds and orders.
+
+    Aromatic bonds have order 1.5; `kekule` holds orders with those
+    resolved into alternating 1/2 where possible (used for drawing).
+    """
+
+    def __init__(self, elements, aromatic, charges, hcount, bonds, orders):
+        self.elements = list(elements)
+        self.aromatic = np.asarray(aromatic, dtype=bool)
+        self.charges = np.asarray(charges, dtype=np.int64)
+        self.hcount = list(hcount)          # explicit [..H..] or None
+        self.bonds = np.asarray(bonds, dtype=np.int64).reshape(-1, 2)
+        self.orders = np.asarray(orders, dtype=np.float64)
+        self.neighbors = [[] for _ in self.elements]
+        for b, (i, j) in enumerate(self.bonds.tolist()):
+            self.neighbors[i].append((j, b))
+            self.neighbors[j].append((i, b))
+        self.kekule = kekulize(self)
+        self._rings = None
+
+    def __len__(self):
+        return len(self.elements)
+
+    @property
+    def rings(self):
+        """Smallest set of smallest rings, computed on first use."""
+        if self._rings is None:
+            self._rings = smallest_rings(self)
+        return self._rings
+
+    def graph(self):
+        G = nx.Graph()
+        G.add_nodes_from(range(len(self)))
+        G.add_edges_from(self.bonds.tolist())
+        return G
+
+    def hydrogens(self):
+        """Explicit H counts for bracket atoms, default valence otherwise."""
+        bond_sum = np.zeros(len(self))
+        np.add.at(bond_sum, self.bonds[:, 0], self.kekule)
+        np.add.at(bond_sum, self.bonds[:, 1], self.kekule)
+        h = []
+        for i, el in enumerate(self.elements):
+            if self.hcount[i] is not None:
+                h.append(self.hcount[i])
+                continue
+            used = int(np.ceil(bond_sum[i] - 1e-9))
+            for v in _VALENCE.get(el, ()):
+                if v >= used:
+                    h.append(v - used)
+                    break
+            else:
+                h.append(0)
+        return h
+
+
+def parse_smiles(smiles):
+    """Parse a SMILES string into a Molecule; ValueError if malformed."""
+    elements, aromatic, charges, hcount = [], [], [], []
+    bonds, orders = [], []
+    stack, prev, bond = [], None, None
+    rings = {}
+    pos = 0
+
+    def add_bond(i, j, order):
+        if order is None:
+            order = 1.5 if aromatic[i] and aromatic[j] else 1.0
+        bonds.append((i, j))
+        orders.append(order)
+
+    for m in _TOKEN.finditer(smiles):
+        if m.start() != pos:
+            raise ValueError(f'bad SMILES at {pos}: {smiles!r}')
+        pos = m.end()
+        bracket, organic, open_, close, bsym, ring, dot = m.groups()
+        if bracket or organic:
+            if bracket:
+                b = _BRACKET.match(bracket)
+                if not b:
+                    raise ValueError(f'bad bracket atom {bracket!r}')
+                _, sym, _, h, charge = b.groups()[:5]
+                h = 0 if h is None else int(h[1:] or 1)
+                if charge is None:
+                    q = 0
+                elif charge[1:].isdigit():
+                    q = int(charge[1:]) * (1 if charge[0] == '+' else -1)
+                else:
+                    q = charge.count('+') - charge.count('-')
+            else:
+                sym, h, q = organic, None, 0
+            idx = len(elements)
+            elements.append(sym.capitalize() if sym != '*' else '*')
+            aromatic.append(sym.islower())
+            charges.append(q)
+            hcount.append(h)
+            if prev is not None:
+                add_bond(prev, idx, bond)
+            prev, bond = idx, None
+        elif open_:
+            if prev is None:
+                raise ValueError(f'branch without an atom at {m.start()}: '
+                                 f'{smiles!r}')
+            stack.append(prev)
+        elif close:
+            if not stack:
+                raise ValueError(f'unbalanced ")" in {smiles!r}')
+            prev = stack.pop()
+        elif bsym:
+            bond = _BOND_ORDER[bsym]
+        elif ring:
+            if prev is None:
+                raise ValueError(f'ring bond without an atom at '
+                                 f'{m.start()}: {smiles!r}')
+            n = int(ring.lstrip('%'))
+            if n in rings:
+                other, order = rings.pop(n)
+                add_bond(other, prev, bond if bond is not None else order)
+            else:
+                rings[n] = (prev, bond)
+            bond = None
+        elif dot:
+            prev = None
+    if pos != len(smiles) or rings or stack:
+        raise ValueError(f'incomplete SMILES: {smiles!r}')
+    return Molecule(elements, aromatic, charges, hcount, bonds, orders)
+
+
+def kekulize(mol):
+    """Resolve aromatic (1.5) bonds into single/double where possible.
+
+    Aromatic atoms that still need a double bond are matched along
+    aromatic bonds; if no perfect matching exists the 1.5 orders stay.
+    """
+    orders = mol.orders.copy()
+    arom = np.flatnonzero(orders == 1.5)
+    if arom.size == 0:
+        return orders
+    need = set()
+    for i in np.flatnonzero(mol.aromatic).tolist():
+        el, q = mol.elements[i], mol.charges[i]
+        if any(orders[b] == 2 for _, b in mol.neighbors[i]):
+            continue
+        heavy = len(mol.neighbors[i])
+        if el == 'C':
+            needs_double = q == 0
+        elif el in ('N', 'P'):
+            needs_double = ((q == 0 and heavy == 2 and not mol.hcount[i])
+                            or (q == 1 and heavy == 3))
+        else:
+            needs_double = el in ('O', 'S') and q == 1
+        if needs_double:
+            need.add(i)
+    G = nx.Graph()
+    G.add_nodes_from(need)
+    for b in arom.tolist():
+        i, j = mol.bonds[b]
+        if i in need and j in need:
+            G.add_edge(int(i), int(j), bond=b)
+    matching = nx.max_weight_matching(G, maxcardinality=True)
+    if 2 * len(matching) != len(need):
+        return orders
+    orders[arom] = 1.0
+    for i, j in matching:
+        orders[G.edges[i, j]['bond']] = 2.0
+    return orders
+
+
+# ---------------------------------------------------------------------------
+# Canonical SMILES
+# ---------------------------------------------------------------------------
+def _rank(keys):
+    """Dense ranks of a list of sortable keys."""
+    order = sorted(set(keys))
+    lookup = {k: r for r, k in enumerate(order)}
+    return [lookup[k] for k in keys]
+
+
+def canonical_ranks(mol):
+    """Atom ranks invariant to input order (ties broken deterministically)."""
+    h = mol.hydrogens()
+    ranks = _rank([(mol.elements[i], bool(mol.aromatic[i]),
+                    len(mol.neighbors[i]), int(mol.charges[i]), h[i])
+                   for i in range(len(mol))])
+
+    def refine(ranks):
+        while True:
+            new = _rank([(ranks[i], tuple(sorted(
+                (ranks[j], mol.orders[b]) for j, b in mol.neighbors[i])))
+                for i in range(len(mol))])
+            if len(set(new)) == len(set(ranks)):
+                return new
+            ranks = new
+
+    ranks = refine(ranks)
+    while len(set(ranks)) < len(mol):
+        # Split the lowest tied class at its first atom and refine again
+        counts = np.bincount(ranks)
+        tied = int(np.flatnonzero(counts > 1)[0])
+        first = ranks.index(tied)
+        ranks = [2 * r + (r == tied and i != first)
+                 for i, r in enumerate(ranks)]
+        ranks = refine(_rank(ranks))
+    return ranks
+
+
+def _atom_token(mol, i):
+    sym = mol.elements[i]
+    if mol.aromatic[i]:
+        sym = sym.lower()
+    if mol.hcount[i] is None and mol.charges[i] == 0:
+        return sym
+    h = mol.hcount[i] or 0
+    q = int(mol.charges[i])
+    hs = '' if h == 0 else 'H' if h == 1 else f'H{h}'
+    qs = '' if q == 0 else ('+' if q > 0 else '-') + (
+        str(abs(q)) if abs(q) > 1 else '')
+    return f'[{sym}{hs}{qs}]'
+
+
+def _bond_token(mol, b):
+    order = mol.orders[b]
+    i, j = mol.bonds[b]
+    if order == 1.0 and mol.aromatic[i] and mol.aromatic[j]:
+        return '-'
+    return {2.0: '=', 3.0: '#', 4.0: '$'}.get(order, '')
+
+
+def canonical_smiles(mol):
+    """Return (smiles, order): order[k] is the input atom written k-th."""
+    ranks = canonical_ranks(mol)
+    nbrs = [sorted(mol.neighbors[i], key=lambda e: ranks[e[0]])
+            for i in range(len(mol))]
+
+    # Pass 1: DFS tree; non-tree edges become ring closures
+    visited = [False] * len(mol)
+    children = [[] for _ in range(len(mol))]
+    closures = [[] for _ in range(len(mol))]
+    roots, seen_bonds = [], set()
+    for start in sorted(range(len(mol)), key=ranks.__getitem__):
+        if visited[start]:
+            continue
+        roots.append(start)
+        visited[start] = True
+        stack = [(start, iter(nbrs[start]))]
+        while stack:
+            u, it = stack[-1]
+            for v, b in it:
+                if b in seen_bonds:
+                    continue
+                seen_bonds.add(b)
+                if visited[v]:
+                    closures[v].append(b)   # opened at v, closed at u
+                    closures[u].append(b)
+                else:
+                    visited[v] = True
+                    children[u].append((v, b))
+                    stack.append((v, iter(nbrs[v])))
+                break
+            else:
+                stack.pop()
+
+    # Pass 2: emit
+    out, order = [], []
+    digit_of, free = {}, list(range(1, 100))
+
+    def emit(u):
+        order.append(u)
+        out.append(_atom_token(mol, u))
+        for b in closures[u]:
+            if b in digit_of:
+                d = digit_of.pop(b)
+                out.append(_bond_token(mol, b) + (str(d) if d < 10
+                                                  else f'%{d}'))
+                free.append(d)
+                free.sort()
+            else:
+                d = digit_of[b] = free.pop(0)
+                out.append(str(d) if d < 10 else f'%{d}')
+        for k, (v, b) in enumerate(children[u]):
+            last = k == len(children[u]) - 1
+            if not last:
+                out.append('(')
+            out.append(_bond_token(mol, b))
+            emit(v)
+            if not last:
+                out.append(')')
+
+    for k, root in enumerate(roots):
+        if k:
+            out.append('.')
+        emit(root)
+    return ''.join(out), np.array(order, dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Depiction
+# ---------------------------------------------------------------------------
+def _shortest_cycle_through(mol, bond):
+    """Atoms and bonds of the shortest ring containing `bond`, or None."""
+    u, v = mol.bonds[bond].tolist()
+    parent = {u: None}
+    queue = deque([u])
+    while queue and v not in parent:
+        a = queue.popleft()
+        for c, b in mol.neighbors[a]:
+            if b != bond and c not in parent:
+                parent[c] = (a, b)
+                queue.append(c)
+    if v not in parent:
+        return None
+    atoms, bonds = [v], [bond]
+    while parent[atoms[-1]] is not None:
+        a, b = parent[atoms[-1]]
+        atoms.append(a)
+        bonds.append(b)
+    return atoms[::-1], bonds
+
+
+def smallest_rings(mol):
+    """Smallest set of smallest rings as (ordered atoms, bond ids) pairs.
+
+    Candidate rings are the shortest cycle through each bond; the
+    smallest ones are kept while they stay independent over GF(2) until
+    there are m - n + components of them.
+    """
+    n_rings = len(mol.bonds) - len(mol) + len(_components(mol))
+    if n_rings <= 0:
+        return []
+    candidates = {}
+    for bond in range(len(mol.bonds)):
+        ring = _shortest_cycle_through(mol, bond)
+        if ring is not None:
+            candidates.setdefault(frozenset(ring[1]), ring)
+    basis, rings = {}, []
+    for key, ring in sorted(candidates.items(), key=lambda kv: len(kv[0])):
+        vec = sum(1 << b for b in key)
+        while vec:
+            top = vec.bit_length() - 1
+            if top not in basis:
+                basis[top] = vec
+                rings.append(ring)
+                break
+            vec ^= basis[top]
+        if len(rings) == n_rings:
+            break
+    return rings
+
+
+def _components(mol):
+    """Connected components as sorted atom lists."""
+    seen, comps = [False] * len(mol), []
+    for start in range(len(mol)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        comp, stack = [], [start]
+        while stack:
+            a = stack.pop()
+            comp.append(a)
+            for c, _ in mol.neighbors[a]:
+                if not seen[c]:
+                    seen[c] = True
+                    stack.append(c)
+        comps.append(sorted(comp))
+    return comps
+
+
+def _polygon(centre, start_angle, k, direction=1):
+    r = 0.5 / np.sin(np.pi / k)
+    ang = start_angle + direction * 2 * np.pi * np.arange(k) / k
+    return centre + r * np.column_stack([np.cos(ang), np.sin(ang)])
+
+
+def _layout_ring_system(rings, xy):
+    """Place a fused/spiro ring system as regular polygons (in place)."""
+    placed_rings = []
+    remaining = sorted(rings, key=len, reverse=True)
+    first = remaining.pop(0)
+    pts = _polygon(np.zeros(2), np.pi / 2, len(first))
+    for a, p in zip(first, pts):
+        xy[a] = p
+    placed_rings.append(first)
+
+    while remaining:
+        # Next ring: most atoms already placed
+        remaining.sort(key=lambda r: -sum(not np.isnan(xy[a, 0]) for a in r))
+        ring = remaining.pop(0)
+        k = len(ring)
+        done = [not np.isnan(xy[a, 0]) for a in ring]
+        old_centre = np.nanmean(
+            np.vstack([xy[r] for r in placed_rings
+                       if set(r) & set(ring)] or [xy[ring]]), axis=0)
+        edge = next((p for p in range(k) if done[p] and done[(p + 1) % k]),
+                    None)
+        if edge is not None:
+            a, b = ring[edge], ring[(edge + 1) % k]
+            mid = (xy[a] + xy[b]) / 2
+            normal = np.array([-(xy[b] - xy[a])[1], (xy[b] - xy[a])[0]])
+            normal /= np.linalg.norm(normal)
+            if np.dot(normal, mid - old_centre) < 0:
+                normal = -normal
+            centre = mid + normal * 0.5 / np.tan(np.pi / k)
+            start = np.arctan2(*(xy[a] - centre)[::-1])
+            bang = np.arctan2(*(xy[b] - centre)[::-1])
+            direction = 1 if np.sin(bang - start) > 0 else -1
+            pts = _polygon(centre, start, k, direction)
+            for p in range(k):
+                atom = ring[(edge + p) % k]
+                if np.isnan(xy[atom, 0]):
+                    xy[atom] = pts[p]
+        else:
+            p0 = next((p for p in range(k) if done[p]), None)
+            if p0 is None:
+                # Not connected to the system yet; try again later
+                remaining.append(ring)
+                continue
+            a = ring[p0]
+            out = xy[a] - old_centre
+            out /= np.linalg.norm(out) or 1.0
+            centre = xy[a] + out * 0.5 / np.sin(np.pi / k)
+            start = np.arctan2(*(xy[a] - centre)[::-1])
+            pts = _polygon(centre, start, k)
+            for p in range(k):
+                atom = ring[(p0 + p) % k]
+                if np.isnan(xy[atom, 0]):
+                    xy[atom] = pts[p]
+        placed_rings.append(ring)
+
+
+def _rotation(theta):
+    c, s = np.cos(theta), np.sin(theta)
+    return np.array([[c, -s], [s, c]])
+
+
+def orient(xy):
+    """Rotate coordinates so the principal axis is horizontal, centred."""
+    xy = xy - xy.mean(axis=0)
+    if len(xy) < 2:
+        return xy
+    _, vecs = np.linalg.eigh(np.cov(xy.T))
+    major = vecs[:, -1]
+    return xy @ _rotation(-np.arctan2(major[1], major[0])).T
+
+
+def depict(mol):
+    """(n, 2) 2-D coordinates with unit bond length."""
+    n = len(mol)
+    rings = [atoms for atoms, _ in mol.rings]
+
+    # Ring systems: rings sharing at least one atom
+    system_of = np.full(n, -1)
+    systems = []
+    for ring in rings:
+        hit = {int(system_of[a]) for a in ring if system_of[a] >= 0}
+        merged = [ring] + [r for s in hit for r in systems[s]]
+        for s in hit:
+            systems[s] = []
+        systems.append(merged)
+        for r in merged:
+            system_of[r] = len(systems) - 1
+    local = {}
+    for s, sys_rings in enumerate(systems):
+        if sys_rings:
+            xy = np.full((n, 2), np.nan)
+            _layout_ring_system(sys_rings, xy)
+            atoms = sorted({a for r in sys_rings for a in r})
+            local[s] = (atoms, xy[atoms])
+
+    xy = np.full((n, 2), np.nan)
+    turn = np.ones(n)
+    queue = deque()
+
+    def place_system(s, anchor, target, direction):
+        atoms, pts = local[s]
+        k = atoms.index(anchor)
+        pts = pts - pts[k]
+        centroid = pts.mean(axis=0)
+        if np.linalg.norm(centroid) > 1e-9 and direction is not None:
+            want = np.arctan2(direction[1], direction[0])
+            have = np.arctan2(centroid[1], centroid[0])
+            pts = pts @ _rotation(want - have).T
+        xy[atoms] = pts + target
+        queue.extend(atoms)
+
+    for comp in _components(mol):
+        offset = 0.0 if np.all(np.isnan(xy[:, 0])) else \
+            np.nanmax(xy[:, 0]) + 2.0
+        sys_ids = [s for s in local if local[s][0][0] in comp]
+        if sys_ids:
+            s = max(sys_ids, key=lambda s: len(local[s][0]))
+            place_system(s, local[s][0][0], local[s][1][0] +
+                         [offset, 0.0], None)
+        else:
+            xy[comp[0]] = (offset, 0.0)
+            queue.append(comp[0])
+
+        while queue:
+            u = queue.popleft()
+            placed = [v for v, _ in mol.neighbors[u]
+                      if not np.isnan(xy[v, 0])]
+            todo = [(v, b) for v, b in mol.neighbors[u]
+                    if np.isnan(xy[v, 0])]
+            if not todo:
+                continue
+            angles = sorted(np.arctan2(*(xy[v] - xy[u])[::-1])
+                            for v in placed)
+            linear = (sum(mol.kekule[b] == 3 for _, b in mol.neighbors[u])
+                      or sum(mol.kekule[b] == 2 for _, b in
+                             mol.neighbors[u]) == 2)
+            if not angles:
+                new = [np.pi / 6 + 2 * np.pi * j / len(todo)
+                       for j in range(len(todo))]
+            elif len(angles) == 1 and len(todo) == 1:
+                # Zig-zag, bending away from whatever is already drawn
+                bends = [0.0] if linear else [np.pi / 3 * turn[u],
+                                              -np.pi / 3 * turn[u]]
+                done = ~np.isnan(xy[:, 0])
+                done[u] = False
+                best, room = bends[0], -1.0
+                for bend in bends:
+                    ang = angles[0] + np.pi + bend
+                    p = xy[u] + (np.cos(ang), np.sin(ang))
+                    clear = (np.linalg.norm(xy[done] - p, axis=1).min()
+                             if done.any() else np.inf)
+                    if clear > room + 1e-6:
+                        best, room = bend, clear
+                new = [angles[0] + np.pi + best]
+                turn[todo[0][0]] = -np.sign(best) if best else turn[u]
+            else:
+                # Spread into the largest free angular gap
+                gaps = np.diff(angles + [angles[0] + 2 * np.pi])
+                g = int(np.argmax(gaps))
+                new = [angles[g] + gaps[g] * (j + 1) / (len(todo) + 1)
+                       for j in range(len(todo))]
+            for (v, _), ang in zip(todo, new):
+                direction = np.array([np.cos(ang), np.sin(ang)])
+                target = xy[u] + direction
+                if system_of[v] >= 0 and system_of[v] in local:
+                    place_system(int(system_of[v]), v, target, direction)
+                else:
+                    xy[v] = target
+                    queue.append(v)
+    return _untangle(mol, xy)
+
+
+def _clashes(xy, cutoff=0.5):
+    """Pairs of atoms drawn closer than `cutoff` bond lengths."""
+    D = np.linalg.norm(xy[:, None] - xy[None], axis=2)
+    i, j = np.nonzero(np.triu(D < cutoff, k=1))
+    return list(zip(i.tolist(), j.tolist()))
+
+
+def _side(mol, start, bond):
+    """Atoms reachable from `start` without crossing `bond`."""
+    seen, stack = {start}, [start]
+    while stack:
+        a = stack.pop()
+        for c, b in mol.neighbors[a]:
+            if b != bond and c not in seen:
+                seen.add(c)
+                stack.append(c)
+    return sorted(seen)
+
+
+def _untangle(mol, xy, max_flips=20):
+    """Mirror substituents across acyclic bonds until atoms stop clashing."""
+    ring_bonds = {b for _, bonds in mol.rings for b in bonds}
+    clashes = _clashes(xy)
+    for _ in range(max_flips):
+        if not clashes:
+            break
+        improved = False
+        for bond in range(len(mol.bonds)):
+            if bond in ring_bonds:
+                continue
+            u, v = mol.bonds[bond]
+            side = _side(mol, v, bond)
+            if u in side or len(side) > len(mol) // 2 + 1:
+                side = _side(mol, u, bond)
+                u, v = v, u
+            if len(side) < 2:
+                continue
+            axis = (xy[v] - xy[u]) / np.linalg.norm(xy[v] - xy[u])
+            rel = xy[side] - xy[u]
+            mirrored = xy.copy()
+            mirrored[side] = xy[u] + 2 * np.outer(rel @ axis, axis) - rel
+            after = _clashes(mirrored)
+            if len(after) < len(clashes):
+                xy[:], clashes, improved = mirrored, after, True
+                break
+        if not improved:
+            break
+    return xy
+
+
+class CoordinateCache:
+    """Depictions keyed by canonical SMILES, optionally backed by JSON."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.store = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as fh:
+                self.store = {k: np.array(v) for k, v in json.load(fh).items()}
+
+    def coordinates(self, mol):
+        """Coordinates of mol in its own atom order (computed once)."""
+        key, order = canonical_smiles(mol)
+        cached = self.store.get(key)
+        if cached is None:
+            xy = orient(depict(mol))
+            self.store[key] = xy[order]
+            return xy
+        xy = np.empty_like(cached)
+        xy[order] = cached
+        return xy
+
+    def save(self, path=None):
+        with open(path or self.path, 'w', encoding='utf-8') as fh:
+            json.dump({k: np.round(v, 3).tolist()
+                       for k, v in self.store.items()}, fh)
+
+
+# ---------------------------------------------------------------------------
+# Drawing
+# ---------------------------------------------------------------------------
+def _ring_centres(mol, xy):
+    """Centre of the smallest ring containing each bond (NaN if none)."""
+    centres = np.full((len(mol.bonds), 2), np.nan)
+    sizes = np.full(len(mol.bonds), np.inf)
+    for atoms, bonds in mol.rings:
+        for k in bonds:
+            if len(atoms) < sizes[k]:
+                sizes[k], centres[k] = len(atoms), xy[atoms].mean(axis=0)
+    return centres
+
+
+def bond_segments(mol, xy, gap=0.16):
+    """Line segments for every bond: (segments (s, 2, 2), multiple mask).
+
+    Ring double bonds get a shortened inner line toward the ring centre;
+    other double and triple bonds are drawn as parallel lines.
+    """
+    p, q = xy[mol.bonds[:, 0]], xy[mol.bonds[:, 1]]
+    d = q - p
+    normal = np.column_stack([-d[:, 1], d[:, 0]])
+    normal /= np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-9)
+    orders = mol.kekule
+    centres = _ring_centres(mol, xy) if np.any(orders > 1) else None
+
+    segs, multiple = [], []
+    for k, order in enumerate(orders.tolist()):
+        if order == 1:
+            segs.append((p[k], q[k]))
+            multiple.append(False)
+        elif order in (1.5, 2) and not np.isnan(centres[k, 0]):
+            side = normal[k] if np.dot(normal[k], centres[k] - p[k]) > 0 \
+                else -normal[k]
+            segs.append((p[k], q[k]))
+            segs.append((p[k] + 0.18 * d[k] + gap * side,
+                         q[k] - 0.18 * d[k] + gap * side))
+            multiple.extend([order == 2, order == 2])
+        else:
+            n_lines = 3 if order >= 3 else 2
+            for t in np.linspace(-1, 1, n_lines) * gap * (n_lines - 1) / 2:
+                segs.append((p[k] + t * normal[k], q[k] + t * normal[k]))
+            multiple.extend([True] * n_lines)
+    return np.array(segs).reshape(-1, 2, 2), np.array(multiple, dtype=bool)
+
+
+def draw_molecules(ax, mols, coords, offsets=None, scale=1.0,
+                   atom_radius=0.22, hetero_radius=0.28, linewidth=2.5,
+                   single_color=SINGLE_COLOR, multiple_color=MULTIPLE_COLOR,
+                   zorder=2):
+    """Draw many molecules with one line and one atom collection.
+
+    coords[i] is molecule i's (n, 2) depiction, placed at offsets[i] and
+    multiplied by `scale` (scalar or per molecule). Returns the
+    (LineCollection, EllipseCollection) added to ax.
+    """
+    n = len(mols)
+    offsets = np.zeros((n, 2)) if offsets is None else np.asarray(offsets)
+    scale = np.broadcast_to(np.asarray(scale, dtype=float), (n,))
+    segs, colors, centres, radii, fills = [], [], [], [], []
+    for mol, xy, off, s in zip(mols, coords, offsets, scale):
+        seg, multiple = bond_segments(mol, xy)
+        segs.append(seg * s + off)
+        colors.extend(np.where(multiple, multiple_color, single_color))
+        centres.append(xy * s + off)
+        hetero = np.array([el != 'C' for el in mol.elements])
+        radii.append(np.where(hetero, hetero_radius, atom_radius) * s)
+        fills.extend(ELEMENT_COLORS.get(el, OTHER_COLOR)
+                     for el in mol.elements)
+    lines = LineCollection(np.concatenate(segs), colors=colors,
+                           linewidths=linewidth, capstyle='round',
+                           alpha=0.85, zorder=zorder)
+    ax.add_collection(lines)
+    diam = 2 * np.concatenate(radii)
+    atoms = EllipseCollection(diam, diam, np.zeros_like(diam), units='xy',
+                              offsets=np.concatenate(centres),
+                              offset_transform=ax.transData,
+                              facecolors=fills, edgecolors='white',
+                              linewidths=linewidth * 0.6, alpha=0.92,
+                              zorder=zorder + 3)
+    ax.add_collection(atoms)
+    return lines, atoms
+
+
+def grid_layout(coords, cols, cell=1.0):
+    """Offsets and scales fitting each depiction into a grid cell."""
+    offsets, scales = [], []
+    for k, xy in enumerate(coords):
+        extent = np.ptp(xy, axis=0).max() if len(xy) > 1 else 0.0
+        scales.append(0.8 * cell / max(extent + 1.0, 4.0))
+        row, col = divmod(k, cols)
+        centre = (xy.max(axis=0) + xy.min(axis=0)) / 2 if len(xy) else 0.0
+        offsets.append(np.array([col * cell, -row * cell]) -
+                       centre * scales[-1])
+    return np.array(offsets), np.array(scales)
+
+
+def draw_grid(ax, mols, cols, cell=1.0, cache=None, origin=(0.0, 0.0),
+              **kwargs):
+    """Depict (via cache) and draw molecules in a grid; returns offsets."""
+    cache = cache if cache is not None else CoordinateCache()
+    coords = [cache.coordinates(m) for m in mols]
+    offsets, scales = grid_layout(coords, cols, cell)
+    offsets = offsets + np.asarray(origin)
+    kwargs.setdefault('linewidth', 1.2)
+    draw_molecules(ax, mols, coords, offsets, scales, **kwargs)
+    return offsets
+
+
+# ---------------------------------------------------------------------------
+# Demo
+# ---------------------------------------------------------------------------
+DRUGS = [
+    'CN1C=NC2=C1C(=O)N(C(=O)N2C)C',          # caffeine
+    'CC(=O)Oc1ccccc1C(=O)O',                 # aspirin
+    'CC(=O)Nc1ccc(O)cc1',                    # paracetamol
+    'CC(C)Cc1ccc(cc1)C(C)C(=O)O',            # ibuprofen
+    'CN1CCC[C@H]1c1cccnc1',                  # nicotine
+    'NCCc1ccc(O)c(O)c1',                     # dopamine
+    'NCCc1c[nH]c2ccc(O)cc12',                # serotonin
+    'CN1C(=O)CN=C(c2ccccc2)c2cc(Cl)ccc12',   # diazepam
+    'OC(=O)c1ccccc1O',                       # salicylic acid
+    'CC12CCC3c4ccc(O)cc4CCC3C1CCC2O',        # estradiol
+]
+
+
+def _random_smiles(rng):
+    """A drug-like SMILES: ring scaffolds joined by short decorated chains."""
+    rings = ['c1ccccc1', 'c1ccncc1', 'C1CCCCC1', 'C1CCNCC1', 'c1ccc2ccccc2c1',
+             'c1ccoc1', 'C1CC1']
+    subs = ['C', 'O', 'N', 'F', 'Cl', 'C(=O)O', 'C(F)(F)F', 'OC', 'C#N']
+    parts = []
+    for k in range(rng.integers(1, 4)):
+        ring = rings[rng.integers(len(rings))]
+        # Rename ring-closure digits so fragments don't clash
+        ring = re.sub(r'\d', lambda m: str(int(m.group()) + 2 * k), ring)
+        chain = 'C' * int(rng.integers(0, 3))
+        sub = subs[rng.integers(len(subs))]
+        parts.append(f'{chain}{ring[:-1]}({sub}){ring[-1]}'
+                     if ring[-1].isdigit() else chain + ring)
+    return ''.join(parts)
+
+
+def _demo(n=500):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    rng = np.random.default_rng(0)
+    smiles = DRUGS + [_random_smiles(rng) for _ in range(n - len(DRUGS))]
+    t0 = time.perf_counter()
+    mols = [parse_smiles(s) for s in smiles]
+    t1 = time.perf_counter()
+    cache = CoordinateCache()
+    for m in mols:
+        cache.coordinates(m)            # depict and store
+    t2 = time.perf_counter()
+    for m in mols:
+        cache.coordinates(m)            # every lookup now hits
+    t3 = time.perf_counter()
+    print(f'{n} molecules: parse {1e3 * (t1 - t0):.0f} ms, depict '
+          f'{1e3 * (t2 - t1):.0f} ms, cached {1e3 * (t3 - t2):.0f} ms')
+
+    fig, ax = plt.subplots(figsize=(20, 25))
+    t0 = time.perf_counter()
+    draw_grid(ax, mols, cols=20, cache=cache)
+    ax.autoscale_view()
+    fig.canvas.draw()
+    print(f'grid draw + render: {time.perf_counter() - t0:.2f} s')
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+pagerank.py
+Sparse power-iteration PageRank with per-iteration convergence history.
+
+The transition matrix is stored once as CSR (rows = targets), so each
+iteration is a single sparse mat-vec plus O(n) vector work:
+
+    x <- alpha * (P^T x + (dangling mass) * d) + (1 - alpha) * v
+
+where v is the personalization (teleport) vector and d the distribution
+that dangling pages (no out-links) jump to -- v by default, as in
+networkx. The L1 change of x after every iteration is recorded so slides
+can plot convergence, and a previous result can be passed back in as a
+warm start after the graph or alpha changes.
+
+Usage:
+    from pagerank import pagerank
+    result = pagerank(A, alpha=0.85)
+    result['rank'], result['residuals']
+
+    python pagerank.py   # ranks a 5M-edge synthetic crawl from a .npy file
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+import csr_graph
+
+
+def transition_matrix(A):
+    """Return (PT, dangling) for adjacency A with A[u, v] = weight of u -> v.
+
+    PT is the CSR matrix of P^T, where P = D^-1 A is row-stochastic on
+    non-dangling rows; `dangling` is a boolean mask of pages with no
+    out-links.
+    """
+    A = sp.csr_matrix(A, dtype=np.float64)
+    out_weight = np.asarray(A.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv = np.zeros_like(out_weight)
+    inv[~dangling] = 1.0 / out_weight[~dangling]
+    P = sp.diags(inv) @ A
+    return P.T.tocsr(), dangling
+
+
+def _as_distribution(vec, n, name):
+    if vec is None:
+        return np.full(n, 1.0 / n)
+    vec = np.asarray(vec, dtype=np.float64)
+    if vec.shape != (n,) or (vec < 0).any() or vec.sum() <= 0:
+        raise ValueError(f'{name} must be a non-negative length-{n} vector '
+                         f'with positive sum')
+    return vec / vec.sum()
+
+
+def pagerank(A, alpha=0.85, personalization=None, dangling_weights=None,
+             x0=None, tol=1e-10, max_iter=200, transition=None):
+    """PageRank of every node by power iteration.
+
+    A                : (n x n) sparse adjacency, A[u, v] = weight of u -> v
+    personalization  : teleport distribution v (default uniform)
+    dangling_weights : where dangling pages jump to (default v)
+    x0               : warm start, e.g. the 'rank' of a previous run
+    tol              : stop once the L1 change between iterates < tol
+    transition       : precomputed transition_matrix(A), reused across runs
+
+    Returns a dict with 'rank', 'residuals' (L1 change per iteration),
+    'iterations' and 'converged'.
+    """
+    PT, dangling = transition if transition is not None \
+        else transition_matrix(A)
+    n = PT.shape[0]
+    v = _as_distribution(personalization, n, 'personalization')
+    d = v if dangling_weights is None else \
+        _as_distribution(dangling_weights, n, 'dangling_weights')
+    x = v.copy() if x0 is None else _as_distribution(x0, n, 'x0')
+
+    residuals = []
+    teleport = (1.0 - alpha) * v
+    for _ in range(max_iter):
+        x_new = PT @ x
+        x_new += x[dangling].sum() * d
+        x_new *= alpha
+        x_new += teleport
+        residual = float(np.abs(x_new - x).sum())
+        residuals.append(residual)
+        x = x_new
+        if residual < tol:
+            break
+
+    return {
+        'rank': x,
+        'residuals': np.array(residuals),
+        'iterations': len(residuals),
+        'converged': bool(residuals) and residuals[-1] < tol,
+    }
+
+
+def _demo(n=1_000_000, m=5_000_000, seed=0):
+    """Write a power-law crawl to disk, memory-map it back and rank it."""
+    rng = np.random.default_rng(seed)
+    # Preferential-attachment-like targets: low ids receive most links
+    src = rng.integers(0, n, size=m, dtype=np.int32)
+    dst = (n * rng.random(m) ** 3).astype(np.int32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'crawl.npy')
+        csr_graph.save_edge_list(path, src, dst)
+        del src, dst
+
+        t0 = time.perf_counter()
+        A = csr_graph.load_edge_list(path, n=n)
+        t1 = time.perf_counter()
+        result = pagerank(A)
+        t2 = time.perf_counter()
+
+    print(f'{n:,} pages, {A.nnz:,} links: load {t1 - t0:.2f} s, '
+          f'rank {t2 - t1:.2f} s over {result["iterations"]} iterations')
+    print('residuals:', ' '.join(f'{r:.1e}' for r in result['residuals']))
+    top = np.argsort(result['rank'])[::-1][:5]
+    print('top pages:', ', '.join(f'{p} ({result["rank"][p]:.2e})'
+                                  for p in top))
+
+
+if __name__ == '__main__':
+    _demo()
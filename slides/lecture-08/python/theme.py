@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+theme.py
+House style of the lecture slides: palette, rcParams and the figure/save path.
+
+Every gen_* script draws on the same dark 4K canvas. Instead of each one
+repeating the palette, plt.style.use('dark_background') and the
+facecolor/savefig boilerplate, they open the canvas with
+
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ...draw...
+
+which creates a 3840x2160 figure under the theme's rcParams, yields it,
+saves it through `save_slide` on a clean exit and always closes it.
+
+The rcParams are dark_background plus the slide overrides (background,
+figure size, savefig defaults), merged once and cached; slide_figure only
+enters an rc_context with the cached dict, so the global rcParams are
+never touched and back-to-back figures pay no style set-up. `warm_fonts`
+resolves the theme's font family in every weight/style the slides use,
+so matplotlib's findfont cache is hot before the first figure is drawn;
+generate_all calls it once at start-up. `theme_key()` hashes the palette,
+rcParams and save options: changing any of them here changes the key, so
+a build cache keyed on it re-renders every slide.
+
+Generators with several outputs that differ only in a few artists (an
+icon per pillar, one panel per variant) build the figure once and call
+`save_variants`: for each variant an update callback mutates the
+artists (text, colours, data), the figure is drawn to a raw RGBA buffer
+in the calling thread -- matplotlib drawing is not thread-safe -- and the
+PNG encoding and write run in a thread pool, overlapping the next draw.
+The bytes match what save_slide would have written.
+
+Usage:
+    from theme import BG, BLUE, TEXT, slide_figure
+    with slide_figure(OUTPUT_PATH, 1, 2) as (fig, (ax_l, ax_r)):
+        ...
+    with slide_figure(OUTPUT_PATH, axes=False) as (fig, _):
+        ax = fig.add_subplot(111, projection='3d')
+    with slide_figure() as (fig, ax):                # one figure, N files
+        label = ax.text(0.5, 0.5, '')
+        save_variants(fig, [('a.png', 'A'), ('b.png', 'B')], label.set_text)
+
+    python theme.py   # theme key and per-figure set-up cost
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import matplotlib
+import matplotlib.pyplot as plt
+import matplotlib.style
+from matplotlib import font_manager
+from PIL import Image, PngImagePlugin
+
+# ---------------------------------------------------------------------------
+# Palette
+# ---------------------------------------------------------------------------
+BG        = '#1b2631'
+CARD_BG   = '#1e3044'
+BLUE      = '#3498db'
+YELLOW    = '#f1c40f'
+GREEN     = '#2ecc71'
+TEAL      = '#1abc9c'
+ORANGE    = '#e67e22'
+RED       = '#e74c3c'
+PURPLE    = '#9b59b6'
+TEXT      = '#ecf0f1'
+MUTED     = '#95a5a6'
+EDGE_CLR  = '#4a5568'
+
+PALETTE = dict(BG=BG, CARD_BG=CARD_BG, BLUE=BLUE, YELLOW=YELLOW,
+               GREEN=GREEN, TEAL=TEAL, ORANGE=ORANGE, RED=RED, PURPLE=PURPLE,
+               TEXT=TEXT, MUTED=MUTED, EDGE_CLR=EDGE_CLR)
+
+# ---------------------------------------------------------------------------
+# Canvas
+# ---------------------------------------------------------------------------
+FIGSIZE = (19.2, 10.8)   # inches; x DPI = 3840x2160
+DPI = 200
+
+SAVE_KW = dict(dpi=DPI, bbox_inches='tight', facecolor=BG, edgecolor='none',
+               metadata={'Software': None})
+
+RC_OVERRIDES = {
+    'figure.figsize': FIGSIZE,
+    'figure.facecolor': BG,
+    'axes.facecolor': BG,
+    'savefig.facecolor': BG,
+    'savefig.edgecolor': 'none',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _rc_items():
+    rc = dict(matplotlib.style.library['dark_background'])
+    rc.update(RC_OVERRIDES)
+    return tuple(rc.items())
+
+
+def theme_rc():
+    """The slide rcParams (dark_background + RC_OVERRIDES) as a new dict."""
+    return dict(_rc_items())
+
+
+@functools.lru_cache(maxsize=None)
+def theme_key():
+    """Hex digest of palette, rcParams and save options."""
+    state = dict(palette=PALETTE, rc=theme_rc(), save=SAVE_KW)
+    blob = json.dumps(state, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def warm_fonts(weights=('normal', 'bold'), styles=('normal', 'italic')):
+    """Resolve the theme font in each weight/style once per process.
+
+    Returns the resolved font files; later findfont calls are cache hits.
+    """
+    with plt.rc_context(theme_rc()):
+        family = plt.rcParams['font.family']
+        return tuple(font_manager.findfont(font_manager.FontProperties(
+            family=family, weight=w, style=s))
+            for w in weights for s in styles)
+
+
+# ---------------------------------------------------------------------------
+# Figures
+# ---------------------------------------------------------------------------
+def save_slide(fig, path, verbose=True, **overrides):
+    """Save fig to path with SAVE_KW (overridden by keyword arguments)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fig.savefig(path, **{**SAVE_KW, **overrides})
+    if verbose:
+        print(f'Saved: {os.path.abspath(path)}')
+
+
+@contextmanager
+def slide_figure(path=None, nrows=1, ncols=1, axes=True, save_kw=None,
+                 **subplots_kw):
+    """Yield (fig, ax) of a themed 4K slide; save to path and close it.
+
+    nrows/ncols and the keyword arguments go to plt.subplots (ax is then
+    whatever it returns); with axes=False the figure comes bare and ax is
+    None. The figure is saved only if the block exits without an error,
+    with save_kw overriding SAVE_KW; it is closed either way.
+    """
+    with plt.rc_context(theme_rc()):
+        if axes:
+            fig, ax = plt.subplots(nrows, ncols, **subplots_kw)
+        else:
+            fig, ax = plt.figure(**subplots_kw), None
+        try:
+            yield fig, ax
+            if path is not None:
+                save_slide(fig, path, **(save_kw or {}))
+        finally:
+            plt.close(fig)
+
+
+def _write_png(path, raw, size, dpi, metadata):
+    """Encode an RGBA buffer as savefig's PNG writer would (same bytes)."""
+    info = PngImagePlugin.PngInfo()
+    entries = {'Software': f'Matplotlib version{matplotlib.__version__}, '
+                           f'https://matplotlib.org/', **(metadata or {})}
+    for key, value in entries.items():
+        if value is not None:
+            info.add_text(key, value)
+    image = Image.frombuffer('RGBA', size, raw, 'raw', 'RGBA', 0, 1)
+    image.save(path, format='png', pnginfo=info, dpi=(dpi, dpi))
+
+
+def save_variants(fig, variants, update, max_workers=4, verbose=True,
+                  **overrides):
+    """Save one figure once per (path, value) variant, mutating it between.
+
+    update(value) changes the figure's artists for that variant. Drawing
+    happens here, in order; PNG encoding runs on max_workers threads.
+    Keyword arguments override SAVE_KW as in save_slide. Returns the paths.
+    """
+    kw = {**SAVE_KW, **overrides}
+    metadata = kw.pop('metadata', None)
+    dpi = kw.get('dpi') or fig.dpi
+    paths, jobs = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for path, value in variants:
+            update(value)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            buf = io.BytesIO()
+            fig.savefig(buf, format='raw', **kw)
+            raw = buf.getvalue()
+            # The renderer savefig just drew with has the output size
+            renderer = fig.canvas.renderer
+            size = int(renderer.width), int(renderer.height)
+            if size[0] * size[1] * 4 != len(raw):
+                fig.savefig(path, metadata=metadata, **kw)
+            else:
+                jobs.append(pool.submit(_write_png, path, raw, size, dpi,
+                                        metadata))
+            paths.append(path)
+        for job in jobs:
+            job.result()
+    if verbose:
+        for path in paths:
+            print(f'Saved: {os.path.abspath(path)}')
+    return paths
+
+
+def _demo(n=20):
+    t0 = time.perf_counter()
+    fonts = warm_fonts()
+    t1 = time.perf_counter()
+    names = sorted({os.path.basename(f) for f in fonts})
+    print(f'theme key {theme_key()}; fonts warmed in '
+          f'{1e3 * (t1 - t0):.0f} ms: {names}')
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        plt.style.use('dark_background')
+        fig, ax = plt.subplots(figsize=FIGSIZE, facecolor=BG)
+        ax.set_facecolor(BG)
+        plt.close(fig)
+    t1 = time.perf_counter()
+    for _ in range(n):
+        with slide_figure() as (fig, ax):
+            pass
+    t2 = time.perf_counter()
+    print(f'figure set-up: style.use + subplots '
+          f'{1e3 * (t1 - t0) / n:.1f} ms, slide_figure '
+          f'{1e3 * (t2 - t1) / n:.1f} ms')
+
+    # Five icon-style variants: one figure each vs one shared figure
+    out = os.path.join(tempfile.mkdtemp(), '{}-{}.png')
+    letters = 'ABCDE'
+    t0 = time.perf_counter()
+    for c in letters:
+        with slide_figure(out.format('each', c), save_kw=dict(
+                verbose=False)) as (fig, ax):
+            ax.axis('off')
+            ax.text(0.5, 0.5, c, fontsize=400, color=BLUE, ha='center',
+                    va='center')
+    t1 = time.perf_counter()
+    with slide_figure() as (fig, ax):
+        ax.axis('off')
+        label = ax.text(0.5, 0.5, '', fontsize=400, color=BLUE,
+                        ha='center', va='center')
+        save_variants(fig, [(out.format('shared', c), c) for c in letters],
+                      label.set_text, verbose=False)
+    t2 = time.perf_counter()
+    same = all(open(out.format('each', c), 'rb').read()
+               == open(out.format('shared', c), 'rb').read()
+               for c in letters)
+    print(f'{len(letters)} variants: a figure each {t1 - t0:.2f} s, '
+          f'save_variants {t2 - t1:.2f} s (identical bytes: {same})')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+triple_store.py
+Compact in-memory triple store with sorted permutation indexes.
+
+Every term (entity, relation or literal) is dictionary-encoded to an int,
+so a knowledge graph is an (m, 3) int array of (subject, predicate,
+object) rows. Three sorted copies of that array -- SPO, POS and OSP --
+turn every lookup with a bound prefix into a pair of binary searches:
+
+    out-edges of s       SPO, first column = s
+    edges with label p   POS, first column = p
+    in-edges of o        OSP, first column = o
+
+Neighbourhood expansion gathers the ranges of a whole frontier at once,
+so k-hop and shortest-path queries touch only the edges they return and
+run in microseconds even over 10^7+ triples. Files are read line by line
+(N-Triples or tab-separated `s<TAB>p<TAB>o`), so dumps larger than the
+Python object overhead of a triple list still load.
+
+Usage:
+    from triple_store import TripleStore
+    store = TripleStore.from_file('dump.nt')
+    nodes, triples = store.k_hop(['Einstein'], k=2)
+    path = store.path('Einstein', 'Berlin')
+    G, pos = store.to_networkx(triples)
+
+    python triple_store.py   # build + query timings on 10M random triples
+"""
+
+import re
+import time
+
+import numpy as np
+
+# One N-Triples term: <iri>, "literal"@lang / ^^<type>, or _:blank
+_NT_TERM = re.compile(r'<[^>]*>|"(?:[^"\\]|\\.)*"(?:@[\w-]+|\^\^<[^>]*>)?'
+                      r'|_:\S+')
+
+# Column order of each permutation index
+_ORDERS = {'spo': (0, 1, 2), 'pos': (1, 2, 0), 'osp': (2, 0, 1)}
+
+
+def parse_line(line):
+    """Split one N-Triples or TSV line into (s, p, o), or None to skip."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if '\t' in line:
+        parts = line.split('\t')
+        return tuple(parts[:3]) if len(parts) >= 3 else None
+    terms = _NT_TERM.findall(line)
+    return tuple(terms[:3]) if len(terms) >= 3 else None
+
+
+def display_name(term):
+    """Short label for a term: IRI local name or bare literal text."""
+    if term.startswith('<') and term.endswith('>'):
+        iri = term[1:-1]
+        return re.split(r'[/#]', iri.rstrip('/'))[-1].replace('_', ' ')
+    if term.startswith('"'):
+        return term[1:term.rindex('"')]
+    return term
+
+
+def _ranges(sorted_col, keys):
+    """Concatenated row indices of every run sorted_col == key."""
+    lo = np.searchsorted(sorted_col, keys, side='left')
+    hi = np.searchsorted(sorted_col, keys, side='right')
+    counts = hi - lo
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+    return starts + np.arange(total)
+
+
+def _row_order(rows, n_terms):
+    """Lexicographic order of (m, 3) id rows.
+
+    Packs each row into one int64 key when the id space allows it, which
+    sorts an order of magnitude faster than np.lexsort.
+    """
+    n = max(int(n_terms), 1)
+    if n ** 3 < 2 ** 63:
+        key = (rows[:, 0] * n + rows[:, 1]) * n + rows[:, 2]
+        return np.argsort(key)
+    order = np.argsort(rows[:, 2], kind='stable')
+    key = rows[order, 0] * n + rows[order, 1]
+    return order[np.argsort(key, kind='stable')]
+
+
+class TripleStore:
+    """Dictionary-encoded triples with SPO / POS / OSP indexes."""
+
+    def __init__(self, triples, terms):
+        self.terms = list(terms)
+        self.term_id = {t: i for i, t in enumerate(self.terms)}
+        triples = np.asarray(triples, dtype=np.int64).reshape(-1, 3)
+        self.index = {}
+        self._first = {}
+        for name, cols in _ORDERS.items():
+            perm = triples[:, cols]
+            order = _row_order(perm, len(self.terms))
+            self.index[name] = np.ascontiguousarray(perm[order])
+            # Contiguous copy of the sort column for fast binary search
+            self._first[name] = self.index[name][:, 0].copy()
+
+    def __len__(self):
+        return len(self.index['spo'])
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def from_triples(cls, rows, chunk_size=1 << 20):
+        """Encode an iterable of (s, p, o) string tuples."""
+        terms, term_id = [], {}
+        chunks, buf = [], []
+
+        def encode(term):
+            i = term_id.get(term)
+            if i is None:
+                i = term_id[term] = len(terms)
+                terms.append(term)
+            return i
+
+        for s, p, o in rows:
+            buf.append(encode(s))
+            buf.append(encode(p))
+            buf.append(encode(o))
+            if len(buf) >= 3 * chunk_size:
+                chunks.append(np.array(buf, dtype=np.int64))
+                buf = []
+        chunks.append(np.array(buf, dtype=np.int64))
+        triples = np.concatenate(chunks).reshape(-1, 3)
+        # Collapse duplicate triples (dumps often repeat facts)
+        triples = np.unique(triples, axis=0)
+        return cls(triples, terms)
+
+    @classmethod
+    def from_file(cls, path, chunk_size=1 << 20):
+        """Stream an N-Triples (.nt) or tab-separated triple file."""
+        def rows():
+            with open(path, encoding='utf-8') as fh:
+                for line in fh:
+                    triple = parse_line(line)
+                    if triple is not None:
+                        yield triple
+        return cls.from_triples(rows(), chunk_size)
+
+    # -- lookups -----------------------------------------------------------
+
+    def ids(self, terms):
+        """Encode terms (strings or ids) to an int array; KeyError if unknown."""
+        if isinstance(terms, (str, int, np.integer)):
+            terms = [terms]
+        return np.array([t if isinstance(t, (int, np.integer))
+                         else self.term_id[t] for t in terms], dtype=np.int64)
+
+    def match(self, s=None, p=None, o=None):
+        """All (s, p, o) id rows matching the bound positions."""
+        bound = [x if x is None else int(self.ids(x)[0]) for x in (s, p, o)]
+        s, p, o = bound
+        if s is not None and p is None and o is not None:
+            # (s, ?, o): SPO would stop at the unbound p and drop o
+            name, key = 'osp', [o, s, p]
+        elif s is not None:
+            name, key = 'spo', [s, p, o]
+        elif p is not None:
+            name, key = 'pos', [p, o, s]
+        elif o is not None:
+            name, key = 'osp', [o, s, p]
+        else:
+            return self.index['spo'].copy()
+        rows = self.index[name]
+        lo, hi = 0, len(rows)
+        for col, value in enumerate(key):
+            if value is None:
+                break
+            column = self._first[name] if col == 0 else rows[lo:hi, col]
+            lo, hi = (lo + np.searchsorted(column, value, 'left'),
+                      lo + np.searchsorted(column, value, 'right'))
+        found = rows[lo:hi]
+        # Undo the column rotation back to (s, p, o)
+        inverse = np.argsort(_ORDERS[name])
+        return found[:, inverse]
+
+    def out_edges(self, subjects):
+        """(s, p, o) rows for every subject in the array."""
+        spo = self.index['spo']
+        return spo[_ranges(self._first['spo'], np.unique(subjects))]
+
+    def in_edges(self, objects):
+        """(s, p, o) rows for every object in the array."""
+        osp = self.index['osp']
+        rows = _ranges(self._first['osp'], np.unique(objects))
+        return osp[rows][:, [1, 2, 0]]
+
+    def k_hop(self, seeds, k=2, direction='both', max_triples=None):
+        """Nodes and triples within k hops of the seed terms.
+
+        direction is 'out', 'in' or 'both'. Expansion stops early once
+        `max_triples` edges have been collected, keeping slides legible.
+        """
+        frontier = np.unique(self.ids(seeds))
+        seen = set(frontier.tolist())
+        collected = []
+        n_triples = 0
+        for _ in range(k):
+            if frontier.size == 0:
+                break
+            parts = []
+            if direction in ('out', 'both'):
+                parts.append(self.out_edges(frontier))
+            if direction in ('in', 'both'):
+                parts.append(self.in_edges(frontier))
+            edges = np.vstack(parts)
+            collected.append(edges)
+            n_triples += len(edges)
+            reached = np.unique(edges[:, [0, 2]])
+            frontier = np.array([n for n in reached.tolist()
+                                 if n not in seen], dtype=np.int64)
+            seen.update(frontier.tolist())
+            if max_triples is not None and n_triples >= max_triples:
+                break
+        triples = (np.unique(np.vstack(collected), axis=0) if collected
+                   else np.empty((0, 3), dtype=np.int64))
+        if max_triples is not None:
+            triples = triples[:max_triples]
+        return np.array(sorted(seen), dtype=np.int64), triples
+
+    def path(self, source, target, max_hops=6):
+        """Shortest undirected path as a list of (s, p, o) id rows, or None.
+
+        Breadth-first from the source, one vectorized frontier expansion
+        per hop, keeping the edge that first reached each node.
+        """
+        src, dst = int(self.ids(source)[0]), int(self.ids(target)[0])
+        if src == dst:
+            return []
+        parent = {src: None}
+        visited = np.array([src], dtype=np.int64)
+        frontier = visited
+        for _ in range(max_hops):
+            out = self.out_edges(frontier)
+            inc = self.in_edges(frontier)
+            # (from, to, s, p, o) for both edge directions
+            steps = np.vstack([np.column_stack([out[:, 0], out[:, 2], out]),
+                               np.column_stack([inc[:, 2], inc[:, 0], inc])])
+            nodes, first = np.unique(steps[:, 1], return_index=True)
+            new = ~np.isin(nodes, visited, assume_unique=True)
+            if not new.any():
+                return None
+            for row in steps[first[new]].tolist():
+                parent[row[1]] = (row[0], tuple(row[2:]))
+            if dst in parent:
+                return self._unwind(parent, dst)
+            frontier = nodes[new]
+            visited = np.union1d(visited, frontier)
+        return None
+
+    @staticmethod
+    def _unwind(parent, node):
+        path = []
+        while parent[node] is not None:
+            prev, triple = parent[node]
+            path.append(triple)
+            node = prev
+        return path[::-1]
+
+    # -- rendering hand-off ------------------------------------------------
+
+    def label(self, term_id):
+        return display_name(self.terms[term_id])
+
+    def to_networkx(self, triples, layout='kamada_kawai', seed=42):
+        """Return (G, pos) for a set of id triples, labelled for drawing.
+
+        Nodes and the 'relation' edge attribute use display names.
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        for s, p, o in np.asarray(triples).tolist():
+            G.add_edge(self.label(s), self.label(o), relation=self.label(p))
+        if len(G) == 0:
+            return G, {}
+        if layout == 'kamada_kawai' and len(G) <= 500:
+            pos = nx.kamada_kawai_layout(G.to_undirected())
+        else:
+            pos = nx.spring_layout(G, seed=seed)
+        return G, pos
+
+
+def _check_match():
+    """match() against a brute-force filter for every bound pattern."""
+    store = TripleStore.from_triples([('a', 'r', 'b'), ('a', 'r', 'c'),
+                                      ('a', 'q', 'b'), ('c', 'q', 'a'),
+                                      ('b', 'r', 'b')])
+    spo = store.index['spo']
+    for s in (None, 'a', 'b', 'c'):
+        for p in (None, 'r', 'q'):
+            for o in (None, 'a', 'b', 'c'):
+                want = spo
+                for col, term in enumerate((s, p, o)):
+                    if term is not None:
+                        want = want[want[:, col] == store.term_id[term]]
+                got = store.match(s, p, o)
+                assert sorted(map(tuple, got.tolist())) == \
+                    sorted(map(tuple, want.tolist())), (s, p, o)
+    assert len(store.match(s='a', o='b')) == 2
+    print('match: all 48 bound/unbound patterns agree with brute force')
+
+
+def _demo(m=10_000_000, n_entities=2_000_000, n_relations=50):
+    """Index 10M random integer triples and time typical queries."""
+    _check_match()
+    rng = np.random.default_rng(0)
+    triples = np.column_stack([
+        rng.integers(0, n_entities, size=m),
+        n_entities + rng.integers(0, n_relations, size=m),
+        rng.integers(0, n_entities, size=m),
+    ])
+    terms = [f'<e{i}>' for i in range(n_entities)] + \
+            [f'<r{i}>' for i in range(n_relations)]
+
+    t0 = time.perf_counter()
+    store = TripleStore(triples, terms)
+    t1 = time.perf_counter()
+    print(f'indexed {len(store):,} triples in {t1 - t0:.1f} s')
+
+    queries = rng.integers(0, n_entities, size=1000)
+    t0 = time.perf_counter()
+    for q in queries:
+        store.match(s=int(q))
+    t1 = time.perf_counter()
+    print(f'match(s=...): {1e6 * (t1 - t0) / len(queries):.1f} us/query')
+
+    t0 = time.perf_counter()
+    for q in queries[:100]:
+        store.k_hop([int(q)], k=2)
+    t1 = time.perf_counter()
+    print(f'2-hop neighbourhood: {1e6 * (t1 - t0) / 100:.0f} us/query')
+
+    t0 = time.perf_counter()
+    found = sum(store.path(int(a), int(b), max_hops=4) is not None
+                for a, b in zip(queries[:20], queries[20:40]))
+    t1 = time.perf_counter()
+    print(f'path (<=4 hops): {1e3 * (t1 - t0) / 20:.1f} ms/query, '
+          f'{found}/20 connected')
+
+
+if __name__ == '__main__':
+    _demo()
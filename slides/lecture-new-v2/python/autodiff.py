@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+autodiff.py
+Minimal vectorized reverse-mode automatic differentiation.
+
+Every operation on a `Var` computes its NumPy value immediately and
+appends one node to the `Tape` it belongs to: the output, its inputs and
+a vector-Jacobian product (vjp) closure. Because nodes are recorded in
+execution order the tape is already topologically sorted, so
+`Tape.backward(loss)` just replays it in reverse, handing each node's
+gradient to its vjp and accumulating (+=) the results into the inputs.
+Broadcasting is undone by summing gradients back to the input's shape.
+
+All work happens in whole-array NumPy calls, so a two-layer MLP on a
+batch of 10^5 examples takes about a tenth of a second per step on one
+core, and the handful of nodes behind a figure cost nothing to recompute
+every time it is drawn.
+
+Usage:
+    from autodiff import Tape, linear, relu, cross_entropy
+    tape = Tape()
+    x = tape.input(X)
+    W, b = tape.param(W0, 'W'), tape.param(b0, 'b')
+    loss = cross_entropy(linear(relu(linear(x, W, b)), W2, b2), y)
+    tape.backward(loss)
+    W.grad, b.grad
+
+    python autodiff.py   # gradient check + MLP timing on 10^5 examples
+"""
+
+import time
+
+import numpy as np
+
+
+class Var:
+    """A value on a tape, plus its gradient once backward has run."""
+
+    def __init__(self, tape, value, op='leaf', inputs=(), vjp=None,
+                 name=None, kind='op'):
+        self.tape = tape
+        self.value = np.asarray(value)
+        self.op = op
+        self.inputs = tuple(inputs)
+        self.vjp = vjp
+        self.name = name
+        self.kind = kind            # 'input', 'param' or 'op'
+        self.grad = None
+        self.index = len(tape.nodes)
+        tape.nodes.append(self)
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    def __repr__(self):
+        return f'Var({self.name or self.op}, shape={self.shape})'
+
+    def __add__(self, other):
+        return add(self, other)
+
+    def __radd__(self, other):
+        return add(other, self)
+
+    def __sub__(self, other):
+        return add(self, neg(other))
+
+    def __rsub__(self, other):
+        return add(other, neg(self))
+
+    def __mul__(self, other):
+        return mul(self, other)
+
+    def __rmul__(self, other):
+        return mul(other, self)
+
+    def __neg__(self):
+        return neg(self)
+
+    def __matmul__(self, other):
+        return matmul(self, other)
+
+
+class Tape:
+    """Ordered record of every Var created through it."""
+
+    def __init__(self):
+        self.nodes = []
+
+    def input(self, value, name='x'):
+        return Var(self, value, name=name, kind='input')
+
+    def param(self, value, name=None):
+        return Var(self, value, name=name, kind='param')
+
+    def constant(self, value):
+        return Var(self, value, op='const', kind='const')
+
+    def zero_grad(self):
+        for node in self.nodes:
+            node.grad = None
+
+    def backward(self, out, grad=None):
+        """Accumulate d(out)/d(node) into .grad of every node on the tape."""
+        out.grad = (np.ones_like(out.value, dtype=np.result_type(
+            out.value, np.float32)) if grad is None else np.asarray(grad))
+        for node in reversed(self.nodes[:out.index + 1]):
+            if node.grad is None or node.vjp is None:
+                continue
+            for inp, g in zip(node.inputs, node.vjp(node.grad)):
+                if g is None or inp.kind == 'const':
+                    continue
+                g = _unbroadcast(g, inp.shape)
+                inp.grad = g if inp.grad is None else inp.grad + g
+
+    def ancestors(self, out):
+        """Nodes `out` depends on, in recording (topological) order."""
+        keep = {out.index}
+        for node in reversed(self.nodes[:out.index + 1]):
+            if node.index in keep:
+                keep.update(inp.index for inp in node.inputs)
+        return [n for n in self.nodes if n.index in keep]
+
+    def depths(self, out):
+        """Longest-path depth of every ancestor of `out` from the leaves."""
+        depth = {}
+        for node in self.ancestors(out):
+            depth[node.index] = 1 + max((depth[i.index] for i in node.inputs),
+                                        default=-1)
+        return depth
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _lift(tape, x):
+    return x if isinstance(x, Var) else tape.constant(x)
+
+
+def _tape_of(*xs):
+    return next(x.tape for x in xs if isinstance(x, Var))
+
+
+def _unbroadcast(g, shape):
+    """Sum a broadcast gradient back down to `shape`."""
+    g = np.asarray(g)
+    while g.ndim > len(shape):
+        g = g.sum(axis=0)
+    for axis, size in enumerate(shape):
+        if size == 1 and g.shape[axis] != 1:
+            g = g.sum(axis=axis, keepdims=True)
+    return g
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+def add(a, b):
+    tape = _tape_of(a, b)
+    a, b = _lift(tape, a), _lift(tape, b)
+    return Var(tape, a.value + b.value, 'add', (a, b),
+               lambda g: (g, g))
+
+
+def neg(a):
+    return Var(a.tape, -a.value, 'neg', (a,), lambda g: (-g,))
+
+
+def mul(a, b):
+    tape = _tape_of(a, b)
+    a, b = _lift(tape, a), _lift(tape, b)
+    return Var(tape, a.value * b.value, 'mul', (a, b),
+               lambda g: (g * b.value, g * a.value))
+
+
+def matmul(a, b):
+    tape = _tape_of(a, b)
+    a, b = _lift(tape, a), _lift(tape, b)
+
+    def vjp(g):
+        if a.value.ndim == 1 and b.value.ndim == 1:     # dot product
+            return g * b.value, g * a.value
+        if b.value.ndim == 1:
+            return np.multiply.outer(g, b.value), a.value.T @ g
+        if a.value.ndim == 1:
+            return g @ b.value.T, np.multiply.outer(a.value, g)
+        return g @ b.value.T, a.value.T @ g
+    return Var(tape, a.value @ b.value, 'matmul', (a, b), vjp)
+
+
+def linear(x, W, b):
+    """x @ W^T + b for W of shape (out, in); one node on the tape."""
+    tape = _tape_of(x, W, b)
+    x, W, b = (_lift(tape, v) for v in (x, W, b))
+
+    def vjp(g):
+        gx = g @ W.value
+        gW = (np.multiply.outer(g, x.value) if x.value.ndim == 1
+              else g.T @ x.value)
+        return gx, gW, g
+    return Var(tape, x.value @ W.value.T + b.value, 'linear', (x, W, b), vjp)
+
+
+def relu(x):
+    y = np.maximum(x.value, 0)
+    return Var(x.tape, y, 'relu', (x,), lambda g: (g * (y > 0),))
+
+
+def tanh(x):
+    y = np.tanh(x.value)
+    return Var(x.tape, y, 'tanh', (x,), lambda g: (g * (1 - y * y),))
+
+
+def exp(x):
+    y = np.exp(x.value)
+    return Var(x.tape, y, 'exp', (x,), lambda g: (g * y,))
+
+
+def log(x):
+    return Var(x.tape, np.log(x.value), 'log', (x,),
+               lambda g: (g / x.value,))
+
+
+def reduce_sum(x, axis=None, keepdims=False):
+    def vjp(g):
+        if axis is not None and not keepdims:
+            g = np.expand_dims(g, axis)
+        return (np.broadcast_to(g, x.shape),)
+    return Var(x.tape, x.value.sum(axis=axis, keepdims=keepdims), 'sum',
+               (x,), vjp)
+
+
+def mean(x, axis=None):
+    n = x.value.size if axis is None else x.shape[axis]
+    return mul(reduce_sum(x, axis), 1.0 / n)
+
+
+def softmax(x, axis=-1):
+    z = x.value - x.value.max(axis=axis, keepdims=True)
+    e = np.exp(z)
+    p = e / e.sum(axis=axis, keepdims=True)
+
+    def vjp(g):
+        return (p * (g - (g * p).sum(axis=axis, keepdims=True)),)
+    return Var(x.tape, p, 'softmax', (x,), vjp)
+
+
+def nll(p, labels):
+    """Mean negative log-probability of the labelled class."""
+    labels = np.atleast_1d(labels)
+    P = np.atleast_2d(p.value)
+    rows = np.arange(len(labels))
+    picked = P[rows, labels]
+
+    def vjp(g):
+        gp = np.zeros_like(P)
+        gp[rows, labels] = -g / (picked * len(labels))
+        return (gp.reshape(p.shape),)
+    return Var(p.tape, -np.log(picked).mean(), 'nll', (p,), vjp)
+
+
+def cross_entropy(logits, labels):
+    """Fused, numerically stable softmax + mean NLL over a batch."""
+    labels = np.asarray(labels)
+    z = logits.value - logits.value.max(axis=-1, keepdims=True)
+    logsumexp = np.log(np.exp(z).sum(axis=-1, keepdims=True))
+    logp = z - logsumexp
+    rows = np.arange(len(labels))
+
+    def vjp(g):
+        grad = np.exp(logp)
+        grad[rows, labels] -= 1
+        return (grad * (g / len(labels)),)
+    return Var(logits.tape, -logp[rows, labels].mean(), 'cross_entropy',
+               (logits,), vjp)
+
+
+# ---------------------------------------------------------------------------
+# Demo
+# ---------------------------------------------------------------------------
+def gradient_check(f, params, eps=1e-6, n_checks=5, seed=0):
+    """Max relative error of tape gradients vs central differences.
+
+    f(tape, vars) must build the scalar loss from fresh Vars.
+    """
+    def loss_value():
+        t = Tape()
+        return float(f(t, [t.param(q) for q in params]).value)
+
+    rng = np.random.default_rng(seed)
+    tape = Tape()
+    vs = [tape.param(p) for p in params]
+    tape.backward(f(tape, vs))
+    worst = 0.0
+    for p, v in zip(params, vs):
+        for _ in range(n_checks):
+            idx = tuple(rng.integers(0, s) for s in p.shape)
+            old = p[idx]
+            p[idx] = old + eps
+            up = loss_value()
+            p[idx] = old - eps
+            down = loss_value()
+            p[idx] = old
+            numeric = (up - down) / (2 * eps)
+            worst = max(worst, abs(numeric - v.grad[idx]) /
+                        max(abs(numeric), abs(v.grad[idx]), 1e-8))
+    return worst
+
+
+def _mlp_loss(X, y):
+    def f(tape, vs):
+        W1, b1, W2, b2 = vs
+        h = relu(linear(tape.constant(X), W1, b1))
+        return cross_entropy(linear(h, W2, b2), y)
+    return f
+
+
+def _vector_loss(tape, vs):
+    """Dot product plus matrix-vector and vector-matrix products."""
+    a, b, M = vs
+    return (a @ b + reduce_sum(tanh(M @ a)) + reduce_sum(tanh(b @ M)))
+
+
+def _demo(n=100_000, d=32, hidden=64, classes=10, steps=20, lr=0.5):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n, d)).astype(np.float32)
+    teacher = rng.normal(size=(classes, d)).astype(np.float32)
+    y = np.argmax(X @ teacher.T, axis=1)
+    params = [rng.normal(size=(hidden, d)) / np.sqrt(d),
+              np.zeros(hidden),
+              rng.normal(size=(classes, hidden)) / np.sqrt(hidden),
+              np.zeros(classes)]
+
+    small = [p.astype(np.float64) for p in params]
+    err = gradient_check(_mlp_loss(X[:64].astype(np.float64), y[:64]), small)
+    print(f'gradient check (64 examples): max relative error {err:.2e}')
+    err = gradient_check(_vector_loss, [rng.normal(size=8), rng.normal(
+        size=8), rng.normal(size=(8, 8)) / np.sqrt(8)])
+    print(f'gradient check (1-D matmul): max relative error {err:.2e}')
+
+    params = [p.astype(np.float32) for p in params]
+    f = _mlp_loss(X, y)
+    t0 = time.perf_counter()
+    for step in range(steps):
+        tape = Tape()
+        vs = [tape.param(p) for p in params]
+        loss = f(tape, vs)
+        tape.backward(loss)
+        for p, v in zip(params, vs):
+            p -= lr * v.grad
+        if step in (0, steps - 1):
+            print(f'  step {step:2d}: loss {float(loss.value):.4f}')
+    dt = (time.perf_counter() - t0) / steps
+    print(f'{n:,} x {d} batch, {hidden}-unit MLP: '
+          f'{1e3 * dt:.1f} ms per forward + backward + update')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+bpe_tokenizer.py
+Byte-level BPE tokenizer: trainable merges, cached encoding.
+
+Text is split into pre-tokens (words with their leading space, digit runs,
+punctuation runs, whitespace) by a GPT-2 style pattern, and each pre-token
+is handled as UTF-8 bytes, so the 256 byte values are the base vocabulary
+and nothing is ever out of vocabulary. Training learns merges: the most
+frequent adjacent pair of tokens becomes a new token, repeatedly.
+
+Training cost does not depend on re-scanning the corpus after a merge:
+
+    words       distinct pre-tokens with their counts (one pass over text)
+    symbols     every word's tokens live in one doubly linked list over flat
+                arrays, so merging a pair is an O(1) unlink
+    pair counts kept up to date from the neighbours of each merge site;
+                `where` maps a pair to the words that contain it, so only
+                those words are visited
+    heap        (-count, pair) entries, invalidated lazily: a popped entry
+                whose count is stale is pushed back with the current count
+
+Encoding applies merges by rank inside each pre-token; the word -> ids
+mapping is memoised in an LRU cache keyed by the pre-token string, so a
+common word costs one dict lookup.
+
+Usage:
+    from bpe_tokenizer import BPETokenizer
+    tok = BPETokenizer.train(['corpus.txt'], vocab_size=8000)
+    tok.save('bpe.json')
+    ids = tok.encode('The cat sat on the mat.')
+    tok.decode(ids), [tok.token_str(i) for i in ids]
+
+    python bpe_tokenizer.py   # train on a synthetic corpus, time encoding
+"""
+
+import heapq
+import json
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+PATTERN = (r"""'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d+| ?[^\s\w]+"""
+           r"""|\s+(?!\S)|\s+""")
+CHUNK_CHARS = 1 << 22
+
+
+def bytes_to_unicode():
+    """GPT-2's printable stand-in for every byte (space becomes 'Ġ')."""
+    keep = (list(range(ord('!'), ord('~') + 1)) +
+            list(range(ord('¡'), ord('¬') + 1)) +
+            list(range(ord('®'), ord('ÿ') + 1)))
+    table, extra = {}, 0
+    for b in range(256):
+        if b in keep:
+            table[b] = chr(b)
+        else:
+            table[b] = chr(256 + extra)
+            extra += 1
+    return table
+
+
+BYTE_CHARS = bytes_to_unicode()
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+def iter_text(paths, chunk_chars=CHUNK_CHARS):
+    """Yield text chunks of about chunk_chars, cut at line ends."""
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as fh:
+            while True:
+                chunk = fh.read(chunk_chars)
+                if not chunk:
+                    break
+                yield chunk + fh.readline()
+
+
+def count_words(texts, pattern=PATTERN):
+    """Counter of UTF-8 pre-tokens over an iterable of text chunks."""
+    split = re.compile(pattern).findall
+    counts = Counter()
+    for text in texts:
+        counts.update(split(text))
+    words = Counter()
+    for word, c in counts.items():
+        words[word.encode('utf-8')] += c
+    return words
+
+
+# ---------------------------------------------------------------------------
+# Training
+# ---------------------------------------------------------------------------
+def learn_merges(words, n_merges, min_count=2, verbose=False):
+    """List of (left, right) merges learned from {bytes word: count}."""
+    # Flat linked list of symbols; words are separated by sentinel -1 links
+    sym, nxt, prv = [], [], []
+    counts, heads = [], []
+    for w, (word, c) in enumerate(words.items()):
+        start = len(sym)
+        heads.append(start)
+        counts.append(c)
+        n = len(word)
+        sym.extend(word)
+        nxt.extend(range(start + 1, start + n))
+        nxt.append(-1)
+        prv.append(-1)
+        prv.extend(range(start, start + n - 1))
+
+    pairs = Counter()
+    where = {}
+    for w, start in enumerate(heads):
+        c = counts[w]
+        i = start
+        while nxt[i] != -1:
+            p = (sym[i], sym[nxt[i]])
+            pairs[p] += c
+            where.setdefault(p, set()).add(w)
+            i = nxt[i]
+    heap = [(-c, p) for p, c in pairs.items()]
+    heapq.heapify(heap)
+
+    merges = []
+    t0 = time.perf_counter()
+    while heap and len(merges) < n_merges:
+        neg, pair = heapq.heappop(heap)
+        current = pairs.get(pair, 0)
+        if -neg != current:
+            if current > 0:
+                heapq.heappush(heap, (-current, pair))
+            continue
+        if current < min_count:
+            break
+        a, b = pair
+        new = 256 + len(merges)
+        merges.append(pair)
+        touched = set()
+        for w in where.pop(pair, ()):
+            c = counts[w]
+            i = heads[w]
+            while i != -1:
+                j = nxt[i]
+                if j == -1:
+                    break
+                if sym[i] != a or sym[j] != b:
+                    i = j
+                    continue
+                left, right = prv[i], nxt[j]
+                if left != -1:
+                    old = (sym[left], a)
+                    pairs[old] -= c
+                    touched.add(old)
+                    p = (sym[left], new)
+                    pairs[p] += c
+                    where.setdefault(p, set()).add(w)
+                    touched.add(p)
+                if right != -1:
+                    old = (b, sym[right])
+                    pairs[old] -= c
+                    touched.add(old)
+                    p = (new, sym[right])
+                    pairs[p] += c
+                    where.setdefault(p, set()).add(w)
+                    touched.add(p)
+                pairs[pair] -= c
+                sym[i] = new
+                nxt[i] = right
+                if right != -1:
+                    prv[right] = i
+                i = right
+        del pairs[pair]
+        touched.discard(pair)
+        for p in touched:
+            c = pairs[p]
+            if c > 0:
+                heapq.heappush(heap, (-c, p))
+            elif p in pairs:
+                del pairs[p]
+        if verbose and len(merges) % 2000 == 0:
+            print(f'  {len(merges):6d} merges, '
+                  f'{time.perf_counter() - t0:.1f} s, heap {len(heap):,}')
+    return merges
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+class BPETokenizer:
+    """Byte-level BPE with merge ranks and an LRU word cache."""
+
+    def __init__(self, merges, pattern=PATTERN, cache_size=1 << 16):
+        self.merges = [tuple(m) for m in merges]
+        self.pattern = pattern
+        self._split = re.compile(pattern).findall
+        self.ranks = {m: r for r, m in enumerate(self.merges)}
+        self.vocab = [bytes([b]) for b in range(256)]
+        for a, b in self.merges:
+            self.vocab.append(self.vocab[a] + self.vocab[b])
+        self._encode_word = lru_cache(maxsize=cache_size)(self._bpe_piece)
+
+    @classmethod
+    def train(cls, paths, vocab_size=8000, pattern=PATTERN, verbose=False):
+        """Learn vocab_size - 256 merges from the text files in paths."""
+        t0 = time.perf_counter()
+        words = count_words(iter_text(paths), pattern)
+        if verbose:
+            print(f'  counted {sum(words.values()):,} pre-tokens '
+                  f'({len(words):,} distinct) in '
+                  f'{time.perf_counter() - t0:.1f} s')
+        return cls(learn_merges(words, vocab_size - 256, verbose=verbose),
+                   pattern)
+
+    @classmethod
+    def from_words(cls, words, vocab_size=8000, pattern=PATTERN):
+        """Learn merges from an existing {bytes word: count} mapping."""
+        return cls(learn_merges(words, vocab_size - 256), pattern)
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def _bpe(self, word):
+        ids = list(word)
+        ranks = self.ranks
+        while len(ids) > 1:
+            best, at = None, -1
+            for k in range(len(ids) - 1):
+                r = ranks.get((ids[k], ids[k + 1]))
+                if r is not None and (best is None or r < best):
+                    best, at = r, k
+            if best is None:
+                break
+            a, b = self.merges[best]
+            new = 256 + best
+            out, k = ids[:at], at
+            while k < len(ids):
+                if k < len(ids) - 1 and ids[k] == a and ids[k + 1] == b:
+                    out.append(new)
+                    k += 2
+                else:
+                    out.append(ids[k])
+                    k += 1
+            ids = out
+        return tuple(ids)
+
+    def _bpe_piece(self, piece):
+        return self._bpe(piece.encode('utf-8'))
+
+    def encode(self, text):
+        enc = self._encode_word
+        return [i for piece in self._split(text) for i in enc(piece)]
+
+    def encode_pieces(self, text):
+        """[(pre-token, ids)] for showing how a text is segmented."""
+        return [(piece, list(self._encode_word(piece)))
+                for piece in self._split(text)]
+
+    def decode(self, ids):
+        return b''.join(self.vocab[i] for i in ids).decode(
+            'utf-8', errors='replace')
+
+    def token_str(self, i):
+        """Printable form of token i, bytes mapped GPT-2 style."""
+        return ''.join(BYTE_CHARS[b] for b in self.vocab[i])
+
+    def cache_info(self):
+        return self._encode_word.cache_info()
+
+    def save(self, path):
+        with open(path, 'w') as fh:
+            json.dump({'pattern': self.pattern, 'merges': self.merges}, fh)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as fh:
+            data = json.load(fh)
+        return cls(data['merges'], data['pattern'])
+
+
+def synthetic_corpus(n_chars=20_000_000, vocab=30_000, seed=0):
+    """Zipf-distributed pseudo-words built from a syllable inventory, in
+    sentences with punctuation and numbers: text with a realistic word
+    frequency curve, for timing without a corpus on disk."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    onsets = ['', 'b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's',
+              't', 'v', 'w', 'st', 'tr', 'pl', 'ch', 'th', 'sh']
+    nuclei = ['a', 'e', 'i', 'o', 'u', 'ea', 'ou', 'ai']
+    codas = ['', '', 'n', 'r', 's', 't', 'l', 'ng', 'st', 'd']
+    lengths = rng.integers(1, 5, size=vocab)
+    lex = []
+    for n in lengths:
+        lex.append(''.join(onsets[rng.integers(len(onsets))] +
+                           nuclei[rng.integers(len(nuclei))] +
+                           codas[rng.integers(len(codas))]
+                           for _ in range(n)))
+    p = 1 / np.arange(1, vocab + 1)
+    p /= p.sum()
+    out, size = [], 0
+    while size < n_chars:
+        ids = rng.choice(vocab, size=200_000, p=p)
+        words = [lex[i] for i in ids]
+        for k in range(0, len(words), 12):
+            words[k] = words[k].capitalize()
+        for k in range(11, len(words), 12):
+            words[k] += '.' if k % 5 else ','
+        for k in range(7, len(words), 97):
+            words[k] = str(int(rng.integers(1, 3000)))
+        text = ' '.join(words) + '\n'
+        out.append(text)
+        size += len(text)
+    return ''.join(out)[:n_chars]
+
+
+def _demo(n_chars=20_000_000, vocab_size=8000):
+    import os
+    import tempfile
+    text = synthetic_corpus(n_chars)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpus.txt')
+        with open(path, 'w') as fh:
+            fh.write(text)
+        t0 = time.perf_counter()
+        tok = BPETokenizer.train([path], vocab_size, verbose=True)
+        print(f'trained {len(tok):,}-token vocabulary on '
+              f'{n_chars / 1e6:.0f} MB in {time.perf_counter() - t0:.1f} s')
+        tok.save(os.path.join(tmp, 'bpe.json'))
+        assert BPETokenizer.load(os.path.join(tmp, 'bpe.json')).merges == \
+            tok.merges
+
+    sample = text[:5_000_000]
+    t0 = time.perf_counter()
+    ids = tok.encode(sample)
+    dt = time.perf_counter() - t0
+    assert tok.decode(ids) == sample
+    info = tok.cache_info()
+    print(f'encoded 5 MB in {dt:.2f} s ({5 / dt:.1f} MB/s), '
+          f'{len(sample) / len(ids):.2f} chars/token, cache hit rate '
+          f'{info.hits / (info.hits + info.misses):.1%}')
+    s = 'The cat sat on the mat, 1234 times.'
+    print(' | '.join(tok.token_str(i) for i in tok.encode(s)))
+
+
+if __name__ == '__main__':
+    _demo()
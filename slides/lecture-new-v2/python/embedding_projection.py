@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+embedding_projection.py
+2-D projections of large embedding matrices: randomized PCA and FFT t-SNE.
+
+Embeddings are read from disk memory-mapped (.npy, or a raw float32 file
+with a known width) and only ever touched in row chunks, so a matrix
+larger than memory still projects.
+
+    randomized_pca   Halko-Martinsson-Tropp randomized SVD of the centred
+                     matrix: a Gaussian sketch, a few power iterations and
+                     an SVD of a (k + oversample) x dim block. Centring is
+                     applied implicitly per chunk, never to a copy.
+    fft_tsne         t-SNE on the PCA coordinates. Neighbours come from
+                     k-means cells (exact distances from each cell to its
+                     nprobe nearest cells), input affinities from a
+                     per-row perplexity search -- or, past UNIFORM_ABOVE
+                     points, uniform weights on a 15-NN graph -- and the
+                     O(n^2) repulsion from an FIt-SNE style grid: points
+                     are splatted onto a mesh, convolved with the Cauchy
+                     kernels by FFT and interpolated back, so an iteration
+                     is O(n + G^2 log G).
+
+On one core, 100k x 768 float32 vectors take about 4 s of PCA and 40 s
+of t-SNE (750 iterations).
+
+`project` wraps both behind a cache: the coordinates are stored as .npy
+under a key built from a hash of the matrix contents, the method and its
+parameters, so a slide re-renders without recomputing anything.
+
+Usage:
+    from embedding_projection import load_embeddings, project
+    X = load_embeddings('vectors.npy')               # memory-mapped
+    xy = project(X, 'tsne', cache_dir='.proj-cache', perplexity=30)
+    xy = project(X, 'pca', cache_dir='.proj-cache')
+
+    python embedding_projection.py   # project 100k x 768 synthetic vectors
+"""
+
+import functools
+import hashlib
+import os
+import time
+
+import numpy as np
+
+CHUNK_ROWS = 8192
+UNIFORM_ABOVE = 50_000   # fft_tsne's 'auto' affinity switches to uniform kNN
+GRID_SPACING = 0.7       # t-SNE repulsion mesh step, in embedding units
+KERNEL_STEPS = 16        # cached kernel spectra per octave of mesh step
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+def load_embeddings(path, dim=None, dtype=np.float32):
+    """Memory-map an (n, dim) matrix from .npy or a raw binary file."""
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if dim is None:
+        raise ValueError('raw embedding files need dim=')
+    return np.memmap(path, dtype=dtype, mode='r').reshape(-1, dim)
+
+
+def iter_rows(X, chunk_rows=CHUNK_ROWS):
+    """Yield (start, float32 block) pairs covering the rows of X."""
+    for lo in range(0, X.shape[0], chunk_rows):
+        yield lo, np.asarray(X[lo:lo + chunk_rows], dtype=np.float32)
+
+
+def matrix_fingerprint(X, chunk_rows=CHUNK_ROWS):
+    """blake2b of the shape, dtype and every byte of X, read in chunks."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(f'{X.shape}|{X.dtype}'.encode())
+    for lo in range(0, X.shape[0], chunk_rows):
+        h.update(np.ascontiguousarray(X[lo:lo + chunk_rows]).data)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Randomized PCA
+# ---------------------------------------------------------------------------
+class PCAResult:
+    """Mean, principal axes and coordinates of a randomized PCA."""
+
+    def __init__(self, mean, components, singular_values, total_variance,
+                 coords, n):
+        self.mean = mean
+        self.components = components                  # (k, dim)
+        self.explained_variance = singular_values ** 2 / (n - 1)
+        self.explained_variance_ratio = \
+            self.explained_variance / total_variance
+        self.coords = coords                          # (n, k)
+
+    def transform(self, X, chunk_rows=CHUNK_ROWS):
+        return np.concatenate([(block - self.mean) @ self.components.T
+                               for _, block in iter_rows(X, chunk_rows)])
+
+
+def randomized_pca(X, k=50, oversample=10, n_iter=7, seed=0,
+                   chunk_rows=CHUNK_ROWS):
+    """Top-k PCA of X via a randomized range finder, in row chunks."""
+    n, dim = X.shape
+    k = min(k, dim, n)
+    rng = np.random.default_rng(seed)
+    mean = np.zeros(dim)
+    total = 0.0
+    for _, block in iter_rows(X, chunk_rows):
+        mean += block.sum(axis=0, dtype=np.float64)
+    mean = (mean / n).astype(np.float32)
+    for _, block in iter_rows(X, chunk_rows):
+        total += float(((block - mean) ** 2).sum(dtype=np.float64))
+    total /= n - 1
+
+    def times(M):          # (X - mean) @ M, as an (n, l) array
+        out = np.empty((n, M.shape[1]), dtype=np.float32)
+        shift = mean @ M
+        for lo, block in iter_rows(X, chunk_rows):
+            out[lo:lo + len(block)] = block @ M - shift
+        return out
+
+    def t_times(Q):        # (X - mean)^T @ Q, as a (dim, l) array
+        out = np.zeros((dim, Q.shape[1]), dtype=np.float64)
+        for lo, block in iter_rows(X, chunk_rows):
+            out += block.T @ Q[lo:lo + len(block)]
+        return (out - np.outer(mean, Q.sum(axis=0))).astype(np.float32)
+
+    # Power iterations on Xc^T Xc: only the small (dim, l) factor is
+    # re-orthonormalised each round; the tall (n, l) QR happens once.
+    W = rng.normal(size=(dim, k + oversample)).astype(np.float32)
+    for _ in range(n_iter):
+        W, _ = np.linalg.qr(t_times(times(W)))
+    Q, _ = np.linalg.qr(times(W))
+    B = t_times(Q).T                                  # (l, dim) = Q^T Xc
+    Ub, S, Vt = np.linalg.svd(B.astype(np.float64), full_matrices=False)
+    coords = (Q @ Ub[:, :k].astype(np.float32)) * S[:k].astype(np.float32)
+    # Fix signs so the largest loading of every axis is positive
+    flip = np.sign(Vt[np.arange(k), np.abs(Vt[:k]).argmax(axis=1)])
+    return PCAResult(mean, (Vt[:k] * flip[:, None]).astype(np.float32),
+                     S[:k], total, coords * flip.astype(np.float32), n)
+
+
+# ---------------------------------------------------------------------------
+# Approximate nearest neighbours
+# ---------------------------------------------------------------------------
+def _kmeans(Y, nlist, rng, n_iter=8, sample=None):
+    """Lloyd's k-means on a row sample; returns (nlist, dim) centroids."""
+    n = len(Y)
+    sample = min(n, sample or 64 * nlist)
+    S = Y[np.sort(rng.choice(n, size=sample, replace=False))]
+    centroids = S[rng.choice(sample, size=nlist, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _nearest_centroid(S, centroids)
+        counts = np.bincount(labels, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, S)
+        ok = counts > 0             # empty cells keep their old centroid
+        centroids[ok] = sums[ok] / counts[ok, None]
+    return centroids
+
+
+def _nearest_centroid(Y, centroids, chunk_rows=CHUNK_ROWS):
+    cc = np.einsum('ij,ij->i', centroids, centroids)
+    return np.concatenate([np.argmin(cc - 2 * block @ centroids.T, axis=1)
+                           for _, block in iter_rows(Y, chunk_rows)])
+
+
+def knn_graph(Y, k=90, nlist=None, nprobe=8, seed=0):
+    """Approximate kNN (ids, squared distances) over k-means cells.
+
+    The rows are partitioned into nlist ~ sqrt(n) cells; every cell's
+    members are scored exactly, in one matrix product, against the
+    members of the nprobe cells whose centroids are nearest its own.
+    Rows with fewer than k candidates are padded with themselves at
+    distance inf.
+    """
+    Y = np.ascontiguousarray(Y, dtype=np.float32)
+    n = len(Y)
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist or int(np.sqrt(n)), n)
+    centroids = _kmeans(Y, nlist, rng)
+    labels = _nearest_centroid(Y, centroids)
+    order = np.argsort(labels, kind='stable')
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+    cc = np.einsum('ij,ij->i', centroids, centroids)
+    probes = np.argsort(cc[:, None] + cc - 2 * centroids @ centroids.T,
+                        axis=1)[:, :min(nprobe, nlist)]
+
+    sq = np.einsum('ij,ij->i', Y, Y)
+    idx = np.repeat(np.arange(n)[:, None], k, axis=1)
+    dist = np.full((n, k), np.inf, dtype=np.float32)
+    for c in range(nlist):
+        rows = order[offsets[c]:offsets[c + 1]]
+        if len(rows) == 0:
+            continue
+        cand = np.concatenate([order[offsets[p]:offsets[p + 1]]
+                               for p in probes[c]])
+        D = sq[rows, None] + sq[cand] - 2 * Y[rows] @ Y[cand].T
+        D[rows[:, None] == cand] = np.inf
+        kk = min(k, len(cand) - 1)
+        if kk < 1:
+            continue
+        part = np.argpartition(D, kk - 1, axis=1)[:, :kk]
+        idx[rows, :kk] = cand[part]
+        dist[rows, :kk] = np.take_along_axis(D, part, axis=1)
+    return idx, np.maximum(dist, 0)
+
+
+# ---------------------------------------------------------------------------
+# t-SNE
+# ---------------------------------------------------------------------------
+def perplexity_affinities(idx, dist, perplexity=30.0, n_steps=40):
+    """Symmetric t-SNE input affinities over the kNN graph.
+
+    Each row's Gaussian precision is found by a vectorized bisection on
+    log-perplexity; p_j|i + p_i|j of every unordered pair is merged into
+    one edge. Returns (a, b, p) with a < b and sum(2 p) = 1.
+    """
+    n, k = idx.shape
+    d = dist.astype(np.float64)
+    d = d - d.min(axis=1, keepdims=True)
+    d[~np.isfinite(d)] = np.inf
+    target = np.log(min(perplexity, (k - 1) / 3))
+    lo = np.zeros(n)
+    hi = np.full(n, np.inf)
+    beta = np.ones(n)
+    d_finite = np.where(np.isfinite(d), d, 0)
+    for _ in range(n_steps):
+        w = np.exp(-d * beta[:, None])
+        s = np.maximum(w.sum(axis=1), 1e-300)
+        H = np.log(s) + beta * (w * d_finite).sum(axis=1) / s
+        if np.abs(H - target).max() < 1e-4:
+            break
+        high = H > target                 # too flat: raise the precision
+        lo = np.where(high, beta, lo)
+        hi = np.where(high, hi, beta)
+        beta = np.where(np.isinf(hi), beta * 2, (lo + hi) / 2)
+    return _symmetrize(idx, w / s[:, None])
+
+
+def uniform_affinities(idx):
+    """Symmetric affinities with p_j|i = 1/k over each row's k
+    neighbours; same output as perplexity_affinities.
+
+    Boehm, Berens & Kobak (2022) show that t-SNE on a uniform 15-NN
+    graph gives practically the embedding of perplexity 30, from a sixth
+    of the edges -- and the edges are what every iteration pays for.
+    """
+    n, k = idx.shape
+    return _symmetrize(idx, np.full((n, k), 1.0 / k))
+
+
+def _symmetrize(idx, P):
+    """Merge p_j|i + p_i|j of every unordered pair into one edge (a < b,
+    sorted by a) carrying (p_j|i + p_i|j) / 2n."""
+    n, k = idx.shape
+    rows = np.repeat(np.arange(n), k)
+    cols = idx.ravel()
+    vals = P.ravel()
+    ok = (rows != cols) & (vals > 0)
+    a = np.minimum(rows, cols)[ok]
+    b = np.maximum(rows, cols)[ok]
+    key, inv = np.unique(a * n + b, return_inverse=True)
+    p = np.bincount(inv, vals[ok]) / (2 * n)
+    return key // n, key % n, p
+
+
+@functools.lru_cache(maxsize=32)
+def _cauchy_spectra(size, step):
+    """rfft2 of w and w^2 on a (size, size) periodic mesh of step
+    2^(step / KERNEL_STEPS), as a (2, size, size // 2 + 1) array."""
+    h = 2.0 ** (step / KERNEL_STEPS)
+    off = (np.fft.fftfreq(size, 1 / size) * h).astype(np.float32)
+    k1 = 1 / (1 + off[:, None] ** 2 + off[None, :] ** 2)
+    return np.fft.rfft2(np.stack([k1, k1 * k1]))
+
+
+def _kernel_spectra(size, h):
+    """Kernel spectra for mesh step h, blended linearly in log h from the
+    two cached ladder steps around it: the mesh step changes every
+    iteration, the ladder steps only every few dozen."""
+    x = KERNEL_STEPS * np.log2(h)
+    step = int(np.floor(x))
+    t = np.float32(x - step)
+    return ((1 - t) * _cauchy_spectra(size, step) +
+            t * _cauchy_spectra(size, step + 1))
+
+
+def _kernel_sums(pos, grid):
+    """Grid approximation of sum_j w_ij and sum_j w_ij^2 (y_i - y_j), with
+    w = 1 / (1 + |y_i - y_j|^2), for pos of shape (2, n): bilinear splat,
+    FFT convolution, bilinear interpolation back to the points.
+
+    The three splatted fields (density and the two coordinate-weighted
+    densities) go through one batched float32 FFT, and the four
+    convolutions come back in one inverse FFT. Both are done one axis at
+    a time, skipping the all-zero half of the padded rows on the way in
+    and the discarded half on the way out. The kernel spectra come from
+    _kernel_spectra, so they are not rebuilt every iteration. Returns
+    (Z, rep) with Z the normalisation sum_{i != j} w_ij and rep of shape
+    (2, n).
+    """
+    n = pos.shape[1]
+    lo = pos.min(axis=1)
+    h = max(float((pos.max(axis=1) - lo).max()), 1e-6) / (grid - 1)
+    u = ((pos - lo[:, None]) / h).astype(np.float32)
+    i0 = np.minimum(u.astype(np.int64), grid - 2)
+    t = u - i0.astype(np.float32)
+    corners = []
+    for dx in (0, 1):
+        for dy in (0, 1):
+            wgt = (t[0] if dx else 1 - t[0]) * (t[1] if dy else 1 - t[1])
+            corners.append(((i0[0] + dx) * grid + i0[1] + dy, wgt))
+    flat = np.concatenate([c for c, _ in corners])
+    wflat = np.concatenate([w for _, w in corners])
+
+    fields = np.empty((3, grid * grid), dtype=np.float32)
+    for f, q in enumerate((None, pos[0], pos[1])):
+        fields[f] = np.bincount(flat, wflat if q is None else
+                                (wflat.reshape(4, n) * q).ravel(),
+                                grid * grid)
+
+    size = 2 * grid
+    kernels = _kernel_spectra(size, h)
+    spectra = np.fft.fft(np.fft.rfft(fields.reshape(3, grid, grid), size,
+                                     axis=2), size, axis=1)
+    conv = np.empty((4,) + spectra.shape[1:], dtype=spectra.dtype)
+    np.multiply(kernels[0], spectra[0], out=conv[0])
+    np.multiply(kernels[1], spectra, out=conv[1:])
+    phi = np.fft.irfft(np.fft.ifft(conv, axis=1)[:, :grid], size,
+                       axis=2)[:, :, :grid].reshape(4, -1)
+    # sum_i sum_j w_ij needs no interpolation: it is sum(rho * phi_w)
+    Z = float(fields[0] @ phi[0]) - n
+    # sum w^2, sum w^2 y_x, sum w^2 y_y per node: gather all four
+    # corners of all three fields at once, then weight and sum them
+    at = np.einsum('fcn,cn->fn', np.take(phi[1:], flat, axis=1).reshape(
+        3, 4, n), wflat.reshape(4, n))
+    return Z, pos * at[0] - at[1:]
+
+
+def _attraction(z, a, b, p, heads, tails):
+    """sum_j p_ij w_ij (y_i - y_j) over the edges (a, b), as complex (n,).
+
+    Points are complex (x + iy), so one gather, product and reduction
+    covers both axes. Edges are sorted by a, so the a-side sums are one
+    reduceat over the runs that start at heads = (ids, offsets); the
+    b-side sums reduce the same terms taken in the order tails =
+    (order, ids, offsets) that sorts b.
+    """
+    d = np.take(z, a)
+    d -= np.take(z, b)
+    w = d.real * d.real
+    w += d.imag * d.imag
+    w += 1
+    np.divide(p, w, out=w)
+    d *= w
+    ids, offsets = heads
+    order, ids_b, offsets_b = tails
+    out = np.zeros(len(z), dtype=np.complex64)
+    out[ids] = np.add.reduceat(d, offsets)
+    out[ids_b] -= np.add.reduceat(np.take(d, order), offsets_b)
+    return out
+
+
+def fft_tsne(Y, perplexity=30.0, n_iter=750, exaggeration_iter=250,
+             exaggeration=12.0, learning_rate=None, grid=None, nprobe=8,
+             seed=0, init=None, affinity='auto', n_neighbors=15,
+             verbose=False):
+    """2-D t-SNE of the rows of Y (typically PCA coordinates).
+
+    affinity is 'perplexity' (Gaussian over 3 * perplexity neighbours),
+    'uniform' (over n_neighbors) or 'auto': perplexity up to
+    UNIFORM_ABOVE points, uniform beyond. Optimisation follows the usual
+    recipe: early exaggeration with momentum 0.5, then momentum 0.8,
+    per-coordinate gains, and a learning rate of n / exaggeration. `init`
+    defaults to the first two columns of Y (the PCA axes) scaled to a
+    standard deviation of 1e-4.
+    """
+    t0 = time.perf_counter()
+    n = len(Y)
+    if affinity == 'auto':
+        affinity = 'uniform' if n > UNIFORM_ABOVE else 'perplexity'
+    if affinity not in ('perplexity', 'uniform'):
+        raise ValueError(f'unknown affinity {affinity!r}')
+    if affinity == 'uniform':
+        idx, _ = knn_graph(Y, min(n_neighbors, n - 1), nprobe=nprobe,
+                           seed=seed)
+        a, b, p = uniform_affinities(idx)
+    else:
+        k = min(int(3 * perplexity), n - 1)
+        idx, dist = knn_graph(Y, k, nprobe=nprobe, seed=seed)
+        a, b, p = perplexity_affinities(idx, dist, perplexity)
+    p = p.astype(np.float32)
+    heads = np.unique(a, return_index=True)
+    order = np.argsort(b, kind='stable')
+    tails = (order,) + np.unique(b[order], return_index=True)
+    if verbose:
+        print(f'  kNN + affinities: {time.perf_counter() - t0:.1f} s '
+              f'({len(p):,} edges)')
+
+    if init is None:
+        init = np.asarray(Y[:, :2], dtype=np.float64)
+    # Optimiser state is (2, n) float32: every per-axis reduction is
+    # contiguous, and the per-iteration updates move half the bytes
+    pos = (np.ascontiguousarray(init.T) / init[:, 0].std() *
+           1e-4).astype(np.float32)
+    eta = learning_rate or max(n / exaggeration, 50)
+    vel = np.zeros_like(pos)
+    gains = np.ones_like(pos)
+    attr = np.empty_like(pos)
+    z = np.empty(n, dtype=np.complex64)
+    for it in range(n_iter):
+        exag = exaggeration if it < exaggeration_iter else 1.0
+        momentum = 0.5 if it < exaggeration_iter else 0.8
+        z.real, z.imag = pos
+        f = _attraction(z, a, b, p, heads, tails)
+        attr[0], attr[1] = f.real, f.imag
+        extent = float(np.ptp(pos, axis=1).max())
+        # Multiples of 32 keep the padded FFT length smooth
+        g = grid or 32 * int(np.clip(np.ceil(extent / GRID_SPACING / 32),
+                                     2, 12))
+        Z, rep = _kernel_sums(pos, g)
+        grad = rep
+        grad *= -4 / max(Z, 1e-12)
+        grad += 4 * exag * attr
+        inc = (grad > 0) != (vel > 0)
+        gains = np.maximum(np.where(inc, gains + 0.2, gains * 0.8), 0.01)
+        vel *= momentum
+        grad *= gains
+        vel -= eta * grad
+        pos += vel
+        pos -= pos.mean(axis=1, keepdims=True, dtype=np.float64)
+        if verbose and (it + 1) % 250 == 0:
+            print(f'  iter {it + 1}: {time.perf_counter() - t0:.1f} s, '
+                  f'grid {g}, extent {extent:.0f}')
+    return pos.T.astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Cached entry point
+# ---------------------------------------------------------------------------
+def project(X, method='tsne', cache_dir=None, pca_dims=50, seed=0,
+            chunk_rows=CHUNK_ROWS, **params):
+    """(n, 2) coordinates of the rows of X by 'pca' or 'tsne'.
+
+    With cache_dir set, results are stored as .npy keyed by a hash of
+    the matrix, the method and every parameter.
+    """
+    if method not in ('pca', 'tsne'):
+        raise ValueError(f'unknown projection method {method!r}')
+    cache_path = None
+    if cache_dir:
+        spec = f'{method}|{pca_dims}|{seed}|{sorted(params.items())}'
+        key = hashlib.blake2b((matrix_fingerprint(X, chunk_rows) +
+                               spec).encode(), digest_size=12).hexdigest()
+        cache_path = os.path.join(cache_dir, f'{method}-{key}.npy')
+        if os.path.exists(cache_path):
+            return np.load(cache_path)
+
+    pca = randomized_pca(X, 2 if method == 'pca' else pca_dims, seed=seed,
+                         chunk_rows=chunk_rows)
+    if method == 'pca':
+        xy = pca.coords[:, :2]
+    else:
+        xy = fft_tsne(pca.coords, seed=seed, **params)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_path, xy)
+    return xy
+
+
+def synthetic_embeddings(n=100_000, dim=768, n_topics=40, topic_dim=24,
+                         spread=0.6, seed=0):
+    """Unit vectors drawn around n_topics centres, each living mostly in
+    its own random topic_dim-dimensional subspace, plus isotropic noise.
+    Returns (X, topic) with X float32 of shape (n, dim)."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_topics, dim))
+    bases = rng.normal(size=(n_topics, topic_dim, dim)) / np.sqrt(dim)
+    topic = rng.integers(0, n_topics, size=n)
+    X = np.empty((n, dim), dtype=np.float32)
+    for lo in range(0, n, CHUNK_ROWS):
+        t = topic[lo:lo + CHUNK_ROWS]
+        coef = rng.normal(size=(len(t), topic_dim)) * spread * np.sqrt(dim)
+        v = centres[t] + np.einsum('nk,nkd->nd', coef, bases[t]) + \
+            0.5 * rng.normal(size=(len(t), dim))
+        X[lo:lo + len(t)] = v / np.linalg.norm(v, axis=1, keepdims=True)
+    return X, topic
+
+
+def _demo(n=100_000, dim=768):
+    X, topic = synthetic_embeddings(n, dim)
+
+    t0 = time.perf_counter()
+    pca = randomized_pca(X, 50)
+    dt = time.perf_counter() - t0
+    # Eigenvalues of isotropic-ish data are nearly degenerate, so compare
+    # the variance the top 20 axes capture rather than single values
+    exact = (np.linalg.svd(X[:5000] - X[:5000].mean(axis=0),
+                           compute_uv=False)[:20] ** 2 / 4999).sum()
+    sub = randomized_pca(X[:5000], 20).explained_variance.sum()
+    print(f'randomized PCA of {n:,} x {dim}: {dt:.1f} s, top-50 explain '
+          f'{pca.explained_variance_ratio.sum():.1%}; 5k-row check: top-20 '
+          f'variance {sub / exact:.4f} of exact')
+
+    Y = pca.coords
+    sample = np.random.default_rng(1).choice(n, 500, replace=False)
+    sq = np.einsum('ij,ij->i', Y, Y)
+    d = sq[sample, None] + sq[None, :] - 2 * Y[sample] @ Y.T
+    d[np.arange(500), sample] = np.inf
+    true = np.argsort(d, axis=1)[:, :15]
+    t0 = time.perf_counter()
+    idx, _ = knn_graph(Y, 15)
+    recall = np.mean([len(set(true[i]) & set(idx[s])) / 15
+                      for i, s in enumerate(sample)])
+    print(f'k-means cell 15-NN: {time.perf_counter() - t0:.1f} s, '
+          f'recall {recall:.2f}')
+
+    t0 = time.perf_counter()
+    xy = fft_tsne(Y, verbose=True)
+    tsne = time.perf_counter() - t0
+    print(f'FFT t-SNE of {n:,} points: {tsne:.1f} s '
+          f'(PCA + t-SNE: {dt + tsne:.1f} s)')
+    centres = np.array([xy[topic == t].mean(axis=0) for t in range(40)])
+    within = np.mean([np.linalg.norm(xy[topic == t] - centres[t],
+                                     axis=1).mean() for t in range(40)])
+    between = np.linalg.norm(centres[:, None] - centres[None], axis=-1)
+    print(f'  mean within-topic radius {within:.1f}, nearest other topic '
+          f'{np.sort(between, axis=1)[:, 1].mean():.1f}')
+
+
+if __name__ == '__main__':
+    _demo()
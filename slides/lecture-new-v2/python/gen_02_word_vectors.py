@@ -2,137 +2,193 @@
 """
 gen_02_word_vectors.py
 2D scatter plot of the king-man+woman=queen word embedding analogy.
+
+With VECTORS_FILE set, the words are placed by a PCA of their real
+embeddings (word_analogy.py) and the equation shows the actual nearest
+word to king - man + woman; otherwise the hand-placed layout is drawn.
+
 Output: ../images/02-word-vectors.png (3840x2160, 4K)
 """
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.patches import FancyArrowPatch
 
+from word_analogy import WordVectors, neighborhood_pca
+from theme import (BLUE, YELLOW, GREEN, TEAL, ORANGE, RED, TEXT, MUTED,
+                   slide_figure)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '02-word-vectors.png')
 
-BG      = '#1b2631'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-TEAL    = '#1abc9c'
-ORANGE  = '#e67e22'
-RED     = '#e74c3c'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+VECTORS_FILE = None  # e.g. 'glove.6B.300d.txt' (converted once to .npy +
+                     # .vocab.txt beside it); None = hand-placed layout
+
+# Box the embedded words must fall in (data coordinates of the axes)
+BOX_X = (-1.2, 5.2)
+BOX_Y = (-0.2, 3.9)
+
+
+def embedded_layout(words, bg_words):
+    """Place words and bg_words by PCA of VECTORS_FILE's vectors.
+
+    The PCA is fitted on the four analogy words alone and rotated so the
+    gender direction (man -> woman, king -> queen) runs left to right and
+    king sits above man; the result is scaled so the parallelogram keeps
+    the size and centre of the hand-placed one, and background words
+    falling outside BOX_X x BOX_Y are left out. Returns (words, bg_words,
+    analogy), analogy being (answer, cosine, position of king - man +
+    woman). Without VECTORS_FILE the inputs come back unchanged and
+    analogy is None.
+    """
+    if not VECTORS_FILE:
+        return words, bg_words, None
+    wv = WordVectors.load(os.path.join(SCRIPT_DIR, VECTORS_FILE), verbose=True)
+    (answer, cosine), = wv.analogy('King', 'Man', 'Woman', k=1)
+    main = list(words)
+    bg = [w for w in bg_words if w in wv]
+    X = wv.vectors_for(main + bg)
+    row = {w: i for i, w in enumerate(main)}
+    target = X[row['King']] - X[row['Man']] + X[row['Woman']]
+    X = np.vstack([X, target / np.linalg.norm(target)])
+    xy = neighborhood_pca(X, fit=np.arange(len(main)))
+
+    gender = (xy[row['Woman']] - xy[row['Man']]
+              + xy[row['Queen']] - xy[row['King']])
+    c, s = gender / np.linalg.norm(gender)
+    xy = xy @ np.array([[c, -s], [s, c]])
+    if xy[row['King'], 1] < xy[row['Man'], 1]:
+        xy[:, 1] *= -1
+
+    hand = np.array([words[w] for w in main])
+    ours = xy[:len(main)]
+    scale = (np.ptp(hand, axis=0).max()
+             / max(np.ptp(ours, axis=0).max(), 1e-12))
+    xy = (xy - ours.mean(axis=0)) * scale + hand.mean(axis=0)
+
+    pos = dict(zip(main + bg + [None], xy))
+    inside = {w: tuple(pos[w]) for w in bg
+              if BOX_X[0] <= pos[w][0] <= BOX_X[1]
+              and BOX_Y[0] <= pos[w][1] <= BOX_Y[1]}
+    return {w: pos[w] for w in main}, inside, (answer, cosine, pos[None])
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-
-    # Word positions forming a parallelogram
-    words = {
-        'King':  np.array([1.0, 3.0]),
-        'Queen': np.array([3.5, 3.0]),
-        'Man':   np.array([1.0, 1.0]),
-        'Woman': np.array([3.5, 1.0]),
-    }
-
-    # Scatter additional "noise" words for context
-    rng = np.random.RandomState(42)
-    bg_words = {
-        'dog': (0.2, 0.3), 'cat': (0.5, 0.5), 'run': (-0.5, 2.0),
-        'happy': (4.5, 2.2), 'car': (-0.8, 0.8), 'child': (2.2, 0.4),
-        'prince': (2.2, 3.5), 'throne': (0.3, 3.8), 'dress': (4.2, 0.5),
-        'crown': (2.3, 3.9), 'boy': (0.5, 1.5), 'girl': (3.8, 1.5),
-    }
-
-    # Draw background words
-    for w, (wx, wy) in bg_words.items():
-        ax.scatter(wx, wy, s=30, c=MUTED, alpha=0.35, zorder=1)
-        ax.text(wx + 0.08, wy + 0.08, w, fontsize=8, color=MUTED,
-                alpha=0.5, family='sans-serif', zorder=1)
-
-    # Subtle grid
-    ax.set_xlim(-1.5, 5.5)
-    ax.set_ylim(-0.5, 5.0)
-    ax.grid(True, alpha=0.12, linewidth=0.5, color=MUTED)
-
-    # Color scheme: gender direction = ORANGE, royalty direction = BLUE
-    gender_color = ORANGE
-    royalty_color = BLUE
-
-    # Draw directional arrows (parallelogram edges)
-    arrow_kw = dict(arrowstyle='->', mutation_scale=18, linewidth=2.5, zorder=3)
-
-    # Gender direction (horizontal): King->Queen, Man->Woman
-    for start, end in [('Man', 'Woman'), ('King', 'Queen')]:
-        a = FancyArrowPatch(
-            words[start], words[end],
-            color=gender_color, **arrow_kw,
-        )
-        ax.add_patch(a)
-
-    # Royalty direction (vertical): Man->King, Woman->Queen
-    for start, end in [('Man', 'King'), ('Woman', 'Queen')]:
-        a = FancyArrowPatch(
-            words[start], words[end],
-            color=royalty_color, **arrow_kw,
-        )
-        ax.add_patch(a)
-
-    # Plot the 4 main words as large dots
-    colors_map = {'King': BLUE, 'Queen': RED, 'Man': TEAL, 'Woman': GREEN}
-    for word, pos in words.items():
-        ax.scatter(*pos, s=280, c=colors_map[word], edgecolors='white',
-                   linewidths=2, zorder=5)
-        # Label offset depends on position
-        offset_x = -0.35 if word in ('King', 'Man') else 0.2
-        offset_y = 0.22
-        ax.text(pos[0] + offset_x, pos[1] + offset_y, word,
-                fontsize=17, fontweight='bold', color=colors_map[word],
-                family='sans-serif', zorder=6)
-
-    # Direction labels
-    mid_gender_top = (words['King'] + words['Queen']) / 2
-    ax.text(mid_gender_top[0], mid_gender_top[1] + 0.35,
-            'Gender direction', ha='center', fontsize=11, fontstyle='italic',
-            color=gender_color, family='sans-serif', zorder=6)
-
-    mid_royalty_left = (words['Man'] + words['King']) / 2
-    ax.text(mid_royalty_left[0] - 0.55, mid_royalty_left[1],
-            'Royalty\ndirection', ha='center', va='center',
-            fontsize=11, fontstyle='italic',
-            color=royalty_color, family='sans-serif', zorder=6,
-            rotation=90)
-
-    # Equation box
-    eq_x, eq_y = 3.8, 4.3
-    ax.text(eq_x, eq_y,
-            r'$\vec{\mathrm{king}} - \vec{\mathrm{man}} + \vec{\mathrm{woman}} \approx \vec{\mathrm{queen}}$',
-            fontsize=18, color=YELLOW, family='sans-serif',
-            ha='center', va='center', zorder=7,
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='#2c3e50',
-                      edgecolor=YELLOW, alpha=0.9, linewidth=1.5))
-
-    # Title
-    ax.set_title('Word Vectors: Arithmetic with Meaning',
-                 fontsize=24, fontweight='bold', color=TEXT,
-                 family='sans-serif', pad=20)
-
-    # Clean up axes
-    ax.set_xlabel('Embedding Dimension 1', fontsize=12, color=MUTED,
-                  family='sans-serif')
-    ax.set_ylabel('Embedding Dimension 2', fontsize=12, color=MUTED,
-                  family='sans-serif')
-    ax.tick_params(colors=MUTED, labelsize=9)
-    for spine in ax.spines.values():
-        spine.set_color(MUTED)
-        spine.set_alpha(0.3)
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        # Word positions forming a parallelogram
+        words = {
+            'King':  np.array([1.0, 3.0]),
+            'Queen': np.array([3.5, 3.0]),
+            'Man':   np.array([1.0, 1.0]),
+            'Woman': np.array([3.5, 1.0]),
+        }
+
+        # Scatter additional "noise" words for context
+        rng = np.random.RandomState(42)
+        bg_words = {
+            'dog': (0.2, 0.3), 'cat': (0.5, 0.5), 'run': (-0.5, 2.0),
+            'happy': (4.5, 2.2), 'car': (-0.8, 0.8), 'child': (2.2, 0.4),
+            'prince': (2.2, 3.5), 'throne': (0.3, 3.8), 'dress': (4.2, 0.5),
+            'crown': (2.3, 3.9), 'boy': (0.5, 1.5), 'girl': (3.8, 1.5),
+        }
+        words, bg_words, analogy = embedded_layout(words, bg_words)
+
+        # Draw background words
+        for w, (wx, wy) in bg_words.items():
+            ax.scatter(wx, wy, s=30, c=MUTED, alpha=0.35, zorder=1)
+            ax.text(wx + 0.08, wy + 0.08, w, fontsize=8, color=MUTED,
+                    alpha=0.5, family='sans-serif', zorder=1)
+
+        # Subtle grid
+        ax.set_xlim(-1.5, 5.5)
+        ax.set_ylim(-0.5, 5.0)
+        ax.grid(True, alpha=0.12, linewidth=0.5, color=MUTED)
+
+        # Color scheme: gender direction = ORANGE, royalty direction = BLUE
+        gender_color = ORANGE
+        royalty_color = BLUE
+
+        # Draw directional arrows (parallelogram edges)
+        arrow_kw = dict(arrowstyle='->', mutation_scale=18, linewidth=2.5, zorder=3)
+
+        # Gender direction (horizontal): King->Queen, Man->Woman
+        for start, end in [('Man', 'Woman'), ('King', 'Queen')]:
+            a = FancyArrowPatch(
+                words[start], words[end],
+                color=gender_color, **arrow_kw,
+            )
+            ax.add_patch(a)
+
+        # Royalty direction (vertical): Man->King, Woman->Queen
+        for start, end in [('Man', 'King'), ('Woman', 'Queen')]:
+            a = FancyArrowPatch(
+                words[start], words[end],
+                color=royalty_color, **arrow_kw,
+            )
+            ax.add_patch(a)
+
+        # Plot the 4 main words as large dots
+        colors_map = {'King': BLUE, 'Queen': RED, 'Man': TEAL, 'Woman': GREEN}
+        for word, pos in words.items():
+            ax.scatter(*pos, s=280, c=colors_map[word], edgecolors='white',
+                       linewidths=2, zorder=5)
+            # Label offset depends on position
+            offset_x = -0.35 if word in ('King', 'Man') else 0.2
+            offset_y = 0.22
+            ax.text(pos[0] + offset_x, pos[1] + offset_y, word,
+                    fontsize=17, fontweight='bold', color=colors_map[word],
+                    family='sans-serif', zorder=6)
+
+        # Direction labels
+        mid_gender_top = (words['King'] + words['Queen']) / 2
+        ax.text(mid_gender_top[0], mid_gender_top[1] + 0.35,
+                'Gender direction', ha='center', fontsize=11,
+                fontstyle='italic',
+                color=gender_color, family='sans-serif', zorder=6)
+
+        mid_royalty_left = (words['Man'] + words['King']) / 2
+        ax.text(mid_royalty_left[0] - 0.55, mid_royalty_left[1],
+                'Royalty\ndirection', ha='center', va='center',
+                fontsize=11, fontstyle='italic',
+                color=royalty_color, family='sans-serif', zorder=6,
+                rotation=90)
+
+        # Where king - man + woman actually lands, and its nearest word
+        equation = r'$\vec{\mathrm{king}} - \vec{\mathrm{man}} + \vec{\mathrm{woman}} \approx \vec{\mathrm{queen}}$'
+        if analogy is not None:
+            answer, cosine, target = analogy
+            ax.scatter(*target, s=320, marker='*', c=YELLOW,
+                       edgecolors='white',
+                       linewidths=1.2, zorder=6)
+            ax.plot(*zip(target, words['Queen']), color=YELLOW, linewidth=1.2,
+                    linestyle=':', alpha=0.7, zorder=4)
+            # The answer is plain text: a vocabulary word may hold
+            # characters mathtext cannot take ('_', '"', '&', ...)
+            equation = (r'$\vec{\mathrm{king}} - \vec{\mathrm{man}} + '
+                        r'\vec{\mathrm{woman}} \approx$ %s  (cos %.2f)'
+                        % (answer.replace('$', r'\$'), cosine))
+
+        # Equation box
+        eq_x, eq_y = 3.8, 4.3
+        ax.text(eq_x, eq_y, equation,
+                fontsize=18, color=YELLOW, family='sans-serif',
+                ha='center', va='center', zorder=7,
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='#2c3e50',
+                          edgecolor=YELLOW, alpha=0.9, linewidth=1.5))
+
+        # Title
+        ax.set_title('Word Vectors: Arithmetic with Meaning',
+                     fontsize=24, fontweight='bold', color=TEXT,
+                     family='sans-serif', pad=20)
+
+        # Clean up axes
+        ax.set_xlabel('Embedding Dimension 1', fontsize=12, color=MUTED,
+                      family='sans-serif')
+        ax.set_ylabel('Embedding Dimension 2', fontsize=12, color=MUTED,
+                      family='sans-serif')
+        ax.tick_params(colors=MUTED, labelsize=9)
+        for spine in ax.spines.values():
+            spine.set_color(MUTED)
+            spine.set_alpha(0.3)
 
 
 if __name__ == '__main__':
@@ -7,15 +7,14 @@ Output: ../images/07-shannon-diagram.png (3840x2160, 4K)
 """
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 
+from theme import (BG, YELLOW, GREEN, TEAL, ORANGE, RED, TEXT, MUTED,
+                   slide_figure)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '07-shannon-diagram.png')
 
-BG = '#1b2631'; BLUE = '#3498db'; YELLOW = '#f1c40f'; GREEN = '#2ecc71'; TEAL = '#1abc9c'
-ORANGE = '#e67e22'; RED = '#e74c3c'; TEXT = '#ecf0f1'; MUTED = '#95a5a6'
-
 
 def draw_flow_row(ax, boxes, y_center, color, row_label):
     """Draw a horizontal row of boxes with arrows between them."""
@@ -68,65 +67,58 @@ def draw_flow_row(ax, boxes, y_center, color, row_label):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-    ax.axis('off')
-
-    # Shannon row (top)
-    shannon_boxes = ['Information\nSource', 'Transmitter', 'Channel',
-                     'Receiver', 'Destination']
-    y_top = 6.5
-    top_centers, bw, bh = draw_flow_row(
-        ax, shannon_boxes, y_top, TEAL, '1948')
-
-    # Noise source pointing into Channel (box index 2)
-    noise_x = top_centers[2][0]
-    noise_y = y_top + bh / 2 + 1.8
-    noise_box = FancyBboxPatch(
-        (noise_x - 1.2, noise_y - 0.5), 2.4, 1.0,
-        boxstyle='round,pad=0.15',
-        facecolor=RED, edgecolor='white',
-        linewidth=1.5, alpha=0.85, zorder=3)
-    ax.add_patch(noise_box)
-    ax.text(noise_x, noise_y, 'Noise\nSource', fontsize=12, fontweight='bold',
-            color=TEXT, ha='center', va='center', zorder=4)
-    # Arrow from noise down into channel
-    noise_arrow = FancyArrowPatch(
-        (noise_x, noise_y - 0.5), (noise_x, y_top + bh / 2 + 0.08),
-        arrowstyle='->', color=RED, lw=2.5,
-        mutation_scale=16, zorder=5)
-    ax.add_patch(noise_arrow)
-
-    # LLM row (bottom)
-    llm_boxes = ['Your\nPrompt', 'Tokenizer', 'Transformer', 'Detokenizer',
-                 'Response']
-    y_bot = 2.2
-    bot_centers, _, _ = draw_flow_row(
-        ax, llm_boxes, y_bot, YELLOW, '2024')
-
-    # Dashed lines connecting corresponding boxes
-    for i in range(len(top_centers)):
-        tc = top_centers[i]
-        bc = bot_centers[i]
-        ax.plot([tc[0], bc[0]], [tc[1] - bh / 2, bc[1] + bh / 2],
-                ls='--', color=MUTED, lw=1.5, alpha=0.5, zorder=1)
-
-    # Title
-    fig.suptitle("Shannon's Model  \u2192  The LLM Pipeline",
-                 fontsize=34, fontweight='bold', color=TEXT, y=0.97)
-    fig.text(0.5, 0.91,
-             'The same architecture, 75 years apart',
-             ha='center', fontsize=22, color=MUTED, style='italic')
-
-    ax.set_xlim(-0.5, 16.5)
-    ax.set_ylim(0, 10)
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.axis('off')
+
+        # Shannon row (top)
+        shannon_boxes = ['Information\nSource', 'Transmitter', 'Channel',
+                         'Receiver', 'Destination']
+        y_top = 6.5
+        top_centers, bw, bh = draw_flow_row(
+            ax, shannon_boxes, y_top, TEAL, '1948')
+
+        # Noise source pointing into Channel (box index 2)
+        noise_x = top_centers[2][0]
+        noise_y = y_top + bh / 2 + 1.8
+        noise_box = FancyBboxPatch(
+            (noise_x - 1.2, noise_y - 0.5), 2.4, 1.0,
+            boxstyle='round,pad=0.15',
+            facecolor=RED, edgecolor='white',
+            linewidth=1.5, alpha=0.85, zorder=3)
+        ax.add_patch(noise_box)
+        ax.text(noise_x, noise_y, 'Noise\nSource', fontsize=12,
+                fontweight='bold',
+                color=TEXT, ha='center', va='center', zorder=4)
+        # Arrow from noise down into channel
+        noise_arrow = FancyArrowPatch(
+            (noise_x, noise_y - 0.5), (noise_x, y_top + bh / 2 + 0.08),
+            arrowstyle='->', color=RED, lw=2.5,
+            mutation_scale=16, zorder=5)
+        ax.add_patch(noise_arrow)
+
+        # LLM row (bottom)
+        llm_boxes = ['Your\nPrompt', 'Tokenizer', 'Transformer', 'Detokenizer',
+                     'Response']
+        y_bot = 2.2
+        bot_centers, _, _ = draw_flow_row(
+            ax, llm_boxes, y_bot, YELLOW, '2024')
+
+        # Dashed lines connecting corresponding boxes
+        for i in range(len(top_centers)):
+            tc = top_centers[i]
+            bc = bot_centers[i]
+            ax.plot([tc[0], bc[0]], [tc[1] - bh / 2, bc[1] + bh / 2],
+                    ls='--', color=MUTED, lw=1.5, alpha=0.5, zorder=1)
+
+        # Title
+        fig.suptitle("Shannon's Model  \u2192  The LLM Pipeline",
+                     fontsize=34, fontweight='bold', color=TEXT, y=0.97)
+        fig.text(0.5, 0.91,
+                 'The same architecture, 75 years apart',
+                 ha='center', fontsize=22, color=MUTED, style='italic')
+
+        ax.set_xlim(-0.5, 16.5)
+        ax.set_ylim(0, 10)
 
 
 if __name__ == '__main__':
@@ -2,27 +2,23 @@
 """
 gen_11_timeline.py
 2000 Years of Mathematics → AI: horizontal timeline from ~100 BCE to 2024.
+Milestone labels are measured and assigned to lanes above and below the
+line by label_layout.py, so events can be added (or read from a file)
+without hand-tuning positions.
 Output: ../images/11-timeline.png
 """
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.lines import Line2D
 
+from label_layout import TextMeasure, layout_labels, load_milestones
+from theme import (BLUE, YELLOW, GREEN, TEAL, ORANGE, RED, TEXT, MUTED,
+                   slide_figure)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '11-timeline.png')
 
-BG     = '#1b2631'
-BLUE   = '#3498db'
-YELLOW = '#f1c40f'
-GREEN  = '#2ecc71'
-TEAL   = '#1abc9c'
-ORANGE = '#e67e22'
-RED    = '#e74c3c'
-TEXT   = '#ecf0f1'
-MUTED  = '#95a5a6'
-
 # Each milestone: (year, label_line1, label_line2, color)
 # Colors map to pillar: Linear Algebra=BLUE, Probability=GREEN,
 #   Calculus/Optim=ORANGE, Info Theory=TEAL, Numerical Optim=YELLOW
@@ -47,6 +43,30 @@ MILESTONES = [
     (2024, 'Hinton Nobel Prize',    'Physics Prize for DL',       RED),
 ]
 
+MILESTONES_FILE = None  # e.g. 'milestones.csv': year,title,subtitle,color
+                        # (color a hex code or BLUE, GREEN, ... by name)
+PALETTE = dict(BLUE=BLUE, YELLOW=YELLOW, GREEN=GREEN, TEAL=TEAL,
+               ORANGE=ORANGE, RED=RED, TEXT=TEXT, MUTED=MUTED)
+
+YEAR_STYLE  = dict(fontsize=8.5, fontweight='bold', family='sans-serif')
+TITLE_STYLE = dict(fontsize=9.5, fontweight='bold', family='sans-serif')
+NOTE_STYLE  = dict(fontsize=8, family='sans-serif')
+LINE_GAP = 0.35         # between the lines of one label, in axes units
+
+
+def milestones():
+    """MILESTONES, or the rows of MILESTONES_FILE in the same shape."""
+    if not MILESTONES_FILE:
+        return MILESTONES
+    return [(row['year'], str(row['title']), str(row.get('subtitle', '')),
+             PALETTE.get(str(row.get('color', '')).upper(),
+                         row.get('color') or MUTED))
+            for row in load_milestones(MILESTONES_FILE)]
+
+
+def year_label(year):
+    return f'{abs(year)}{"" if year > 0 else " BCE"}'
+
 
 def year_to_x(year, x_min, x_max, y_min=-100, y_max=2024):
     """Map a year to an x-coordinate using a piecewise scale.
@@ -63,124 +83,103 @@ def year_to_x(year, x_min, x_max, y_min=-100, y_max=2024):
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    plt.style.use('dark_background')
-
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-    ax.set_facecolor(BG)
-    ax.set_xlim(0, 100)
-    ax.set_ylim(0, 100)
-    ax.axis('off')
-
-    # --- Title ---
-    ax.text(50, 94, '2000 Years of Mathematics  →  AI',
-            ha='center', va='center', fontsize=26, fontweight='bold',
-            color=TEXT, family='sans-serif')
-    ax.text(50, 89.5,
-            'Key milestones that built the mathematical foundation of modern AI',
-            ha='center', va='center', fontsize=14, color=MUTED,
-            family='sans-serif', fontstyle='italic')
-
-    # --- Timeline baseline ---
-    tl_y   = 48          # vertical centre of the timeline track
-    x_left = 4
-    x_right = 97
-
-    ax.plot([x_left, x_right], [tl_y, tl_y],
-            color=MUTED, linewidth=2.5, zorder=2, solid_capstyle='round')
-
-    # Arrow head at right end
-    ax.annotate('', xy=(x_right + 0.5, tl_y),
-                xytext=(x_right - 0.1, tl_y),
-                arrowprops=dict(arrowstyle='->', color=MUTED, lw=2.0))
-
-    # --- Axis tick labels (century marks) ---
-    century_years = [1, 500, 1000, 1500, 1600, 1700, 1800, 1900, 1950, 2000, 2024]
-    century_labels = ['1 CE', '500', '1000', '1500', '1600', '1700', '1800', '1900', '1950', '2000', '2024']
-    for yr, lbl in zip(century_years, century_labels):
-        cx = year_to_x(yr, x_left, x_right)
-        ax.plot([cx, cx], [tl_y - 1.0, tl_y + 1.0],
-                color=MUTED, linewidth=0.8, zorder=2)
-        ax.text(cx, tl_y - 2.5, lbl,
-                ha='center', va='top', fontsize=7, color=MUTED,
-                family='monospace')
-
-    # Label far left
-    ax.text(year_to_x(-100, x_left, x_right) - 0.5, tl_y - 2.5,
-            '~100 BCE', ha='center', va='top', fontsize=7,
-            color=MUTED, family='monospace')
-
-    # --- Plot milestones ---
-    # Alternate labels above (odd index) and below (even index)
-    above_y_base = tl_y + 6
-    below_y_base = tl_y - 6
-    stem_above   = 5.0
-    stem_below   = 5.0
-    label_spacing_above = 6.5
-    label_spacing_below = 6.5
-
-    for idx, (year, line1, line2, color) in enumerate(MILESTONES):
-        x = year_to_x(year, x_left, x_right)
-        above = (idx % 2 == 0)
-
-        # Dot on timeline
-        ax.plot(x, tl_y, 'o', markersize=9, color=color,
-                markeredgecolor='white', markeredgewidth=0.8, zorder=5)
-
-        if above:
-            stem_end = tl_y + stem_above
-            label_y  = above_y_base + (idx // 2) * label_spacing_above
-            # clamp to figure top
-            label_y  = min(label_y, 85)
-            connector_y = label_y - 2.8
-            ax.annotate('',
-                        xy=(x, stem_end),
-                        xytext=(x, tl_y + 1.5),
-                        arrowprops=dict(arrowstyle='-', color=color,
-                                        lw=1.2, linestyle='dotted'))
-            ax.plot([x, x], [stem_end, connector_y],
-                    color=color, linewidth=1.0, linestyle=':', zorder=3)
-        else:
-            stem_end = tl_y - stem_below
-            label_y  = below_y_base - (idx // 2) * label_spacing_below
-            label_y  = max(label_y, 5)
-            connector_y = label_y + 4.0
-            ax.plot([x, x], [tl_y - 1.5, connector_y],
+    with slide_figure(OUTPUT_PATH) as (fig, ax):
+        ax.set_xlim(0, 100)
+        ax.set_ylim(0, 100)
+        ax.axis('off')
+
+        # --- Title ---
+        ax.text(50, 94, '2000 Years of Mathematics  →  AI',
+                ha='center', va='center', fontsize=26, fontweight='bold',
+                color=TEXT, family='sans-serif')
+        ax.text(50, 89.5,
+                'Key milestones that built the mathematical foundation of modern AI',
+                ha='center', va='center', fontsize=14, color=MUTED,
+                family='sans-serif', fontstyle='italic')
+
+        # --- Timeline baseline ---
+        tl_y   = 48          # vertical centre of the timeline track
+        x_left = 4
+        x_right = 97
+
+        ax.plot([x_left, x_right], [tl_y, tl_y],
+                color=MUTED, linewidth=2.5, zorder=2, solid_capstyle='round')
+
+        # Arrow head at right end
+        ax.annotate('', xy=(x_right + 0.5, tl_y),
+                    xytext=(x_right - 0.1, tl_y),
+                    arrowprops=dict(arrowstyle='->', color=MUTED, lw=2.0))
+
+        # --- Axis tick labels (century marks) ---
+        century_years = [1, 500, 1000, 1500, 1600, 1700, 1800, 1900, 1950, 2000, 2024]
+        century_labels = ['1 CE', '500', '1000', '1500', '1600', '1700', '1800', '1900', '1950', '2000', '2024']
+        for yr, lbl in zip(century_years, century_labels):
+            cx = year_to_x(yr, x_left, x_right)
+            ax.plot([cx, cx], [tl_y - 1.0, tl_y + 1.0],
+                    color=MUTED, linewidth=0.8, zorder=2)
+            ax.text(cx, tl_y - 2.5, lbl,
+                    ha='center', va='top', fontsize=7, color=MUTED,
+                    family='monospace')
+
+        # Label far left
+        ax.text(year_to_x(-100, x_left, x_right) - 0.5, tl_y - 2.5,
+                '~100 BCE', ha='center', va='top', fontsize=7,
+                color=MUTED, family='monospace')
+
+        # --- Plot milestones ---
+        # Labels (year / title / note) are measured once, then placed in
+        # lanes above and below the line so that no label overlaps another
+        # label or another milestone's leader.
+        events = milestones()
+        measure = TextMeasure(ax)
+        blocks = [[(year_label(year), YEAR_STYLE), (line1, TITLE_STYLE),
+                   (line2, NOTE_STYLE)] for year, line1, line2, _ in events]
+        sizes = np.array([measure.block(b, LINE_GAP) for b in blocks])
+        xs = np.array([year_to_x(year, x_left, x_right)
+                       for year, _, _, _ in events])
+        lay = layout_labels(xs, sizes[:, 0], sizes[:, 1], y0=tl_y, offset=6.0,
+                            x_min=0.5, x_max=99.5, n_lanes=5, lane_gap=1.2,
+                            pad=0.8)
+        if lay.overlaps.any():
+            print(f'  {lay.overlaps.sum()} milestone labels did not fit '
+                  f'without overlap')
+        leaders = lay.leaders(clearance=1.5, inset=0.4)
+
+        for idx, (year, line1, line2, color) in enumerate(events):
+            x = xs[idx]
+
+            # Dot on timeline
+            ax.plot(x, tl_y, 'o', markersize=9, color=color,
+                    markeredgecolor='white', markeredgewidth=0.8, zorder=5)
+
+            # Leader from the dot to the label's near edge
+            (lx0, ly0), (lx1, ly1) = leaders[idx]
+            ly1 -= lay.side[idx] * 0.4
+            ax.plot([lx0, lx1], [ly0, ly1],
                     color=color, linewidth=1.0, linestyle=':', zorder=3)
 
-        # Year badge
-        ax.text(x, label_y + 3.2,
-                f'{abs(year)}{"" if year > 0 else " BCE"}',
-                ha='center', va='bottom', fontsize=8.5,
-                color=color, fontweight='bold', family='sans-serif')
-        # Line 1
-        ax.text(x, label_y + 1.2, line1,
-                ha='center', va='bottom', fontsize=9.5,
-                color=TEXT, fontweight='bold', family='sans-serif')
-        # Line 2
-        ax.text(x, label_y - 0.5, line2,
-                ha='center', va='bottom', fontsize=8,
-                color=MUTED, family='sans-serif')
-
-    # --- Legend (pillar color key) ---
-    legend_items = [
-        mpatches.Patch(color=BLUE,   label='Linear Algebra'),
-        mpatches.Patch(color=GREEN,  label='Probability & Statistics'),
-        mpatches.Patch(color=ORANGE, label='Calculus & Optimization'),
-        mpatches.Patch(color=TEAL,   label='Information Theory'),
-        mpatches.Patch(color=YELLOW, label='Numerical Optimization'),
-        mpatches.Patch(color=RED,    label='AI Milestone'),
-    ]
-    leg = ax.legend(handles=legend_items, loc='lower center',
-                    ncol=6, fontsize=10,
-                    facecolor='#2c3e50', edgecolor=MUTED,
-                    labelcolor=TEXT, framealpha=0.9,
-                    bbox_to_anchor=(0.5, -0.01))
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+            # Year badge, title and note, stacked from the label's bottom
+            cx, bottom = lay.center[idx], lay.bottom[idx]
+            offsets = measure.stack(blocks[idx], LINE_GAP)
+            for (text, style), dy, colour in zip(blocks[idx], offsets,
+                                                 (color, TEXT, MUTED)):
+                ax.text(cx, bottom + dy, text, ha='center', va='bottom',
+                        color=colour, **style)
+
+        # --- Legend (pillar color key) ---
+        legend_items = [
+            mpatches.Patch(color=BLUE,   label='Linear Algebra'),
+            mpatches.Patch(color=GREEN,  label='Probability & Statistics'),
+            mpatches.Patch(color=ORANGE, label='Calculus & Optimization'),
+            mpatches.Patch(color=TEAL,   label='Information Theory'),
+            mpatches.Patch(color=YELLOW, label='Numerical Optimization'),
+            mpatches.Patch(color=RED,    label='AI Milestone'),
+        ]
+        leg = ax.legend(handles=legend_items, loc='lower center',
+                        ncol=6, fontsize=10,
+                        facecolor='#2c3e50', edgecolor=MUTED,
+                        labelcolor=TEXT, framealpha=0.9,
+                        bbox_to_anchor=(0.5, -0.01))
 
 
 if __name__ == '__main__':
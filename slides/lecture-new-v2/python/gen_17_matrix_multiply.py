@@ -1,28 +1,32 @@
 #!/usr/bin/env python3
 """
 gen_17_matrix_multiply.py
-Annotated matrix multiplication diagram: W (3x3) times x (3x1) equals y (3x1).
-One row of W and the column of x are highlighted to show the dot-product mechanism.
+Matrix multiplication, from one dot product to measured throughput.
+Left top: W (3x3) times x (3x1) equals y, one row of W and the column of x
+highlighted to show the dot-product mechanism.
+Left bottom: a 64x64 product computed in 16x16 tiles -- the tile row of A,
+tile column of B and output tile in flight, with the finished tiles of C.
+Right: roofline of the kernels measured by matmul_bench.py on this machine
+(naive triple loop, tiled einsum, BLAS np.matmul) against the measured
+copy bandwidth and BLAS peak.
 Output: ../images/17-matrix-multiply.png (3840x2160, 4K)
 """
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgb
+
+from matmul_bench import (dram_bandwidth, load_results, peak_gflops,
+                          run_benchmarks, speedup)
+from theme import (BG, BLUE, YELLOW, GREEN, TEAL, ORANGE, RED, TEXT, MUTED,
+                   slide_figure)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, '..', 'images', '17-matrix-multiply.png')
 
-BG     = '#1b2631'
-BLUE   = '#3498db'
-YELLOW = '#f1c40f'
-GREEN  = '#2ecc71'
-TEAL   = '#1abc9c'
-ORANGE = '#e67e22'
-RED    = '#e74c3c'
-TEXT   = '#ecf0f1'
-MUTED  = '#95a5a6'
+# Saved matmul_bench results (JSON) to draw instead of measuring live,
+# e.g. numbers taken on the lecture machine. None = benchmark now.
+RESULTS_FILE = None
 
 # Dim variants for non-highlighted cells
 BLUE_DIM   = '#1a4a6e'
@@ -40,43 +44,73 @@ y = W @ x  # shape (3,1)
 
 HIGHLIGHT_ROW = 1   # which row of W / which cell of y to highlight
 
-
-def draw_matrix(ax, values, x0, y0, cell_w, cell_h,
-                highlight_row=None, highlight_col=None,
-                face_bright=None, face_dim=None,
-                full_highlight=False):
-    """Draw a matrix as a grid of Rectangle patches with text values.
-
-    Parameters
-    ----------
-    full_highlight : if True every cell in the matrix gets the bright colour
-                     (used for the x vector column).
+# Tiled panel: matrix size, tile size and the output tile in flight
+TILED_N    = 64
+TILE       = 16
+TILE_FOCUS = (1, 2)          # (tile row, tile column) of C being computed
+
+# Matrices with more cells than this are drawn without value labels
+MAX_LABELLED_CELLS = 64
+
+
+# ---------------------------------------------------------------------------
+# Vectorized matrix rendering
+# ---------------------------------------------------------------------------
+def _rounded_rect(w, h, r, n_arc=5):
+    """Polygon (k, 2) of a w x h rectangle with corner radius r at (0, 0)."""
+    r = min(r, w / 2, h / 2)
+    t = np.linspace(0, np.pi / 2, n_arc)
+    corners = [((w - r, h - r), 0), ((r, h - r), 1),
+               ((r, r), 2), ((w - r, r), 3)]
+    pts = [np.column_stack([cx + r * np.cos(t + q * np.pi / 2),
+                            cy + r * np.sin(t + q * np.pi / 2)])
+           for (cx, cy), q in corners]
+    return np.vstack(pts)
+
+
+def draw_matrix(ax, values, x0, y0, cell_w, cell_h, facecolors,
+                text_colors=None, fontsize=17, gap=0.08, zorder=2):
+    """Draw a matrix as a single PolyCollection of rounded cells.
+
+    (x0, y0) is the top-left corner; row r occupies
+    [y0 - (r + 1) * cell_h, y0 - r * cell_h]. facecolors is one colour per
+    cell in row-major order. Values are printed only for matrices of at
+    most MAX_LABELLED_CELLS cells, so a 64x64 tile panel costs one artist.
     """
     rows, cols = values.shape
-    patches = {}
-    for r in range(rows):
-        for c in range(cols):
-            is_bright = full_highlight or (
-                (highlight_row is not None and r == highlight_row) or
-                (highlight_col is not None and c == highlight_col)
-            )
-            fc = face_bright if is_bright else face_dim
-            rect = mpatches.FancyBboxPatch(
-                (x0 + c * cell_w, y0 - r * cell_h),
-                cell_w * 0.92, cell_h * 0.88,
-                boxstyle='round,pad=0.02',
-                facecolor=fc, edgecolor=BG, linewidth=1.5,
-                transform=ax.transData, clip_on=False)
-            ax.add_patch(rect)
-            cx = x0 + c * cell_w + cell_w * 0.46
-            cy = y0 - r * cell_h + cell_h * 0.44
-            val_str = f'{values[r, c]:+.2f}'
-            tc = TEXT if is_bright else MUTED
-            ax.text(cx, cy, val_str, ha='center', va='center',
-                    fontsize=17, fontweight='bold', color=tc,
-                    family='monospace')
-            patches[(r, c)] = rect
-    return patches
+    w, h = cell_w * (1 - gap), cell_h * (1 - gap)
+    template = _rounded_rect(w, h, 0.12 * min(w, h))
+    c, r = np.meshgrid(np.arange(cols), np.arange(rows))
+    origins = np.column_stack([x0 + c.ravel() * cell_w,
+                               y0 - (r.ravel() + 1) * cell_h])
+    cells = PolyCollection(template[None] + origins[:, None, :],
+                           facecolors=facecolors, edgecolors='none',
+                           zorder=zorder)
+    ax.add_collection(cells)
+    if values.size <= MAX_LABELLED_CELLS:
+        for (rr, cc), v in np.ndenumerate(values):
+            tc = TEXT if text_colors is None else text_colors[rr * cols + cc]
+            ax.text(x0 + cc * cell_w + w / 2,
+                    y0 - rr * cell_h - cell_h + h / 2,
+                    f'{v:+.2f}', ha='center', va='center',
+                    fontsize=fontsize, fontweight='bold', color=tc,
+                    family='monospace', zorder=zorder + 1)
+    return cells
+
+
+def highlight_colors(bright, dim, mask):
+    """Row-major facecolours: `bright` where mask is True, else `dim`."""
+    return np.where(np.asarray(mask).ravel(), bright, dim)
+
+
+def shaded(values, color, strength):
+    """Blend `color` into BG per cell: strength 0 -> BG, 1 -> color."""
+    bg, fg = np.array(to_rgb(BG)), np.array(to_rgb(color))
+    s = np.clip(np.asarray(strength, dtype=float).ravel(), 0, 1)[:, None]
+    v = np.asarray(values, dtype=float).ravel()[:, None]
+    # Cell value modulates brightness a little so the matrix reads as data
+    s = s * (0.55 + 0.45 * (v - v.min()) / max(np.ptp(v), 1e-12))
+    return bg + s * (fg - bg)
 
 
 def bracket(ax, x0, y0, height, opening='left', color=TEXT, lw=2.5):
@@ -92,258 +126,236 @@ def bracket(ax, x0, y0, height, opening='left', color=TEXT, lw=2.5):
             transform=ax.transData, clip_on=False)
 
 
-def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    plt.style.use('dark_background')
-
-    fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
+def bracketed(ax, x0, y0, cols, rows, cell_w, cell_h, gap=0.12):
+    """Brackets around a matrix drawn by draw_matrix at (x0, y0)."""
+    bracket(ax, x0 - gap, y0, rows * cell_h, 'left')
+    bracket(ax, x0 + cols * cell_w + gap * 0.4, y0, rows * cell_h, 'right')
+
+
+def tile_grid(ax, x0, y0, size, n_tiles, color=BG, lw=1.5):
+    """Tile boundaries over a square matrix panel, in two calls."""
+    edges = np.linspace(0, size, n_tiles + 1)[1:-1]
+    ax.vlines(x0 + edges, y0 - size, y0, colors=color, lw=lw, zorder=4)
+    ax.hlines(y0 - edges, x0, x0 + size, colors=color, lw=lw, zorder=4)
+
+
+def outline(ax, x0, y0, w, h, color, lw=2.4):
+    ax.plot([x0, x0 + w, x0 + w, x0, x0], [y0, y0, y0 - h, y0 - h, y0],
+            color=color, lw=lw, zorder=5, solid_joinstyle='round')
+
+
+# ---------------------------------------------------------------------------
+# Panels
+# ---------------------------------------------------------------------------
+def draw_dot_product(ax, top):
+    """W . x = y with one row / output cell highlighted."""
+    cell = 0.9
+    x_W = 0.55
+    x_x = x_W + 3 * cell + 0.95
+    x_y = x_x + cell + 0.95
+
+    rows = np.arange(3)[:, None] == HIGHLIGHT_ROW
+    draw_matrix(ax, W, x_W, top, cell, cell,
+                highlight_colors(BLUE, BLUE_DIM,
+                                 np.broadcast_to(rows, W.shape)),
+                text_colors=highlight_colors(TEXT, MUTED,
+                                             np.broadcast_to(rows, W.shape)),
+                fontsize=15)
+    draw_matrix(ax, x, x_x, top, cell, cell, [GREEN] * 3, fontsize=15)
+    draw_matrix(ax, y, x_y, top, cell, cell,
+                highlight_colors(YELLOW, YELLOW_DIM, rows),
+                text_colors=highlight_colors(BG, MUTED, rows),
+                fontsize=15)
+    for x0, cols in ((x_W, 3), (x_x, 1), (x_y, 1)):
+        bracketed(ax, x0, top, cols, 3, cell, cell)
+
+    mid = top - 1.5 * cell
+    ax.text(x_x - 0.45, mid, '×', ha='center', va='center',
+            fontsize=34, fontweight='bold', color=TEXT)
+    ax.text(x_y - 0.45, mid, '=', ha='center', va='center',
+            fontsize=34, fontweight='bold', color=TEXT)
+
+    label_y = top + 0.25
+    for x0, cols, name, colour, dims in (
+            (x_W, 3, 'Weights  W', BLUE, '3 × 3'),
+            (x_x, 1, 'Input  x', GREEN, '3 × 1'),
+            (x_y, 1, 'Output  y', YELLOW, '3 × 1')):
+        ax.text(x0 + cols * cell / 2, label_y, f'{name}\n({dims})',
+                ha='center', va='bottom', fontsize=15, fontweight='bold',
+                color=colour, linespacing=1.3)
+
+    def num(v):
+        return f'{v:.2f}' if v >= 0 else f'({v:.2f})'
+    terms = '\n   + '.join(f'{num(w)}×{num(v)}'
+                            for w, v in zip(W[HIGHLIGHT_ROW], x[:, 0]))
+    ax.text(x_y + cell + 0.45, mid + 0.35, 'dot product',
+            ha='left', va='center', fontsize=15, fontstyle='italic',
+            color=ORANGE)
+    ax.text(x_y + cell + 0.45, mid - 0.1,
+            f'y₂ = {terms}\n   = {y[HIGHLIGHT_ROW, 0]:+.3f}',
+            ha='left', va='top', fontsize=13, color=MUTED,
+            family='monospace', linespacing=1.5)
+
+
+def draw_tiled(ax, top, best_tile):
+    """A (64x64) . B = C computed tile by tile, one tile in flight."""
+    rng = np.random.default_rng(7)
+    A = rng.random((TILED_N, TILED_N))
+    B = rng.random((TILED_N, TILED_N))
+    C = A @ B
+    size = 2.75
+    cell = size / TILED_N
+    n_tiles = TILED_N // TILE
+    ti, tj = TILE_FOCUS
+    x_A, x_B, x_C = 0.55, 0.55 + size + 0.75, 0.55 + 2 * (size + 0.75)
+
+    tile_of = np.arange(TILED_N) // TILE
+    a_on = np.broadcast_to((tile_of == ti)[:, None], A.shape)
+    b_on = np.broadcast_to((tile_of == tj)[None, :], B.shape)
+    tile_rank = tile_of[:, None] * n_tiles + tile_of[None, :]
+    focus_rank = ti * n_tiles + tj
+    c_strength = np.where(tile_rank < focus_rank, 0.55,
+                          np.where(tile_rank == focus_rank, 1.0, 0.08))
+    c_color = np.where((tile_rank == focus_rank).ravel()[:, None],
+                       shaded(C, YELLOW, c_strength), shaded(C, TEAL, c_strength))
+
+    draw_matrix(ax, A, x_A, top, cell, cell,
+                shaded(A, BLUE, np.where(a_on, 1.0, 0.25)), gap=0.0)
+    draw_matrix(ax, B, x_B, top, cell, cell,
+                shaded(B, GREEN, np.where(b_on, 1.0, 0.25)), gap=0.0)
+    draw_matrix(ax, C, x_C, top, cell, cell, c_color, gap=0.0)
+
+    t = size / n_tiles
+    for x0 in (x_A, x_B, x_C):
+        tile_grid(ax, x0, top, size, n_tiles)
+        bracketed(ax, x0, top, 1, 1, size, size)
+    outline(ax, x_A, top - ti * t, size, t, BLUE)
+    outline(ax, x_B + tj * t, top, t, size, GREEN)
+    outline(ax, x_C + tj * t, top - ti * t, t, t, YELLOW)
+
+    mid = top - size / 2
+    ax.text(x_B - 0.375, mid, '×', ha='center', va='center',
+            fontsize=30, fontweight='bold', color=TEXT)
+    ax.text(x_C - 0.375, mid, '=', ha='center', va='center',
+            fontsize=30, fontweight='bold', color=TEXT)
+    for x0, name, colour in ((x_A, 'A', BLUE), (x_B, 'B', GREEN),
+                             (x_C, 'C', YELLOW)):
+        ax.text(x0 + size / 2, top + 0.12,
+                f'{name}  ({TILED_N} × {TILED_N})',
+                ha='center', va='bottom', fontsize=14, fontweight='bold',
+                color=colour)
+
+    ax.text(x_A, top - size - 0.25,
+            f'Tiled: C is built in {TILE}×{TILE} tiles. Each tile of A '
+            f'and B is loaded once and reused {TILE} times from cache,\n'
+            f'so arithmetic intensity grows with the tile -- measured best '
+            f'tile here: {best_tile}×{best_tile}.',
+            ha='left', va='top', fontsize=12, color=MUTED, linespacing=1.5)
+
+
+def draw_roofline(ax, results):
+    """Measured GFLOP/s vs modelled arithmetic intensity, with roofs."""
+    peak = peak_gflops(results)
+    dram = dram_bandwidth(results)
+    cache = max(results['bandwidth']['gbps'])
+    ai = np.logspace(-1.5, 2.5, 200)
+
+    ax.plot(ai, np.minimum(peak, dram * ai), color=TEXT, lw=2.5,
+            label=f'roof: DRAM {dram:.0f} GB/s, BLAS peak {peak:.0f} GFLOP/s')
+    ax.plot(ai, np.minimum(peak, cache * ai), color=MUTED, lw=1.5, ls='--',
+            label=f'cache roof: {cache:.0f} GB/s')
+
+    styles = {'naive': (RED, 'o', 'naive triple loop (Python)'),
+              'tiled': (BLUE, 's', f'tiled einsum, tile {results["tile"]}'),
+              'blas':  (YELLOW, 'D', 'BLAS np.matmul')}
+    for kind, rows in results['kernels'].items():
+        colour, marker, label = styles[kind]
+        xs = [r['intensity'] for r in rows]
+        ys = [r['gflops'] for r in rows]
+        ax.scatter(xs, ys, s=110, color=colour, marker=marker, zorder=5,
+                   edgecolors='white', linewidths=1.2, label=label)
+        if kind == 'blas':
+            for i, r in enumerate(rows):
+                ax.annotate(f'n={r["n"]}', (r['intensity'], r['gflops']),
+                            xytext=(0, 12 if i % 2 == 0 else -22),
+                            textcoords='offset points',
+                            ha='center', fontsize=11, color=colour)
+
+    sweep = results['tile_sweep']
+    ax.plot([r['intensity'] for r in sweep], [r['gflops'] for r in sweep],
+            color=GREEN, lw=1.8, marker='o', markersize=6, zorder=4,
+            label=f'tile sweep at n={results["sweep_n"]}')
+    for r in sweep:
+        ax.annotate(str(r['tile']), (r['intensity'], r['gflops']),
+                    xytext=(0, -16), textcoords='offset points',
+                    ha='center', fontsize=10, color=GREEN)
+
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlim(ai[0], ai[-1])
+    ax.set_ylim(0.01, peak * 4)
+    ax.set_xlabel('Arithmetic intensity (FLOP / byte, modelled)',
+                  fontsize=15, color=TEXT, labelpad=8)
+    ax.set_ylabel('Measured GFLOP/s', fontsize=15, color=TEXT, labelpad=8)
+    ax.tick_params(colors=MUTED, labelsize=12)
+    ax.grid(True, alpha=0.15, color=MUTED, which='both')
     ax.set_facecolor(BG)
-    ax.axis('off')
-
-    # ------------------------------------------------------------------
-    # Layout geometry
-    # ------------------------------------------------------------------
-    cell_w = 0.10
-    cell_h = 0.14
-
-    rows_W, cols_W = 3, 3
-    rows_x, cols_x = 3, 1
-    rows_y, cols_y = 3, 1
-
-    mat_top = 0.72          # y of the top-left corner of each matrix top row
-
-    # x positions (left edge of each matrix block)
-    pad_sym = 0.06          # gap for × and = symbols
-    x_W = 0.08
-    x_op1 = x_W + cols_W * cell_w + 0.01          # × operator
-    x_x = x_op1 + pad_sym                          # matrix x
-    x_op2 = x_x + cols_x * cell_w + 0.01          # = operator
-    x_y  = x_op2 + pad_sym                         # result y
-
-    bkt_gap = 0.018         # gap between bracket and cell column
-
-    # ------------------------------------------------------------------
-    # Draw W (3x3)
-    # ------------------------------------------------------------------
-    draw_matrix(ax, W, x_W, mat_top, cell_w, cell_h,
-                highlight_row=HIGHLIGHT_ROW,
-                face_bright=BLUE, face_dim=BLUE_DIM)
-
-    # Left + right brackets for W
-    total_h = rows_W * cell_h
-    bracket(ax, x_W - bkt_gap, mat_top + cell_h * 0.88, total_h,
-            opening='left', color=TEXT)
-    bracket(ax, x_W + cols_W * cell_w * 0.92 + bkt_gap,
-            mat_top + cell_h * 0.88, total_h,
-            opening='right', color=TEXT)
-
-    # ------------------------------------------------------------------
-    # Operator ×
-    # ------------------------------------------------------------------
-    op_y = mat_top - (rows_W * cell_h) / 2 + cell_h * 0.44
-    ax.text(x_op1 + pad_sym * 0.45, op_y, '\u00d7',
-            ha='center', va='center', fontsize=40,
-            fontweight='bold', color=TEXT)
-
-    # ------------------------------------------------------------------
-    # Draw x (3x1) — full highlight green
-    # ------------------------------------------------------------------
-    draw_matrix(ax, x, x_x, mat_top, cell_w, cell_h,
-                full_highlight=True,
-                face_bright=GREEN, face_dim=GREEN_DIM)
-
-    bracket(ax, x_x - bkt_gap, mat_top + cell_h * 0.88, total_h,
-            opening='left', color=TEXT)
-    bracket(ax, x_x + cols_x * cell_w * 0.92 + bkt_gap,
-            mat_top + cell_h * 0.88, total_h,
-            opening='right', color=TEXT)
-
-    # ------------------------------------------------------------------
-    # Operator =
-    # ------------------------------------------------------------------
-    ax.text(x_op2 + pad_sym * 0.45, op_y, '=',
-            ha='center', va='center', fontsize=40,
-            fontweight='bold', color=TEXT)
-
-    # ------------------------------------------------------------------
-    # Draw y (3x1) — only HIGHLIGHT_ROW cell bright yellow
-    # ------------------------------------------------------------------
-    draw_matrix(ax, y, x_y, mat_top, cell_w, cell_h,
-                highlight_row=HIGHLIGHT_ROW,
-                face_bright=YELLOW, face_dim=YELLOW_DIM)
-
-    bracket(ax, x_y - bkt_gap, mat_top + cell_h * 0.88, total_h,
-            opening='left', color=TEXT)
-    bracket(ax, x_y + cols_y * cell_w * 0.92 + bkt_gap,
-            mat_top + cell_h * 0.88, total_h,
-            opening='right', color=TEXT)
-
-    # ------------------------------------------------------------------
-    # Annotation: arc / arrow showing row DOT col = cell
-    # ------------------------------------------------------------------
-    # Centre of highlighted row of W (middle cell of row HIGHLIGHT_ROW)
-    row_mid_x = x_W + 1.5 * cell_w * 0.92       # approx horizontal mid of W
-    row_mid_y = mat_top - HIGHLIGHT_ROW * cell_h + cell_h * 0.44
-
-    # Centre of x column
-    col_mid_x = x_x + cell_w * 0.46
-    col_mid_y = mat_top - 1 * cell_h + cell_h * 0.44  # vertical mid of x
-
-    # Centre of result cell
-    res_mid_x = x_y + cell_w * 0.46
-    res_mid_y = mat_top - HIGHLIGHT_ROW * cell_h + cell_h * 0.44
-
-    # Curved annotation below the matrices
-    ann_y = mat_top - rows_W * cell_h - 0.04
-
-    # Left dot-product bracket
-    ax.annotate('', xy=(col_mid_x, ann_y + 0.01),
-                xytext=(row_mid_x, ann_y + 0.01),
-                arrowprops=dict(
-                    arrowstyle='->', color=ORANGE,
-                    lw=2.0,
-                    connectionstyle='arc3,rad=0.0'))
-
-    # Arrow from dot-product zone to result cell
-    ax.annotate('', xy=(res_mid_x, ann_y + 0.01),
-                xytext=(col_mid_x + 0.04, ann_y + 0.01),
-                arrowprops=dict(
-                    arrowstyle='->', color=ORANGE,
-                    lw=2.0,
-                    connectionstyle='arc3,rad=0.0'))
-
-    # Dot-product label
-    mid_ann_x = (row_mid_x + col_mid_x + 0.04) / 2
-    ax.text(mid_ann_x, ann_y - 0.04,
-            'dot product', ha='center', va='top',
-            fontsize=15, color=ORANGE, fontstyle='italic')
-
-    # Arrow from result annotation to result cell
-    ax.annotate('', xy=(res_mid_x, res_mid_y - cell_h * 0.44),
-                xytext=(res_mid_x, ann_y + 0.01),
-                arrowprops=dict(
-                    arrowstyle='->', color=YELLOW,
-                    lw=2.0,
-                    connectionstyle='arc3,rad=0.0'))
-
-    # ------------------------------------------------------------------
-    # Vertical highlight line on x vector
-    # ------------------------------------------------------------------
-    # Already full-bright; add a tinted glow rectangle behind x column
-    glow = mpatches.FancyBboxPatch(
-        (x_x - 0.008, mat_top + cell_h * 0.88 - total_h - 0.005),
-        cell_w * 0.92 + 0.016, total_h + 0.01,
-        boxstyle='round,pad=0.01',
-        facecolor='none', edgecolor=GREEN, linewidth=2.2, alpha=0.5,
-        transform=ax.transData, clip_on=False)
-    ax.add_patch(glow)
-
-    # Horizontal highlight line on row HIGHLIGHT_ROW of W
-    glow_row = mpatches.FancyBboxPatch(
-        (x_W - 0.008,
-         mat_top - HIGHLIGHT_ROW * cell_h - 0.005),
-        cols_W * cell_w * 0.92 + 0.016, cell_h * 0.88 + 0.01,
-        boxstyle='round,pad=0.01',
-        facecolor='none', edgecolor=BLUE, linewidth=2.2, alpha=0.6,
-        transform=ax.transData, clip_on=False)
-    ax.add_patch(glow_row)
-
-    # ------------------------------------------------------------------
-    # Matrix labels
-    # ------------------------------------------------------------------
-    label_y = mat_top + cell_h * 0.88 + 0.06
-    lbl_cx_W = x_W + cols_W * cell_w * 0.92 / 2
-    lbl_cx_x = x_x + cols_x * cell_w * 0.92 / 2
-    lbl_cx_y = x_y + cols_y * cell_w * 0.92 / 2
-
-    ax.text(lbl_cx_W, label_y, 'Weight Matrix  W',
-            ha='center', va='bottom', fontsize=18,
-            fontweight='bold', color=BLUE)
-    ax.text(lbl_cx_x, label_y, 'Input  x',
-            ha='center', va='bottom', fontsize=18,
-            fontweight='bold', color=GREEN)
-    ax.text(lbl_cx_y, label_y, 'Output  y',
-            ha='center', va='bottom', fontsize=18,
-            fontweight='bold', color=YELLOW)
-
-    # Dimensions
-    ax.text(lbl_cx_W, label_y - 0.04, '(3 \u00d7 3)',
-            ha='center', va='top', fontsize=12, color=MUTED)
-    ax.text(lbl_cx_x, label_y - 0.04, '(3 \u00d7 1)',
-            ha='center', va='top', fontsize=12, color=MUTED)
-    ax.text(lbl_cx_y, label_y - 0.04, '(3 \u00d7 1)',
-            ha='center', va='top', fontsize=12, color=MUTED)
-
-    # ------------------------------------------------------------------
-    # Right-side annotation panel
-    # ------------------------------------------------------------------
-    rx = x_y + cols_y * cell_w * 0.92 + 0.10
-    ry = 0.80
-
-    ax.text(rx, ry, 'How It Works', ha='left', va='top',
-            fontsize=18, fontweight='bold', color=TEXT)
-
-    steps = [
-        (BLUE,   'Highlighted row of W',
-                 'The second row  [0.20,  0.90,  -0.40]\n'
-                 'represents one neuron\'s weights.'),
-        (GREEN,  'Input column x',
-                 'The vector  [1.20,  -0.80,  0.50]\n'
-                 'is the data flowing into the layer.'),
-        (ORANGE, 'Dot product',
-                 '0.20\u00d71.20 + 0.90\u00d7(\u22120.80) + (\u22120.40)\u00d70.50\n'
-                 f'= {y[HIGHLIGHT_ROW,0]:+.3f}'),
-        (YELLOW, 'Result cell y\u2082',
-                 'One number  \u2014  the activation of\n'
-                 'that single neuron.'),
-    ]
-
-    sy = ry - 0.08
-    for color, heading, body in steps:
-        ax.add_patch(mpatches.FancyBboxPatch(
-            (rx - 0.01, sy - 0.07), 0.30, 0.10,
-            boxstyle='round,pad=0.01',
-            facecolor=color, alpha=0.12,
-            edgecolor=color, linewidth=0.8,
-            transform=ax.transData, clip_on=False))
-        ax.text(rx + 0.005, sy - 0.005, heading, ha='left', va='top',
-                fontsize=13, fontweight='bold', color=color)
-        ax.text(rx + 0.005, sy - 0.032, body, ha='left', va='top',
-                fontsize=10.5, color=MUTED, linespacing=1.4)
-        sy -= 0.13
-
-    # Key insight
-    ax.add_patch(mpatches.FancyBboxPatch(
-        (rx - 0.01, sy - 0.04), 0.30, 0.075,
-        boxstyle='round,pad=0.01',
-        facecolor='#0d2137', edgecolor=TEAL,
-        linewidth=1.5,
-        transform=ax.transData, clip_on=False))
-    ax.text(rx + 0.14, sy + 0.0,
-            'Each output neuron = one row\u2019s dot product.\n'
-            'Three rows \u2192 three outputs\u2014done in parallel!',
-            ha='center', va='top', fontsize=11,
-            color=TEAL, linespacing=1.4)
-
-    # ------------------------------------------------------------------
-    # Main title
-    # ------------------------------------------------------------------
-    fig.text(0.5, 0.965,
-             'Matrix Multiplication: The Engine of Every Neural Layer',
-             ha='center', va='top', fontsize=24,
-             fontweight='bold', color=TEXT)
-    fig.text(0.5, 0.935,
-             'y = W\u00b7x   \u2014   each output row is a dot product of one weight row with the input',
-             ha='center', va='top', fontsize=14,
-             color=MUTED, fontstyle='italic')
-
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-
-    plt.savefig(OUTPUT_PATH, dpi=200, bbox_inches='tight',
-                facecolor=BG, edgecolor='none')
-    plt.close(fig)
-    print(f'Saved: {os.path.abspath(OUTPUT_PATH)}')
+    for spine in ax.spines.values():
+        spine.set_color(MUTED)
+    legend = ax.legend(fontsize=11, loc='lower right', frameon=True,
+                       fancybox=True, framealpha=0.8, edgecolor=MUTED,
+                       labelcolor=TEXT)
+    legend.get_frame().set_facecolor(BG)
+    ax.set_title('Roofline on this machine', fontsize=18,
+                 fontweight='bold', color=TEXT, pad=12)
+
+
+def speedup_line(results):
+    ns_naive = {r['n'] for r in results['kernels']['naive']}
+    ns_blas = [r['n'] for r in results['kernels']['blas']]
+    common = max(ns_naive & set(ns_blas))
+    n_big = max(ns_blas)
+    return (f'n = {common}:  BLAS is '
+            f'{speedup(results, common, "naive", "blas"):,.0f}× faster '
+            f'than the naive loop.\nn = {n_big}:  BLAS is '
+            f'{speedup(results, n_big, "tiled", "blas"):,.0f}× faster '
+            f'than tiled einsum.')
+
+
+def main():
+    results = (load_results(RESULTS_FILE) if RESULTS_FILE
+               else run_benchmarks())
+    best_tile = max(results['tile_sweep'], key=lambda r: r['gflops'])['tile']
+
+    with slide_figure(OUTPUT_PATH, axes=False,
+                      save_kw=dict(bbox_inches=None)) as (fig, _):
+        # Left: equal-unit canvas for both matrix panels
+        left = [0.01, 0.04, 0.55, 0.84]
+        ax = fig.add_axes(left)
+        ax.set_facecolor(BG)
+        ax.axis('off')
+        ax.set_xlim(0, left[2] * 19.2)
+        ax.set_ylim(0, left[3] * 10.8)
+        draw_dot_product(ax, top=7.9)
+        draw_tiled(ax, top=4.1, best_tile=best_tile)
+
+        ax_roof = fig.add_axes([0.63, 0.17, 0.35, 0.66])
+        draw_roofline(ax_roof, results)
+        fig.text(0.805, 0.075, speedup_line(results), ha='center', va='center',
+                 fontsize=13, color=TEAL, linespacing=1.5)
+
+        # ------------------------------------------------------------------
+        # Main title
+        # ------------------------------------------------------------------
+        fig.text(0.5, 0.965,
+                 'Matrix Multiplication: The Engine of Every Neural Layer',
+                 ha='center', va='top', fontsize=24,
+                 fontweight='bold', color=TEXT)
+        fig.text(0.5, 0.925,
+                 'y = W·x   —   every output is a dot product; '
+                 'how the products are scheduled decides the speed',
+                 ha='center', va='top', fontsize=14,
+                 color=MUTED, fontstyle='italic')
 
 
 if __name__ == '__main__':
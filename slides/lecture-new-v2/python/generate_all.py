@@ -4,7 +4,10 @@ generate_all.py
 Runner script: imports and executes all gen_*.py visualization scripts.
 
 Creates the ../images/ directory if needed, runs each script in sequence,
-reports success/failure for each, and prints a summary at the end.
+reports success/failure for each, and prints a summary at the end. The
+rendered PNGs are then re-encoded by png_optimize (palette quantization
+within a perceptual error bound, max-effort deflate) and the byte savings
+reported.
 
 Usage:
     cd slides/lecture-new/python && python generate_all.py
@@ -18,6 +21,10 @@ import traceback
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 IMAGES_DIR = os.path.join(SCRIPT_DIR, '..', 'images')
 
+# Post-render PNG optimisation (see png_optimize.py)
+OPTIMIZE_PNGS = True
+PNG_CACHE_DIR = None     # e.g. '.png-cache' to skip already-seen renders
+
 # All gen_* modules in order. Each must define a main() function.
 SCRIPTS = [
     'gen_01_five_pillars_overview',
@@ -67,6 +74,10 @@ def main():
     if SCRIPT_DIR not in sys.path:
         sys.path.insert(0, SCRIPT_DIR)
 
+    # Shared slide theme: resolve its fonts once before the first figure
+    from theme import theme_key, warm_fonts
+    warm_fonts()
+
     total = len(SCRIPTS)
     successes = 0
     failures = []
@@ -74,6 +85,7 @@ def main():
     print(f'{"=" * 60}')
     print(f'  Generating {total} lecture-new visualizations')
     print(f'  Output directory: {os.path.abspath(IMAGES_DIR)}')
+    print(f'  Theme: {theme_key()}')
     print(f'{"=" * 60}\n')
 
     for i, script_name in enumerate(SCRIPTS, 1):
@@ -86,6 +98,15 @@ def main():
             print(f'        FAILED.\n')
             failures.append(script_name)
 
+    if OPTIMIZE_PNGS and successes:
+        from png_optimize import optimize_images, rendered_pngs
+        print('Optimizing PNGs ...')
+        # Only the rendered slides; external/ and portraits/ stay as shipped
+        optimize_images(rendered_pngs(IMAGES_DIR), cache_dir=PNG_CACHE_DIR and
+                        os.path.join(SCRIPT_DIR, PNG_CACHE_DIR),
+                        key=theme_key())
+        print()
+
     # Summary
     print(f'{"=" * 60}')
     print(f'  Generated {successes}/{total} images successfully')
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+matmul_bench.py
+Measured matrix-multiply kernels and the memory roofs they run under.
+
+Three ways to compute C = A @ B on float64 matrices:
+
+    naive_matmul   the textbook i-j-k triple loop in interpreted Python
+    tiled_matmul   C is built tile by tile; each (tile x tile) block
+                   product is one vectorized NumPy einsum (no BLAS), so
+                   a tile of A and a tile of B are reused from cache
+                   `tile` times before being evicted
+    np.matmul      the BLAS the slide deck really uses
+
+`memory_bandwidth` times large array copies at growing working-set sizes,
+which exposes the cache levels of the machine; its largest size is the
+DRAM roof of the roofline. `run_benchmarks` collects everything the
+figure needs in one dict (GFLOP/s per kernel and size, a tile-size sweep,
+the bandwidth curve) that can be saved as JSON and re-drawn later.
+
+Arithmetic intensity (FLOPs per byte of DRAM traffic) is modelled, not
+counted: hardware counters are not portable. A kernel with no reuse
+moves 16 bytes per multiply-add, a tiled kernel reloads A and B once per
+tile, and BLAS is bounded by the compulsory 3 n^2 words.
+
+Usage:
+    from matmul_bench import run_benchmarks, save_results, load_results
+    results = run_benchmarks()
+    save_results('bench.json', results)
+
+    python matmul_bench.py   # print the full benchmark table
+"""
+
+import json
+import time
+
+import numpy as np
+
+WORD = 8        # bytes per float64
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+def naive_matmul(A, B):
+    """Scalar i-j-k triple loop over Python lists."""
+    rows, inner = A.shape
+    cols = B.shape[1]
+    a = A.tolist()
+    bt = B.T.tolist()          # row j of bt is column j of B
+    C = [[0.0] * cols for _ in range(rows)]
+    for i in range(rows):
+        ai, ci = a[i], C[i]
+        for j in range(cols):
+            bj = bt[j]
+            s = 0.0
+            for k in range(inner):
+                s += ai[k] * bj[k]
+            ci[j] = s
+    return np.array(C)
+
+
+def tiled_matmul(A, B, tile=128):
+    """Blocked product; each tile product is an einsum, not a BLAS call."""
+    rows, inner = A.shape
+    cols = B.shape[1]
+    C = np.zeros((rows, cols), dtype=np.result_type(A, B))
+    for i in range(0, rows, tile):
+        for k in range(0, inner, tile):
+            a = A[i:i + tile, k:k + tile]
+            for j in range(0, cols, tile):
+                C[i:i + tile, j:j + tile] += np.einsum(
+                    'ik,kj->ij', a, B[k:k + tile, j:j + tile])
+    return C
+
+
+KERNELS = {
+    'naive': naive_matmul,
+    'tiled': tiled_matmul,
+    'blas': np.matmul,
+}
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+def best_time(fn, *args, repeat=3, min_time=0.05):
+    """Best-of-`repeat` wall time of fn(*args), each timed over >= min_time."""
+    best = float('inf')
+    for _ in range(repeat):
+        calls, t0 = 0, time.perf_counter()
+        while True:
+            fn(*args)
+            calls += 1
+            dt = time.perf_counter() - t0
+            if dt >= min_time:
+                break
+        best = min(best, dt / calls)
+    return best
+
+
+def gflops(n, seconds):
+    return 2 * n ** 3 / seconds / 1e9
+
+
+def arithmetic_intensity(kind, n, tile=128):
+    """Modelled FLOPs per byte of DRAM traffic for an n x n product."""
+    if kind == 'naive':
+        return 2 / (2 * WORD)
+    if kind == 'tiled':
+        return min(tile, n) / WORD
+    return n / (1.5 * WORD)    # 2 n^3 FLOPs over 3 n^2 words
+
+
+def memory_bandwidth(sizes_kib=(16, 64, 256, 1024, 4096, 16384, 65536),
+                     repeat=3):
+    """Copy bandwidth in GB/s (read + write) at each working-set size."""
+    rates = []
+    for kib in sizes_kib:
+        n = max(kib * 1024 // (2 * WORD), 1)   # src + dst fill the set
+        src = np.ones(n)
+        dst = np.empty_like(src)
+        dt = best_time(np.copyto, dst, src, repeat=repeat)
+        rates.append(2 * n * WORD / dt / 1e9)
+    return list(sizes_kib), rates
+
+
+def run_benchmarks(naive_sizes=(16, 32, 64), sizes=(64, 128, 256, 512, 1024),
+                   sweep_n=512, tiles=(16, 32, 64, 128, 256, 512), tile=128,
+                   seed=0):
+    """Everything the matmul slide draws, as a JSON-serialisable dict.
+
+    Keys: 'kernels' (kind -> list of {n, seconds, gflops, intensity}),
+    'tile_sweep' (list of {tile, gflops, intensity} at n = sweep_n),
+    'bandwidth' ({kib, gbps}), 'tile' and 'sweep_n'.
+    """
+    rng = np.random.default_rng(seed)
+    mats = {}
+
+    def pair(n):
+        if n not in mats:
+            mats[n] = (rng.random((n, n)), rng.random((n, n)))
+        return mats[n]
+
+    runs = {'naive': naive_sizes, 'tiled': sizes, 'blas': sizes}
+    kernels = {}
+    for kind, ns in runs.items():
+        fn = KERNELS[kind]
+        rows = []
+        for n in ns:
+            A, B = pair(n)
+            args = (A, B, tile) if kind == 'tiled' else (A, B)
+            dt = best_time(fn, *args, repeat=1 if kind == 'naive' else 3)
+            rows.append({'n': n, 'seconds': dt, 'gflops': gflops(n, dt),
+                         'intensity': arithmetic_intensity(kind, n, tile)})
+        kernels[kind] = rows
+
+    A, B = pair(sweep_n)
+    sweep = []
+    for t in tiles:
+        dt = best_time(tiled_matmul, A, B, t)
+        sweep.append({'tile': t, 'gflops': gflops(sweep_n, dt),
+                      'intensity': arithmetic_intensity('tiled', sweep_n, t)})
+
+    kib, gbps = memory_bandwidth()
+    return {'kernels': kernels, 'tile_sweep': sweep,
+            'bandwidth': {'kib': kib, 'gbps': gbps},
+            'tile': tile, 'sweep_n': sweep_n}
+
+
+def speedup(results, n, slow='naive', fast='blas'):
+    """Time ratio of two kernels at size n, or None if either is missing."""
+    t = {kind: {r['n']: r['seconds'] for r in rows}
+         for kind, rows in results['kernels'].items()}
+    if n not in t.get(slow, {}) or n not in t.get(fast, {}):
+        return None
+    return t[slow][n] / t[fast][n]
+
+
+def peak_gflops(results):
+    return max(r['gflops'] for r in results['kernels']['blas'])
+
+
+def dram_bandwidth(results):
+    """Copy bandwidth of the largest working set, in GB/s."""
+    return results['bandwidth']['gbps'][-1]
+
+
+def save_results(path, results):
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=1)
+
+
+def load_results(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _demo():
+    t0 = time.perf_counter()
+    results = run_benchmarks()
+    print(f'benchmarks took {time.perf_counter() - t0:.1f} s')
+    for kind, rows in results['kernels'].items():
+        for r in rows:
+            print(f'  {kind:5s} n={r["n"]:5d}  {1e3 * r["seconds"]:9.2f} ms  '
+                  f'{r["gflops"]:8.3f} GFLOP/s  AI {r["intensity"]:6.2f}')
+    print(f'tile sweep at n={results["sweep_n"]}:')
+    for r in results['tile_sweep']:
+        print(f'  tile {r["tile"]:4d}  {r["gflops"]:6.2f} GFLOP/s')
+    print('copy bandwidth:')
+    for kib, gbps in zip(results['bandwidth']['kib'],
+                         results['bandwidth']['gbps']):
+        print(f'  {kib:6d} KiB  {gbps:6.1f} GB/s')
+    for n in (64, 1024):
+        for slow, fast in (('naive', 'blas'), ('tiled', 'blas')):
+            s = speedup(results, n, slow, fast)
+            if s is not None:
+                print(f'n={n}: blas is {s:,.0f}x faster than {slow}')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+png_optimize.py
+Post-render PNG optimisation: drop the unused alpha channel, quantize to a
+palette when the error is below a perceptual threshold, deflate hard.
+
+savefig writes every slide as 8-bit RGBA, although the canvas is opaque
+and a slide is a flat #1b2631 background with a handful of accent
+colours plus their anti-aliased edges -- a few thousand distinct colours
+at most. Each PNG is re-encoded as the smallest of:
+
+    palette   the image's own colours when there are at most 256 of them
+              (lossless); otherwise an adaptive palette (fast octree, then
+              median cut) accepted only if the CIE76 colour error stays
+              within MAX_MEAN_DE on average and MAX_TAIL_DE for 99.9% of
+              the pixels. The error is measured per distinct colour, each
+              one remapped to its nearest palette entry in Lab, so it is
+              the error of exactly the image that gets written.
+    RGB       the lossless fallback, alpha dropped when it is all opaque
+    original  when neither is smaller, the file is left alone
+
+and written with deflate level 9 under two zlib strategies, keeping the
+smaller. Files go through a process pool. With a cache_dir, results are
+kept by content hash (of the input and the settings): a re-render that
+reproduces a known PNG gets its optimised bytes without re-quantizing,
+and already-optimised files are recognised and skipped.
+
+Only the slides the gen_* scripts render are candidates by default:
+rendered_pngs() lists the PNGs directly in ../images and leaves the
+third-party files in external/ and portraits/ alone.
+
+Usage:
+    from png_optimize import optimize_images, rendered_pngs
+    results = optimize_images(rendered_pngs(), cache_dir='.png-cache')
+
+    python png_optimize.py [DIR_OR_PNG ...]   # default: rendered_pngs()
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(SCRIPT_DIR, '..', 'images')
+
+COLORS = 256
+MAX_MEAN_DE = 1.0      # mean CIE76 difference: below a just-noticeable step
+MAX_TAIL_DE = 6.0      # ... at the TAIL quantile (anti-aliased edges)
+TAIL = 0.999
+QUANTIZERS = (Image.Quantize.FASTOCTREE, Image.Quantize.MEDIANCUT)
+STRATEGIES = (0, 1)    # zlib Z_DEFAULT_STRATEGY, Z_FILTERED
+LAB_CHUNK = 65536      # colours per block of the nearest-palette search
+
+
+# ---------------------------------------------------------------------------
+# Colour error
+# ---------------------------------------------------------------------------
+def srgb_to_lab(rgb):
+    """CIE Lab (D65) of (n, 3) uint8 sRGB colours, as float32."""
+    c = np.asarray(rgb, dtype=np.float32) / 255
+    c = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    m = np.array([[0.4124, 0.3576, 0.1805],
+                  [0.2126, 0.7152, 0.0722],
+                  [0.0193, 0.1192, 0.9505]], dtype=np.float32)
+    xyz = c @ m.T / np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz),
+                 (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]),
+                     200 * (f[:, 1] - f[:, 2])], axis=-1)
+
+
+def unique_colors(rgb):
+    """Distinct colours of an (h, w, 3) image: (colors, inverse, counts)."""
+    px = rgb.reshape(-1, 3).astype(np.int32)
+    packed = px[:, 0] << 16 | px[:, 1] << 8 | px[:, 2]
+    u, inverse, counts = np.unique(packed, return_inverse=True,
+                                   return_counts=True)
+    colors = np.stack([u >> 16, u >> 8 & 255, u & 255], -1).astype(np.uint8)
+    return colors, inverse, counts
+
+
+def nearest_palette(lab, lab_palette):
+    """Index of and CIE76 distance to the nearest palette entry, per colour."""
+    p2 = (lab_palette ** 2).sum(axis=1)
+    idx = np.empty(len(lab), dtype=np.intp)
+    dist = np.empty(len(lab), dtype=np.float32)
+    for lo in range(0, len(lab), LAB_CHUNK):
+        block = lab[lo:lo + LAB_CHUNK]
+        d2 = p2 - 2 * block @ lab_palette.T
+        idx[lo:lo + LAB_CHUNK] = k = d2.argmin(axis=1)
+        best = d2[np.arange(len(block)), k] + (block ** 2).sum(axis=1)
+        dist[lo:lo + LAB_CHUNK] = np.sqrt(np.maximum(best, 0))
+    return idx, dist
+
+
+def palette_error(dist, counts):
+    """Pixel-weighted mean and TAIL quantile of per-colour errors."""
+    order = np.argsort(dist)
+    cum = np.cumsum(counts[order])
+    tail = dist[order][min(np.searchsorted(cum, TAIL * cum[-1]),
+                           len(dist) - 1)]
+    return float(dist @ counts / cum[-1]), float(tail)
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+def quantize(rgb, colors=COLORS, max_mean_de=MAX_MEAN_DE,
+             max_tail_de=MAX_TAIL_DE):
+    """Palette image of (h, w, 3) rgb within the error bounds, or None.
+
+    Returns (image, note) where note describes palette size and error.
+    """
+    h, w, _ = rgb.shape
+    cols, inverse, counts = unique_colors(rgb)
+    if len(cols) <= colors:
+        index, palette, note = inverse, cols, f'palette {len(cols)}, lossless'
+    else:
+        lab = srgb_to_lab(cols)
+        source = Image.fromarray(rgb)
+        for method in QUANTIZERS:
+            q = source.quantize(colors, method=method,
+                                dither=Image.Dither.NONE)
+            palette = np.frombuffer(bytes(q.getpalette()[:3 * colors]),
+                                    dtype=np.uint8).reshape(-1, 3)
+            k, dist = nearest_palette(lab, srgb_to_lab(palette))
+            mean, tail = palette_error(dist, counts)
+            if mean <= max_mean_de and tail <= max_tail_de:
+                break
+        else:
+            return None
+        # Keep only the entries some colour maps to
+        used, k = np.unique(k, return_inverse=True)
+        index, palette = k[inverse], palette[used]
+        note = f'palette {len(used)}, dE {mean:.2f} / {tail:.2f}'
+    image = Image.fromarray(index.astype(np.uint8).reshape(h, w))
+    image.putpalette(palette.tobytes())
+    return image, note
+
+
+def encode_png(image, info):
+    """Smallest deflate-9 encoding of image over STRATEGIES."""
+    best = None
+    for strategy in STRATEGIES:
+        buf = io.BytesIO()
+        image.save(buf, format='png', optimize=True, compress_type=strategy,
+                   **info)
+        if best is None or buf.tell() < len(best):
+            best = buf.getvalue()
+    return best
+
+
+def optimize_png(data, colors=COLORS, max_mean_de=MAX_MEAN_DE,
+                 max_tail_de=MAX_TAIL_DE):
+    """(bytes, note) of the smallest acceptable re-encoding of PNG data.
+
+    DPI and text chunks are kept. The input comes back unchanged (note
+    'kept') when no candidate is smaller.
+    """
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    info = {}
+    if 'dpi' in image.info:
+        info['dpi'] = tuple(round(d) for d in image.info['dpi'])
+    if image.text:
+        info['pnginfo'] = PngImagePlugin.PngInfo()
+        for key, value in image.text.items():
+            info['pnginfo'].add_text(key, value)
+
+    candidate, note = image, 'lossless'
+    if image.mode == 'RGBA' and image.getextrema()[3] == (255, 255):
+        candidate, note = image.convert('RGB'), 'RGB, alpha dropped'
+    if candidate.mode == 'RGB':
+        quantized = quantize(np.asarray(candidate), colors, max_mean_de,
+                             max_tail_de)
+        if quantized is not None:
+            candidate, note = quantized
+    out = encode_png(candidate, info)
+    if len(out) >= len(data):
+        return data, 'kept'
+    return out, note
+
+
+def _optimize_job(job):
+    path, data, settings = job
+    return (path,) + optimize_png(data, **settings)
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def rendered_pngs(images_dir=IMAGES_DIR):
+    """The gen_* outputs: PNGs directly in images_dir, no subdirectories."""
+    return sorted(glob.glob(os.path.join(images_dir, '*.png')))
+
+
+def find_pngs(paths):
+    """Sorted PNG files under the given files and directories."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found += [os.path.join(root, n) for n in names
+                          if n.lower().endswith('.png')]
+        elif path.lower().endswith('.png'):
+            found.append(path)
+    return sorted(found)
+
+
+def _write(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def optimize_images(paths, cache_dir=None, workers=None, colors=COLORS,
+                    max_mean_de=MAX_MEAN_DE, max_tail_de=MAX_TAIL_DE,
+                    verbose=True, key=''):
+    """Optimise every PNG under paths in place; returns one dict per file.
+
+    Keys: 'path', 'before', 'after' (bytes), 'note', 'cached'. Files are
+    spread over `workers` processes (inline when workers == 1). With
+    cache_dir, results are looked up and stored by content hash; `key`
+    (generate_all passes the theme key) is part of every cache key, so
+    entries from another theme are never reused.
+    """
+    t0 = time.perf_counter()
+    settings = dict(colors=colors, max_mean_de=max_mean_de,
+                    max_tail_de=max_tail_de)
+    spec = (f'{colors}|{max_mean_de}|{max_tail_de}|{TAIL}|'
+            f'{[q.name for q in QUANTIZERS]}|{STRATEGIES}|'
+            f'{Image.__version__}|{key}|')
+    index, index_path = {}, None
+    if cache_dir:
+        index_path = os.path.join(cache_dir, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path) as fh:
+                index = json.load(fh)
+
+    def cache_key(digest):
+        return _digest((spec + digest).encode())
+
+    results, jobs = {}, []
+    for path in find_pngs(paths):
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        digest = _digest(data)
+        hit = index.get(cache_key(digest))
+        blob = hit and os.path.join(cache_dir, f'{hit}.png')
+        if hit == digest:
+            results[path] = dict(path=path, before=len(data),
+                                 after=len(data), note='optimised',
+                                 cached=True)
+        elif hit and os.path.exists(blob):
+            with open(blob, 'rb') as fh:
+                out = fh.read()
+            _write(path, out)
+            results[path] = dict(path=path, before=len(data),
+                                 after=len(out), note='from cache',
+                                 cached=True)
+        else:
+            jobs.append((path, data, settings))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        done = [_optimize_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            done = list(pool.map(_optimize_job, jobs))
+
+    for (path, data, _), (_, out, note) in zip(jobs, done):
+        changed = note != 'kept'
+        if changed:
+            _write(path, out)
+        results[path] = dict(path=path, before=len(data), after=len(out),
+                             note=note, cached=False)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            digest = _digest(out)
+            if changed:
+                _write(os.path.join(cache_dir, f'{digest}.png'), out)
+            index[cache_key(_digest(data))] = digest
+            index[cache_key(digest)] = digest
+    if cache_dir and jobs:
+        with open(index_path, 'w') as fh:
+            json.dump(index, fh, indent=0, sort_keys=True)
+
+    results = [results[p] for p in sorted(results)]
+    if verbose:
+        print_report(results, time.perf_counter() - t0,
+                     min(workers, max(len(jobs), 1)))
+    return results
+
+
+def print_report(results, seconds=None, workers=None):
+    """Per-file sizes and the total saving."""
+    before = sum(r['before'] for r in results)
+    after = sum(r['after'] for r in results)
+    for r in results:
+        saved = 1 - r['after'] / r['before'] if r['before'] else 0.0
+        print(f'  {os.path.relpath(r["path"]):<48} {r["before"] / 1024:8.1f}'
+              f' KB -> {r["after"] / 1024:7.1f} KB  {-100 * saved:4.0f}%  '
+              f'{r["note"]}')
+    saved = 1 - after / before if before else 0.0
+    line = (f'PNG: {len(results)} files, {before / 2**20:.2f} MB -> '
+            f'{after / 2**20:.2f} MB ({-100 * saved:.0f}%, '
+            f'{(before - after) / 2**20:.2f} MB saved), '
+            f'{sum(r["cached"] for r in results)} from cache')
+    if seconds is not None:
+        line += f', {seconds:.1f} s on {workers} worker(s)'
+    print(line)
+
+
+def main():
+    results = optimize_images(sys.argv[1:] or rendered_pngs())
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
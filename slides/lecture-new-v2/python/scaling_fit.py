@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+scaling_fit.py
+Fit scaling laws to tables of training runs, with bootstrap bands.
+
+Two forms are fitted to (N parameters, D tokens, loss) runs:
+
+    kaplan       L(N) = (N_c / N)^alpha
+    chinchilla   L(N, D) = E + A / N^alpha + B / D^beta
+
+Following Hoffmann et al., the objective is a Huber loss (delta = 1e-3)
+on log-loss residuals, and the Chinchilla form is fitted through its
+log-sum-exp, log L = LSE(a - alpha log N, b - beta log D, e) with
+A = e^a, B = e^b, E = e^e, which keeps every parameter unconstrained.
+
+The optimiser is L-BFGS written for a *batch* of problems: parameters
+are an (S, P) array, the two-loop recursion and the backtracking line
+search run on all S rows at once. A multi-start grid (thousands of
+starts for the Chinchilla form) is one batch; so is a bootstrap, where
+row s refits the data under multinomial resampling weights. Bootstrap
+batches are split across a process pool.
+
+`fit_scaling_law` returns a JSON-serialisable dict (best parameters,
+bootstrap parameter draws, dataset hash) and caches it per dataset
+hash, form and settings, so a re-render never refits.
+
+Usage:
+    from scaling_fit import load_runs, fit_scaling_law, predict, band
+    runs = load_runs('runs.csv')          # N, D, compute, loss columns
+    fit = fit_scaling_law(runs, 'chinchilla', cache_dir='.fit-cache')
+    lo, hi = band(fit, N=np.logspace(8, 12), D=20 * np.logspace(8, 12))
+
+    python scaling_fit.py   # recover Chinchilla constants from noisy runs
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+HUBER_DELTA = 1e-3
+
+FORMS = {
+    'kaplan': ('log_Nc', 'alpha'),
+    'chinchilla': ('a', 'b', 'e', 'alpha', 'beta'),
+}
+
+
+# ---------------------------------------------------------------------------
+# Run tables
+# ---------------------------------------------------------------------------
+COLUMN_ALIASES = {
+    'N': ('n', 'params', 'parameters', 'n_params'),
+    'D': ('d', 'tokens', 'data', 'n_tokens'),
+    'C': ('c', 'compute', 'flops'),
+    'loss': ('loss', 'l', 'final_loss', 'eval_loss'),
+}
+
+
+def load_runs(path):
+    """{'N', 'D', 'C', 'loss'} float arrays from a CSV with a header row.
+
+    Column names are matched case-insensitively against common aliases;
+    a missing D or C is filled in from C = 6 N D.
+    """
+    table = np.genfromtxt(path, delimiter=',', names=True, dtype=np.float64,
+                          encoding='utf-8')
+    names = {n.lower(): n for n in table.dtype.names}
+    runs = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                runs[key] = np.atleast_1d(table[names[alias]])
+                break
+    if 'N' not in runs or 'loss' not in runs:
+        raise ValueError(f'{path}: need parameter and loss columns')
+    if 'D' not in runs and 'C' in runs:
+        runs['D'] = runs['C'] / (6 * runs['N'])
+    if 'C' not in runs and 'D' in runs:
+        runs['C'] = 6 * runs['N'] * runs['D']
+    return runs
+
+
+def dataset_hash(runs):
+    h = hashlib.blake2b(digest_size=12)
+    for key in sorted(runs):
+        h.update(key.encode())
+        h.update(np.ascontiguousarray(runs[key], dtype=np.float64).data)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Models and objective
+# ---------------------------------------------------------------------------
+def predict_log(form, theta, log_n, log_d=None):
+    """log L for parameters theta (S, P) at points (M,): returns (S, M),
+    plus d log L / d theta as (S, M, P)."""
+    theta = np.atleast_2d(theta)
+    if form == 'kaplan':
+        c, alpha = theta[:, :1], theta[:, 1:2]
+        out = alpha * (c - log_n)
+        grad = np.stack([np.broadcast_to(alpha, out.shape), c - log_n],
+                        axis=-1)
+        return out, grad
+    a, b, e, alpha, beta = (theta[:, k:k + 1] for k in range(5))
+    terms = np.stack([a - alpha * log_n, b - beta * log_d,
+                      np.broadcast_to(e, (len(theta), len(log_n)))], -1)
+    top = terms.max(axis=-1, keepdims=True)
+    w = np.exp(terms - top)
+    s = w.sum(axis=-1, keepdims=True)
+    out = (top + np.log(s))[..., 0]
+    p = w / s                                        # softmax weights
+    grad = np.stack([p[..., 0], p[..., 1], p[..., 2],
+                     -p[..., 0] * log_n, -p[..., 1] * log_d], axis=-1)
+    return out, grad
+
+
+def huber(r, delta=HUBER_DELTA):
+    """Huber loss and its derivative, elementwise."""
+    a = np.abs(r)
+    small = a <= delta
+    loss = np.where(small, 0.5 * r * r, delta * (a - 0.5 * delta))
+    dloss = np.where(small, r, delta * np.sign(r))
+    return loss, dloss
+
+
+def objective(form, log_n, log_d, log_l, weights, delta=HUBER_DELTA):
+    """fun(theta, rows) -> (f (S,), grad (S, P)) of the weighted Huber loss.
+
+    weights is (1, M) when every problem sees the same data (multi-start)
+    or (S_total, M) with one row per problem (bootstrap); rows picks the
+    problems that theta belongs to.
+    """
+    shared = len(weights) == 1
+
+    def fun(theta, rows):
+        w = weights if shared else weights[rows]
+        pred, dpred = predict_log(form, theta, log_n, log_d)
+        loss, dloss = huber(pred - log_l, delta)
+        f = (w * loss).sum(axis=1)
+        g = np.einsum('sm,smp->sp', w * dloss, dpred)
+        return f, g
+    return fun
+
+
+# ---------------------------------------------------------------------------
+# Batched L-BFGS
+# ---------------------------------------------------------------------------
+def lbfgs(fun, x0, history=10, max_iter=500, ftol=1e-10, gtol=1e-10):
+    """Minimise S independent problems at once.
+
+    fun(x, rows) returns (f, g) for the parameter rows x of problems rows.
+    Each problem keeps its own curvature pairs and step length; the
+    two-loop recursion runs on the still-active problems only, and each
+    backtracking step re-evaluates only the problems whose step was not
+    yet accepted. Problems stop independently once the relative decrease
+    or the gradient falls below tolerance. Returns (x, f, iterations).
+    """
+    x = np.array(x0, dtype=np.float64)
+    S, P = x.shape
+    f, g = fun(x, np.arange(S))
+    s_hist = np.zeros((history, S, P))
+    y_hist = np.zeros((history, S, P))
+    rho_hist = np.zeros((history, S))
+    active = np.arange(S)
+    it = 0
+    for it in range(1, max_iter + 1):
+        n_hist = min(it - 1, history)
+        slots = [(it - 2 - k) % history for k in range(n_hist)]  # newest 1st
+        ga = g[active]
+        q = ga.copy()
+        alphas = []
+        for k in slots:
+            s, y = s_hist[k, active], y_hist[k, active]
+            a = rho_hist[k, active] * np.einsum('sp,sp->s', s, q)
+            q -= a[:, None] * y
+            alphas.append(a)
+        if slots:
+            s, y = s_hist[slots[0], active], y_hist[slots[0], active]
+            sy = np.einsum('sp,sp->s', s, y)
+            yy = np.einsum('sp,sp->s', y, y)
+            ok = (sy > 0) & (yy > 0)
+            gamma = np.where(ok, sy / np.where(ok, yy, 1), 1.0)
+            q *= gamma[:, None]
+        else:
+            q /= np.maximum(np.abs(ga).max(axis=1, keepdims=True), 1.0)
+        for k, a in zip(reversed(slots), reversed(alphas)):
+            s, y = s_hist[k, active], y_hist[k, active]
+            b = rho_hist[k, active] * np.einsum('sp,sp->s', y, q)
+            q += s * (a - b)[:, None]
+        d = -q
+        slope = np.einsum('sp,sp->s', ga, d)
+        bad = slope >= 0                       # not a descent direction
+        d[bad] = -ga[bad]
+        slope[bad] = -np.einsum('sp,sp->s', ga[bad], ga[bad])
+
+        # Armijo backtracking; only rejected rows are re-evaluated
+        xa, fa = x[active], f[active]
+        x_new, f_new, g_new = xa.copy(), fa.copy(), ga.copy()
+        moved = np.zeros(len(active), dtype=bool)
+        pending = np.arange(len(active))
+        t = np.ones(len(active))
+        for _ in range(40):
+            trial = xa[pending] + t[pending, None] * d[pending]
+            f_t, g_t = fun(trial, active[pending])
+            ok = f_t <= fa[pending] + 1e-4 * t[pending] * slope[pending]
+            hit = pending[ok]
+            x_new[hit], f_new[hit], g_new[hit] = trial[ok], f_t[ok], g_t[ok]
+            moved[hit] = True
+            pending = pending[~ok]
+            if not len(pending):
+                break
+            t[pending] *= 0.5
+
+        slot = (it - 1) % history
+        s, y = x_new - xa, g_new - ga
+        sy = np.einsum('sp,sp->s', s, y)
+        s_hist[slot, active], y_hist[slot, active] = s, y
+        rho_hist[slot, active] = np.where(
+            sy > 1e-18, 1 / np.where(sy > 1e-18, sy, 1), 0.0)
+
+        done = (~moved | (np.abs(fa - f_new) <= ftol * (1 + np.abs(fa))) |
+                (np.abs(g_new).max(axis=1) <= gtol))
+        x[active], f[active], g[active] = x_new, f_new, g_new
+        active = active[~done]
+        if not len(active):
+            break
+    return x, f, it
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+def start_grid(form):
+    """Multi-start grid (the Chinchilla one follows Hoffmann et al.)."""
+    if form == 'kaplan':
+        axes = [np.arange(15.0, 46.0, 5.0), [0.02, 0.05, 0.1, 0.2, 0.5]]
+    else:
+        axes = [np.arange(0.0, 26.0, 5.0), np.arange(0.0, 26.0, 5.0),
+                [-1.0, -0.5, 0.0, 0.5, 1.0], [0.0, 0.5, 1.0, 1.5, 2.0],
+                [0.0, 0.5, 1.0, 1.5, 2.0]]
+    return np.array(list(itertools.product(*axes)), dtype=np.float64)
+
+
+def _columns(runs, form):
+    log_n = np.log(np.asarray(runs['N'], dtype=np.float64))
+    log_d = None
+    if form == 'chinchilla':
+        log_d = np.log(np.asarray(runs['D'], dtype=np.float64))
+    return log_n, log_d, np.log(np.asarray(runs['loss'], dtype=np.float64))
+
+
+def fit_multistart(runs, form, starts=None, delta=HUBER_DELTA):
+    """Best parameters over the start grid: (theta (P,), objective)."""
+    log_n, log_d, log_l = _columns(runs, form)
+    starts = start_grid(form) if starts is None else starts
+    weights = np.ones((1, len(log_l)))
+    x, f, _ = lbfgs(objective(form, log_n, log_d, log_l, weights, delta),
+                    starts)
+    best = int(np.nanargmin(f))
+    return x[best], float(f[best])
+
+
+def _bootstrap_chunk(args):
+    form, log_n, log_d, log_l, weights, theta0, delta = args
+    x0 = np.repeat(theta0[None, :], len(weights), axis=0)
+    x, _, _ = lbfgs(objective(form, log_n, log_d, log_l, weights, delta), x0)
+    return x
+
+
+def bootstrap(runs, form, theta, n_boot=1000, workers=None, chunk=250,
+              seed=0, delta=HUBER_DELTA):
+    """(n_boot, P) refits under multinomial resampling of the runs.
+
+    Each replicate starts from the full-data optimum; replicates are
+    batched `chunk` at a time and the batches spread over `workers`
+    processes (inline when workers == 1).
+    """
+    log_n, log_d, log_l = _columns(runs, form)
+    rng = np.random.default_rng(seed)
+    m = len(log_l)
+    weights = rng.multinomial(m, np.full(m, 1 / m), size=n_boot).astype(
+        np.float64)
+    jobs = [(form, log_n, log_d, log_l, weights[lo:lo + chunk],
+             np.asarray(theta, dtype=np.float64), delta)
+            for lo in range(0, n_boot, chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        parts = [_bootstrap_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            parts = list(pool.map(_bootstrap_chunk, jobs))
+    return np.concatenate(parts)
+
+
+def fit_scaling_law(runs, form='chinchilla', n_boot=1000, cache_dir=None,
+                    workers=None, seed=0, delta=HUBER_DELTA):
+    """Best fit plus bootstrap draws, as a JSON-serialisable dict.
+
+    Keys: 'form', 'names', 'theta', 'objective', 'boot' (n_boot x P),
+    'params' (readable constants), 'dataset', 'n_runs', 'seconds'.
+    """
+    if form not in FORMS:
+        raise ValueError(f'unknown scaling-law form {form!r}')
+    key = dataset_hash(runs)
+    cache_path = None
+    if cache_dir:
+        spec = f'{form}|{n_boot}|{seed}|{delta}'
+        tag = hashlib.blake2b((key + spec).encode(),
+                              digest_size=8).hexdigest()
+        cache_path = os.path.join(cache_dir, f'{form}-{tag}.json')
+        if os.path.exists(cache_path):
+            with open(cache_path) as fh:
+                return json.load(fh)
+
+    t0 = time.perf_counter()
+    theta, f = fit_multistart(runs, form, delta=delta)
+    boot = bootstrap(runs, form, theta, n_boot, workers, seed=seed,
+                     delta=delta) if n_boot else np.empty((0, len(theta)))
+    fit = {'form': form, 'names': list(FORMS[form]),
+           'theta': theta.tolist(), 'objective': f,
+           'boot': boot.tolist(), 'params': readable(form, theta),
+           'dataset': key, 'n_runs': int(len(runs['loss'])),
+           'seconds': time.perf_counter() - t0}
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w') as fh:
+            json.dump(fit, fh)
+    return fit
+
+
+def readable(form, theta):
+    """The constants as usually quoted (N_c, or E, A, B) and exponents."""
+    theta = np.asarray(theta, dtype=np.float64)
+    if form == 'kaplan':
+        return {'N_c': float(np.exp(theta[0])), 'alpha': float(theta[1])}
+    a, b, e, alpha, beta = theta
+    return {'E': float(np.exp(e)), 'A': float(np.exp(a)),
+            'B': float(np.exp(b)), 'alpha': float(alpha),
+            'beta': float(beta)}
+
+
+def predict(fit, N, D=None, theta=None):
+    """Loss of the fitted law (or of explicit theta rows) at N (and D)."""
+    single = theta is None
+    theta = np.atleast_2d(fit['theta'] if single else theta)
+    shape = np.shape(N)
+    log_n = np.log(np.ravel(N).astype(np.float64))
+    log_d = None if D is None else np.log(np.ravel(D).astype(np.float64))
+    out, _ = predict_log(fit['form'], theta, log_n, log_d)
+    out = np.exp(out)
+    return out[0].reshape(shape) if single else out.reshape((-1,) + shape)
+
+
+def band(fit, N, D=None, level=0.95):
+    """Pointwise bootstrap percentile band of the predicted loss."""
+    draws = predict(fit, N, D, theta=np.asarray(fit['boot']))
+    tail = 50 * (1 - level)
+    return (np.percentile(draws, tail, axis=0),
+            np.percentile(draws, 100 - tail, axis=0))
+
+
+def synthetic_runs(form='chinchilla', n_runs=120, noise=0.01, seed=0):
+    """Runs drawn from a known law with multiplicative noise.
+
+    chinchilla: Hoffmann et al.'s constants over a grid of model sizes
+    and tokens-per-parameter ratios; kaplan: the (8e13 / N)^0.076 curve
+    with D = 20 N.
+    """
+    rng = np.random.default_rng(seed)
+    if form == 'kaplan':
+        N = np.logspace(7.5, 12.5, n_runs)
+        D = 20 * N
+        loss = (8e13 / N) ** 0.076
+    else:
+        N = 10 ** rng.uniform(7.5, 10.5, n_runs)
+        D = N * 10 ** rng.uniform(0, 2.5, n_runs)
+        loss = 1.69 + 406.4 / N ** 0.34 + 410.7 / D ** 0.28
+    loss = loss * np.exp(noise * rng.normal(size=n_runs))
+    return {'N': N, 'D': D, 'C': 6 * N * D, 'loss': loss}
+
+
+def _demo():
+    runs = synthetic_runs('chinchilla')
+    t0 = time.perf_counter()
+    theta, f = fit_multistart(runs, 'chinchilla')
+    print(f'{len(start_grid("chinchilla")):,}-start Chinchilla fit of '
+          f'{len(runs["loss"])} runs: {time.perf_counter() - t0:.1f} s')
+    p = readable('chinchilla', theta)
+    print('  fitted  E={E:.3f} A={A:.1f} B={B:.1f} alpha={alpha:.3f} '
+          'beta={beta:.3f}'.format(**p))
+    print('  true    E=1.690 A=406.4 B=410.7 alpha=0.340 beta=0.280')
+
+    t0 = time.perf_counter()
+    boot = bootstrap(runs, 'chinchilla', theta, 1000)
+    print(f'  1000 bootstrap refits on {os.cpu_count()} worker(s): '
+          f'{time.perf_counter() - t0:.1f} s')
+    lo, hi = np.percentile(boot[:, 3:], [2.5, 97.5], axis=0)
+    print(f'  95% CI alpha [{lo[0]:.3f}, {hi[0]:.3f}], '
+          f'beta [{lo[1]:.3f}, {hi[1]:.3f}]')
+
+    kap = fit_scaling_law(synthetic_runs('kaplan', 40, 0.03, seed=7),
+                          'kaplan', n_boot=500)
+    print(f'Kaplan fit: N_c={kap["params"]["N_c"]:.2e}, '
+          f'alpha={kap["params"]["alpha"]:.4f} '
+          f'({kap["seconds"]:.1f} s with 500 bootstrap refits)')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+streaming_softmax.py
+One-pass softmax statistics over a full vocabulary, for many temperatures.
+
+A language model's next-token logits have 50k-1M entries. Softmax needs
+a max and a sum over all of them, but both can be kept as running
+values: when a new chunk raises the max from m to m', the old sum is
+rescaled by exp(m - m'). `OnlineSoftmax` does this for a whole vector of
+temperatures at once, so each chunk of C logits becomes one (T x C)
+array and peak memory is T * chunk floats however large V is.
+
+Beyond the normaliser it also keeps, in the same pass:
+
+    entropy   the running sum of e^(z - m) * z gives H = m + log s - u / s
+    top-k     raw-logit order is the same at every temperature T > 0, so
+              one argpartition-merged list of the k largest logits serves
+              every row; top-p (nucleus) sizes are read off it
+
+Chunks may come from an in-memory array, a memory-mapped .npy file, or a
+generator such as `lm_head_chunks`, which computes the logits h @ W^T of
+an output layer slice by slice and never holds all V of them.
+
+Usage:
+    from streaming_softmax import streaming_softmax, zipf_logits
+    stats = streaming_softmax(zipf_logits(1_000_000),
+                              temperatures=np.linspace(0.1, 3, 64))
+    stats.entropy            # (T,) nats
+    stats.top_probs()        # (T, k)
+    stats.nucleus_size(0.9)  # (T,)
+
+    python streaming_softmax.py   # check against dense softmax, time 1M x 64
+"""
+
+import time
+
+import numpy as np
+
+CHUNK = 1 << 16
+
+
+def iter_chunks(logits, chunk=CHUNK):
+    """Yield 1-D float32 chunks from an array, memmap or iterable of chunks."""
+    if isinstance(logits, np.ndarray):
+        for lo in range(0, logits.shape[-1], chunk):
+            yield np.asarray(logits[lo:lo + chunk], dtype=np.float32)
+    else:
+        for block in logits:
+            yield np.asarray(block, dtype=np.float32).ravel()
+
+
+def lm_head_chunks(h, W, chunk=CHUNK):
+    """Logits h @ W^T of an output layer, computed `chunk` rows of W at a time."""
+    h = np.asarray(h, dtype=np.float32)
+    for lo in range(0, W.shape[0], chunk):
+        yield np.asarray(W[lo:lo + chunk], dtype=np.float32) @ h
+
+
+def zipf_logits(V, exponent=1.1, noise=0.3, seed=0):
+    """Synthetic next-token logits whose softmax is roughly Zipfian.
+
+    Rank r gets logit -exponent * log(r) plus a little Gaussian noise,
+    and ranks are shuffled over token ids like a real vocabulary.
+    """
+    rng = np.random.default_rng(seed)
+    z = -exponent * np.log(np.arange(1, V + 1, dtype=np.float64))
+    z += noise * rng.normal(size=V)
+    return rng.permutation(z).astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Online accumulator
+# ---------------------------------------------------------------------------
+class OnlineSoftmax:
+    """Running max, sum, entropy term and top-k for T temperatures."""
+
+    def __init__(self, temperatures=(1.0,), k=1024):
+        self.temperatures = np.atleast_1d(
+            np.asarray(temperatures, dtype=np.float64))
+        if np.any(self.temperatures <= 0):
+            raise ValueError('temperatures must be positive')
+        T = len(self.temperatures)
+        self.k = k
+        self.m = np.full(T, -np.inf)     # running max of z / T
+        self.s = np.zeros(T)             # sum of exp(z/T - m)
+        self.u = np.zeros(T)             # sum of exp(z/T - m) * z/T
+        self.top_logits = np.empty(0, dtype=np.float32)
+        self.top_ids = np.empty(0, dtype=np.int64)
+        self.size = 0
+
+    def update(self, chunk):
+        """Fold one 1-D chunk of logits (the next ids in order) in."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.size == 0:
+            return self
+        inv_t = (1.0 / self.temperatures).astype(np.float32)[:, None]
+        z = chunk[None, :] * inv_t                       # (T, C)
+        m_new = np.maximum(self.m, z.max(axis=1))
+        scale = np.exp(self.m - m_new)                   # 0 on the first chunk
+        e = np.exp(z - m_new[:, None].astype(np.float32))
+        self.s = self.s * scale + e.sum(axis=1, dtype=np.float64)
+        self.u = self.u * scale + np.einsum('tc,tc->t', e, z,
+                                            dtype=np.float64)
+        self.m = m_new
+
+        ids = np.arange(self.size, self.size + chunk.size)
+        kk = min(self.k, chunk.size)
+        part = np.argpartition(-chunk, kk - 1)[:kk]
+        cand = np.concatenate([self.top_logits, chunk[part]])
+        cand_ids = np.concatenate([self.top_ids, ids[part]])
+        if cand.size > self.k:
+            keep = np.argpartition(-cand, self.k - 1)[:self.k]
+            cand, cand_ids = cand[keep], cand_ids[keep]
+        self.top_logits, self.top_ids = cand, cand_ids
+        self.size += chunk.size
+        return self
+
+    def result(self):
+        order = np.argsort(-self.top_logits, kind='stable')
+        return SoftmaxStats(self.temperatures, self.m, self.s, self.u,
+                            self.top_logits[order], self.top_ids[order],
+                            self.size)
+
+
+class SoftmaxStats:
+    """Finished statistics of a streamed softmax, one row per temperature."""
+
+    def __init__(self, temperatures, m, s, u, top_logits, top_ids, size):
+        self.temperatures = temperatures
+        self.log_z = m + np.log(s)           # log partition function of z / T
+        self.entropy = self.log_z - u / s    # nats
+        self.top_logits = top_logits         # best first
+        self.top_ids = top_ids
+        self.size = size
+
+    @property
+    def entropy_bits(self):
+        return self.entropy / np.log(2)
+
+    @property
+    def perplexity(self):
+        return np.exp(self.entropy)
+
+    def top_probs(self, k=None):
+        """(T, k) probabilities of the k most likely tokens."""
+        z = self.top_logits[:k].astype(np.float64)
+        return np.exp(z[None, :] / self.temperatures[:, None] -
+                      self.log_z[:, None])
+
+    def nucleus_size(self, p=0.9):
+        """Tokens needed to reach cumulative probability p, per temperature.
+
+        Rows whose nucleus is larger than the kept top-k return -1.
+        """
+        cum = np.cumsum(self.top_probs(), axis=1)
+        reached = cum >= p
+        size = reached.argmax(axis=1) + 1
+        return np.where(reached.any(axis=1), size, -1)
+
+    def sample(self, temperature_index=0, top_k=None, top_p=None, rng=None):
+        """Draw one token id with top-k and/or top-p truncation."""
+        rng = np.random.default_rng(rng)
+        probs = self.top_probs(top_k)[temperature_index]
+        if top_p is not None:
+            cut = np.searchsorted(np.cumsum(probs), top_p) + 1
+            probs = probs[:cut]
+        return int(self.top_ids[rng.choice(len(probs), p=probs / probs.sum())])
+
+
+def streaming_softmax(logits, temperatures=(1.0,), k=1024, chunk=CHUNK):
+    """Single-pass softmax statistics of `logits` at every temperature."""
+    acc = OnlineSoftmax(temperatures, k)
+    for block in iter_chunks(logits, chunk):
+        acc.update(block)
+    return acc.result()
+
+
+def _dense(z, t):
+    p = np.exp(z / t - np.max(z / t))
+    p /= p.sum()
+    return p, -(p * np.log(np.maximum(p, 1e-300))).sum()
+
+
+def _demo(V=1_000_000, n_temps=64):
+    z = zipf_logits(V)
+    temps = np.linspace(0.1, 3.0, n_temps)
+
+    check = streaming_softmax(z, temps[[0, 20, -1]], k=16, chunk=10_000)
+    for row, t in enumerate(temps[[0, 20, -1]]):
+        p, h = _dense(z.astype(np.float64), t)
+        top = np.sort(p)[::-1][:16]
+        print(f'T={t:4.2f}: entropy {check.entropy[row]:.5f} vs dense '
+              f'{h:.5f}, top-16 max abs err '
+              f'{np.abs(check.top_probs()[row] - top).max():.1e}')
+
+    t0 = time.perf_counter()
+    stats = streaming_softmax(z, temps)
+    dt = time.perf_counter() - t0
+    print(f'{V:,} logits x {n_temps} temperatures in {1e3 * dt:.0f} ms '
+          f'(peak work array {n_temps * CHUNK * 4 / 2**20:.0f} MiB)')
+    for i in (0, n_temps // 3, n_temps - 1):
+        print(f'  T={temps[i]:4.2f}: H={stats.entropy_bits[i]:5.2f} bits, '
+              f'top-1 {stats.top_probs(1)[i, 0]:.3f}, '
+              f'nucleus(0.9) {stats.nucleus_size(0.9)[i]}')
+
+    rng = np.random.default_rng(1)
+    W = rng.normal(size=(50_000, 256)).astype(np.float32) / 16
+    h = rng.normal(size=256)
+    t0 = time.perf_counter()
+    head = streaming_softmax(lm_head_chunks(h, W), temps)
+    print(f'50k x 256 output layer, chunked: '
+          f'{1e3 * (time.perf_counter() - t0):.0f} ms, '
+          f'H(T=1) = {np.interp(1.0, temps, head.entropy_bits):.2f} bits')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+training_log.py
+Stream a training log of 10^6-10^8 steps down to a plottable curve.
+
+A log is CSV (header row, one row per logged step) or JSONL (one object
+per line). It is read in chunks of rows, and each chunk feeds three
+incremental reducers per series:
+
+    EMA        exponential moving average with a half-life in steps,
+               carried across chunks and evaluated in vectorized
+               blocks (no per-row Python loop)
+    windows    count / mean / std / min / max per fixed window of steps,
+               accumulated with bincount and ufunc.at
+    LTTB       Largest-Triangle-Three-Buckets downsampling, applied to
+               each chunk and once more to the concatenated survivors,
+               so only a few thousand points per series ever stay in
+               memory
+
+Series may be sparse (validation loss every 1000 steps): missing CSV
+fields and absent JSON keys become NaN and are skipped per series.
+
+`reduce_log` caches its result as .npz under a key built from a
+fingerprint of the file (size, mtime and the blake2b of its first and
+last MiB) plus the reduction parameters. A re-render with an unchanged
+log therefore reads a few hundred kB instead of parsing the whole file.
+
+Usage:
+    from training_log import reduce_log
+    log = reduce_log('run.csv', columns=('loss', 'val_loss'),
+                     cache_dir='.cache')
+    x, y = log['loss'].points         # LTTB of the raw series
+    x, y = log['loss'].ema_points     # LTTB of its EMA
+    log['loss'].windows['mean']       # per-window statistics
+
+    python training_log.py   # write a 10^6-step log, reduce it cold and cached
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+CHUNK_ROWS = 1 << 18
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+def _float_or_nan(field):
+    return float(field or 'nan')
+
+
+def _csv_chunks(fh, columns, chunk_rows):
+    header = fh.readline().strip().split(',')
+    idx = [header.index(c) for c in columns]
+    while True:
+        lines = list(itertools.islice(fh, chunk_rows))
+        if not lines:
+            return
+        # loadtxt's C parser with a converter for empty fields is several
+        # times faster than genfromtxt's missing-value handling
+        yield np.loadtxt(lines, delimiter=',', usecols=idx, ndmin=2,
+                         dtype=np.float64, converters=_float_or_nan)
+
+
+def _jsonl_chunks(fh, columns, chunk_rows):
+    nan = float('nan')
+    while True:
+        lines = list(itertools.islice(fh, chunk_rows))
+        if not lines:
+            return
+        rows = []
+        for line in lines:
+            if line.strip():
+                rec = json.loads(line)
+                rows.append([rec.get(c, nan) for c in columns])
+        yield np.array(rows, dtype=np.float64).reshape(-1, len(columns))
+
+
+def read_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Yield (rows, len(columns)) float64 blocks; missing values are NaN."""
+    reader = _jsonl_chunks if path.endswith(('.jsonl', '.json')) \
+        else _csv_chunks
+    with open(path) as fh:
+        yield from reader(fh, list(columns), chunk_rows)
+
+
+def fingerprint(path, edge=1 << 20):
+    """Cheap content key: size, mtime and hashes of the first/last MiB."""
+    st = os.stat(path)
+    h = hashlib.blake2b(digest_size=12)
+    h.update(f'{st.st_size}:{st.st_mtime_ns}'.encode())
+    with open(path, 'rb') as fh:
+        h.update(fh.read(edge))
+        if st.st_size > edge:
+            fh.seek(max(st.st_size - edge, edge))
+            h.update(fh.read(edge))
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Incremental reducers
+# ---------------------------------------------------------------------------
+def ema_block(x, alpha, y0=None):
+    """EMA y_t = alpha_t * x_t + (1 - alpha_t) * y_{t-1}, vectorized.
+
+    `alpha` is a scalar or one weight per sample. With D_k the product of
+    the decays d_j = 1 - alpha_j, the closed form is
+    y_k = D_k (y0 + sum_j alpha_j x_j / D_j); it is evaluated in blocks
+    short enough that 1 / D_k stays finite.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), x.shape)
+    out = np.empty_like(x)
+    cum = np.cumsum(-np.log1p(-np.minimum(alpha, 1 - 1e-15)))
+    prev = x[0] if y0 is None and x.size else y0
+    lo = 0
+    while lo < x.size:
+        base = cum[lo - 1] if lo else 0.0
+        hi = max(lo + 1, int(np.searchsorted(cum, base + 600, 'right')))
+        c = cum[lo:hi] - base
+        out[lo:hi] = np.exp(-c) * (prev + np.cumsum(
+            alpha[lo:hi] * x[lo:hi] * np.exp(c)))
+        prev = out[hi - 1]
+        lo = hi
+    return out
+
+
+class EMA:
+    """EMA with a half-life in steps, carried from one chunk to the next.
+
+    The weight of each sample follows the step gap since the previous
+    one, so a series logged every 1000 steps is smoothed over the same
+    span of training as one logged every step.
+    """
+
+    def __init__(self, halflife):
+        self.halflife = halflife
+        self.value = None
+        self.step = None
+
+    def update(self, steps, x):
+        if x.size == 0:
+            return x
+        prev = steps[0] if self.step is None else self.step
+        gaps = np.diff(steps, prepend=prev)
+        y = ema_block(x, 1 - 0.5 ** (gaps / self.halflife), self.value)
+        self.value, self.step = y[-1], steps[-1]
+        return y
+
+
+class WindowStats:
+    """Count, mean, std, min and max of a series per `window` steps."""
+
+    def __init__(self, window):
+        self.window = window
+        self.n = np.zeros(0)
+        self.s = np.zeros(0)
+        self.s2 = np.zeros(0)
+        self.lo = np.zeros(0)
+        self.hi = np.zeros(0)
+
+    def _grow(self, size):
+        if size <= self.n.size:
+            return
+        extra = size - self.n.size
+        self.n = np.concatenate([self.n, np.zeros(extra)])
+        self.s = np.concatenate([self.s, np.zeros(extra)])
+        self.s2 = np.concatenate([self.s2, np.zeros(extra)])
+        self.lo = np.concatenate([self.lo, np.full(extra, np.inf)])
+        self.hi = np.concatenate([self.hi, np.full(extra, -np.inf)])
+
+    def update(self, steps, values):
+        if steps.size == 0:
+            return
+        b = (steps // self.window).astype(np.int64)
+        self._grow(int(b.max()) + 1)
+        size = self.n.size
+        self.n += np.bincount(b, minlength=size)
+        self.s += np.bincount(b, values, minlength=size)
+        self.s2 += np.bincount(b, values * values, minlength=size)
+        np.minimum.at(self.lo, b, values)
+        np.maximum.at(self.hi, b, values)
+
+    def result(self):
+        keep = self.n > 0
+        n = self.n[keep]
+        mean = self.s[keep] / n
+        var = np.maximum(self.s2[keep] / n - mean ** 2, 0)
+        return {'step': (np.flatnonzero(keep) + 0.5) * self.window,
+                'count': n, 'mean': mean, 'std': np.sqrt(var),
+                'min': self.lo[keep], 'max': self.hi[keep]}
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: n_out points that keep the shape.
+
+    First and last points are kept; every bucket in between contributes
+    the point forming the largest triangle with the previously chosen
+    point and the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Mean of every bucket, for use as the "next" vertex
+    csx = np.concatenate([[0.0], np.cumsum(x)])
+    csy = np.concatenate([[0.0], np.cumsum(y)])
+    lo_e, hi_e = edges[:-1], np.maximum(edges[1:], edges[:-1] + 1)
+    mx = (csx[hi_e] - csx[lo_e]) / (hi_e - lo_e)
+    my = (csy[hi_e] - csy[lo_e]) / (hi_e - lo_e)
+    mx = np.append(mx[1:], x[-1])
+    my = np.append(my[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = lo_e[i], hi_e[i]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - mx[i]) * (by - y[a]) -
+                      (x[a] - bx) * (my[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+class StreamingLTTB:
+    """LTTB over a stream: reduce each chunk, then the survivors.
+
+    Each chunk keeps `oversample` times its share of the final budget,
+    which keeps the two-stage result visually identical to one-shot LTTB.
+    """
+
+    def __init__(self, n_out, expected=None, oversample=4):
+        self.n_out = n_out
+        self.expected = expected
+        self.oversample = oversample
+        self.xs, self.ys = [], []
+
+    def update(self, x, y):
+        if x.size == 0:
+            return
+        if self.expected:
+            share = self.oversample * self.n_out * x.size / self.expected
+        else:
+            share = self.oversample * self.n_out
+        # Sparse series (one eval per thousand rows) are kept whole
+        share = max(int(share), min(x.size, self.n_out), 3)
+        rx, ry = lttb(x, y, share)
+        self.xs.append(rx)
+        self.ys.append(ry)
+
+    def result(self):
+        if not self.xs:
+            return np.empty(0), np.empty(0)
+        return lttb(np.concatenate(self.xs), np.concatenate(self.ys),
+                    self.n_out)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+class ReducedSeries:
+    """Downsampled raw series, downsampled EMA and window statistics."""
+
+    def __init__(self, points, ema_points, windows, count, last_ema):
+        self.points = points
+        self.ema_points = ema_points
+        self.windows = windows
+        self.count = count
+        self.last_ema = last_ema
+
+
+def _estimate_rows(path, sample=1 << 16):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as fh:
+        head = fh.read(sample)
+    lines = max(head.count(b'\n'), 1)
+    return int(size / len(head) * lines) if head else 0
+
+
+def reduce_log(path, columns=('loss',), step_column='step', n_points=4000,
+               ema_halflife=200, window=1000, cache_dir=None,
+               chunk_rows=CHUNK_ROWS):
+    """Stream `path` once and return {column: ReducedSeries}.
+
+    With cache_dir set, results are stored as .npz keyed by the file
+    fingerprint and parameters and reused while the log is unchanged.
+    """
+    params = f'{columns}|{step_column}|{n_points}|{ema_halflife}|{window}'
+    cache_path = None
+    if cache_dir:
+        key = hashlib.blake2b(
+            (fingerprint(path) + params).encode(), digest_size=12).hexdigest()
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cache_path = os.path.join(cache_dir, f'{stem}-{key}.npz')
+        if os.path.exists(cache_path):
+            return _load(cache_path, columns)
+
+    expected = _estimate_rows(path)
+    emas = {c: EMA(ema_halflife) for c in columns}
+    wins = {c: WindowStats(window) for c in columns}
+    raw = {c: StreamingLTTB(n_points, expected) for c in columns}
+    smooth = {c: StreamingLTTB(n_points, expected) for c in columns}
+    counts = dict.fromkeys(columns, 0)
+    for block in read_chunks(path, (step_column,) + tuple(columns),
+                             chunk_rows):
+        steps = block[:, 0]
+        for j, c in enumerate(columns, start=1):
+            ok = np.isfinite(block[:, j]) & np.isfinite(steps)
+            s, v = steps[ok], block[ok, j]
+            counts[c] += s.size
+            wins[c].update(s, v)
+            raw[c].update(s, v)
+            smooth[c].update(s, emas[c].update(s, v))
+
+    result = {c: ReducedSeries(raw[c].result(), smooth[c].result(),
+                               wins[c].result(), counts[c],
+                               emas[c].value) for c in columns}
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save(cache_path, result)
+    return result
+
+
+def _save(path, result):
+    arrays = {}
+    for c, r in result.items():
+        arrays[f'{c}/x'], arrays[f'{c}/y'] = r.points
+        arrays[f'{c}/ema_x'], arrays[f'{c}/ema_y'] = r.ema_points
+        for k, v in r.windows.items():
+            arrays[f'{c}/win_{k}'] = v
+        arrays[f'{c}/count'] = np.array(r.count)
+        arrays[f'{c}/last_ema'] = np.array(
+            np.nan if r.last_ema is None else r.last_ema)
+    np.savez(path, **arrays)
+
+
+def _load(path, columns):
+    data = np.load(path)
+    result = {}
+    for c in columns:
+        windows = {k[len(c) + 5:]: data[k] for k in data.files
+                   if k.startswith(f'{c}/win_')}
+        result[c] = ReducedSeries((data[f'{c}/x'], data[f'{c}/y']),
+                                  (data[f'{c}/ema_x'], data[f'{c}/ema_y']),
+                                  windows, int(data[f'{c}/count']),
+                                  float(data[f'{c}/last_ema']))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Synthetic logs
+# ---------------------------------------------------------------------------
+def synthetic_run(steps, rng, init=4.05, final=1.52, decay=4.5e-5,
+                  val_gap=0.16):
+    """Training and validation loss of a plausible run at `steps`."""
+    steps = np.asarray(steps, dtype=np.float64)
+    base = final + (init - final) * np.exp(-decay * steps)
+    noise = (0.08 * np.exp(-steps / 30_000) + 0.015) * rng.normal(
+        size=steps.size)
+    # Occasional loss spikes that decay over a few hundred steps
+    spikes = np.where(rng.random(steps.size) < 2e-5,
+                      rng.exponential(0.6, steps.size), 0.0)
+    spike = ema_block(spikes, 1 - 0.5 ** (1 / 60), 0.0) * 8
+    val = base + val_gap * (1 - np.exp(-steps / 40_000)) + \
+        0.02 * rng.normal(size=steps.size)
+    return base + noise + spike, val
+
+
+def write_synthetic_log(path, n_steps=1_000_000, eval_every=1000,
+                        chunk_rows=CHUNK_ROWS, seed=0):
+    """Write a CSV or JSONL log with loss every step, val_loss sparsely."""
+    rng = np.random.default_rng(seed)
+    scale = 100_000 / n_steps       # same curve shape at any length
+    jsonl = path.endswith(('.jsonl', '.json'))
+    with open(path, 'w') as fh:
+        if not jsonl:
+            fh.write('step,loss,val_loss\n')
+        for lo in range(0, n_steps, chunk_rows):
+            steps = np.arange(lo, min(lo + chunk_rows, n_steps))
+            loss, val = synthetic_run(steps * scale, rng)
+            has_val = steps % eval_every == 0
+            if jsonl:
+                fh.writelines(
+                    json.dumps({'step': int(s), 'loss': round(float(l), 5),
+                                **({'val_loss': round(float(v), 5)}
+                                   if hv else {})}) + '\n'
+                    for s, l, v, hv in zip(steps, loss, val, has_val))
+            else:
+                val_txt = np.where(has_val, np.char.mod('%.5f', val), '')
+                rows = np.char.add(np.char.add(np.char.add(
+                    steps.astype(str), ','), np.char.mod('%.5f', loss)),
+                    np.char.add(',', val_txt))
+                fh.write('\n'.join(rows.tolist()) + '\n')
+
+
+def _demo(n_steps=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.csv')
+        t0 = time.perf_counter()
+        write_synthetic_log(path, n_steps)
+        print(f'wrote {n_steps:,}-step log ({os.path.getsize(path) / 2**20:.0f}'
+              f' MiB) in {time.perf_counter() - t0:.1f} s')
+
+        cache = os.path.join(tmp, 'cache')
+        for label in ('cold', 'cached'):
+            t0 = time.perf_counter()
+            log = reduce_log(path, ('loss', 'val_loss'), cache_dir=cache)
+            dt = time.perf_counter() - t0
+            print(f'  {label:6s} reduce: {1e3 * dt:8.1f} ms')
+        for c, r in log.items():
+            print(f'  {c}: {r.count:,} points -> {r.points[0].size} LTTB, '
+                  f'{r.windows["mean"].size} windows, final EMA '
+                  f'{r.last_ema:.3f}')
+
+        x = np.linspace(0, 1, 200_000)
+        y = np.sin(40 * x) + 0.1 * np.random.default_rng(0).normal(size=x.size)
+        one = lttb(x, y, 2000)[1]
+        s = StreamingLTTB(2000, x.size)
+        for lo in range(0, x.size, 30_000):
+            s.update(x[lo:lo + 30_000], y[lo:lo + 30_000])
+        two = s.result()[1]
+        print(f'streaming vs one-shot LTTB: y range {np.ptp(two):.3f} vs '
+              f'{np.ptp(one):.3f}, mean {two.mean():+.3f} vs {one.mean():+.3f}')
+
+
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+word_analogy.py
+Word analogies (a - b + c) over memory-mapped, unit-normalized embeddings.
+
+A GloVe or word2vec text file ('word v1 v2 ...' per line; word2vec's
+'count dim' header line is skipped) is read once and converted to
+
+    <prefix>.npy         (n, dim) float32, every row scaled to unit length
+    <prefix>.vocab.txt   one word per line, row order
+
+After that the matrix is opened memory-mapped, so loading 400k x 300
+vectors costs nothing and only the pages a query touches are read.
+
+Queries are answered in batches: the B query vectors (a - b + c,
+normalised) form a (B, dim) matrix and the vocabulary is streamed in row
+blocks; each block costs one (B, rows) matmul, and the block's
+candidates are merged into a running top-k. Rows are unit length, so
+the scores are cosines (3CosAdd), and the query words themselves are
+excluded. One pass over the matrix serves the whole batch, so a batch
+of 200 analogies over 400k x 300 costs about 5 ms per query, nearly
+all of it the matmul. After the first block a candidate must beat the
+query's current k-th best score, so merging stays tiny.
+
+`neighborhood_pca` projects a handful of words to 2-D with a PCA fitted
+on just those vectors (or a chosen subset of them), which keeps local directions like gender or
+royalty instead of the corpus-wide principal axes.
+
+Usage:
+    from word_analogy import WordVectors, neighborhood_pca
+    wv = WordVectors.load('glove.6B.300d.txt')   # converts once, then mmap
+    wv.analogy('king', 'man', 'woman')           # [('queen', 0.69), ...]
+    wv.analogies([('king', 'man', 'woman'), ('paris', 'france', 'italy')])
+    xy = neighborhood_pca(wv.vectors_for(['king', 'queen', 'man']))
+
+    python word_analogy.py   # convert + query a synthetic 400k x 300 set
+"""
+
+import os
+import time
+
+import numpy as np
+
+BLOCK_ROWS = 1 << 15
+CHUNK_LINES = 20_000
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+def _count_lines(path):
+    """Lines in the file, counting a last line without a newline."""
+    n, last = 0, b'\n'
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 24), b''):
+            n += block.count(b'\n')
+            last = block[-1:]
+    return n + (last != b'\n')
+
+
+def _parse(lines, dim):
+    """(words, (len(lines), dim) float32) for a block of text lines."""
+    words, rest = [], []
+    for line in lines:
+        word, _, values = line.rstrip().partition(' ')
+        words.append(word)
+        rest.append(values)
+    flat = np.array(' '.join(rest).split(), dtype=np.float32)
+    if flat.size == len(lines) * dim:
+        return words, flat.reshape(-1, dim)
+    # Some words contain spaces: take the last dim fields as the vector
+    words, rows = [], []
+    for line in lines:
+        parts = line.rstrip().rsplit(' ', dim)
+        if len(parts) != dim + 1:
+            raise ValueError(f'bad embedding line: {line[:60]!r}...')
+        words.append(parts[0])
+        rows.append(parts[1:])
+    return words, np.array(rows, dtype=np.float32)
+
+
+def convert_text(path, prefix=None, verbose=False):
+    """Convert a GloVe/word2vec text file to normalized .npy + vocabulary.
+
+    Returns the prefix the files were written under (default: path
+    without its extension). The text is streamed in chunks, and rows go
+    straight into a memory-mapped output, so memory stays flat.
+    """
+    prefix = prefix or os.path.splitext(path)[0]
+    t0 = time.perf_counter()
+    n = _count_lines(path)
+    with open(path, encoding='utf-8', errors='replace') as fh:
+        first = fh.readline()
+        head = first.split()
+        if len(head) == 2 and all(h.isdigit() for h in head):
+            # word2vec header: trust its dim, not its count, for sizing
+            n, dim = n - 1, int(head[1])
+            first = fh.readline()
+        else:
+            dim = len(first.rstrip().split(' ')) - 1
+        out = np.lib.format.open_memmap(prefix + '.npy.tmp', mode='w+',
+                                        dtype=np.float32, shape=(n, dim))
+        words, row, lines = [], 0, [first]
+        for line in fh:
+            lines.append(line)
+            if len(lines) == CHUNK_LINES:
+                row = _store(out, row, words, lines, dim)
+                lines = []
+        row = _store(out, row, words, lines, dim)
+    out.flush()
+    del out
+    if row != n:
+        # Blank lines were counted but not stored
+        X = np.load(prefix + '.npy.tmp', mmap_mode='r')[:row]
+        np.save(prefix + '.npy', X)
+        del X
+        os.remove(prefix + '.npy.tmp')
+    else:
+        os.replace(prefix + '.npy.tmp', prefix + '.npy')
+    with open(prefix + '.vocab.txt', 'w', encoding='utf-8') as fh:
+        fh.write('\n'.join(words) + '\n')
+    if verbose:
+        print(f'  converted {row:,} x {dim} vectors in '
+              f'{time.perf_counter() - t0:.1f} s')
+    return prefix
+
+
+def _store(out, row, words, lines, dim):
+    lines = [l for l in lines if l.strip()]
+    if not lines:
+        return row
+    w, X = _parse(lines, dim)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    X /= np.maximum(norms, 1e-12)
+    out[row:row + len(X)] = X
+    words.extend(w)
+    return row + len(X)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+class WordVectors:
+    """Unit-length word vectors (memory-mapped) with a vocabulary index."""
+
+    def __init__(self, vectors, words):
+        if len(words) != vectors.shape[0]:
+            raise ValueError(f'{len(words)} words for {vectors.shape[0]} '
+                             f'vectors')
+        self.vectors = vectors
+        self.words = list(words)
+        self.index = {}
+        for i, w in enumerate(self.words):
+            self.index.setdefault(w, i)
+
+    @classmethod
+    def open(cls, prefix):
+        """Memory-map <prefix>.npy with <prefix>.vocab.txt."""
+        X = np.load(prefix + '.npy', mmap_mode='r')
+        with open(prefix + '.vocab.txt', encoding='utf-8') as fh:
+            words = fh.read().split('\n')[:X.shape[0]]
+        return cls(X, words)
+
+    @classmethod
+    def load(cls, path, verbose=False):
+        """Open a text embedding file, converting it on first use.
+
+        The .npy/.vocab.txt pair next to the text file is reused as long
+        as it is newer than the text.
+        """
+        prefix = os.path.splitext(path)[0]
+        if path.endswith('.npy'):
+            return cls.open(prefix)
+        npy = prefix + '.npy'
+        if not (os.path.exists(npy) and
+                os.path.exists(prefix + '.vocab.txt') and
+                os.path.getmtime(npy) >= os.path.getmtime(path)):
+            convert_text(path, prefix, verbose=verbose)
+        return cls.open(prefix)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return self.lookup(word) is not None
+
+    def lookup(self, word):
+        """Row of word, trying it as given and then lower-cased."""
+        i = self.index.get(word)
+        if i is None:
+            i = self.index.get(word.lower())
+        return i
+
+    def _row(self, word):
+        i = self.lookup(word)
+        if i is None:
+            raise KeyError(f'{word!r} is not in the vocabulary')
+        return i
+
+    def vectors_for(self, words):
+        """(len(words), dim) float32 copy of the vectors of words."""
+        return np.asarray(self.vectors[[self._row(w) for w in words]],
+                          dtype=np.float32)
+
+    def nearest(self, Q, k=10, exclude=None, block_rows=BLOCK_ROWS):
+        """Top-k rows by cosine for each row-query of Q.
+
+        Q is (B, dim), normalised here; exclude is an optional list of B
+        row-id collections to skip. Returns (ids, scores), both (B, k),
+        best first.
+        """
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float32))
+        Q = Q / np.maximum(np.linalg.norm(Q, axis=1, keepdims=True), 1e-12)
+        B, n = len(Q), len(self)
+        k = min(k, n)
+        ex_rows = ex_cols = None
+        if exclude is not None:
+            pairs = [(r, b) for b, rows in enumerate(exclude) for r in rows]
+            if pairs:
+                ex_rows, ex_cols = np.array(pairs).T
+        best_s = best_i = None
+        for lo in range(0, n, block_rows):
+            block = np.asarray(self.vectors[lo:lo + block_rows])
+            S = Q @ block.T                             # (B, rows)
+            if ex_rows is not None:
+                hit = (ex_rows >= lo) & (ex_rows < lo + len(block))
+                S[ex_cols[hit], ex_rows[hit] - lo] = -np.inf
+            if best_s is None or len(best_s[0]) < k:
+                # Until every query holds k rows: partition the block
+                kk = min(k, S.shape[1])
+                top = np.argpartition(S, S.shape[1] - kk, axis=1)[:, -kk:]
+                cand_b = np.repeat(np.arange(B), kk)
+                cand_i = (top + lo).ravel()
+                cand_s = np.take_along_axis(S, top, axis=1).ravel()
+            else:
+                # Afterwards only scores beating the k-th best can matter
+                cand_b, col = np.nonzero(S > best_s[:, -1:])
+                if not len(cand_b):
+                    continue
+                cand_i, cand_s = col + lo, S[cand_b, col]
+            if best_s is not None:
+                cand_b = np.concatenate([np.repeat(np.arange(B),
+                                                   best_s.shape[1]), cand_b])
+                cand_i = np.concatenate([best_i.ravel(), cand_i])
+                cand_s = np.concatenate([best_s.ravel(), cand_s])
+            # Per query, best first; keep the first k of each group
+            order = np.lexsort((-cand_s, cand_b))
+            cand_b, cand_i, cand_s = (cand_b[order], cand_i[order],
+                                      cand_s[order])
+            start = np.searchsorted(cand_b, np.arange(B))
+            rank = np.arange(len(cand_b)) - start[cand_b]
+            width = min(k, int(np.bincount(cand_b, minlength=B).min()))
+            keep = rank < width
+            best_i = cand_i[keep].reshape(B, width)
+            best_s = cand_s[keep].reshape(B, width)
+        return best_i, best_s
+
+    def analogies(self, queries, k=5):
+        """For each (a, b, c): the words closest to a - b + c.
+
+        ('king', 'man', 'woman') asks for king - man + woman; the three
+        query words are never returned. Returns [[(word, cosine), ...]].
+        """
+        rows = [[self._row(w) for w in q] for q in queries]
+        ids = np.array(rows)
+        V = np.asarray(self.vectors[ids.ravel()],
+                       dtype=np.float32).reshape(len(rows), 3, -1)
+        Q = V[:, 0] - V[:, 1] + V[:, 2]
+        top, score = self.nearest(Q, k, exclude=rows)
+        return [[(self.words[i], float(s)) for i, s in zip(ti, si)]
+                for ti, si in zip(top, score)]
+
+    def analogy(self, a, b, c, k=5):
+        return self.analogies([(a, b, c)], k)[0]
+
+    def neighbors(self, word, k=10):
+        """[(word, cosine)] of the k nearest other words."""
+        i = self._row(word)
+        top, score = self.nearest(self.vectors[i], k, exclude=[[i]])
+        return [(self.words[j], float(s)) for j, s in zip(top[0], score[0])]
+
+
+def neighborhood_pca(X, dims=2, fit=None):
+    """(len(X), dims) coordinates from a PCA fitted on the rows of X.
+
+    fit, if given, selects the rows the axes are fitted on (e.g. just the
+    four words of an analogy); every row is then projected onto them.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    F = X if fit is None else X[fit]
+    mean = F.mean(axis=0)
+    _, _, vt = np.linalg.svd(F - mean, full_matrices=False)
+    return (X - mean) @ vt[:dims].T
+
+
+# ---------------------------------------------------------------------------
+# Demo
+# ---------------------------------------------------------------------------
+def synthetic_vectors(n=400_000, dim=300, n_quads=2000, seed=0):
+    """Random unit vectors with planted analogies.
+
+    Returns (X, words, quads): for quad (m, w, k, q) the vectors are
+    base, base + g, base + r, base + r + g (plus noise) for shared
+    directions g and r, so k - m + w lands next to q.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, dim), dtype=np.float32)
+    g = rng.standard_normal(dim).astype(np.float32) * 0.8
+    r = rng.standard_normal(dim).astype(np.float32) * 0.8
+    rows = rng.permutation(n)[:4 * n_quads].reshape(n_quads, 4)
+    base = rng.standard_normal((n_quads, 1, dim), dtype=np.float32)
+    shift = np.stack([0 * g, g, r, r + g])[None]
+    noise = 0.2 * rng.standard_normal((n_quads, 4, dim), dtype=np.float32)
+    X[rows] = base + shift + noise
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    words = [f'w{i}' for i in range(n)]
+    quads = [tuple(words[i] for i in q) for q in rows]
+    return X, words, quads
+
+
+def _demo(n=400_000, dim=300, n_queries=200):
+    import tempfile
+    X, words, quads = synthetic_vectors(n, dim)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Text round trip on a slice (a full 400k x 300 text file is 1 GB)
+        path = os.path.join(tmp, 'vectors.txt')
+        with open(path, 'w') as fh:
+            for w, row in zip(words[:50_000], X[:50_000]):
+                fh.write(w + ' ' + ' '.join(f'{v:.5f}' for v in row) + '\n')
+        t0 = time.perf_counter()
+        small = WordVectors.load(path)
+        print(f'converted 50,000 x {dim} text vectors in '
+              f'{time.perf_counter() - t0:.1f} s')
+        assert np.allclose(small.vectors[:100], X[:100], atol=1e-4)
+
+        np.save(os.path.join(tmp, 'big.npy'), X)
+        with open(os.path.join(tmp, 'big.vocab.txt'), 'w') as fh:
+            fh.write('\n'.join(words) + '\n')
+        del X
+        t0 = time.perf_counter()
+        wv = WordVectors.open(os.path.join(tmp, 'big'))
+        print(f'opened {len(wv):,} x {dim} memory-mapped in '
+              f'{(time.perf_counter() - t0) * 1e3:.0f} ms')
+
+        queries = [(k, m, w) for m, w, k, _ in quads[:n_queries]]
+        wv.analogies(queries[:4])                  # warm the page cache
+        t0 = time.perf_counter()
+        answers = wv.analogies(queries, k=5)
+        dt = time.perf_counter() - t0
+        hits = sum(ans[0][0] == q[3] for ans, q in
+                   zip(answers, quads[:n_queries]))
+        print(f'{n_queries} analogies in one batch: {dt * 1e3:.0f} ms '
+              f'({dt / n_queries * 1e3:.1f} ms/query), top-1 accuracy '
+              f'{hits / n_queries:.0%}')
+
+        # Blocked top-k must match a brute-force top-k
+        Q = np.asarray(wv.vectors[:8]) + np.asarray(wv.vectors[8:16])
+        ids, _ = wv.nearest(Q, k=10, block_rows=10_000)
+        full = np.asarray(wv.vectors) @ (Q / np.linalg.norm(
+            Q, axis=1, keepdims=True)).T
+        assert (ids == np.argsort(-full, axis=0)[:10].T).all()
+        print('  blocked top-k matches brute force')
+        del wv, small
+
+
+if __name__ == '__main__':
+    _demo()
@@ -12,19 +12,10 @@ Output:
 (each 3840x2160, 4K)
 """
 import os
-import matplotlib.pyplot as plt
 
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+from theme import BLUE, YELLOW, GREEN, TEAL, ORANGE, slide_figure
 
-BG      = '#1b2631'
-BLUE    = '#3498db'
-YELLOW  = '#f1c40f'
-GREEN   = '#2ecc71'
-TEAL    = '#1abc9c'
-ORANGE  = '#e67e22'
-RED     = '#e74c3c'
-TEXT    = '#ecf0f1'
-MUTED   = '#95a5a6'
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # (output_filename, symbol, color)
 ICONS = [
@@ -39,32 +30,22 @@ ICONS = [
 def main():
     for filename, symbol, color in ICONS:
         output_path = os.path.join(SCRIPT_DIR, '..', 'images', filename)
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        plt.style.use('dark_background')
-        fig, ax = plt.subplots(figsize=(19.2, 10.8), facecolor=BG)
-        ax.set_facecolor(BG)
-        fig.patch.set_facecolor(BG)
-
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.axis('off')
-
-        ax.text(
-            0.5, 0.5,
-            symbol,
-            ha='center', va='center',
-            fontsize=400,
-            alpha=0.15,
-            color=color,
-            transform=ax.transAxes,
-            clip_on=False,
-        )
 
-        plt.savefig(output_path, dpi=200, bbox_inches='tight',
-                    facecolor=BG, edgecolor='none')
-        plt.close(fig)
-        print(f'Saved: {os.path.abspath(output_path)}')
+        with slide_figure(output_path) as (fig, ax):
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.axis('off')
+
+            ax.text(
+                0.5, 0.5,
+                symbol,
+                ha='center', va='center',
+                fontsize=400,
+                alpha=0.15,
+                color=color,
+                transform=ax.transAxes,
+                clip_on=False,
+            )
 
 
 if __name__ == '__main__':
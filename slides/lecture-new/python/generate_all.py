@@ -67,6 +67,10 @@ def main():
     if SCRIPT_DIR not in sys.path:
         sys.path.insert(0, SCRIPT_DIR)
 
+    # Shared slide theme: resolve its fonts once before the first figure
+    from theme import theme_key, warm_fonts
+    warm_fonts()
+
     total = len(SCRIPTS)
     successes = 0
     failures = []
@@ -74,6 +78,7 @@ def main():
     print(f'{"=" * 60}')
     print(f'  Generating {total} lecture-new visualizations')
     print(f'  Output directory: {os.path.abspath(IMAGES_DIR)}')
+    print(f'  Theme: {theme_key()}')
     print(f'{"=" * 60}\n')
 
     for i, script_name in enumerate(SCRIPTS, 1):